@@ -0,0 +1,67 @@
+"""Add execution_rollups and rolled_up flags on executions and results
+
+Revision ID: 7c3e91d5a2b4
+Revises: 9f49c241529f
+Create Date: 2026-10-18 09:12:41.208315
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c3e91d5a2b4'
+down_revision: Union[str, None] = '9f49c241529f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The application's create_all and its startup column check (ensure_execution_rollup_columns)
+    # may already have created any of these, so each step checks first
+    inspector = sa.inspect(op.get_bind())
+
+    # Existing rows start un-rolled-up; the catch-up task folds history in batch by batch
+    for table in ('job_executions', 'job_execution_results'):
+        if 'rolled_up' not in {column['name'] for column in inspector.get_columns(table)}:
+            op.add_column(table, sa.Column('rolled_up', sa.Boolean(), nullable=False, server_default='false'))
+        index_name = f'idx_{table}_rollup_pending'
+        if index_name not in {index['name'] for index in inspector.get_indexes(table)}:
+            op.create_index(index_name, table, ['id'], postgresql_where=sa.text('NOT rolled_up'))
+
+    if not inspector.has_table('execution_rollups'):
+        op.create_table(
+            'execution_rollups',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('scope', sa.String(length=10), nullable=False),
+            sa.Column('scope_id', sa.Integer(), nullable=False),
+            sa.Column('grain', sa.String(length=10), nullable=False),
+            sa.Column('bucket', sa.DateTime(timezone=True), nullable=False),
+            sa.Column('total', sa.Integer(), nullable=False),
+            sa.Column('completed', sa.Integer(), nullable=False),
+            sa.Column('failed', sa.Integer(), nullable=False),
+            sa.Column('cancelled', sa.Integer(), nullable=False),
+            sa.Column('timed', sa.Integer(), nullable=False),
+            sa.Column('duration_sum_ms', sa.BigInteger(), nullable=False),
+            sa.Column('duration_min_ms', sa.BigInteger(), nullable=True),
+            sa.Column('duration_max_ms', sa.BigInteger(), nullable=True),
+            sa.Column('duration_histogram', postgresql.ARRAY(sa.BigInteger()), nullable=False),
+            sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('uq_execution_rollups_key', 'execution_rollups',
+                        ['scope', 'scope_id', 'grain', 'bucket'], unique=True)
+        op.create_index('idx_execution_rollups_grain_bucket', 'execution_rollups', ['grain', 'bucket'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_execution_rollups_grain_bucket', table_name='execution_rollups')
+    op.drop_index('uq_execution_rollups_key', table_name='execution_rollups')
+    op.drop_table('execution_rollups')
+    op.drop_index('idx_job_execution_results_rollup_pending', table_name='job_execution_results')
+    op.drop_index('idx_job_executions_rollup_pending', table_name='job_executions')
+    op.drop_column('job_execution_results', 'rolled_up')
+    op.drop_column('job_executions', 'rolled_up')
@@ -13,6 +13,7 @@ from pydantic import BaseModel, Field
 from app.database.database import get_db
 from app.core.auth_dependencies import get_current_user
 from app.core.logging import get_structured_logger
+from app.services.execution_rollup_service import ExecutionRollupService
 
 api_base_url = os.getenv("API_BASE_URL", "/api/v3")
 router = APIRouter(prefix=f"{api_base_url}/analytics", tags=["Analytics v3"])
@@ -129,25 +130,37 @@ async def get_job_performance_metrics(
     current_user: Dict[str, Any] = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get job performance analytics"""
+    """Get job performance analytics from the execution rollups"""
     try:
-        # Mock performance trend data
-        performance_trend = []
-        for i in range(days):
-            date = datetime.now(timezone.utc) - timedelta(days=i)
-            performance_trend.append({
-                "date": date.date().isoformat(),
-                "avg_duration": 45.5 + (i % 10),
-                "success_rate": 90.0 + (i % 8),
-                "job_count": 20 + (i % 5)
-            })
+        rollups = ExecutionRollupService(db)
+        now = datetime.now(timezone.utc)
+        start_time = now - timedelta(days=days - 1)
+        daily = rollups.buckets("day", start_time, now)
+        summary = rollups.combine(daily)
+        
+        # Busiest hours of the day (UTC) over the period
+        executions_by_hour = [0] * 24
+        for hour, stats in rollups.buckets("hour", start_time, now):
+            executions_by_hour[hour.hour] += stats.total
+        busiest = sorted(range(24), key=lambda hour: executions_by_hour[hour], reverse=True)[:5]
+        peak_hours = sorted(hour for hour in busiest if executions_by_hour[hour])
+        
+        # Newest day first
+        performance_trend = [
+            {
+                "date": day.date().isoformat(),
+                "avg_duration": round(stats.avg_seconds, 2),
+                "success_rate": round(stats.success_rate, 2),
+                "job_count": stats.total
+            } for day, stats in reversed(daily)
+        ]
         
         metrics = JobPerformanceMetrics(
-            average_duration=47.3,
-            success_rate=91.2,
-            failure_rate=8.8,
-            jobs_per_hour=6.5,
-            peak_hours=[9, 10, 14, 15, 16],
+            average_duration=round(summary.avg_seconds, 2),
+            success_rate=round(summary.success_rate, 2),
+            failure_rate=round(summary.failed / summary.total * 100, 2) if summary.total else 0,
+            jobs_per_hour=round(summary.total / (days * 24), 2),
+            peak_hours=peak_hours,
             performance_trend=performance_trend
         )
         
@@ -216,48 +229,49 @@ async def get_execution_trends(
     current_user: Dict[str, Any] = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get execution trend analytics"""
+    """Get execution trend analytics from the execution rollups"""
     try:
         # Determine data points based on period
         if period == "day":
             data_points = 24  # Hours
             time_unit = "hour"
+            step = timedelta(hours=1)
         elif period == "week":
             data_points = 7   # Days
             time_unit = "day"
+            step = timedelta(days=1)
         else:  # month
             data_points = 30  # Days
             time_unit = "day"
+            step = timedelta(days=1)
+        
+        now = datetime.now(timezone.utc)
+        buckets = ExecutionRollupService(db).buckets(time_unit, now - step * (data_points - 1), now)
         
-        # Mock trend data
+        # Newest bucket first
         success_trend = []
         failure_trend = []
         duration_trend = []
         
-        for i in range(data_points):
-            if period == "day":
-                timestamp = datetime.now(timezone.utc) - timedelta(hours=i)
-            else:
-                timestamp = datetime.now(timezone.utc) - timedelta(days=i)
-            
+        for timestamp, stats in reversed(buckets):
             success_trend.append({
                 "timestamp": timestamp.isoformat(),
-                "value": 15 + (i % 8)
+                "value": stats.completed
             })
             
             failure_trend.append({
                 "timestamp": timestamp.isoformat(),
-                "value": 2 + (i % 3)
+                "value": stats.failed
             })
             
             duration_trend.append({
                 "timestamp": timestamp.isoformat(),
-                "value": 45.0 + (i % 15)
+                "value": round(stats.avg_seconds, 2)
             })
         
         trends = ExecutionTrends(
             period=period,
-            total_executions=sum(point["value"] for point in success_trend) + sum(point["value"] for point in failure_trend),
+            total_executions=sum(stats.total for _, stats in buckets),
             success_trend=success_trend,
             failure_trend=failure_trend,
             duration_trend=duration_trend
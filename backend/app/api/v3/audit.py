@@ -5,6 +5,7 @@ All audit and lookup endpoints in v3 structure
 
 import os
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import FileResponse, StreamingResponse
 from sqlalchemy.orm import Session
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
@@ -12,7 +13,8 @@ import logging
 
 from app.database.database import get_db
 from app.core.auth_dependencies import get_current_user
-from app.domains.audit.services.audit_service import AuditService
+from app.domains.audit.services.audit_service import AuditService, audit_export_manager
+from app.domains.audit.services.audit_export import EXPORT_FORMATS
 from app.services.user_service import UserService
 from app.services.universal_target_service import UniversalTargetService
 
@@ -266,4 +268,129 @@ async def get_audit_stats(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to get audit statistics: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+
+def _export_filters(
+    event_type: Optional[str],
+    user_id: Optional[int],
+    resource_type: Optional[str],
+    severity: Optional[str],
+    start_date: Optional[datetime],
+    end_date: Optional[datetime]
+) -> Dict[str, Any]:
+    filters = {
+        'event_type': event_type,
+        'user_id': user_id,
+        'resource_type': resource_type,
+        'severity': severity,
+        'start_date': start_date,
+        'end_date': end_date
+    }
+    return {key: value for key, value in filters.items() if value is not None}
+
+
+@router.get("/export")
+async def export_audit_events(
+    format: str = Query("csv", regex="^(csv|json|jsonl)$"),
+    compress: bool = Query(False, description="gzip the export (.gz download)"),
+    event_type: Optional[str] = Query(None),
+    user_id: Optional[int] = Query(None),
+    resource_type: Optional[str] = Query(None),
+    severity: Optional[str] = Query(None),
+    start_date: Optional[datetime] = Query(None),
+    end_date: Optional[datetime] = Query(None),
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Stream matching audit events, oldest first, as a chunked download."""
+    audit_service = AuditService(db)
+    filters = _export_filters(event_type, user_id, resource_type, severity, start_date, end_date)
+    media_type, extension = EXPORT_FORMATS[format]
+    filename = f"audit_export_{datetime.utcnow().strftime('%Y%m%dT%H%M%S')}.{extension}"
+    if compress:
+        media_type, filename = "application/gzip", f"{filename}.gz"
+    return StreamingResponse(
+        audit_service.export_audit_events(format, filters, compress=compress),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@router.post("/exports", status_code=status.HTTP_202_ACCEPTED)
+async def create_audit_export(
+    format: str = Query("csv", regex="^(csv|json|jsonl)$"),
+    compress: bool = Query(True),
+    event_type: Optional[str] = Query(None),
+    user_id: Optional[int] = Query(None),
+    resource_type: Optional[str] = Query(None),
+    severity: Optional[str] = Query(None),
+    start_date: Optional[datetime] = Query(None),
+    end_date: Optional[datetime] = Query(None),
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """Start a background export job; poll it for progress and download the file when completed."""
+    try:
+        filters = _export_filters(event_type, user_id, resource_type, severity, start_date, end_date)
+        return await audit_export_manager.create(
+            format, filters, compress=compress, requested_by=current_user.get("username")
+        )
+    except Exception as e:
+        logger.error(f"Failed to start audit export: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to start audit export: {str(e)}"
+        )
+
+
+@router.get("/exports")
+async def list_audit_exports(
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """List export jobs, newest first."""
+    return {"exports": audit_export_manager.list_jobs()}
+
+
+def _get_export_job(job_id: str) -> Dict[str, Any]:
+    job = audit_export_manager.get_job(job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Audit export {job_id} not found"
+        )
+    return job
+
+
+@router.get("/exports/{job_id}")
+async def get_audit_export(
+    job_id: str,
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """Get an export job's status and progress."""
+    return _get_export_job(job_id)
+
+
+@router.post("/exports/{job_id}/resume")
+async def resume_audit_export(
+    job_id: str,
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """Resume a failed or interrupted export job from its last written chunk."""
+    _get_export_job(job_id)
+    return await audit_export_manager.resume(job_id)
+
+
+@router.get("/exports/{job_id}/download")
+async def download_audit_export(
+    job_id: str,
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """Download the file of a completed export job."""
+    job = _get_export_job(job_id)
+    if job["status"] != "completed":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Audit export {job_id} is {job['status']} ({job['progress']}%)"
+        )
+    media_type = "application/gzip" if job["compress"] else EXPORT_FORMATS[job["format"]][0]
+    return FileResponse(audit_export_manager.data_path(job), media_type=media_type, filename=job["file"])
@@ -14,6 +14,7 @@ from app.database.database import get_db
 from app.core.auth_dependencies import get_current_user
 from app.schemas.user_schemas import UserLogin
 from app.services.user_service import UserService
+from app.core.security import PasswordHasherBusy
 from app.core.session_security import (
     create_user_session, 
     verify_session_token, 
@@ -65,10 +66,17 @@ async def login_with_session(
     client_ip = request.client.host if request.client else "unknown"
     user_agent = request.headers.get("user-agent", "unknown")
     
-    # Authenticate user
-    user = UserService.authenticate_user(
-        db, user_credentials.username, user_credentials.password
-    )
+    # Authenticate user - bcrypt runs on the password hashing pool, not the event loop
+    try:
+        user = await UserService.authenticate_user_async(
+            db, user_credentials.username, user_credentials.password
+        )
+    except PasswordHasherBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many concurrent logins, please retry",
+            headers={"Retry-After": "1"},
+        )
     if not user:
         # Log failed login attempt
         await audit_service.log_event(
@@ -16,8 +16,9 @@ from pydantic import BaseModel, Field
 from app.services.health_management_service import HealthManagementService, HealthManagementError
 from app.services.system_management_service import SystemManagementService
 from app.database.database import get_db
-from app.core.auth_dependencies import get_current_user, get_current_user_optional
+from app.core.auth_dependencies import get_current_user, get_current_user_optional, auth_latency, require_admin_role
 from app.core.logging import get_structured_logger
+from app.core.caching import get_cache_stats
 from app.core.config import settings
 
 api_base_url = os.getenv("API_BASE_URL", "/api/v3")
@@ -101,6 +102,13 @@ class SystemHealthResponse(BaseModel):
     uptime: str
 
 
+class IpBlockRequest(BaseModel):
+    """Request model for blocking an address or CIDR range"""
+    network: str = Field(..., description="IP address or CIDR range, e.g. 203.0.113.0/24")
+    reason: str = Field(..., min_length=1, description="Why the address is blocked")
+    duration_hours: float = Field(24, gt=0, le=24 * 365, description="Hours until the block expires")
+
+
 # ENDPOINTS
 
 @router.get("/info", response_model=SystemInfoResponse)
@@ -1318,6 +1326,102 @@ async def get_system_metrics(
         )
 
 
+@router.get("/monitoring/cache-stats")
+async def get_cache_statistics(
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """Get per-operation hit rates of the shared service cache and of the auth principal cache"""
+    try:
+        return {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "operations": await get_cache_stats(),
+            "auth": auth_latency.get_stats()
+        }
+    except Exception as e:
+        logger.error(f"Failed to get cache statistics: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get cache statistics: {str(e)}"
+        )
+
+
+# IP BLOCKLIST ENDPOINTS
+
+@router.get("/security/ip-blocks")
+async def list_ip_blocks(
+    current_user: Dict[str, Any] = Depends(require_admin_role)
+):
+    """List the active IP/CIDR blocks"""
+    from app.domains.security.services.ip_blocklist import ip_blocklist
+
+    blocks = ip_blocklist.list_blocks()
+    return {"blocks": blocks, "total": len(blocks), "stats": ip_blocklist.get_stats()}
+
+
+@router.post("/security/ip-blocks")
+async def block_ip_address(
+    block_request: IpBlockRequest,
+    request: Request,
+    current_user: Dict[str, Any] = Depends(require_admin_role),
+    db: Session = Depends(get_db)
+):
+    """Block an IP address or CIDR range; every process applies it within moments"""
+    from app.domains.security.services.security_service import SecurityService
+    from app.domains.audit.services.audit_service import AuditService, AuditEventType, AuditSeverity
+
+    result = await SecurityService(db).block_ip(
+        block_request.network, block_request.reason, block_request.duration_hours
+    )
+    if not result["success"]:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=result["error"])
+
+    await AuditService(db).log_event(
+        event_type=AuditEventType.SYSTEM_CONFIG_CHANGED,
+        user_id=current_user["id"],
+        resource_type="ip_blocklist",
+        resource_id=result["block_details"]["network"],
+        action="block_ip",
+        details={
+            "network": result["block_details"]["network"],
+            "reason": block_request.reason,
+            "duration_hours": block_request.duration_hours
+        },
+        severity=AuditSeverity.HIGH,
+        ip_address=request.client.host if request.client else "unknown",
+        user_agent=request.headers.get("user-agent", "unknown")
+    )
+    return result
+
+
+@router.delete("/security/ip-blocks/{network:path}")
+async def unblock_ip_address(
+    network: str,
+    request: Request,
+    current_user: Dict[str, Any] = Depends(require_admin_role),
+    db: Session = Depends(get_db)
+):
+    """Remove the block of an IP address or CIDR range (e.g. /security/ip-blocks/203.0.113.0/24)"""
+    from app.domains.security.services.security_service import SecurityService
+    from app.domains.audit.services.audit_service import AuditService, AuditEventType, AuditSeverity
+
+    result = await SecurityService(db).unblock_ip(network)
+    if not result["success"]:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=result["error"])
+
+    await AuditService(db).log_event(
+        event_type=AuditEventType.SYSTEM_CONFIG_CHANGED,
+        user_id=current_user["id"],
+        resource_type="ip_blocklist",
+        resource_id=network,
+        action="unblock_ip",
+        details={"network": network},
+        severity=AuditSeverity.MEDIUM,
+        ip_address=request.client.host if request.client else "unknown",
+        user_agent=request.headers.get("user-agent", "unknown")
+    )
+    return result
+
+
 # SYSTEM SETTINGS ENDPOINTS
 
 @router.get("/settings")
@@ -6,6 +6,7 @@ All target management endpoints in v3 structure
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 import os
+import time
 import logging
 from fastapi import APIRouter, Depends, HTTPException, status, Request, Query
 from sqlalchemy.orm import Session
@@ -13,6 +14,8 @@ from sqlalchemy.orm import Session
 from app.database.database import get_db
 from app.services.universal_target_service import UniversalTargetService
 from app.services.health_monitoring_service import HealthMonitoringService
+from app.services.health_history_service import HealthHistoryService
+from app.config.health_monitoring import HEALTH_TIER_AUTH, HEALTH_TIER_DEEP
 from app.services.target_management_service import TargetManagementService
 from app.utils.target_utils import getTargetIpAddress
 from app.domains.audit.services.audit_service import AuditService, AuditEventType, AuditSeverity
@@ -96,7 +99,7 @@ async def get_target(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Target with ID {target_id} not found"
         )
-    return target
+    return target_service.attach_circuit_breaker_states(target)
 
 
 @router.post("/", response_model=TargetResponse, status_code=status.HTTP_201_CREATED)
@@ -490,21 +493,28 @@ async def perform_health_checks(
 @router.post("/health-check-batch")
 async def health_check_batch(
     target_ids: List[int],
+    deep: bool = Query(False, description="Run tier 2 deep checks (remote command) instead of tier 1"),
     current_user: Dict[str, Any] = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Perform health checks on specific targets."""
+    """Perform on-demand health checks on specific targets."""
     try:
         health_service = HealthMonitoringService(db)
+        tier = HEALTH_TIER_DEEP if deep else HEALTH_TIER_AUTH
         results = []
         
         for target_id in target_ids:
             try:
-                result = health_service.check_target_health(target_id)
+                target = db.query(UniversalTarget).filter(UniversalTarget.id == target_id).first()
+                if not target:
+                    raise ValueError(f"Target {target_id} not found")
+                
+                result = health_service.check_target_health(target, tier=tier)
                 results.append({
                     "target_id": target_id,
                     "success": True,
-                    "health_status": result.get("status", "unknown"),
+                    "health_status": result.get("health_status", "unknown"),
+                    "tier": result.get("tier", tier),
                     "response_time": result.get("response_time"),
                     "message": result.get("message", "Health check completed")
                 })
@@ -525,6 +535,54 @@ async def health_check_batch(
         )
 
 
+@router.get("/health/history")
+async def get_health_history(
+    target_ids: Optional[List[int]] = Query(None),
+    environment: Optional[str] = Query(None),
+    hours: int = Query(24, ge=1, le=2160),
+    resolution: Optional[str] = Query(None, regex="^(raw|5m|1h)$"),
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Availability, flapping and latency percentiles for a group of targets, most transitions first."""
+    try:
+        if not target_ids:
+            query = db.query(UniversalTarget.id).filter(UniversalTarget.is_active == True)
+            if environment:
+                query = query.filter(UniversalTarget.environment == environment)
+            target_ids = [row.id for row in query.all()]
+        
+        end = time.time()
+        return HealthHistoryService().get_group_summary(target_ids, end - hours * 3600, end, resolution)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get health history: {str(e)}"
+        )
+
+
+@router.get("/{target_id}/health/history")
+async def get_target_health_history(
+    target_id: int,
+    hours: int = Query(24, ge=1, le=2160),
+    resolution: Optional[str] = Query(None, regex="^(raw|5m|1h)$"),
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """Availability, transitions and latency percentiles for one target."""
+    try:
+        end = time.time()
+        return HealthHistoryService().get_target_summary(target_id, end - hours * 3600, end, resolution)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get target health history: {str(e)}"
+        )
+
+
 # TARGET TYPES (from v1)
 
 @router.get("/types")
@@ -53,6 +53,24 @@ HEALTH_THRESHOLDS = {
     'recovery_success_count': 2      # Successes needed to recover from critical
 }
 
+# Adaptive scheduling of per-target checks (see HealthCheckScheduler)
+HEALTH_SCHEDULING = {
+    'probe_interval_divisor': 5,        # Liveness probes per health check interval
+    'min_interval': 15,                 # Never schedule a target sooner than this (seconds)
+    'max_backoff_factor': 8,            # Cap on interval stretching for long-stable targets
+    'stable_checks_per_doubling': 10,   # Unchanged checks needed to double the interval
+    'transition_interval_factor': 0.25, # Interval multiplier while a status change awaits confirmation
+    'jitter': 0.1                       # +/- fraction applied to every interval
+}
+
+# Health history retention - every tier is a fixed-size ring, so storage is bounded per target
+HEALTH_HISTORY_SETTINGS = {
+    'enabled': os.getenv('HEALTH_HISTORY_ENABLED', 'true').lower() == 'true',
+    'raw_capacity': int(os.getenv('HEALTH_HISTORY_RAW_SAMPLES', '1440')),     # Individual check results
+    'bucket_5m_capacity': int(os.getenv('HEALTH_HISTORY_5M_BUCKETS', '2016')), # 7 days of 5 minute buckets
+    'bucket_1h_capacity': int(os.getenv('HEALTH_HISTORY_1H_BUCKETS', '2160'))  # 90 days of 1 hour buckets
+}
+
 # Global health monitoring settings
 HEALTH_MONITORING_SETTINGS = {
     'enabled': os.getenv('HEALTH_MONITORING_ENABLED', 'true').lower() == 'true',
@@ -60,9 +78,36 @@ HEALTH_MONITORING_SETTINGS = {
     'max_concurrent_checks': int(os.getenv('HEALTH_MAX_CONCURRENT', '5')),
     'retry_failed_checks': os.getenv('HEALTH_RETRY_FAILED', 'true').lower() == 'true',
     'log_all_checks': os.getenv('HEALTH_LOG_ALL_CHECKS', 'false').lower() == 'true',
-    'alert_on_status_change': os.getenv('HEALTH_ALERT_CHANGES', 'true').lower() == 'true'
+    'alert_on_status_change': os.getenv('HEALTH_ALERT_CHANGES', 'true').lower() == 'true',
+    'max_concurrent_probes': int(os.getenv('HEALTH_MAX_CONCURRENT_PROBES', '200')),  # Tier 0 sockets in flight
+    'liveness_timeout': int(os.getenv('HEALTH_LIVENESS_TIMEOUT', '3'))  # Tier 0 connect timeout (seconds)
+}
+
+# Health check tiers
+HEALTH_TIER_LIVENESS = 0   # TCP connect to the primary method port, every cycle
+HEALTH_TIER_AUTH = 1       # Protocol-level authenticated check, on the per-status interval
+HEALTH_TIER_DEEP = 2       # Authenticated check plus a remote command, on demand only
+
+# Default ports used by the tier 0 probe when a method config has no explicit port
+HEALTH_CHECK_DEFAULT_PORTS = {
+    'ssh': 22,
+    'winrm': 5985,
+    'snmp': 161,
+    'telnet': 23,
+    'rest_api': 80,
+    'smtp': 587,
+    'mysql': 3306,
+    'postgresql': 5432,
+    'mssql': 1433,
+    'oracle': 1521,
+    'mongodb': 27017,
+    'redis': 6379,
+    'elasticsearch': 9200
 }
 
+# Method types without a TCP handshake - tier 0 cannot tell anything about them
+HEALTH_CHECK_UDP_METHODS = {'snmp'}
+
 
 def get_health_check_interval(environment: str, health_status: str) -> int:
     """
@@ -93,6 +138,23 @@ def get_health_check_timeout(method_type: str) -> int:
     return HEALTH_CHECK_TIMEOUTS.get(method_type.lower(), HEALTH_CHECK_TIMEOUTS['default'])
 
 
+def get_health_check_port(method_type: str, config: Dict[str, Any]) -> int:
+    """
+    Get the port probed for a communication method.
+    
+    Args:
+        method_type: Communication method type (ssh, winrm, ...)
+        config: Communication method config
+        
+    Returns:
+        int: Port number, or None when the method type has no known default
+    """
+    port = (config or {}).get('port')
+    if port:
+        return int(port)
+    return HEALTH_CHECK_DEFAULT_PORTS.get(method_type.lower())
+
+
 def should_escalate_to_warning(consecutive_failures: int, response_time: float = None) -> bool:
     """
     Determine if target should be marked as warning status.
@@ -133,6 +195,28 @@ def should_escalate_to_critical(consecutive_failures: int, response_time: float
     return False
 
 
+def get_required_confirmations(old_status: str, new_status: str) -> int:
+    """
+    Get the number of consecutive identical results needed before committing a status change.
+    
+    Args:
+        old_status: Currently stored health status
+        new_status: Status observed by the latest checks
+        
+    Returns:
+        int: Consecutive observations required (1 commits immediately)
+    """
+    if old_status == 'unknown':
+        return 1
+    if new_status == 'critical':
+        return HEALTH_THRESHOLDS['consecutive_failures_critical']
+    if new_status == 'warning':
+        return HEALTH_THRESHOLDS['consecutive_failures_warning']
+    if new_status == 'healthy':
+        return HEALTH_THRESHOLDS['recovery_success_count']
+    return 1
+
+
 def should_recover_to_healthy(consecutive_successes: int, response_time: float) -> bool:
     """
     Determine if target should recover to healthy status.
@@ -10,8 +10,8 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.types import ASGIApp
 
 from app.core.audit_utils import log_audit_event
+from app.core.audit_policy import AGGREGATE, RECORD, SAMPLE, api_access_aggregator, api_audit_policy
 from app.domains.audit.services.audit_service import AuditEventType, AuditSeverity
-from app.database.database import get_db
 
 logger = logging.getLogger(__name__)
 
@@ -125,6 +125,10 @@ class AuditMiddleware(BaseHTTPMiddleware):
         """
         Log API access event.
         
+        Writes, errors and security-relevant responses are recorded in full;
+        reads are counted in a rollup and only a sample is recorded in full
+        (see app.core.audit_policy).
+        
         Args:
             request: The request object
             path: The request path
@@ -137,6 +141,17 @@ class AuditMiddleware(BaseHTTPMiddleware):
             error: The error message if any
         """
         try:
+            execution_time_ms = int(execution_time * 1000)
+            decision, sample_rate = api_audit_policy.decide(method, path, status_code, error=bool(error))
+            api_access_aggregator.note(decision)
+            if decision != RECORD:
+                api_access_aggregator.add(
+                    (user_id, client_host, method, path, status_code),
+                    execution_time_ms, user_agent, sampled=decision == SAMPLE
+                )
+            if decision == AGGREGATE:
+                return
+            
             # Determine event type and severity based on status code
             event_type = AuditEventType.API_ACCESS
             
@@ -159,7 +174,7 @@ class AuditMiddleware(BaseHTTPMiddleware):
                 "path": path,
                 "method": method,
                 "status_code": status_code,
-                "execution_time_ms": int(execution_time * 1000),
+                "execution_time_ms": execution_time_ms,
                 "query_params": query_params,
                 "headers": {
                     k: v for k, v in request.headers.items() 
@@ -170,14 +185,13 @@ class AuditMiddleware(BaseHTTPMiddleware):
             # Add error details if available
             if error:
                 details["error"] = error
+            if decision == SAMPLE:
+                details["sample_rate"] = sample_rate
             
-            # Get database session
+            # Queue the event for the audit pipeline - no database session is needed
             try:
-                db = next(get_db())
-                
-                # Log the event
                 await log_audit_event(
-                    db=db,
+                    db=None,
                     event_type=event_type,
                     user_id=user_id,
                     resource_type="api",
@@ -194,10 +208,3 @@ class AuditMiddleware(BaseHTTPMiddleware):
         except Exception as e:
             logger.error(f"Error in API audit logging: {str(e)}")
 
-
-# Add new event types to AuditEventType enum
-if not hasattr(AuditEventType, 'API_ACCESS'):
-    AuditEventType.API_ACCESS = "api_access"
-
-if not hasattr(AuditEventType, 'API_ERROR'):
-    AuditEventType.API_ERROR = "api_error"
\ No newline at end of file
@@ -0,0 +1,286 @@
+"""
+Policy for auditing API access: what gets a full entry, what is sampled and
+what is only counted.
+
+- Writes (anything but GET/HEAD/OPTIONS), server errors, 401/403/429 and paths
+  under AUDIT_API_ALWAYS_RECORD_PATHS are always recorded in full.
+- Other requests are reads. Each read is counted in a rollup keyed by user,
+  client, method, path and status; every AUDIT_API_ROLLUP_INTERVAL seconds one
+  API_ACCESS_ROLLUP record per key carries the count and p50/p95/max latency.
+- On top of the rollup, a read is recorded in full with the probability of the
+  first matching AUDIT_API_SAMPLING_RULES rule, else AUDIT_API_READ_SAMPLE_RATE.
+
+Rules are separated by ';' and read "<method> <path glob> [<status>]=<rate>",
+where method and status may be '*' and status is a code or a class like 4xx:
+
+    GET /api/v3/*/status*=0; * * 4xx=1
+"""
+import asyncio
+import fnmatch
+import logging
+import random
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+RECORD = "record"
+SAMPLE = "sample"
+AGGREGATE = "aggregate"
+
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+SECURITY_STATUS_CODES = frozenset({401, 403, 429})
+
+
+class SamplingRule(NamedTuple):
+    method: str
+    path: str
+    status: str
+    rate: float
+
+    def matches(self, method: str, path: str, status_code: int) -> bool:
+        if self.method != "*" and self.method != method:
+            return False
+        if self.status != "*":
+            code = str(status_code)
+            if self.status.endswith("xx") and code[0] != self.status[0]:
+                return False
+            if not self.status.endswith("xx") and code != self.status:
+                return False
+        return fnmatch.fnmatchcase(path, self.path)
+
+
+def parse_rules(spec: str) -> List[SamplingRule]:
+    """Parse AUDIT_API_SAMPLING_RULES; malformed rules are logged and skipped."""
+    rules = []
+    for raw in (spec or "").split(";"):
+        raw = raw.strip()
+        if not raw:
+            continue
+        try:
+            pattern, rate = raw.rsplit("=", 1)
+            parts = pattern.split()
+            if len(parts) == 2:
+                parts.append("*")
+            method, path, status = parts
+            rules.append(SamplingRule(method.upper(), path, status.lower(), min(1.0, max(0.0, float(rate)))))
+        except ValueError:
+            logger.warning(f"Ignoring malformed audit sampling rule: '{raw}'")
+    return rules
+
+
+class ApiAuditPolicy:
+    """Decides per request whether to record, sample or only aggregate."""
+
+    def __init__(
+        self,
+        rules: List[SamplingRule],
+        default_read_rate: float = 0.01,
+        always_record_paths: Tuple[str, ...] = ()
+    ):
+        self.rules = rules
+        self.default_read_rate = default_read_rate
+        self.always_record_paths = always_record_paths
+
+    def sample_rate(self, method: str, path: str, status_code: int) -> float:
+        for rule in self.rules:
+            if rule.matches(method, path, status_code):
+                return rule.rate
+        return self.default_read_rate
+
+    def decide(self, method: str, path: str, status_code: int, error: bool = False) -> Tuple[str, float]:
+        """Return (RECORD | SAMPLE | AGGREGATE, sample rate); SAMPLE reads are aggregated too."""
+        if method not in READ_METHODS or error or status_code >= 500 or status_code in SECURITY_STATUS_CODES:
+            return RECORD, 1.0
+        if any(path.startswith(prefix) for prefix in self.always_record_paths):
+            return RECORD, 1.0
+        rate = self.sample_rate(method, path, status_code)
+        if rate > 0 and random.random() < rate:
+            return SAMPLE, rate
+        return AGGREGATE, rate
+
+
+class _Rollup:
+    __slots__ = ("count", "sampled", "latencies", "first_seen", "last_seen", "user_agent")
+
+    def __init__(self, now: float, user_agent: str):
+        self.count = 0
+        self.sampled = 0
+        self.latencies: List[float] = []
+        self.first_seen = now
+        self.last_seen = now
+        self.user_agent = user_agent
+
+
+def _isoformat(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat()
+
+
+# Key: (user_id, client host, method, path, status code)
+RollupKey = Tuple[Optional[int], str, str, str, int]
+
+
+class ApiAccessAggregator:
+    """Collapses repeated identical reads into periodic rollup records."""
+
+    LATENCY_SAMPLES = 256   # Reservoir per key for the percentiles
+
+    def __init__(self, interval: float = 60.0, max_keys: int = 10000):
+        self.interval = interval
+        self.max_keys = max_keys
+        self._rollups: Dict[RollupKey, _Rollup] = {}
+        self._window_start = time.time()
+        self._task: Optional[asyncio.Task] = None
+        self._early_flush: Optional[asyncio.Task] = None
+
+        self.requests = 0
+        self.recorded = 0
+        self.sampled = 0
+        self.aggregated = 0
+        self.rollups_written = 0
+
+    def note(self, decision: str):
+        self.requests += 1
+        if decision == RECORD:
+            self.recorded += 1
+        elif decision == SAMPLE:
+            self.sampled += 1
+
+    def add(self, key: RollupKey, execution_time_ms: float, user_agent: str, sampled: bool):
+        rollup = self._rollups.get(key)
+        now = time.time()
+        if rollup is None:
+            rollup = self._rollups[key] = _Rollup(now, user_agent)
+        rollup.count += 1
+        rollup.last_seen = now
+        if sampled:
+            rollup.sampled += 1
+        if len(rollup.latencies) < self.LATENCY_SAMPLES:
+            rollup.latencies.append(execution_time_ms)
+        else:
+            slot = random.randrange(rollup.count)
+            if slot < self.LATENCY_SAMPLES:
+                rollup.latencies[slot] = execution_time_ms
+        self.aggregated += 1
+
+        if len(self._rollups) >= self.max_keys and (self._early_flush is None or self._early_flush.done()):
+            # Too many distinct reads for one window - flush early
+            self._early_flush = asyncio.get_running_loop().create_task(self.flush())
+
+    @staticmethod
+    def _percentile(ordered: List[float], pct: float) -> float:
+        if not ordered:
+            return 0.0
+        return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+    def drain(self) -> List[Dict[str, Any]]:
+        """Take the current window's rollups as audit event arguments."""
+        rollups, self._rollups = self._rollups, {}
+        window_start, self._window_start = self._window_start, time.time()
+        events = []
+        for (user_id, client_host, method, path, status_code), rollup in rollups.items():
+            ordered = sorted(rollup.latencies)
+            events.append({
+                "user_id": user_id,
+                "resource_id": path,
+                "action": method,
+                "ip_address": client_host,
+                "user_agent": rollup.user_agent,
+                "details": {
+                    "path": path,
+                    "method": method,
+                    "status_code": status_code,
+                    "count": rollup.count,
+                    "sampled_records": rollup.sampled,
+                    "latency_ms": {
+                        "p50": self._percentile(ordered, 50),
+                        "p95": self._percentile(ordered, 95),
+                        "max": ordered[-1] if ordered else 0.0
+                    },
+                    "first_seen": _isoformat(rollup.first_seen),
+                    "last_seen": _isoformat(rollup.last_seen),
+                    "window_start": _isoformat(window_start),
+                    "window_seconds": round(time.time() - window_start, 3)
+                }
+            })
+        return events
+
+    async def flush(self) -> int:
+        """Write one API_ACCESS_ROLLUP record per key of the current window."""
+        from app.core.audit_utils import log_audit_event
+        from app.domains.audit.services.audit_service import AuditEventType, AuditSeverity
+
+        events = self.drain()
+        for event in events:
+            # LOW rather than INFO: the audit queue drops INFO first, and a rollup stands for many requests
+            await log_audit_event(
+                db=None,
+                event_type=AuditEventType.API_ACCESS_ROLLUP,
+                resource_type="api",
+                severity=AuditSeverity.LOW,
+                **event
+            )
+        self.rollups_written += len(events)
+        return len(events)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"API access rollup flush failed: {e}")
+
+    async def start(self):
+        if self._task is None or self._task.done():
+            self._window_start = time.time()
+            self._task = asyncio.get_running_loop().create_task(self._run(), name="api-audit-rollup")
+
+    async def stop(self):
+        """Stop the flusher and write the partial window."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        await self.flush()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "recorded": self.recorded,
+            "sampled": self.sampled,
+            "aggregated": self.aggregated,
+            "rollups_written": self.rollups_written,
+            "open_rollups": len(self._rollups),
+            "full_entry_ratio": round((self.recorded + self.sampled) / self.requests, 4) if self.requests else 0.0
+        }
+
+    def prometheus_lines(self) -> List[str]:
+        return [
+            f"opsconductor_api_audit_requests_total {self.requests}",
+            f'opsconductor_api_audit_entries_total{{decision="record"}} {self.recorded}',
+            f'opsconductor_api_audit_entries_total{{decision="sample"}} {self.sampled}',
+            f"opsconductor_api_audit_aggregated_total {self.aggregated}",
+            f"opsconductor_api_audit_rollups_written_total {self.rollups_written}",
+            f"opsconductor_api_audit_open_rollups {len(self._rollups)}",
+        ]
+
+
+# Global API audit policy and rollup aggregator (flusher started by the application lifespan)
+api_audit_policy = ApiAuditPolicy(
+    parse_rules(settings.AUDIT_API_SAMPLING_RULES),
+    default_read_rate=settings.AUDIT_API_READ_SAMPLE_RATE,
+    always_record_paths=tuple(
+        prefix.strip() for prefix in settings.AUDIT_API_ALWAYS_RECORD_PATHS.split(",") if prefix.strip()
+    )
+)
+api_access_aggregator = ApiAccessAggregator(
+    interval=settings.AUDIT_API_ROLLUP_INTERVAL,
+    max_keys=settings.AUDIT_API_ROLLUP_MAX_KEYS
+)
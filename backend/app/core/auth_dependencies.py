@@ -2,26 +2,85 @@
 Centralized authentication dependencies for all routers.
 This ensures consistent authentication across the entire application.
 """
-from fastapi import Depends, HTTPException, status
+import time
+from fastapi import Depends, HTTPException, Response, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 from app.database.database import get_db
 from app.core.session_security import verify_session_token
+from app.core.session_manager import session_manager
 from app.services.user_service import UserService
 
 # Security scheme
 security = HTTPBearer()
 
 
+class AuthLatencyStats:
+    """Latency histogram of get_current_user, reported apart from endpoint latency."""
+    
+    BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5)
+    
+    def __init__(self):
+        self.bucket_counts = [0] * len(self.BUCKETS)
+        self.count = 0
+        self.total_seconds = 0.0
+        self.principal_hits = 0
+        self.principal_misses = 0
+    
+    def record(self, seconds: float, principal_hit: bool):
+        self.count += 1
+        self.total_seconds += seconds
+        if principal_hit:
+            self.principal_hits += 1
+        else:
+            self.principal_misses += 1
+        for i, bound in enumerate(self.BUCKETS):
+            if seconds <= bound:
+                self.bucket_counts[i] += 1
+                break
+    
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.principal_hits + self.principal_misses
+        return {
+            "requests": self.count,
+            "avg_ms": round(self.total_seconds / self.count * 1000, 3) if self.count else 0.0,
+            "principal_hit_rate": round(self.principal_hits / lookups, 4) if lookups else 0.0,
+            "buckets_ms": {f"<={bound * 1000:g}": count for bound, count in zip(self.BUCKETS, self.bucket_counts)}
+        }
+    
+    def prometheus_lines(self) -> List[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.BUCKETS, self.bucket_counts):
+            cumulative += count
+            lines.append(f'opsconductor_auth_duration_seconds_bucket{{le="{bound}"}} {cumulative}')
+        lines.extend([
+            f'opsconductor_auth_duration_seconds_bucket{{le="+Inf"}} {self.count}',
+            f"opsconductor_auth_duration_seconds_sum {self.total_seconds}",
+            f"opsconductor_auth_duration_seconds_count {self.count}",
+            f"opsconductor_auth_principal_cache_hits_total {self.principal_hits}",
+            f"opsconductor_auth_principal_cache_misses_total {self.principal_misses}",
+        ])
+        return lines
+
+
+# Per-process auth latency, exported with the Prometheus metrics
+auth_latency = AuthLatencyStats()
+
+
 async def get_current_user(
+    response: Response,
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
 ) -> Dict[str, Any]:
     """
     Centralized authentication dependency.
     Returns user information from session-based authentication.
+    
+    The resolved user is cached per session (see SessionManager.cache_principal),
+    so a warm request costs the session lookup only - no database query.
     """
     if not credentials:
         raise HTTPException(
@@ -30,8 +89,9 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    start_time = time.perf_counter()
     token = credentials.credentials
-    user_info = await verify_session_token(token)
+    user_info = await verify_session_token(token, with_principal=True)
     
     if not user_info:
         raise HTTPException(
@@ -40,23 +100,36 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    # Get full user details from database
+    principal = user_info.get("principal")
+    principal_hit = principal is not None
+    
+    # Get full user details from database on a principal cache miss
     user_id = user_info.get("user_id")
-    if user_id:
+    if not principal_hit and user_id:
         user = UserService.get_user_by_id(db, user_id)
         if user:
-            # Return combined user info with session data
-            return {
+            principal = {
                 "id": user.id,
                 "username": user.username,
                 "email": user.email,
                 "role": user.role,
-                "is_active": user.is_active,
-                "session_info": {
-                    "session_id": user_info.get("session_id"),
-                    "last_activity": user_info.get("last_activity")
-                }
+                "is_active": user.is_active
+            }
+            await session_manager.cache_principal(user_info["session_id"], user.id, principal)
+    
+    if principal:
+        elapsed = time.perf_counter() - start_time
+        auth_latency.record(elapsed, principal_hit)
+        response.headers["Server-Timing"] = f"auth;dur={elapsed * 1000:.2f}"
+        
+        # Return combined user info with session data
+        return {
+            **principal,
+            "session_info": {
+                "session_id": user_info.get("session_id"),
+                "last_activity": user_info.get("last_activity")
             }
+        }
     
     raise HTTPException(
         status_code=status.HTTP_404_NOT_FOUND,
@@ -7,11 +7,13 @@ PHASE 2 IMPROVEMENTS:
 - ✅ Connection pooling
 - ✅ Error handling
 - ✅ Health checks
+- ✅ Incremental SCAN + UNLINK pattern sweeps (never KEYS)
 """
 
 import logging
 from typing import Optional
 import os
+import time
 from functools import lru_cache
 
 # Handle Redis import gracefully
@@ -27,6 +29,10 @@ except ImportError:
         async def setex(self, key, ttl, value): return True
         async def delete(self, *keys): return len(keys)
         async def keys(self, pattern): return []
+        async def scan_iter(self, match=None, count=None):
+            return
+            yield
+        async def unlink(self, *keys): return len(keys)
         async def close(self): pass
         async def info(self): return {"redis_version": "mock", "connected_clients": 1}
     
@@ -43,6 +49,14 @@ logger = logging.getLogger(__name__)
 # Redis connection pool
 _redis_pool: Optional[redis.ConnectionPool] = None
 _redis_client: Optional[redis.Redis] = None
+_sync_redis_clients: dict = {}
+# decode_responses -> (epoch time before which no reconnect is attempted, current backoff seconds)
+_sync_redis_backoff: dict = {}
+
+SYNC_REDIS_RETRY_MIN_SECONDS = 1
+SYNC_REDIS_RETRY_MAX_SECONDS = 60
+
+SCAN_BATCH_SIZE = 500  # Keys per SCAN step and per UNLINK
 
 
 @lru_cache(maxsize=1)
@@ -142,6 +156,41 @@ def get_redis_client() -> Optional[redis.Redis]:
     return _redis_client
 
 
+def get_sync_redis_client(decode_responses: bool = True):
+    """
+    Get a blocking Redis client for synchronous code (Celery tasks, sync services).
+    Shares the configuration of the async pool; returns None if Redis is unreachable.
+    Pass decode_responses=False for a client that reads and writes raw bytes.
+    After a failed connect, further attempts back off exponentially (1s up to 60s)
+    so callers on hot paths don't pay a connect timeout each time while Redis is down.
+    """
+    if not REDIS_AVAILABLE:
+        return None
+    if decode_responses in _sync_redis_clients:
+        return _sync_redis_clients[decode_responses]
+    
+    retry_at, backoff = _sync_redis_backoff.get(decode_responses, (0, 0))
+    if time.time() < retry_at:
+        return None
+    
+    try:
+        import redis as sync_redis
+        config = dict(get_redis_config(), decode_responses=decode_responses)
+        client = sync_redis.Redis(**config)
+        client.ping()
+        _sync_redis_clients[decode_responses] = client
+        _sync_redis_backoff.pop(decode_responses, None)
+        return client
+    except Exception as e:
+        backoff = min(max(backoff * 2, SYNC_REDIS_RETRY_MIN_SECONDS), SYNC_REDIS_RETRY_MAX_SECONDS)
+        _sync_redis_backoff[decode_responses] = (time.time() + backoff, backoff)
+        logger.warning(
+            "Synchronous Redis client unavailable",
+            extra={"error": str(e), "retry_in": backoff}
+        )
+        return None
+
+
 async def is_redis_available() -> bool:
     """Check if Redis is available"""
     if not _redis_client:
@@ -172,6 +221,27 @@ async def get_redis_info() -> dict:
         return {"status": "error", "error": str(e)}
 
 
+async def scan_delete(client, pattern: str, batch_size: int = SCAN_BATCH_SIZE) -> int:
+    """
+    Delete every key matching a glob pattern without blocking Redis.
+    
+    Walks the keyspace with SCAN and frees matches with UNLINK in batches, so
+    each step costs O(batch) instead of KEYS' O(total keys). Only for sweeps
+    that cannot be expressed as a tag set (see app.core.caching.invalidate_tags).
+    Keys created during the walk may be missed.
+    """
+    deleted = 0
+    batch = []
+    async for key in client.scan_iter(match=pattern, count=batch_size):
+        batch.append(key)
+        if len(batch) >= batch_size:
+            deleted += await client.unlink(*batch)
+            batch = []
+    if batch:
+        deleted += await client.unlink(*batch)
+    return deleted
+
+
 class CacheManager:
     """High-level cache management utility"""
     
@@ -250,12 +320,7 @@ class CacheManager:
             return 0
         
         try:
-            full_pattern = self._make_key(pattern)
-            keys = await self.client.keys(full_pattern)
-            if keys:
-                await self.client.delete(*keys)
-                return len(keys)
-            return 0
+            return await scan_delete(self.client, self._make_key(pattern))
         except Exception as e:
             logger.warning(
                 "Cache pattern clear failed",
@@ -0,0 +1,360 @@
+"""
+Shared caching layer for service operations
+Backs the per-service with_caching decorators with one implementation
+
+- ✅ Single-flight: concurrent callers of a cold key share one computation,
+  in-process via a shared future and across processes via a Redis lock
+- ✅ Stale-while-revalidate: expired entries stay servable for a grace window
+  while exactly one caller refreshes them
+- ✅ Jittered TTLs so entries written together don't expire together
+- ✅ Tag-based invalidation (Redis sorted sets of keys per tag) instead of KEYS scans,
+  broadcast so every process also drops tagged entries from its memory tier
+- ✅ Per-operation hit/stale/miss counters, aggregated across processes in Redis
+"""
+
+import asyncio
+import json
+import random
+import time
+import uuid
+from collections import defaultdict
+from functools import wraps
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Union
+
+from app.core.cache import get_redis_client, get_sync_redis_client
+from app.core.logging import get_structured_logger
+from app.shared.infrastructure.cache import TAG_PREFIX, TAG_TTL, cache_service
+
+logger = get_structured_logger(__name__)
+
+LOCK_PREFIX = "cache_lock:"
+STATS_KEY = "cache:op_stats"
+
+TTL_JITTER = 0.1             # +/- fraction applied to every TTL
+LOCK_TIMEOUT = 30            # Seconds a computation may hold the single-flight lock
+STATS_FLUSH_INTERVAL = 10    # Seconds between pushes of local counters to Redis
+OUTCOMES = ("hit", "stale", "miss", "coalesced")
+
+# Delete the lock only if we still own it
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+_inflight: Dict[str, asyncio.Future] = {}
+_pending_stats: Dict[str, int] = defaultdict(int)
+_last_stats_flush = 0.0
+
+TagSpec = Union[None, Iterable[str], Callable[..., Iterable[str]]]
+
+
+def _jittered(ttl: int) -> int:
+    return max(1, int(ttl * random.uniform(1 - TTL_JITTER, 1 + TTL_JITTER)))
+
+
+def _record(operation: str, outcome: str):
+    _pending_stats[f"{operation}:{outcome}"] += 1
+
+
+async def _flush_stats(redis_client, force: bool = False):
+    """Push local counters to the shared stats hash at most every STATS_FLUSH_INTERVAL seconds."""
+    global _last_stats_flush
+    now = time.monotonic()
+    if not _pending_stats or (not force and now - _last_stats_flush < STATS_FLUSH_INTERVAL):
+        return
+    _last_stats_flush = now
+
+    counts = dict(_pending_stats)
+    _pending_stats.clear()
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        for field, count in counts.items():
+            pipe.hincrby(STATS_KEY, field, count)
+        await pipe.execute()
+    except Exception as e:
+        logger.warning("Cache stats flush failed", extra={"error": str(e)})
+
+
+async def _read(redis_client, key: str) -> Optional[Dict[str, Any]]:
+    raw = await redis_client.get(key)
+    if not raw:
+        return None
+    entry = json.loads(raw)
+    # Entries written before this layer existed carry no freshness stamp
+    if not isinstance(entry, dict) or "fresh_until" not in entry:
+        return None
+    return entry
+
+
+async def _write(redis_client, key: str, value: Any, ttl: int, stale_ttl: int, tags: List[str]):
+    fresh_for = _jittered(ttl)
+    now = time.time()
+    entry = {"value": value, "fresh_until": now + fresh_for}
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.setex(key, fresh_for + stale_ttl, json.dumps(entry, default=str))
+    for tag in tags:
+        # Scored by expiry; members that have expired are dropped on every write
+        pipe.zadd(f"{TAG_PREFIX}{tag}", {key: now + fresh_for + stale_ttl})
+        pipe.zremrangebyscore(f"{TAG_PREFIX}{tag}", "-inf", now)
+        pipe.expire(f"{TAG_PREFIX}{tag}", max(TAG_TTL, fresh_for + stale_ttl))
+    await pipe.execute()
+
+
+async def _acquire_lock(redis_client, key: str) -> Optional[str]:
+    """Returns a lock token, None if another caller holds the lock, or "" if locking is unavailable."""
+    token = uuid.uuid4().hex
+    try:
+        if await redis_client.set(f"{LOCK_PREFIX}{key}", token, nx=True, ex=LOCK_TIMEOUT):
+            return token
+    except Exception as e:
+        logger.warning("Cache lock unavailable, computing without it", extra={"cache_key": key, "error": str(e)})
+        return ""
+    return None
+
+
+async def _release_lock(redis_client, key: str, token: str):
+    if not token:
+        return
+    try:
+        await redis_client.eval(_RELEASE_SCRIPT, 1, f"{LOCK_PREFIX}{key}", token)
+    except Exception as e:
+        logger.warning("Cache lock release failed", extra={"cache_key": key, "error": str(e)})
+
+
+async def _compute_and_store(redis_client, key: str, operation: str, compute: Callable[[], Awaitable[Any]],
+                             ttl: int, stale_ttl: int, tags: List[str]) -> Any:
+    start_time = time.time()
+    result = await compute()
+    try:
+        await _write(redis_client, key, result, ttl, stale_ttl, tags)
+        logger.info(
+            "Cached operation result",
+            extra={"cache_key": key, "operation": operation, "execution_time": time.time() - start_time}
+        )
+    except Exception as e:
+        logger.warning("Cache write failed", extra={"cache_key": key, "error": str(e), "operation": operation})
+    return result
+
+
+async def _load(redis_client, key: str, operation: str, compute: Callable[[], Awaitable[Any]],
+                ttl: int, stale_ttl: int, tags: List[str]) -> Any:
+    """Fill a cold key, letting only one process compute it."""
+    token = await _acquire_lock(redis_client, key)
+    if token is not None:
+        try:
+            return await _compute_and_store(redis_client, key, operation, compute, ttl, stale_ttl, tags)
+        finally:
+            await _release_lock(redis_client, key, token)
+
+    # Another process is computing - wait for its result rather than stampeding the database
+    deadline = time.monotonic() + LOCK_TIMEOUT
+    delay = 0.05
+    while time.monotonic() < deadline:
+        await asyncio.sleep(delay)
+        entry = await _read(redis_client, key)
+        if entry:
+            _record(operation, "coalesced")
+            return entry["value"]
+        if not await redis_client.exists(f"{LOCK_PREFIX}{key}"):
+            break
+        delay = min(delay * 2, 0.5)
+
+    # The lock holder failed or gave up - compute it ourselves
+    return await _compute_and_store(redis_client, key, operation, compute, ttl, stale_ttl, tags)
+
+
+async def cached_call(key: str, operation: str, compute: Callable[[], Awaitable[Any]], ttl: int,
+                      stale_ttl: Optional[int] = None, tags: Optional[List[str]] = None) -> Any:
+    """
+    Return the cached result for key, computing it at most once across all callers.
+
+    Args:
+        key: Full Redis key of the entry
+        operation: Name used for hit-rate accounting
+        compute: Zero-argument coroutine function producing the value
+        ttl: Seconds the value is fresh (jittered)
+        stale_ttl: Seconds a stale value may still be served while one caller refreshes it
+                   (defaults to ttl)
+        tags: Tags the entry can be invalidated by
+    """
+    redis_client = get_redis_client()
+    if not redis_client:
+        return await compute()
+
+    stale_ttl = ttl if stale_ttl is None else stale_ttl
+    tags = tags or []
+
+    try:
+        entry = await _read(redis_client, key)
+    except Exception as e:
+        logger.warning(
+            "Cache read failed, proceeding without cache",
+            extra={"cache_key": key, "error": str(e), "operation": operation}
+        )
+        return await compute()
+
+    try:
+        if entry and time.time() < entry["fresh_until"]:
+            _record(operation, "hit")
+            return entry["value"]
+
+        if entry:
+            # Stale: one caller refreshes inline, everyone else is served the old value meanwhile
+            token = await _acquire_lock(redis_client, key)
+            if token is None:
+                _record(operation, "stale")
+                return entry["value"]
+            _record(operation, "miss")
+            try:
+                return await _compute_and_store(redis_client, key, operation, compute, ttl, stale_ttl, tags)
+            finally:
+                await _release_lock(redis_client, key, token)
+
+        # Cold: coroutines of this process share one load
+        inflight = _inflight.get(key)
+        if inflight is not None:
+            _record(operation, "coalesced")
+            return await asyncio.shield(inflight)
+
+        _record(operation, "miss")
+        future = asyncio.get_running_loop().create_future()
+        _inflight[key] = future
+        try:
+            result = await _load(redis_client, key, operation, compute, ttl, stale_ttl, tags)
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Don't warn about the exception if no other caller was waiting on it
+            future.exception()
+            raise
+        finally:
+            _inflight.pop(key, None)
+    finally:
+        await _flush_stats(redis_client)
+
+
+def cached_operation(prefix: str, cache_key_func: Callable[..., str], ttl: int,
+                     tags: TagSpec = None, stale_ttl: Optional[int] = None):
+    """
+    Decorator caching an async service method through the shared caching layer.
+
+    Args:
+        prefix: Service cache prefix, e.g. "target_mgmt:"; also used as a tag covering
+                every entry of the service
+        cache_key_func: Builds the key suffix from the method arguments
+        ttl: Seconds the result is fresh
+        tags: Extra tags - a list, or a callable taking the method arguments
+        stale_ttl: Seconds a stale result may be served while it is refreshed
+    """
+    def decorator(func):
+        operation = f"{prefix}{func.__name__}"
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            key = f"{prefix}{cache_key_func(*args, **kwargs)}"
+            extra_tags = tags(*args, **kwargs) if callable(tags) else (tags or [])
+            return await cached_call(
+                key,
+                operation,
+                lambda: func(*args, **kwargs),
+                ttl,
+                stale_ttl=stale_ttl,
+                tags=[prefix.rstrip(":"), *extra_tags]
+            )
+        return wrapper
+    return decorator
+
+
+async def invalidate_tags(*tags: str) -> int:
+    """Delete every cache entry carrying any of the given tags; returns the number of entries removed."""
+    if not tags:
+        return 0
+    cache_service.memory_cache.invalidate(tags=tags)
+
+    redis_client = get_redis_client()
+    if not redis_client:
+        return 0
+
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        for tag in tags:
+            pipe.zrange(f"{TAG_PREFIX}{tag}", 0, -1)
+        members = await pipe.execute()
+
+        keys = set().union(*members)
+        pipe = redis_client.pipeline(transaction=False)
+        if keys:
+            pipe.delete(*keys)
+        pipe.delete(*[f"{TAG_PREFIX}{tag}" for tag in tags])
+        bus = cache_service.invalidation_bus
+        if bus is not None and bus.enabled:
+            pipe.publish(bus.channel, bus.message(tags=tags))
+        results = await pipe.execute()
+        return results[0] if keys else 0
+    except Exception as e:
+        logger.warning("Cache tag invalidation failed", extra={"tags": list(tags), "error": str(e)})
+        return 0
+
+
+def invalidate_tags_sync(*tags: str) -> int:
+    """invalidate_tags for synchronous code (sync services, Celery tasks)."""
+    if not tags:
+        return 0
+    # May run on a worker thread - let the memory tier apply it on its own thread
+    cache_service.memory_cache.defer_invalidation(tags=tags)
+
+    redis_client = get_sync_redis_client()
+    if not redis_client:
+        return 0
+
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        for tag in tags:
+            pipe.zrange(f"{TAG_PREFIX}{tag}", 0, -1)
+        members = pipe.execute()
+
+        keys = set().union(*members)
+        pipe = redis_client.pipeline(transaction=False)
+        if keys:
+            pipe.delete(*keys)
+        pipe.delete(*[f"{TAG_PREFIX}{tag}" for tag in tags])
+        bus = cache_service.invalidation_bus
+        if bus is not None and bus.enabled:
+            pipe.publish(bus.channel, bus.message(tags=tags))
+        results = pipe.execute()
+        return results[0] if keys else 0
+    except Exception as e:
+        logger.warning("Cache tag invalidation failed", extra={"tags": list(tags), "error": str(e)})
+        return 0
+
+
+async def get_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Hit/stale/miss counts and hit rate per cached operation, across all processes."""
+    redis_client = get_redis_client()
+    counts: Dict[str, Dict[str, int]] = defaultdict(lambda: dict.fromkeys(OUTCOMES, 0))
+
+    raw = dict(_pending_stats)
+    if redis_client:
+        await _flush_stats(redis_client, force=True)
+        try:
+            raw = await redis_client.hgetall(STATS_KEY)
+        except Exception as e:
+            logger.warning("Cache stats read failed", extra={"error": str(e)})
+
+    for field, count in raw.items():
+        operation, _, outcome = field.rpartition(":")
+        if outcome in OUTCOMES:
+            counts[operation][outcome] += int(count)
+
+    stats = {}
+    for operation, outcome_counts in sorted(counts.items()):
+        lookups = sum(outcome_counts.values())
+        served = lookups - outcome_counts["miss"]
+        stats[operation] = dict(outcome_counts, lookups=lookups, hit_rate=round(served / lookups, 4) if lookups else 0.0)
+    return stats
@@ -48,6 +48,14 @@ celery_app.conf.beat_schedule = {
         'task': 'app.tasks.periodic_tasks.process_recurring_schedules_task',
         'schedule': 30.0,  # Every 30 seconds to check for recurring schedules
     },
+    'downsample-health-history': {
+        'task': 'app.tasks.periodic_tasks.downsample_health_history_task',
+        'schedule': 300.0,  # Every 5 minutes, one raw -> 5m bucket per run
+    },
+    'rollup-executions': {
+        'task': 'app.tasks.periodic_tasks.rollup_executions_task',
+        'schedule': 60.0,  # Executions not counted on completion, and history backfill
+    },
 }
 
 if __name__ == "__main__":
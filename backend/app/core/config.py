@@ -16,6 +16,11 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 480  # 8 hours for a full work day
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
     
+    # Password hashing runs on a bounded thread pool, off the event loop
+    BCRYPT_ROUNDS: int = 12                     # Cost factor; weaker hashes are upgraded on the next login
+    PASSWORD_HASH_WORKERS: int = 0              # Threads per process (0 = min(4, CPU count))
+    PASSWORD_HASH_MAX_QUEUE: int = 64           # Hashes that may wait for a thread before logins get 503
+    
     # CORS
     CORS_ORIGINS: Optional[str] = None
     
@@ -32,6 +37,64 @@ class Settings(BaseSettings):
     MAX_RETRIES: int = 3
     RETRY_BACKOFF_BASE: float = 2.0
     
+    # Hourly/daily execution rollups, updated as executions finish and by a catch-up task
+    EXECUTION_ROLLUP_BATCH_SIZE: int = 1000     # Executions (and results) folded in per catch-up transaction
+    EXECUTION_ROLLUP_MAX_BATCHES: int = 50      # Per catch-up run, so a history backfill spreads over runs
+    EXECUTION_ROLLUP_HOURLY_RETENTION_DAYS: int = 90  # Daily rows are kept indefinitely
+    
+    # Per-host circuit breaker shared by jobs, health checks, connection tests and notifications
+    CIRCUIT_BREAKER_ENABLED: bool = True
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD: int = 3   # Connect failures within the window that open the circuit
+    CIRCUIT_BREAKER_FAILURE_WINDOW: int = 60     # Seconds
+    CIRCUIT_BREAKER_OPEN_SECONDS: int = 30       # First open period, doubled after each failed probe
+    CIRCUIT_BREAKER_MAX_OPEN_SECONDS: int = 600
+    
+    # In-process tier of the shared CacheService
+    MEMORY_CACHE_MAX_ENTRIES: int = 1000
+    MEMORY_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    MEMORY_CACHE_NAMESPACE_QUOTA: float = 0.5   # Share of the byte budget one key namespace may use
+    CACHE_CODEC: str = "orjson"                 # orjson, msgpack or json - unavailable ones fall back to orjson/json
+    CACHE_COMPRESSION_THRESHOLD: int = 1024     # Encoded bytes above which values are zlib-compressed (0 disables)
+    CACHE_INVALIDATION_ENABLED: bool = True     # Broadcast writes so other processes evict their memory-tier copies
+    CACHE_INVALIDATION_CHANNEL: str = "cache:invalidate"
+    
+    # IP/CIDR blocklist mirrored in memory by every process, checked on every request
+    IP_BLOCKLIST_ENABLED: bool = True
+    IP_BLOCKLIST_CHANNEL: str = "security:ip_blocklist"  # Pub/sub channel announcing blocklist changes
+    IP_BLOCKLIST_SWEEP_INTERVAL: int = 60       # Seconds between expired-entry sweeps
+    TRUSTED_PROXIES: Optional[str] = None       # Comma-separated proxy addresses/CIDRs whose X-Forwarded-For/X-Real-IP name the client
+    THREAT_SCAN_MAX_CHARS: int = 1048576        # Request content beyond this is not scanned for threat signatures
+    
+    # Resolved user per session, so authenticated requests skip the users table
+    AUTH_PRINCIPAL_CACHE_TTL: int = 300         # Seconds; role/active/password changes invalidate immediately
+    
+    # Sessions are Redis hashes; activity refreshes are coalesced per session
+    SESSION_ACTIVITY_WRITE_INTERVAL: int = 60   # Seconds between activity/TTL writes of one session (0 writes every request)
+    SESSION_SETTINGS_CACHE_TTL: int = 60        # Seconds the inactivity timeout settings are cached per process
+    
+    # Audit events are queued and written in batches by a background task
+    AUDIT_LOG_DIR: str = "/app/logs/audit"      # Time-partitioned, indexed segments
+    AUDIT_LOG_PATH: str = "/app/logs/audit.log" # Pre-segmentation log, imported as the oldest segment if present
+    AUDIT_SEGMENT_MAX_BYTES: int = 268435456    # 256MB
+    AUDIT_SEGMENT_SPAN_SECONDS: int = 3600      # One segment per hour
+    AUDIT_FSYNC: bool = True                    # One fsync per written batch
+    AUDIT_QUEUE_MAX_SIZE: int = 10000
+    AUDIT_QUEUE_OVERFLOW: str = "drop_info"     # block, drop_info (drop INFO events first) or spill (to AUDIT_SPILL_PATH)
+    AUDIT_SPILL_PATH: str = "/app/logs/audit_spill.jsonl"
+    AUDIT_BATCH_SIZE: int = 500
+    AUDIT_FLUSH_INTERVAL_MS: int = 50           # How long a partial batch may wait to fill up
+    AUDIT_STREAM_MAXLEN: int = 10000            # Recent events kept in the Redis stream (approximate)
+    AUDIT_STATS_DAYS: int = 7                   # Days covered by the audit statistics counters
+    AUDIT_EXPORT_DIR: str = "/app/exports/audit"  # Background export files and their job state
+    AUDIT_EXPORT_CHUNK_ROWS: int = 1000         # Events serialized per streamed chunk / job checkpoint
+    
+    # API access auditing: writes, errors and security responses in full, reads sampled and rolled up
+    AUDIT_API_SAMPLING_RULES: str = "* * 4xx=1"  # "<method> <path glob> [<status>]=<rate>; ..." - first match wins
+    AUDIT_API_READ_SAMPLE_RATE: float = 0.01    # Full-entry rate for reads no rule matches
+    AUDIT_API_ALWAYS_RECORD_PATHS: str = "/api/v3/auth,/api/v3/audit,/api/v3/users,/api/v3/data-export"
+    AUDIT_API_ROLLUP_INTERVAL: int = 60         # Seconds per rollup window
+    AUDIT_API_ROLLUP_MAX_KEYS: int = 10000      # Distinct reads per window before an early flush
+    
     class Config:
         env_file = ".env"
 
@@ -0,0 +1,77 @@
+"""
+Rejects requests from blocked addresses before any other middleware runs.
+
+A plain ASGI middleware: the check is an in-memory radix-tree lookup
+(ip_blocklist.check), so it adds no I/O and no per-request task overhead.
+
+Behind a reverse proxy the peer address is the proxy's. When the peer is in
+TRUSTED_PROXIES, the client is taken from X-Forwarded-For (the right-most
+hop that is not itself a trusted proxy) or else X-Real-IP. Headers from
+untrusted peers are ignored, since any client can send them.
+"""
+import json
+from typing import Optional
+
+from app.core.config import settings
+from app.domains.security.services.ip_blocklist import NetworkSet, ip_blocklist
+
+_BLOCKED_BODY = json.dumps({"detail": "Access denied"}).encode()
+
+
+def resolve_client_ip(scope, trusted_proxies: NetworkSet) -> Optional[str]:
+    """The client address of a request, looking through trusted proxies."""
+    client = scope.get("client")
+    if not client:
+        return None
+    peer = client[0]
+    if not trusted_proxies or peer not in trusted_proxies:
+        return peer
+
+    forwarded_for = real_ip = None
+    for name, value in scope.get("headers") or ():
+        if name == b"x-forwarded-for":
+            # Repeated headers are one comma-separated list in order
+            forwarded_for = value if forwarded_for is None else forwarded_for + b"," + value
+        elif name == b"x-real-ip":
+            real_ip = value
+
+    if forwarded_for is not None:
+        hops = [hop.strip() for hop in forwarded_for.decode("latin-1").split(",") if hop.strip()]
+        for hop in reversed(hops):
+            if hop not in trusted_proxies:
+                return hop
+        if hops:
+            # Every hop is a trusted proxy; the left-most is the furthest from us
+            return hops[0]
+    if real_ip is not None and real_ip.strip():
+        return real_ip.decode("latin-1").strip()
+    return peer
+
+
+class IpBlocklistMiddleware:
+    """Answers 403 to HTTP and websocket connections from blocked addresses."""
+
+    def __init__(self, app, trusted_proxies: Optional[str] = None):
+        self.app = app
+        self.trusted_proxies = NetworkSet.from_setting(
+            settings.TRUSTED_PROXIES if trusted_proxies is None else trusted_proxies
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] in ("http", "websocket") and ip_blocklist.enabled and scope.get("client"):
+            block = ip_blocklist.check(resolve_client_ip(scope, self.trusted_proxies))
+            if block is not None:
+                if scope["type"] == "websocket":
+                    await send({"type": "websocket.close", "code": 1008})
+                    return
+                await send({
+                    "type": "http.response.start",
+                    "status": 403,
+                    "headers": [
+                        (b"content-type", b"application/json"),
+                        (b"content-length", str(len(_BLOCKED_BODY)).encode())
+                    ]
+                })
+                await send({"type": "http.response.body", "body": _BLOCKED_BODY})
+                return
+        await self.app(scope, receive, send)
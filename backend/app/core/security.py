@@ -1,23 +1,166 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from app.core.config import settings
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing - hashes below BCRYPT_ROUNDS are flagged for rehash on login
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS
+)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against its hash."""
+    """Verify a password against its hash (blocking - use password_hasher in async code)."""
     return pwd_context.verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
-    """Generate password hash."""
+    """Generate password hash (blocking - use password_hasher in async code)."""
     return pwd_context.hash(password)
 
 
+class PasswordHasherBusy(Exception):
+    """Raised when the password hashing queue is full; callers should answer 503."""
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a dedicated bounded thread pool so it never blocks the event loop.
+    
+    bcrypt releases the GIL, so a few workers hash in parallel while the loop keeps
+    serving other requests. At most max_queue operations may wait for a worker;
+    beyond that PasswordHasherBusy is raised instead of letting a login storm
+    queue up unboundedly.
+    """
+    
+    BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+    
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = max(1, workers)
+        self.max_queue = max_queue
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.rehashed = 0
+        self.max_in_flight = 0
+        self.wait_seconds_total = 0.0
+        self.run_seconds_total = 0.0
+        self.wait_buckets = [0] * len(self.BUCKETS)
+        self.run_buckets = [0] * len(self.BUCKETS)
+    
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+        return self._executor
+    
+    def _observe(self, buckets: List[int], seconds: float):
+        for i, bound in enumerate(self.BUCKETS):
+            if seconds <= bound:
+                buckets[i] += 1
+                break
+    
+    async def _run(self, fn: Callable, *args) -> Any:
+        with self._lock:
+            if self.in_flight >= self.workers + self.max_queue:
+                self.rejected += 1
+                raise PasswordHasherBusy("Password hashing queue is full")
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        
+        submitted = time.perf_counter()
+        timings = {}
+        
+        def timed():
+            started = time.perf_counter()
+            timings["wait"] = started - submitted
+            try:
+                return fn(*args)
+            finally:
+                timings["run"] = time.perf_counter() - started
+        
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, timed)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+                if "run" in timings:
+                    self.completed += 1
+                    self.wait_seconds_total += timings["wait"]
+                    self.run_seconds_total += timings["run"]
+                    self._observe(self.wait_buckets, timings["wait"])
+                    self._observe(self.run_buckets, timings["run"])
+    
+    async def hash(self, password: str) -> str:
+        return await self._run(pwd_context.hash, password)
+    
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(pwd_context.verify, plain_password, hashed_password)
+    
+    async def verify_and_update(self, plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """
+        Verify a password; if it matches a hash below the current policy (e.g. a
+        lower bcrypt cost), also return its rehash under the current policy.
+        """
+        verified, new_hash = await self._run(pwd_context.verify_and_update, plain_password, hashed_password)
+        if new_hash:
+            self.rehashed += 1
+        return verified, new_hash
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "rehashed": self.rehashed,
+            "avg_wait_ms": round(self.wait_seconds_total / self.completed * 1000, 3) if self.completed else 0.0,
+            "avg_run_ms": round(self.run_seconds_total / self.completed * 1000, 3) if self.completed else 0.0
+        }
+    
+    def prometheus_lines(self) -> List[str]:
+        lines = []
+        for name, buckets, total in (
+            ("queue_wait", self.wait_buckets, self.wait_seconds_total),
+            ("duration", self.run_buckets, self.run_seconds_total)
+        ):
+            cumulative = 0
+            for bound, count in zip(self.BUCKETS, buckets):
+                cumulative += count
+                lines.append(f'opsconductor_password_hash_{name}_seconds_bucket{{le="{bound}"}} {cumulative}')
+            lines.extend([
+                f'opsconductor_password_hash_{name}_seconds_bucket{{le="+Inf"}} {self.completed}',
+                f"opsconductor_password_hash_{name}_seconds_sum {total}",
+                f"opsconductor_password_hash_{name}_seconds_count {self.completed}",
+            ])
+        lines.extend([
+            f"opsconductor_password_hash_in_flight {self.in_flight}",
+            f"opsconductor_password_hash_rejected_total {self.rejected}",
+            f"opsconductor_password_hash_rehashed_total {self.rehashed}",
+        ])
+        return lines
+
+
+# Per-process password hashing pool
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS or min(4, os.cpu_count() or 1),
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE
+)
+
+
 # OLD JWT TOKEN FUNCTIONS REMOVED
 # These have been replaced by session-based authentication
 # See app.core.session_security for the new session token system
@@ -28,7 +171,6 @@ def verify_token(token: str) -> Optional[dict]:
     COMPATIBILITY WRAPPER: Verify token using session-based authentication.
     This replaces the old JWT expiration system with activity-based sessions.
     """
-    import asyncio
     from app.core.session_security import verify_session_token
     
     # Run the async session verification in sync context
@@ -6,9 +6,10 @@ import json
 import time
 import logging
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 from app.shared.infrastructure.cache import cache_service
 from app.core.config import settings
+from app.core.caching import invalidate_tags, invalidate_tags_sync
 from sqlalchemy.orm import Session
 from app.database.database import SessionLocal
 from app.domains.audit.services.audit_service import AuditService, AuditEventType, AuditSeverity
@@ -16,13 +17,107 @@ from app.domains.audit.services.audit_service import AuditService, AuditEventTyp
 logger = logging.getLogger(__name__)
 
 class SessionManager:
-    """Manages user sessions with activity-based expiration."""
+    """
+    Manages user sessions with activity-based expiration.
+    
+    Each session is a Redis hash (session_id, user_id, user_data, created_at,
+    last_activity) whose TTL is the inactivity timeout. Activity refreshes
+    rewrite a single field and the TTL in one pipeline, at most once per
+    SESSION_ACTIVITY_WRITE_INTERVAL seconds per session. Every user has a set
+    of their session ids for listing and bulk revocation; expired members are
+    pruned whenever it is read, so no cleanup job is needed.
+    """
     
     # Default session configuration (will be overridden by system settings)
     DEFAULT_SESSION_TIMEOUT_MINUTES = 60  # 60 minutes of inactivity
     DEFAULT_WARNING_THRESHOLD_MINUTES = 2  # 2 minutes before timeout
+    MIN_SESSION_TIMEOUT_SECONDS = 28800  # 8 hours, so sessions never expire quickly
     SESSION_PREFIX = "user_session:"
-    ACTIVITY_PREFIX = "user_activity:"
+    ACTIVITY_PREFIX = "user_activity:"  # Sessions before hash storage kept activity separately
+    USER_SESSIONS_PREFIX = "user_sessions:"  # Set of each user's session ids
+    PRINCIPAL_PREFIX = "auth_principal:"  # Resolved user of a session
+    PRINCIPAL_TAG = "principal_user:"     # Tag indexing each user's cached principals
+    
+    # Timeout settings are read from the database at most once per SESSION_SETTINGS_CACHE_TTL
+    _timeout_settings: Optional[Tuple[int, int]] = None
+    _timeout_settings_expires_at = 0.0
+    
+    @staticmethod
+    def _decode_session(session_data: Any) -> Optional[Dict[str, Any]]:
+        """Legacy sessions are stored as dicts, the oldest ones as a JSON string."""
+        if isinstance(session_data, dict):
+            return session_data
+        try:
+            return json.loads(session_data)
+        except (TypeError, ValueError):
+            return None
+    
+    @staticmethod
+    def _encode_hash(session_data: Dict[str, Any]) -> Dict[str, str]:
+        return {
+            "session_id": session_data["session_id"],
+            "user_id": str(session_data["user_id"]),
+            "user_data": json.dumps(session_data.get("user_data") or {}, default=str),
+            "created_at": session_data["created_at"],
+            "last_activity": session_data["last_activity"]
+        }
+    
+    @staticmethod
+    def _decode_hash(fields: Optional[Dict[Any, Any]]) -> Optional[Dict[str, Any]]:
+        if not fields:
+            return None
+        session_data = {
+            (key.decode() if isinstance(key, bytes) else key): (value.decode() if isinstance(value, bytes) else value)
+            for key, value in fields.items()
+        }
+        try:
+            session_data["user_id"] = int(session_data["user_id"])
+            session_data["user_data"] = json.loads(session_data.get("user_data") or "{}")
+        except (KeyError, TypeError, ValueError):
+            return None
+        return session_data
+    
+    @classmethod
+    def _session_key(cls, session_id: str) -> str:
+        return f"{cls.SESSION_PREFIX}{session_id}"
+    
+    @classmethod
+    def _index_key(cls, user_id: int) -> str:
+        return f"{cls.USER_SESSIONS_PREFIX}{user_id}"
+    
+    @classmethod
+    def _queue_write(cls, batch, session_data: Dict[str, Any], timeout_seconds: int,
+                     fields: Optional[Dict[str, str]] = None) -> None:
+        """Queue a session write (all fields, or just the given ones) plus TTL refreshes."""
+        session_key = cls._session_key(session_data["session_id"])
+        index_key = cls._index_key(session_data["user_id"])
+        if not cache_service.redis_client:
+            # No Redis: the session lives in this process only
+            cache_service.memory_cache.set(session_key, dict(session_data), timeout_seconds, (index_key,))
+            return
+        batch.call("hset", session_key, mapping=fields or cls._encode_hash(session_data))
+        batch.call("expire", session_key, timeout_seconds)
+        # The index outlives the user's longest session; dead members are pruned on read
+        batch.call("sadd", index_key, session_data["session_id"])
+        batch.call("expire", index_key, timeout_seconds)
+    
+    @classmethod
+    async def _migrate_legacy(cls, session_id: str) -> Optional[Dict[str, Any]]:
+        """Convert a session stored as a single encoded value into a hash, keeping its TTL."""
+        session_key = cls._session_key(session_id)
+        session_data = cls._decode_session(await cache_service.get(session_key))
+        if not session_data or "user_id" not in session_data:
+            return None
+        session_data.setdefault("session_id", session_id)
+        session_data.setdefault("created_at", datetime.utcnow().isoformat())
+        session_data.setdefault("last_activity", session_data["created_at"])
+        ttl = await cache_service.get_ttl(session_key) or await cls._get_session_timeout()
+        
+        async with cache_service.batch() as batch:
+            batch.delete(session_key, f"{cls.ACTIVITY_PREFIX}{session_id}")
+            cls._queue_write(batch, session_data, ttl)
+        logger.info(f"Migrated session {session_id} to hash storage")
+        return session_data
     
     @classmethod
     async def _log_session_event(cls, event_type: AuditEventType, user_id: int, session_id: str, details: Dict[str, Any], ip_address: Optional[str] = None, user_agent: Optional[str] = None) -> None:
@@ -62,9 +157,14 @@ class SessionManager:
         except Exception as e:
             logger.error(f"Failed to log session event: {str(e)}")
     
+    
     @classmethod
     async def _get_timeout_settings(cls) -> tuple:
-        """Get timeout settings from system settings or use defaults."""
+        """Get timeout settings from system settings or use defaults (cached per process)."""
+        now = time.monotonic()
+        if cls._timeout_settings is not None and now < cls._timeout_settings_expires_at:
+            return cls._timeout_settings
+        
         try:
             # Create a database session
             db = SessionLocal()
@@ -88,53 +188,46 @@ class SessionManager:
             warning_seconds = warning_minutes * 60
             
             logger.info(f"Using session timeout: {timeout_minutes} minutes ({timeout_seconds} seconds)")
-            return timeout_seconds, warning_seconds
+            cls._timeout_settings = (timeout_seconds, warning_seconds)
         except Exception as e:
             logger.error(f"Failed to get timeout settings: {str(e)}")
             # Use defaults - minimum 8 hours (480 minutes)
             default_timeout = max(cls.DEFAULT_SESSION_TIMEOUT_MINUTES, 480) * 60
             default_warning = cls.DEFAULT_WARNING_THRESHOLD_MINUTES * 60
             logger.info(f"Using default session timeout: {default_timeout // 60} minutes ({default_timeout} seconds)")
-            return default_timeout, default_warning
+            cls._timeout_settings = (default_timeout, default_warning)
+        
+        cls._timeout_settings_expires_at = now + settings.SESSION_SETTINGS_CACHE_TTL
+        return cls._timeout_settings
+    
+    @classmethod
+    async def _get_session_timeout(cls) -> int:
+        timeout_seconds, _ = await cls._get_timeout_settings()
+        return max(timeout_seconds, cls.MIN_SESSION_TIMEOUT_SECONDS)
     
     @classmethod
     async def create_session(cls, user_id: int, user_data: Dict[str, Any]) -> str:
         """Create a new user session."""
         await cache_service.initialize()
         
-        # Get timeout settings
-        timeout_seconds, _ = await cls._get_timeout_settings()
-        
-        # Ensure minimum timeout of 8 hours (480 minutes) to prevent quick expiration
-        timeout_seconds = max(timeout_seconds, 28800)  # 8 hours in seconds
+        timeout_seconds = await cls._get_session_timeout()
         
         # Generate session ID (can be simple timestamp + user_id for now)
         session_id = f"{user_id}_{int(time.time())}"
-        session_key = f"{cls.SESSION_PREFIX}{session_id}"
-        activity_key = f"{cls.ACTIVITY_PREFIX}{session_id}"
         
         # Store session data
+        now = datetime.utcnow().isoformat()
         session_data = {
             "user_id": user_id,
             "user_data": user_data,
-            "created_at": datetime.utcnow().isoformat(),
-            "last_activity": datetime.utcnow().isoformat(),
+            "created_at": now,
+            "last_activity": now,
             "session_id": session_id
         }
         
-        # Store in Redis with longer TTL to ensure session doesn't expire quickly
-        await cache_service.set(
-            session_key, 
-            json.dumps(session_data), 
-            ttl=timeout_seconds
-        )
-        
-        # Track last activity separately for faster updates
-        await cache_service.set(
-            activity_key,
-            datetime.utcnow().isoformat(),
-            ttl=timeout_seconds
-        )
+        # Hash, TTL and the user's session index in one round-trip
+        async with cache_service.batch() as batch:
+            cls._queue_write(batch, session_data, timeout_seconds)
         
         # Log session creation with timeout
         logger.info(f"Created new session {session_id} for user {user_id} with timeout {timeout_seconds} seconds")
@@ -160,68 +253,127 @@ class SessionManager:
         return session_id
     
     @classmethod
-    async def get_session(cls, session_id: str) -> Optional[Dict[str, Any]]:
-        """Get session data if valid."""
+    async def _load(cls, session_id: str, with_principal: bool) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
         await cache_service.initialize()
         
-        session_key = f"{cls.SESSION_PREFIX}{session_id}"
-        session_data = await cache_service.get(session_key)
+        session_key = cls._session_key(session_id)
+        principal_key = f"{cls.PRINCIPAL_PREFIX}{session_id}"
+        if not cache_service.redis_client:
+            principal = cache_service.memory_cache.get(principal_key) if with_principal else None
+            return cache_service.memory_cache.get(session_key), principal
         
-        if not session_data:
-            return None
-            
-        try:
-            return json.loads(session_data)
-        except json.JSONDecodeError:
-            return None
+        async with cache_service.batch() as batch:
+            session = batch.call("hgetall", session_key)
+            principal = batch.get(principal_key) if with_principal else None
+        
+        if session.error is not None:
+            # WRONGTYPE: written before sessions were hashes
+            session_data = await cls._migrate_legacy(session_id) if "WRONGTYPE" in str(session.error) else None
+        else:
+            session_data = cls._decode_hash(session.value)
+        return session_data, principal.value if principal is not None else None
+    
+    @classmethod
+    async def get_session(cls, session_id: str) -> Optional[Dict[str, Any]]:
+        """Get session data if valid."""
+        session_data, _ = await cls._load(session_id, with_principal=False)
+        return session_data
+    
+    @classmethod
+    async def get_session_and_principal(cls, session_id: str) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """Get session data and the cached principal of the session in at most one round-trip."""
+        return await cls._load(session_id, with_principal=True)
+    
+    @classmethod
+    async def cache_principal(cls, session_id: str, user_id: int, principal: Dict[str, Any]) -> None:
+        """Cache the resolved user of a session, tagged by user for invalidation."""
+        await cache_service.set(
+            f"{cls.PRINCIPAL_PREFIX}{session_id}",
+            principal,
+            ttl=settings.AUTH_PRINCIPAL_CACHE_TTL,
+            tags=[f"{cls.PRINCIPAL_TAG}{user_id}"]
+        )
     
     @classmethod
-    async def update_activity(cls, session_id: str) -> bool:
-        """Update last activity timestamp and extend session."""
+    async def invalidate_principals(cls, user_id: int) -> None:
+        """Drop the cached principal of every session of a user (role, active flag or password changed)."""
+        await invalidate_tags(f"{cls.PRINCIPAL_TAG}{user_id}")
+    
+    @classmethod
+    def invalidate_principals_sync(cls, user_id: int) -> None:
+        """invalidate_principals for synchronous code."""
+        invalidate_tags_sync(f"{cls.PRINCIPAL_TAG}{user_id}")
+    
+    @classmethod
+    async def _get_user_session_ids(cls, user_id: int) -> List[str]:
+        index_key = cls._index_key(user_id)
+        if not cache_service.redis_client:
+            return [key[len(cls.SESSION_PREFIX):] for key in cache_service.memory_cache.tagged_keys(index_key)]
+        async with cache_service.batch() as batch:
+            members = batch.call("smembers", index_key)
+        return sorted(member.decode() if isinstance(member, bytes) else member for member in members.value or ())
+    
+    @classmethod
+    async def get_user_sessions(cls, user_id: int) -> List[Dict[str, Any]]:
+        """Get all live sessions of a user (two round-trips, pruning expired ones from the index)."""
         await cache_service.initialize()
         
-        # Get timeout settings - use a longer default timeout to prevent quick expiration
-        timeout_seconds, _ = await cls._get_timeout_settings()
-        
-        # Ensure minimum timeout of 8 hours (480 minutes) to prevent quick expiration
-        timeout_seconds = max(timeout_seconds, 28800)  # 8 hours in seconds
-        
-        session_key = f"{cls.SESSION_PREFIX}{session_id}"
-        activity_key = f"{cls.ACTIVITY_PREFIX}{session_id}"
+        session_ids = await cls._get_user_session_ids(user_id)
+        if not cache_service.redis_client:
+            entries = [cache_service.memory_cache.get(cls._session_key(session_id)) for session_id in session_ids]
+            return [entry for entry in entries if entry]
+        
+        async with cache_service.batch() as batch:
+            replies = [batch.call("hgetall", cls._session_key(session_id)) for session_id in session_ids]
+        
+        sessions, expired = [], []
+        for session_id, reply in zip(session_ids, replies):
+            session_data = cls._decode_hash(reply.value)
+            if session_data is not None:
+                sessions.append(session_data)
+            elif reply.error is None:
+                expired.append(session_id)
+        
+        if expired:
+            async with cache_service.batch() as batch:
+                batch.call("srem", cls._index_key(user_id), *expired)
+        return sessions
+    
+    @classmethod
+    async def update_activity(cls, session_id: str, session_data: Optional[Dict[str, Any]] = None,
+                              force: bool = False) -> bool:
+        """
+        Update last activity timestamp and extend session.
         
-        # Check if session exists
-        session_data = await cache_service.get(session_key)
+        Callers that have just loaded the session (e.g. token validation) pass it as
+        session_data to skip re-reading it. Unless forced, the write is skipped when
+        the session was already refreshed in the last SESSION_ACTIVITY_WRITE_INTERVAL
+        seconds - the TTL it set is at most that far behind.
+        """
+        if session_data is None:
+            session_data = await cls.get_session(session_id)
         if not session_data:
             return False
         
-        # Update activity timestamp
-        current_time = datetime.utcnow().isoformat()
+        now = datetime.utcnow()
+        if not force and settings.SESSION_ACTIVITY_WRITE_INTERVAL > 0:
+            try:
+                last_activity = datetime.fromisoformat(session_data["last_activity"])
+                if (now - last_activity).total_seconds() < settings.SESSION_ACTIVITY_WRITE_INTERVAL:
+                    return True
+            except (KeyError, TypeError, ValueError):
+                pass
         
-        # Set with longer TTL to ensure session doesn't expire quickly
-        await cache_service.set(
-            activity_key,
-            current_time,
-            ttl=timeout_seconds
-        )
+        timeout_seconds = await cls._get_session_timeout()
+        session_data["last_activity"] = now.isoformat()
         
-        # Update session data with new activity time
-        try:
-            session_dict = json.loads(session_data)
-            session_dict["last_activity"] = current_time
-            
-            # Set with longer TTL to ensure session doesn't expire quickly
-            await cache_service.set(
-                session_key,
-                json.dumps(session_dict),
-                ttl=timeout_seconds
-            )
-            
-            # Log successful session extension
-            logger.info(f"Session {session_id} activity updated, extended for {timeout_seconds} seconds")
-            return True
-        except json.JSONDecodeError:
-            logger.error(f"Failed to parse session data for {session_id}")
-            return False
+        # One field and the TTLs, in one round-trip
+        async with cache_service.batch() as batch:
+            cls._queue_write(batch, session_data, timeout_seconds,
+                             fields={"last_activity": session_data["last_activity"]})
+        
+        logger.debug(f"Session {session_id} activity updated, extended for {timeout_seconds} seconds")
+        return True
     
     @classmethod
     async def get_session_status(cls, session_id: str) -> Dict[str, Any]:
@@ -231,14 +383,10 @@ class SessionManager:
         # Get timeout settings
         timeout_seconds, warning_seconds = await cls._get_timeout_settings()
         
-        session_key = f"{cls.SESSION_PREFIX}{session_id}"
-        activity_key = f"{cls.ACTIVITY_PREFIX}{session_id}"
-        
         # Get TTL from Redis
-        session_ttl = await cache_service.get_ttl(session_key)
-        activity_ttl = await cache_service.get_ttl(activity_key)
+        time_remaining = await cache_service.get_ttl(cls._session_key(session_id))
         
-        if session_ttl <= 0:
+        if time_remaining <= 0:
             return {
                 "valid": False,
                 "expired": True,
@@ -247,9 +395,6 @@ class SessionManager:
                 "warning_threshold": warning_seconds
             }
         
-        # Use the shorter TTL (should be the same, but safety check)
-        time_remaining = min(session_ttl, activity_ttl) if activity_ttl > 0 else session_ttl
-        
         return {
             "valid": True,
             "expired": False,
@@ -273,56 +418,52 @@ class SessionManager:
         Returns:
             bool: True if session was extended
         """
-        # Get timeout settings from system settings
-        timeout_seconds, _ = await cls._get_timeout_settings()
-        
-        # Ensure minimum timeout of 8 hours (480 minutes) to prevent quick expiration
-        timeout_seconds = max(timeout_seconds, 28800)  # 8 hours in seconds
+        timeout_seconds = await cls._get_session_timeout()
         
         if extend_by_seconds is None:
             extend_by_seconds = timeout_seconds
         else:
             # Ensure minimum extension time
-            extend_by_seconds = max(extend_by_seconds, 28800)  # 8 hours in seconds
+            extend_by_seconds = max(extend_by_seconds, cls.MIN_SESSION_TIMEOUT_SECONDS)
         
-        # Update activity
-        result = await cls.update_activity(session_id)
+        # An explicit extension always writes, regardless of the activity write interval
+        session_data = await cls.get_session(session_id)
+        result = await cls.update_activity(session_id, session_data, force=True)
         
         if result:
-            # Get session data for audit logging
-            session_data = None
-            try:
-                session_key = f"{cls.SESSION_PREFIX}{session_id}"
-                session_json = await cache_service.get(session_key)
-                if session_json:
-                    session_data = json.loads(session_json)
-            except Exception as e:
-                logger.warning(f"Failed to get session data for audit logging: {str(e)}")
+            # Use user_id from session data if not provided
+            if user_id is None:
+                user_id = session_data.get("user_id")
             
-            # Log session extension
-            if session_data:
-                # Use user_id from session data if not provided
-                if user_id is None:
-                    user_id = session_data.get("user_id")
-                
-                # Log the event
-                await cls._log_session_event(
-                    event_type=AuditEventType.SESSION_EXTENDED,
-                    user_id=user_id,
-                    session_id=session_id,
-                    details={
-                        "username": session_data.get("user_data", {}).get("username"),
-                        "created_at": session_data.get("created_at"),
-                        "last_activity": session_data.get("last_activity"),
-                        "extended_at": datetime.utcnow().isoformat(),
-                        "extended_by_seconds": extend_by_seconds
-                    },
-                    ip_address=ip_address,
-                    user_agent=user_agent
-                )
+            # Log the event
+            await cls._log_session_event(
+                event_type=AuditEventType.SESSION_EXTENDED,
+                user_id=user_id,
+                session_id=session_id,
+                details={
+                    "username": session_data.get("user_data", {}).get("username"),
+                    "created_at": session_data.get("created_at"),
+                    "last_activity": session_data.get("last_activity"),
+                    "extended_at": datetime.utcnow().isoformat(),
+                    "extended_by_seconds": extend_by_seconds
+                },
+                ip_address=ip_address,
+                user_agent=user_agent
+            )
         
         return result
     
+    @classmethod
+    def _queue_delete(cls, batch, session_id: str, user_id: Optional[int]) -> None:
+        """Queue deletion of a session, its legacy activity key and its principal."""
+        batch.delete(
+            cls._session_key(session_id),
+            f"{cls.ACTIVITY_PREFIX}{session_id}",
+            f"{cls.PRINCIPAL_PREFIX}{session_id}"
+        )
+        if user_id is not None:
+            batch.call("srem", cls._index_key(user_id), session_id)
+    
     @classmethod
     async def destroy_session(cls, session_id: str, user_id: Optional[int] = None, ip_address: Optional[str] = None, user_agent: Optional[str] = None) -> bool:
         """
@@ -337,31 +478,23 @@ class SessionManager:
         Returns:
             bool: True if session was destroyed
         """
-        await cache_service.initialize()
-        
-        session_key = f"{cls.SESSION_PREFIX}{session_id}"
-        activity_key = f"{cls.ACTIVITY_PREFIX}{session_id}"
-        
         # Get session data for audit logging before deletion
         session_data = None
         try:
-            session_json = await cache_service.get(session_key)
-            if session_json:
-                session_data = json.loads(session_json)
+            session_data = await cls.get_session(session_id)
         except Exception as e:
             logger.warning(f"Failed to get session data for audit logging: {str(e)}")
         
-        # Delete both keys
-        await cache_service.delete(session_key)
-        await cache_service.delete(activity_key)
+        # Use user_id from session data if not provided
+        if user_id is None and session_data:
+            user_id = session_data.get("user_id")
+        
+        # Delete the session, its principal and its index entry
+        async with cache_service.batch() as batch:
+            cls._queue_delete(batch, session_id, user_id)
         
         # Log session termination
         if session_data:
-            # Use user_id from session data if not provided
-            if user_id is None:
-                user_id = session_data.get("user_id")
-            
-            # Log the event
             await cls._log_session_event(
                 event_type=AuditEventType.SESSION_TERMINATED,
                 user_id=user_id,
@@ -379,45 +512,96 @@ class SessionManager:
         return True
     
     @classmethod
-    async def cleanup_expired_sessions(cls):
+    async def revoke_user_sessions(cls, user_id: int, reason: Optional[str] = None) -> int:
         """
-        Cleanup expired sessions.
+        Destroy every session of a user (e.g. on deactivation) in two round-trips.
         
-        Redis TTL automatically handles cleanup of expired keys, but this method
-        can be used to perform additional cleanup tasks or logging.
+        Returns:
+            int: Number of sessions revoked
         """
-        # Redis TTL automatically handles cleanup, but we can log the event
-        # for audit purposes if we have a way to detect expired sessions
+        await cache_service.initialize()
         
-        # This is a placeholder for future implementation
-        # We could scan Redis for sessions that are about to expire and log them
+        session_ids = await cls._get_user_session_ids(user_id)
+        if not session_ids:
+            return 0
         
-        # For now, we'll just log a system maintenance event
-        try:
-            # Create a database session
-            db = SessionLocal()
-            
-            # Create audit service
-            audit_service = AuditService(db)
-            
-            # Log the event
-            await audit_service.log_event(
-                event_type=AuditEventType.SYSTEM_MAINTENANCE,
-                user_id=None,  # System operation
-                resource_type="session",
-                resource_id="cleanup",
-                action="cleanup_expired_sessions",
-                details={
-                    "timestamp": datetime.utcnow().isoformat(),
-                    "note": "Redis TTL automatically handles session expiration"
-                },
-                severity=AuditSeverity.INFO
-            )
-            
-            # Close the database session
-            db.close()
-        except Exception as e:
-            logger.error(f"Failed to log session cleanup event: {str(e)}")
+        async with cache_service.batch() as batch:
+            for session_id in session_ids:
+                cls._queue_delete(batch, session_id, None)
+            batch.delete(cls._index_key(user_id))
+        
+        logger.info(f"Revoked {len(session_ids)} sessions of user {user_id}")
+        await cls._log_session_event(
+            event_type=AuditEventType.SESSION_TERMINATED,
+            user_id=user_id,
+            session_id="*",
+            details={
+                "session_ids": session_ids,
+                "reason": reason,
+                "terminated_at": datetime.utcnow().isoformat()
+            }
+        )
+        return len(session_ids)
+
+    @classmethod
+    def revoke_user_sessions_sync(cls, db: Session, user_id: int, reason: Optional[str] = None) -> int:
+        """
+        revoke_user_sessions for synchronous code (UserService), also dropping the
+        user's cached principals in every process.
+        
+        Returns:
+            int: Number of sessions revoked
+        """
+        cls.invalidate_principals_sync(user_id)
+        index_key = cls._index_key(user_id)
+        
+        if not cache_service.redis_client:
+            # No Redis: sessions live in this process's memory tier only
+            session_keys = cache_service.memory_cache.tagged_keys(index_key)
+            for session_key in session_keys:
+                cache_service.memory_cache.delete(session_key)
+            session_ids = [key[len(cls.SESSION_PREFIX):] for key in session_keys]
+        else:
+            from app.core.cache import get_sync_redis_client
+            redis_client = get_sync_redis_client()
+            if not redis_client:
+                logger.warning(f"Redis unavailable, sessions of user {user_id} were not revoked")
+                return 0
+            try:
+                session_ids = sorted(redis_client.smembers(index_key))
+                pipe = redis_client.pipeline(transaction=False)
+                for session_id in session_ids:
+                    pipe.delete(
+                        cls._session_key(session_id),
+                        f"{cls.ACTIVITY_PREFIX}{session_id}",
+                        f"{cls.PRINCIPAL_PREFIX}{session_id}"
+                    )
+                pipe.delete(index_key)
+                pipe.execute()
+            except Exception as e:
+                logger.error(f"Failed to revoke sessions of user {user_id}: {str(e)}")
+                return 0
+        
+        if not session_ids:
+            return 0
+        
+        logger.info(f"Revoked {len(session_ids)} sessions of user {user_id}")
+        from app.core.audit_utils import log_audit_event_sync
+        log_audit_event_sync(
+            db=db,
+            event_type=AuditEventType.SESSION_TERMINATED,
+            user_id=user_id,
+            resource_type="session",
+            resource_id="*",
+            action=AuditEventType.SESSION_TERMINATED.value,
+            details={
+                "session_ids": session_ids,
+                "reason": reason,
+                "terminated_at": datetime.utcnow().isoformat()
+            },
+            severity=AuditSeverity.INFO
+        )
+        return len(session_ids)
 
 # Global session manager instance
-session_manager = SessionManager()
\ No newline at end of file
+session_manager = SessionManager()
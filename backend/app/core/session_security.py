@@ -41,10 +41,12 @@ def create_session_token(user_id: int, session_id: str) -> str:
     return encoded_jwt
 
 
-async def verify_session_token(token: str) -> Optional[Dict[str, Any]]:
+async def verify_session_token(token: str, with_principal: bool = False) -> Optional[Dict[str, Any]]:
     """
     Verify session token and check if session is still valid.
     Returns user data if valid, None if invalid.
+    With with_principal, the cached principal of the session (or None on a miss)
+    is returned under "principal", read in the same round-trip as the session.
     """
     try:
         # Decode JWT (no expiration check)
@@ -59,7 +61,10 @@ async def verify_session_token(token: str) -> Optional[Dict[str, Any]]:
             return None
         
         # Check if session is still valid in Redis
-        session_data = await session_manager.get_session(session_id)
+        if with_principal:
+            session_data, principal = await session_manager.get_session_and_principal(session_id)
+        else:
+            session_data, principal = await session_manager.get_session(session_id), None
         if not session_data:
             return None
         
@@ -67,15 +72,18 @@ async def verify_session_token(token: str) -> Optional[Dict[str, Any]]:
         if session_data.get("user_id") != user_id:
             return None
         
-        # Update activity (this extends the session)
-        await session_manager.update_activity(session_id)
+        # Update activity (this extends the session, coalesced per SESSION_ACTIVITY_WRITE_INTERVAL), reusing the session just read
+        await session_manager.update_activity(session_id, session_data)
         
-        return {
+        user_info = {
             "user_id": user_id,
             "session_id": session_id,
             "user_data": session_data.get("user_data", {}),
             "last_activity": session_data.get("last_activity")
         }
+        if with_principal:
+            user_info["principal"] = principal
+        return user_info
         
     except JWTError:
         return None
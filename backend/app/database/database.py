@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.orm import declarative_base, sessionmaker
 from app.core.config import settings
 
@@ -18,4 +18,26 @@ def get_db():
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
+
+
+def ensure_execution_rollup_columns():
+    """
+    Add the rolled_up flags and their pending indexes to existing execution tables.
+
+    create_all only creates missing tables, and every query on job_executions or
+    job_execution_results selects rolled_up, so a database created before
+    revision 7c3e91d5a2b4 would fail until that migration runs. The DDL only runs
+    when the column is missing; the migration skips whatever already exists.
+    """
+    inspector = inspect(engine)
+    for table in ("job_executions", "job_execution_results"):
+        if not inspector.has_table(table) or "rolled_up" in {c["name"] for c in inspector.get_columns(table)}:
+            continue
+        with engine.begin() as connection:
+            connection.execute(text(
+                f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS rolled_up BOOLEAN NOT NULL DEFAULT false"
+            ))
+            connection.execute(text(
+                f"CREATE INDEX IF NOT EXISTS idx_{table}_rollup_pending ON {table} (id) WHERE NOT rolled_up"
+            ))
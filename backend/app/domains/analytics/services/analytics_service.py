@@ -11,6 +11,7 @@ from app.shared.infrastructure.cache import cached
 from app.models.job_models import Job, JobExecution, ExecutionStatus
 from app.models.universal_target_models import UniversalTarget
 from app.models.user_models import User
+from app.services.execution_rollup_service import ExecutionRollupService, ALL
 
 
 @injectable()
@@ -48,9 +49,7 @@ class AnalyticsService:
         
         # Recent activity (last 24 hours)
         yesterday = datetime.now(timezone.utc) - timedelta(days=1)
-        recent_executions = self.db.query(JobExecution).filter(
-            JobExecution.started_at >= yesterday
-        ).count()
+        recent_executions = ExecutionRollupService(self.db).summary(yesterday).total
         
         return {
             "totals": {
@@ -89,37 +88,16 @@ class AnalyticsService:
             func.count(JobExecution.id).label('count')
         ).group_by(JobExecution.status).all())
         
-        # Success rate (last 30 days)
+        # Success rate and average execution time (last 30 days)
         thirty_days_ago = datetime.now(timezone.utc) - timedelta(days=30)
-        recent_executions = self.db.query(JobExecution).filter(
-            JobExecution.started_at >= thirty_days_ago
-        )
-        
-        total_recent = recent_executions.count()
-        successful_recent = recent_executions.filter(
-            JobExecution.status == ExecutionStatus.COMPLETED
-        ).count()
-        
-        success_rate = (successful_recent / total_recent * 100) if total_recent > 0 else 0
-        
-        # Average execution time
-        avg_execution_time = self.db.query(
-            func.avg(
-                func.extract('epoch', JobExecution.completed_at - JobExecution.started_at)
-            )
-        ).filter(
-            and_(
-                JobExecution.status == ExecutionStatus.COMPLETED,
-                JobExecution.completed_at.isnot(None)
-            )
-        ).scalar() or 0
+        recent = ExecutionRollupService(self.db).summary(thirty_days_ago)
         
         return {
             "status_distribution": {status: count for status, count in job_status_counts},
             "type_distribution": {job_type: count for job_type, count in job_type_counts},
             "execution_status_distribution": {status.value: count for status, count in execution_status_counts},
-            "success_rate_30d": round(success_rate, 2),
-            "avg_execution_time_seconds": round(avg_execution_time, 2)
+            "success_rate_30d": round(recent.success_rate, 2),
+            "avg_execution_time_seconds": round(recent.avg_seconds, 2)
         }
     
     async def _get_target_metrics(self) -> Dict[str, Any]:
@@ -181,72 +159,30 @@ class AnalyticsService:
     
     async def _get_performance_metrics(self) -> Dict[str, Any]:
         """Get system performance metrics."""
-        # Job execution performance over time
+        # Job execution performance over time, from the hourly rollups
         last_24h = datetime.now(timezone.utc) - timedelta(hours=24)
-        
-        # Hourly execution counts for last 24 hours
-        hourly_executions = (self.db.query(
-            func.date_trunc('hour', JobExecution.started_at).label('hour'),
-            func.count(JobExecution.id).label('count')
-        ).filter(
-            JobExecution.started_at >= last_24h
-        ).group_by(
-            func.date_trunc('hour', JobExecution.started_at)
-        ).order_by('hour').all())
-        
-        # Error rate by hour
-        hourly_errors = (self.db.query(
-            func.date_trunc('hour', JobExecution.started_at).label('hour'),
-            func.count(JobExecution.id).label('count')
-        ).filter(
-            and_(
-                JobExecution.started_at >= last_24h,
-                JobExecution.status == ExecutionStatus.FAILED
-            )
-        ).group_by(
-            func.date_trunc('hour', JobExecution.started_at)
-        ).order_by('hour').all())
+        hourly = ExecutionRollupService(self.db).buckets("hour", last_24h)
         
         return {
             "hourly_executions_24h": [
                 {
                     "hour": hour.isoformat(),
-                    "count": count
-                } for hour, count in hourly_executions
+                    "count": stats.total
+                } for hour, stats in hourly if stats.total
             ],
             "hourly_errors_24h": [
                 {
                     "hour": hour.isoformat(),
-                    "count": count
-                } for hour, count in hourly_errors
+                    "count": stats.failed
+                } for hour, stats in hourly if stats.failed
             ]
         }
     
     async def _get_trend_metrics(self) -> Dict[str, Any]:
         """Get trend analysis metrics."""
-        # Daily execution trends for last 30 days
+        # Daily execution trends for last 30 days, from the daily rollups
         thirty_days_ago = datetime.now(timezone.utc) - timedelta(days=30)
-        
-        daily_executions = (self.db.query(
-            func.date_trunc('day', JobExecution.started_at).label('day'),
-            func.count(JobExecution.id).label('total'),
-            func.sum(
-                func.case(
-                    [(JobExecution.status == ExecutionStatus.COMPLETED, 1)],
-                    else_=0
-                )
-            ).label('successful'),
-            func.sum(
-                func.case(
-                    [(JobExecution.status == ExecutionStatus.FAILED, 1)],
-                    else_=0
-                )
-            ).label('failed')
-        ).filter(
-            JobExecution.started_at >= thirty_days_ago
-        ).group_by(
-            func.date_trunc('day', JobExecution.started_at)
-        ).order_by('day').all())
+        daily_executions = ExecutionRollupService(self.db).buckets("day", thirty_days_ago)
         
         # Target discovery trends
         daily_targets = (self.db.query(
@@ -262,10 +198,10 @@ class AnalyticsService:
             "daily_executions_30d": [
                 {
                     "day": day.date().isoformat(),
-                    "total": int(total or 0),
-                    "successful": int(successful or 0),
-                    "failed": int(failed or 0)
-                } for day, total, successful, failed in daily_executions
+                    "total": stats.total,
+                    "successful": stats.completed,
+                    "failed": stats.failed
+                } for day, stats in daily_executions
             ],
             "daily_targets_30d": [
                 {
@@ -276,57 +212,25 @@ class AnalyticsService:
         }
     
     @cached(ttl=600, key_prefix="analytics_job_performance")
-    async def get_job_performance_analysis(self, job_id: Optional[int] = None) -> Dict[str, Any]:
-        """Get detailed job performance analysis."""
-        query = self.db.query(JobExecution)
+    async def get_job_performance_analysis(self, job_id: Optional[int] = None, days: int = 30) -> Dict[str, Any]:
+        """Get detailed job performance analysis of the last `days` days, from the daily rollups."""
+        since = datetime.now(timezone.utc) - timedelta(days=days)
+        stats = ExecutionRollupService(self.db).summary(since, scope_id=job_id or ALL)
         
-        if job_id:
-            query = query.filter(JobExecution.job_id == job_id)
-        
-        # Get execution statistics
-        executions = query.filter(JobExecution.completed_at.isnot(None)).all()
-        
-        if not executions:
+        if not stats.total:
             return {"message": "No completed executions found"}
         
-        # Calculate metrics
-        execution_times = []
-        success_count = 0
-        failure_count = 0
-        
-        for execution in executions:
-            if execution.completed_at and execution.started_at:
-                duration = (execution.completed_at - execution.started_at).total_seconds()
-                execution_times.append(duration)
-                
-                if execution.status == ExecutionStatus.COMPLETED:
-                    success_count += 1
-                else:
-                    failure_count += 1
-        
-        if execution_times:
-            avg_time = sum(execution_times) / len(execution_times)
-            min_time = min(execution_times)
-            max_time = max(execution_times)
-            
-            # Calculate percentiles
-            sorted_times = sorted(execution_times)
-            p50 = sorted_times[len(sorted_times) // 2]
-            p95 = sorted_times[int(len(sorted_times) * 0.95)]
-        else:
-            avg_time = min_time = max_time = p50 = p95 = 0
-        
         return {
-            "total_executions": len(executions),
-            "success_count": success_count,
-            "failure_count": failure_count,
-            "success_rate": (success_count / len(executions) * 100) if executions else 0,
+            "total_executions": stats.total,
+            "success_count": stats.completed,
+            "failure_count": stats.failed + stats.cancelled,
+            "success_rate": stats.success_rate,
             "execution_times": {
-                "average_seconds": round(avg_time, 2),
-                "min_seconds": round(min_time, 2),
-                "max_seconds": round(max_time, 2),
-                "p50_seconds": round(p50, 2),
-                "p95_seconds": round(p95, 2)
+                "average_seconds": round(stats.avg_seconds, 2),
+                "min_seconds": round((stats.duration_min_ms or 0) / 1000, 2),
+                "max_seconds": round((stats.duration_max_ms or 0) / 1000, 2),
+                "p50_seconds": round(stats.percentile_seconds(0.5) or 0, 2),
+                "p95_seconds": round(stats.percentile_seconds(0.95) or 0, 2)
             }
         }
     
@@ -372,17 +276,8 @@ class AnalyticsService:
             })
         
         # Check for high failure rate
-        last_24h = now - timedelta(hours=24)
-        recent_executions = self.db.query(JobExecution).filter(
-            JobExecution.started_at >= last_24h
-        )
-        
-        total_recent = recent_executions.count()
-        failed_recent = recent_executions.filter(
-            JobExecution.status == ExecutionStatus.FAILED
-        ).count()
-        
-        failure_rate = (failed_recent / total_recent * 100) if total_recent > 0 else 0
+        recent = ExecutionRollupService(self.db).summary(now - timedelta(hours=24), now)
+        failure_rate = (recent.failed / recent.total * 100) if recent.total > 0 else 0
         
         if failure_rate > 10:
             issues.append({
@@ -0,0 +1,291 @@
+"""
+Streaming audit export.
+
+Events are read from the audit log with AuditLogStore.iter_entries (oldest
+first, one block at a time) and serialized chunk by chunk, so memory stays
+flat however large the export is. stream_export() feeds a chunked HTTP
+response, optionally gzip-compressed. AuditExportManager runs large exports as
+background jobs: each writes to a file under AUDIT_EXPORT_DIR and records its
+row count, file size and log cursor after every chunk. After a failure or a
+restart it truncates the file to the last recorded size and continues from
+the cursor. Compressed job files are written as one gzip member per chunk,
+which is still a valid .gz file.
+"""
+import asyncio
+import csv
+import gzip
+import io
+import itertools
+import json
+import logging
+import os
+import uuid
+import zlib
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from app.domains.audit.services.audit_log_store import AuditLogStore
+
+logger = logging.getLogger(__name__)
+
+# format: (media type, file extension)
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "json": ("application/json", "json"),
+    "jsonl": ("application/x-ndjson", "jsonl")
+}
+
+CSV_COLUMNS = [
+    "id", "timestamp", "event_type", "user_id", "resource_type", "resource_id", "action",
+    "severity", "ip_address", "user_agent", "details", "prev_hash", "checksum"
+]
+
+
+class AuditExportError(Exception):
+    """Raised for invalid export requests."""
+
+
+class ExportSerializer:
+    """Serializes audit entries as CSV, a JSON array or JSON lines, chunk by chunk."""
+
+    def __init__(self, format: str):
+        if format not in EXPORT_FORMATS:
+            raise AuditExportError(f"Unsupported export format: {format}")
+        self.format = format
+
+    def header(self) -> str:
+        if self.format == "csv":
+            return ",".join(CSV_COLUMNS) + "\r\n"
+        return "[" if self.format == "json" else ""
+
+    def rows(self, entries: List[Dict[str, Any]], written: int) -> str:
+        """Serialize entries that follow `written` rows already in the output."""
+        if self.format == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            for entry in entries:
+                writer.writerow([
+                    json.dumps(entry.get(column), separators=(",", ":"), default=str) if column == "details"
+                    else entry.get(column, "")
+                    for column in CSV_COLUMNS
+                ])
+            return buffer.getvalue()
+
+        lines = (json.dumps(entry, separators=(",", ":"), default=str) for entry in entries)
+        if self.format == "jsonl":
+            return "".join(f"{line}\n" for line in lines)
+        return "".join(f"{',' if written + i else ''}\n{line}" for i, line in enumerate(lines))
+
+    def footer(self) -> str:
+        return "\n]\n" if self.format == "json" else ""
+
+
+def export_window(filters: Optional[Dict[str, Any]]) -> Tuple[Dict[str, Any], Optional[datetime], Optional[datetime]]:
+    """Split API-style filters into indexed field filters and the time range."""
+    filters = dict(filters or {})
+    since = filters.pop("start_date", None)
+    until = filters.pop("end_date", None)
+    return filters, since, until
+
+
+async def iter_export_chunks(
+    store: AuditLogStore,
+    filters: Optional[Dict[str, Any]] = None,
+    cursor: Optional[str] = None,
+    chunk_size: int = 1000
+) -> AsyncIterator[List[Tuple[str, Dict[str, Any]]]]:
+    """Read matching entries off the event loop, chunk_size at a time."""
+    field_filters, since, until = export_window(filters)
+    entries = store.iter_entries(filters=field_filters, since=since, until=until, cursor=cursor)
+    loop = asyncio.get_running_loop()
+    try:
+        while True:
+            chunk = await loop.run_in_executor(None, lambda: list(itertools.islice(entries, chunk_size)))
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        entries.close()
+
+
+async def stream_export(
+    store: AuditLogStore,
+    format: str,
+    filters: Optional[Dict[str, Any]] = None,
+    compress: bool = False,
+    chunk_size: int = 1000
+) -> AsyncIterator[bytes]:
+    """Yield the export as byte chunks (one per chunk_size entries) for a streaming response."""
+    serializer = ExportSerializer(format)
+    compressor = zlib.compressobj(wbits=31) if compress else None
+
+    def encode(text: str, flush_mode: Optional[int] = None) -> bytes:
+        data = text.encode()
+        if compressor is None:
+            return data
+        data = compressor.compress(data)
+        return data + compressor.flush(flush_mode) if flush_mode is not None else data
+
+    yield encode(serializer.header())
+    written = 0
+    async for chunk in iter_export_chunks(store, filters, chunk_size=chunk_size):
+        # Sync-flush per chunk so the client receives data as it is produced
+        yield encode(serializer.rows([entry for _, entry in chunk], written), zlib.Z_SYNC_FLUSH)
+        written += len(chunk)
+    yield encode(serializer.footer(), zlib.Z_FINISH)
+
+
+class AuditExportManager:
+    """Runs resumable export jobs in the background and tracks their progress."""
+
+    def __init__(self, store: AuditLogStore, directory: str, chunk_size: int = 1000):
+        self.store = store
+        self.directory = directory
+        self.chunk_size = chunk_size
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def _job_path(self, job_id: str) -> str:
+        return os.path.join(self.directory, f"{job_id}.job.json")
+
+    def data_path(self, job: Dict[str, Any]) -> str:
+        return os.path.join(self.directory, job["file"])
+
+    def _save(self, job: Dict[str, Any]):
+        job["updated_at"] = datetime.now(timezone.utc).isoformat()
+        tmp_path = f"{self._job_path(job['id'])}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(job, handle, default=str)
+        os.replace(tmp_path, self._job_path(job["id"]))
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        if not job_id.replace("_", "").isalnum():
+            return None
+        try:
+            with open(self._job_path(job_id), "r", encoding="utf-8") as handle:
+                return json.load(handle)
+        except (OSError, ValueError):
+            return None
+
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        if not os.path.isdir(self.directory):
+            return []
+        jobs = [self.get_job(name[:-9]) for name in os.listdir(self.directory) if name.endswith(".job.json")]
+        return sorted((job for job in jobs if job), key=lambda job: job["created_at"], reverse=True)
+
+    async def create(
+        self,
+        format: str,
+        filters: Optional[Dict[str, Any]] = None,
+        compress: bool = True,
+        requested_by: Optional[str] = None
+    ) -> Dict[str, Any]:
+        ExportSerializer(format)  # Validate the format before creating anything
+        os.makedirs(self.directory, exist_ok=True)
+        field_filters, since, until = export_window(filters)
+        estimate = await asyncio.get_running_loop().run_in_executor(
+            None, lambda: self.store.estimate(field_filters, since, until)
+        )
+        job_id = f"audit_export_{uuid.uuid4().hex[:12]}"
+        job = {
+            "id": job_id,
+            "format": format,
+            "compress": compress,
+            "filters": {key: value.isoformat() if isinstance(value, datetime) else value
+                        for key, value in (filters or {}).items() if value is not None},
+            "file": f"{job_id}.{EXPORT_FORMATS[format][1]}{'.gz' if compress else ''}",
+            "status": "running",
+            "rows": 0,
+            "bytes": 0,
+            "cursor": None,
+            "estimated_rows": estimate,
+            "progress": 0.0,
+            "error": None,
+            "requested_by": requested_by,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "completed_at": None
+        }
+        self._save(job)
+        self._spawn(job)
+        logger.info(f"📦 Audit export {job_id} started ({format}, ~{estimate} events)")
+        return job
+
+    async def resume(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Continue an interrupted or failed job from its last recorded cursor."""
+        job = self.get_job(job_id)
+        if job is None or job["status"] == "completed" or job_id in self._tasks:
+            return job
+        job["status"] = "running"
+        job["error"] = None
+        self._save(job)
+        self._spawn(job)
+        logger.info(f"📦 Audit export {job_id} resumed at {job['rows']} events")
+        return job
+
+    async def resume_interrupted(self):
+        """Restart jobs that were running when the process stopped."""
+        for job in self.list_jobs():
+            if job["status"] in ("running", "interrupted"):
+                await self.resume(job["id"])
+
+    async def stop(self):
+        """Cancel running jobs; they stay resumable from their last chunk."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _spawn(self, job: Dict[str, Any]):
+        task = asyncio.get_running_loop().create_task(self._run(job), name=f"audit-export-{job['id']}")
+        self._tasks[job["id"]] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job["id"], None))
+
+    @staticmethod
+    def _write(handle, data: bytes) -> int:
+        handle.write(data)
+        handle.flush()
+        return handle.tell()
+
+    async def _run(self, job: Dict[str, Any]):
+        serializer = ExportSerializer(job["format"])
+        loop = asyncio.get_running_loop()
+
+        def encode(text: str) -> bytes:
+            data = text.encode()
+            return gzip.compress(data) if job["compress"] and data else data
+
+        try:
+            with open(self.data_path(job), "ab") as handle:
+                # Drop anything written after the last recorded chunk
+                handle.truncate(job["bytes"])
+                if job["bytes"] == 0:
+                    await loop.run_in_executor(None, self._write, handle, encode(serializer.header()))
+                chunks = iter_export_chunks(self.store, self._parse_filters(job["filters"]),
+                                            cursor=job["cursor"], chunk_size=self.chunk_size)
+                async for chunk in chunks:
+                    data = encode(serializer.rows([entry for _, entry in chunk], job["rows"]))
+                    job["bytes"] = await loop.run_in_executor(None, self._write, handle, data)
+                    job["rows"] += len(chunk)
+                    job["cursor"] = chunk[-1][0]
+                    if job["estimated_rows"]:
+                        job["progress"] = round(min(99.9, job["rows"] / job["estimated_rows"] * 100), 1)
+                    self._save(job)
+                job["bytes"] = await loop.run_in_executor(None, self._write, handle, encode(serializer.footer()))
+            job.update(status="completed", progress=100.0, completed_at=datetime.now(timezone.utc).isoformat())
+            self._save(job)
+            logger.info(f"✅ Audit export {job['id']} completed: {job['rows']} events, {job['bytes']} bytes")
+        except asyncio.CancelledError:
+            job["status"] = "interrupted"
+            self._save(job)
+            raise
+        except Exception as e:
+            job.update(status="failed", error=str(e))
+            self._save(job)
+            logger.error(f"❌ Audit export {job['id']} failed after {job['rows']} events: {e}")
+
+    @staticmethod
+    def _parse_filters(filters: Dict[str, Any]) -> Dict[str, Any]:
+        parsed = dict(filters)
+        for key in ("start_date", "end_date"):
+            if parsed.get(key):
+                parsed[key] = datetime.fromisoformat(parsed[key])
+        return parsed
@@ -0,0 +1,84 @@
+"""
+Hash chain and Merkle trees for audit log integrity.
+
+Every entry carries prev_hash, the checksum of the entry written before it,
+and its checksum covers prev_hash, so deleting, inserting or reordering
+entries breaks the chain at that point. The checksums of a block are the
+leaves of the block's Merkle root, and the block roots of a segment are the
+leaves of the segment root recorded in the checkpoint log when the segment is
+sealed. A contiguous range of blocks is verified against that root with a
+proof of O(log n) subtree hashes (the tree shape follows RFC 6962: the left
+subtree holds the largest power of two below the leaf count).
+"""
+import hashlib
+import json
+from typing import Any, Dict, Iterator, List, Sequence
+
+GENESIS_HASH = "0" * 64
+
+
+def entry_checksum(entry: Dict[str, Any]) -> str:
+    """SHA-256 over the entry without its checksum field (prev_hash included)."""
+    entry_copy = entry.copy()
+    entry_copy.pop("checksum", None)
+    entry_str = json.dumps(entry_copy, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(entry_str.encode()).hexdigest()
+
+
+def _node(left: str, right: str) -> str:
+    return hashlib.sha256(f"{left}{right}".encode()).hexdigest()
+
+
+def _split(count: int) -> int:
+    """Size of the left subtree: the largest power of two below count."""
+    split = 1
+    while split * 2 < count:
+        split *= 2
+    return split
+
+
+def merkle_root(leaves: Sequence[str]) -> str:
+    if not leaves:
+        return GENESIS_HASH
+    if len(leaves) == 1:
+        return leaves[0]
+    split = _split(len(leaves))
+    return _node(merkle_root(leaves[:split]), merkle_root(leaves[split:]))
+
+
+def range_proof(leaves: Sequence[str], start: int, end: int) -> List[str]:
+    """Roots of the maximal subtrees outside leaves[start:end], left to right."""
+    if end <= 0 or start >= len(leaves):
+        return [merkle_root(leaves)]
+    if start <= 0 and end >= len(leaves):
+        return []
+    split = _split(len(leaves))
+    return range_proof(leaves[:split], start, end) + range_proof(leaves[split:], start - split, end - split)
+
+
+def root_from_range(count: int, start: int, end: int, range_leaves: Sequence[str], proof: Sequence[str]) -> str:
+    """Recompute the root of a tree of count leaves from leaves[start:end] and their range proof."""
+    leaves, siblings = iter(range_leaves), iter(proof)
+
+    def rebuild(size: int, lo: int, hi: int) -> str:
+        if hi <= 0 or lo >= size:
+            return next(siblings)
+        if lo <= 0 and hi >= size:
+            return merkle_root([next(leaves) for _ in range(size)])
+        split = _split(size)
+        left = rebuild(split, lo, hi)
+        return _node(left, rebuild(size - split, lo - split, hi - split))
+
+    try:
+        return rebuild(count, start, end)
+    except StopIteration:
+        return ""
+
+
+def chain(entries: Iterator[Dict[str, Any]], prev_hash: str) -> str:
+    """Link entries to their predecessors and set their checksums; returns the last checksum."""
+    for entry in entries:
+        entry["prev_hash"] = prev_hash
+        entry["checksum"] = entry_checksum(entry)
+        prev_hash = entry["checksum"]
+    return prev_hash
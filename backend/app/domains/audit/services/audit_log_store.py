@@ -0,0 +1,853 @@
+"""
+Append-only, time-partitioned audit log with per-segment indexes.
+
+The log is a directory of JSON-lines segments named after the start of their
+time partition (audit-<YYYYMMDDTHHMMSS>-<seq>.jsonl). A new segment is started
+when the partition (AUDIT_SEGMENT_SPAN_SECONDS) changes or the segment reaches
+AUDIT_SEGMENT_MAX_BYTES; the previous one is sealed by writing its index next
+to it (<segment>.idx). An index splits the segment into blocks of about
+BLOCK_BYTES and records, per block, its byte range, timestamp range and entry
+count (the sparse time index) and, per value of user_id, event_type, severity
+and resource_type, the blocks holding it with their entry counts (the inverted
+indexes). Queries walk segments and blocks newest-first, skip those the
+indexes rule out, and seek to and parse only the remaining blocks; totals of
+single-field queries come from the index counts without reading anything.
+
+Entries are hash-chained as they are appended and every block carries the
+Merkle root of its entries' checksums (see audit_integrity). Sealing a segment
+appends its root to checkpoints.jsonl, itself a hash chain, and verify()
+checks a time range against those checkpoints.
+
+Several processes write the same directory (the backend's audit pipeline,
+Celery workers and beat falling back to direct appends), so every append,
+seal and checkpoint happens under an exclusive flock on <dir>/.lock. Under it
+the writer first catches up on what other processes did - new or sealed
+segments, lines appended to the active segment, new checkpoints - so it
+chains from the true head and never truncates anything but a torn line left
+by a crashed writer. Readers refresh the same way under a shared lock.
+
+Writes are grouped: a batch is written with one write() and made durable with
+a single fsync. append() and query() block on disk I/O; async callers use
+append_async(), which runs on a dedicated single-thread executor so appends
+stay ordered, and query_async().
+"""
+import asyncio
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.domains.audit.services.audit_integrity import (
+    GENESIS_HASH, chain, entry_checksum, merkle_root, range_proof, root_from_range
+)
+
+try:
+    import fcntl
+except ImportError:  # Not POSIX: only safe with a single writer process
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+INDEXED_FIELDS = ("user_id", "event_type", "severity", "resource_type")
+SEGMENT_SUFFIX = ".jsonl"
+INDEX_SUFFIX = ".idx"
+CHECKPOINT_FILE = "checkpoints.jsonl"
+LOCK_FILE = ".lock"
+_SEGMENT_NAME = re.compile(r"^audit-(\d{8}T\d{6})-(\d{6})\.jsonl$")
+
+# Block: [offset, length, min_ts, max_ts, count, merkle root (set when the block is closed)]
+Block = List[Any]
+AuditMatch = Callable[[Dict[str, Any]], bool]
+
+
+def _entry_time(entry: Dict[str, Any]) -> float:
+    try:
+        return datetime.fromisoformat(str(entry["timestamp"]).replace("Z", "+00:00")).timestamp()
+    except (KeyError, TypeError, ValueError):
+        return 0.0
+
+
+def _index_value(value: Any) -> Optional[str]:
+    return None if value is None or value == "" else str(value)
+
+
+class SegmentIndex:
+    """Sparse timestamp index and per-field inverted indexes of one segment."""
+
+    def __init__(self, block_bytes: int):
+        self.block_bytes = block_bytes
+        self.blocks: List[Block] = []
+        self.postings: Dict[str, Dict[str, List[List[int]]]] = {field: {} for field in INDEXED_FIELDS}
+        self.size = 0
+        self.count = 0
+        self.min_ts: Optional[float] = None
+        self.max_ts: Optional[float] = None
+        self.first_prev: Optional[str] = None
+        self.last_hash: Optional[str] = None
+        self._open: Optional[Block] = None
+        self._open_values: Dict[str, Counter] = {}
+        self._open_leaves: List[str] = []
+
+    def add(self, entry: Dict[str, Any], length: int):
+        """Index an entry appended at the current end of the segment."""
+        ts = _entry_time(entry)
+        if self._open is None:
+            self._open = [self.size, 0, ts, ts, 0]
+            self._open_values = {field: Counter() for field in INDEXED_FIELDS}
+            self._open_leaves = []
+        block = self._open
+        block[1] += length
+        block[2] = min(block[2], ts)
+        block[3] = max(block[3], ts)
+        block[4] += 1
+        for field in INDEXED_FIELDS:
+            value = _index_value(entry.get(field))
+            if value is not None:
+                self._open_values[field][value] += 1
+        checksum = entry.get("checksum") or entry_checksum(entry)
+        self._open_leaves.append(checksum)
+        if self.count == 0:
+            self.first_prev = entry.get("prev_hash")
+        self.last_hash = checksum
+
+        self.size += length
+        self.count += 1
+        self.min_ts = ts if self.min_ts is None else min(self.min_ts, ts)
+        self.max_ts = ts if self.max_ts is None else max(self.max_ts, ts)
+        if block[1] >= self.block_bytes:
+            self.close_block()
+
+    def close_block(self):
+        if self._open is None:
+            return
+        block_id = len(self.blocks)
+        self._open.append(merkle_root(self._open_leaves))
+        self.blocks.append(self._open)
+        for field, values in self._open_values.items():
+            postings = self.postings[field]
+            for value, count in values.items():
+                postings.setdefault(value, []).append([block_id, count])
+        self._open = None
+        self._open_values = {}
+        self._open_leaves = []
+
+    def snapshot_blocks(self) -> List[Block]:
+        """Closed blocks plus the open one (without a root yet)."""
+        return self.blocks + ([list(self._open)] if self._open is not None else [])
+
+    @property
+    def root(self) -> str:
+        return merkle_root([block[5] for block in self.blocks])
+
+    def candidates(
+        self,
+        filters: Dict[str, str],
+        since: Optional[float],
+        until: Optional[float]
+    ) -> List[Tuple[Block, Optional[int]]]:
+        """
+        Blocks that may hold matches, newest first, with the number of entries
+        matching the rarest filter (None for the open block, which has no postings).
+        """
+        if self.count == 0 or (since is not None and self.max_ts < since) or (until is not None and self.min_ts > until):
+            return []
+
+        if filters:
+            # Walk the shortest posting list, keeping blocks that appear in all the others
+            lists = sorted((self.postings.get(field, {}).get(value, []) for field, value in filters.items()), key=len)
+            others = [{block_id for block_id, _ in postings} for postings in lists[1:]]
+            selected = [
+                (self.blocks[block_id], count) for block_id, count in lists[0]
+                if all(block_id in blocks for blocks in others)
+            ]
+        else:
+            selected = [(block, block[4]) for block in self.blocks]
+        if self._open is not None:
+            open_values = self._open_values
+            if all(open_values.get(field, {}).get(value) for field, value in filters.items()):
+                selected.append((self._open, None))
+
+        return [
+            (block, count) for block, count in reversed(selected)
+            if (since is None or block[3] >= since) and (until is None or block[2] <= until)
+        ]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "block_bytes": self.block_bytes,
+            "size": self.size,
+            "count": self.count,
+            "min_ts": self.min_ts,
+            "max_ts": self.max_ts,
+            "first_prev": self.first_prev,
+            "last_hash": self.last_hash,
+            "root": self.root,
+            "blocks": self.blocks,
+            "postings": self.postings
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SegmentIndex":
+        if any(len(block) < 6 for block in data["blocks"]):
+            raise ValueError("index has no Merkle roots")
+        index = cls(data["block_bytes"])
+        index.blocks = data["blocks"]
+        index.postings = {field: data["postings"].get(field, {}) for field in INDEXED_FIELDS}
+        index.size = data["size"]
+        index.count = data["count"]
+        index.min_ts = data["min_ts"]
+        index.max_ts = data["max_ts"]
+        index.first_prev = data.get("first_prev")
+        index.last_hash = data.get("last_hash")
+        return index
+
+
+class AuditSegment:
+    """One segment file and its index."""
+
+    def __init__(self, path: str, index: SegmentIndex, sealed: bool):
+        self.path = path
+        self.index = index
+        self.sealed = sealed
+
+    @property
+    def name(self) -> str:
+        return os.path.basename(self.path)
+
+    def iter_block(self, handle, block: Block) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """Entries of a block in file order, with the offset just past each one."""
+        handle.seek(block[0])
+        position = block[0]
+        for line in handle.read(block[1]).splitlines(keepends=True):
+            position += len(line)
+            try:
+                yield position, json.loads(line)
+            except ValueError:
+                continue
+
+    def read_block(self, handle, block: Block) -> List[Dict[str, Any]]:
+        """Entries of a block, newest first."""
+        entries = [entry for _, entry in self.iter_block(handle, block)]
+        entries.reverse()
+        return entries
+
+    def scan(self, block_bytes: int) -> SegmentIndex:
+        """Rebuild the index by reading the whole segment (unsealed or legacy segments)."""
+        index = SegmentIndex(block_bytes)
+        self.catch_up(index)
+        return index
+
+    def catch_up(self, index: Optional[SegmentIndex] = None) -> int:
+        """Index the complete lines past the end of the index (appended by other processes); returns how many."""
+        index = index or self.index
+        added = 0
+        if os.path.getsize(self.path) <= index.size:
+            return added
+        with open(self.path, "rb") as handle:
+            handle.seek(index.size)
+            for line in handle:
+                if not line.endswith(b"\n"):
+                    break  # Torn or in-flight write at the end; appends resume after the last full line
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    entry = {}
+                index.add(entry, len(line))
+                added += 1
+        return added
+
+    def write_index(self, fsync: bool):
+        self.index.close_block()
+        tmp_path = f"{self.path}{INDEX_SUFFIX}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(self.index.to_dict(), handle, separators=(",", ":"))
+            handle.flush()
+            if fsync:
+                os.fsync(handle.fileno())
+        os.replace(tmp_path, f"{self.path}{INDEX_SUFFIX}")
+        self.sealed = True
+
+
+class AuditLogStore:
+    """Segmented, indexed append-only audit log with group commit."""
+
+    BLOCK_BYTES = 64 * 1024
+
+    def __init__(
+        self,
+        directory: str,
+        fsync: bool = True,
+        segment_max_bytes: int = 256 * 1024 * 1024,
+        segment_span_seconds: int = 3600,
+        legacy_path: Optional[str] = None
+    ):
+        self.directory = directory
+        self.fsync = fsync
+        self.segment_max_bytes = segment_max_bytes
+        self.segment_span_seconds = segment_span_seconds
+        self.legacy_path = legacy_path
+        self._segments: Optional[List[AuditSegment]] = None
+        self._checkpoints: List[Dict[str, Any]] = []
+        self._checkpoints_read = 0  # Bytes of the checkpoint log already loaded
+        self._last_hash = GENESIS_HASH
+        self._handle = None
+        self._lock = threading.RLock()
+        self._lock_file = None
+        self._lock_depth = 0
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="audit-file")
+
+        self.appends = 0
+        self.entries_written = 0
+        self.fsyncs = 0
+        self.segments_sealed = 0
+        self.checkpoints_written = 0
+        self.queries = 0
+        self.blocks_read = 0
+        self.blocks_skipped = 0
+
+    # Locking ------------------------------------------------------------------
+
+    @contextmanager
+    def _locked(self, exclusive: Optional[bool] = True):
+        """
+        Hold the in-process lock and the cross-process file lock, exclusive for
+        writers and shared for readers (exclusive=None: shared once loaded, since
+        the first load may repair what a crashed writer left). Re-entrant.
+        """
+        with self._lock:
+            if self._lock_depth or fcntl is None:
+                self._lock_depth += 1
+                try:
+                    yield
+                finally:
+                    self._lock_depth -= 1
+                return
+
+            if exclusive is None:
+                exclusive = self._segments is None
+            if self._lock_file is None:
+                os.makedirs(self.directory, exist_ok=True)
+                self._lock_file = open(os.path.join(self.directory, LOCK_FILE), "a+b")
+            fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+                fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_UN)
+
+    # Opening and rolling ----------------------------------------------------
+
+    def _open_segment(self, path: str) -> AuditSegment:
+        """A segment with its stored index if it is sealed, otherwise indexed by scanning it."""
+        index_path = f"{path}{INDEX_SUFFIX}"
+        if os.path.exists(index_path):
+            try:
+                with open(index_path, "r", encoding="utf-8") as handle:
+                    return AuditSegment(path, SegmentIndex.from_dict(json.load(handle)), sealed=True)
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Rebuilding unreadable audit index {index_path}: {e}")
+        segment = AuditSegment(path, SegmentIndex(self.BLOCK_BYTES), sealed=False)
+        segment.index = segment.scan(self.BLOCK_BYTES)
+        return segment
+
+    def _load(self) -> List[AuditSegment]:
+        """
+        The segment list, brought up to date with the directory. Call with _locked held.
+
+        The first load also seals segments left unsealed by a crash and writes
+        missing checkpoints, so it must hold the lock exclusively.
+        """
+        if self._segments is not None:
+            return self._refresh()
+        os.makedirs(self.directory, exist_ok=True)
+        self._load_checkpoints()
+        self._import_legacy()
+
+        segments = [
+            self._open_segment(os.path.join(self.directory, name))
+            for name in sorted(os.listdir(self.directory)) if _SEGMENT_NAME.match(name)
+        ]
+
+        # Only the newest segment stays open for appends; sealed ones all get a checkpoint
+        checkpointed = {checkpoint["segment"] for checkpoint in self._checkpoints}
+        for segment in segments[:-1]:
+            if not segment.sealed:
+                segment.write_index(self.fsync)
+        for segment in segments:
+            if segment.sealed and segment.name not in checkpointed:
+                self._checkpoint(segment)
+        self._set_segments(segments)
+        return segments
+
+    def _refresh(self) -> List[AuditSegment]:
+        """Pick up segments other processes created, sealed or appended to, and their checkpoints."""
+        self._load_checkpoints()
+        known = {segment.name: segment for segment in self._segments}
+        segments = []
+        for name in sorted(os.listdir(self.directory)):
+            if not _SEGMENT_NAME.match(name):
+                continue
+            segment = known.get(name)
+            if segment is None:
+                segment = self._open_segment(os.path.join(self.directory, name))
+            elif not segment.sealed:
+                if os.path.exists(f"{segment.path}{INDEX_SUFFIX}"):
+                    segment = self._open_segment(segment.path)
+                else:
+                    segment.catch_up()
+            segments.append(segment)
+        self._set_segments(segments)
+        return segments
+
+    def _set_segments(self, segments: List[AuditSegment]):
+        self._segments = segments
+        self._last_hash = next(
+            (segment.index.last_hash for segment in reversed(segments) if segment.index.last_hash), GENESIS_HASH
+        )
+
+    def _load_checkpoints(self):
+        """Read checkpoint records appended since the last call."""
+        path = os.path.join(self.directory, CHECKPOINT_FILE)
+        if not os.path.exists(path):
+            self._checkpoints, self._checkpoints_read = [], 0
+            return
+        with open(path, "rb") as handle:
+            handle.seek(self._checkpoints_read)
+            for line in handle:
+                if not line.endswith(b"\n"):
+                    break
+                self._checkpoints_read += len(line)
+                try:
+                    self._checkpoints.append(json.loads(line))
+                except ValueError:
+                    logger.error(f"Unreadable audit checkpoint in {path}")
+
+    def _checkpoint(self, segment: AuditSegment):
+        """Append the sealed segment's Merkle root to the (hash-chained) checkpoint log."""
+        index = segment.index
+        record = {
+            "segment": segment.name,
+            "count": index.count,
+            "blocks": len(index.blocks),
+            "min_ts": index.min_ts,
+            "max_ts": index.max_ts,
+            "root": index.root,
+            "first_prev": index.first_prev,
+            "last_hash": index.last_hash,
+            "sealed_at": datetime.now(timezone.utc).isoformat()
+        }
+        chain([record], self._checkpoints[-1]["checksum"] if self._checkpoints else GENESIS_HASH)
+        with open(os.path.join(self.directory, CHECKPOINT_FILE), "ab") as handle:
+            handle.write(json.dumps(record, separators=(",", ":")).encode() + b"\n")
+            handle.flush()
+            if self.fsync:
+                os.fsync(handle.fileno())
+            self._checkpoints_read = handle.tell()
+        self._checkpoints.append(record)
+        self.checkpoints_written += 1
+        logger.info(f"Audit checkpoint {segment.name}: {index.count} events, root {record['root']}")
+
+    def _import_legacy(self):
+        """Move a single-file audit log from before segmentation in as the oldest segment."""
+        if not self.legacy_path or not os.path.isfile(self.legacy_path):
+            return
+        path = os.path.join(self.directory, f"audit-00000000T000000-000000{SEGMENT_SUFFIX}")
+        if os.path.exists(path):
+            return
+        os.replace(self.legacy_path, path)
+        segment = AuditSegment(path, SegmentIndex(self.BLOCK_BYTES), sealed=False)
+        segment.index = segment.scan(self.BLOCK_BYTES)
+        segment.write_index(self.fsync)
+        self._checkpoint(segment)
+        logger.info(f"Imported legacy audit log {self.legacy_path} ({segment.index.count} events)")
+
+    def _partition_start(self, now: float) -> int:
+        return int(now // self.segment_span_seconds * self.segment_span_seconds)
+
+    def _segment_partition(self, segment: AuditSegment) -> Optional[int]:
+        try:
+            stamp = datetime.strptime(_SEGMENT_NAME.match(segment.name).group(1), "%Y%m%dT%H%M%S")
+        except ValueError:
+            return None  # The imported legacy segment belongs to no partition
+        return int(stamp.replace(tzinfo=timezone.utc).timestamp())
+
+    def _active_segment(self, now: float, incoming: int) -> AuditSegment:
+        segments = self._load()
+        partition = self._partition_start(now)
+        active = segments[-1] if segments and not segments[-1].sealed else None
+        if active is not None and self._segment_partition(active) == partition \
+                and active.index.size + incoming <= self.segment_max_bytes:
+            return active
+
+        if active is not None:
+            self._seal(active)
+        stamp = datetime.fromtimestamp(partition, tz=timezone.utc).strftime("%Y%m%dT%H%M%S")
+        sequence = sum(1 for segment in segments if segment.name.startswith(f"audit-{stamp}-"))
+        path = os.path.join(self.directory, f"audit-{stamp}-{sequence:06d}{SEGMENT_SUFFIX}")
+        segment = AuditSegment(path, SegmentIndex(self.BLOCK_BYTES), sealed=False)
+        segments.append(segment)
+        return segment
+
+    def _seal(self, segment: AuditSegment):
+        self._close_handle()
+        segment.write_index(self.fsync)
+        self._checkpoint(segment)
+        self.segments_sealed += 1
+
+    def _close_handle(self):
+        if self._handle is not None and not self._handle.closed:
+            self._handle.close()
+        self._handle = None
+
+    def _write(self, segment: AuditSegment, data: bytes):
+        if self._handle is None or self._handle.closed or self._handle.name != segment.path:
+            self._close_handle()
+            self._handle = open(segment.path, "ab")
+        # The index covers every complete line (_refresh ran under the same exclusive
+        # lock), so anything past it is a torn line from a writer that crashed mid-write
+        if os.fstat(self._handle.fileno()).st_size > segment.index.size:
+            logger.warning(f"Dropping a torn audit line at the end of {segment.name}")
+            self._handle.truncate(segment.index.size)
+        self._handle.write(data)
+        self._handle.flush()
+        if self.fsync:
+            os.fsync(self._handle.fileno())
+            self.fsyncs += 1
+
+    # Writing ----------------------------------------------------------------
+
+    @staticmethod
+    def encode(entry: Dict[str, Any]) -> bytes:
+        return json.dumps(entry, separators=(",", ":"), default=str).encode() + b"\n"
+
+    def append(self, entries: Iterable[Dict[str, Any]]) -> int:
+        """
+        Chain and append entries as one write and (optionally) one fsync; returns
+        the number written. Sets prev_hash and checksum on the entries.
+        """
+        entries = list(entries)
+        if not entries:
+            return 0
+        with self._locked(exclusive=True):
+            self._load()
+            last_hash = chain(entries, self._last_hash)
+            lines = [(entry, self.encode(entry)) for entry in entries]
+            now = time.time()
+            segment = self._active_segment(now, sum(len(line) for _, line in lines))
+            # A batch larger than the remaining room still goes into one segment
+            self._write(segment, b"".join(line for _, line in lines))
+            self._last_hash = last_hash
+            for entry, line in lines:
+                segment.index.add(entry, len(line))
+            self.appends += 1
+            self.entries_written += len(lines)
+        return len(lines)
+
+    async def append_async(self, entries: List[Dict[str, Any]]) -> int:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, self.append, entries)
+
+    def close(self):
+        with self._lock:
+            self._close_handle()
+            if self._lock_file is not None:
+                self._lock_file.close()
+                self._lock_file = None
+
+    # Reading ----------------------------------------------------------------
+
+    def query(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        offset: int = 0,
+        limit: int = 50,
+        match: Optional[AuditMatch] = None,
+        count_total: bool = True
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Return (events, total) for entries matching all equality filters on the
+        indexed fields, the time range and match, newest first in write order.
+
+        With count_total=False the scan stops once the page is full and total
+        only counts the matches seen so far.
+        """
+        filters = self._index_filters(filters)
+        since_ts = since.timestamp() if since else None
+        until_ts = until.timestamp() if until else None
+        # Index counts are exact when nothing but one indexed field is filtered
+        countable = match is None and len(filters) <= 1
+
+        with self._locked(exclusive=None):
+            segments = list(self._load())
+            plans = [(segment, segment.index.candidates(filters, since_ts, until_ts)) for segment in reversed(segments)]
+        self.queries += 1
+
+        events: List[Dict[str, Any]] = []
+        total = 0
+        for segment, blocks in plans:
+            if not blocks:
+                continue
+            if not count_total and len(events) >= limit:
+                break
+            with open(segment.path, "rb") as handle:
+                for block, count in blocks:
+                    page_full = len(events) >= limit
+                    if page_full and not count_total:
+                        break
+                    inside = (since_ts is None or block[2] >= since_ts) and (until_ts is None or block[3] <= until_ts)
+                    if countable and count is not None and inside and (page_full or total + count <= offset):
+                        total += count
+                        self.blocks_skipped += 1
+                        continue
+
+                    self.blocks_read += 1
+                    for entry in segment.read_block(handle, block):
+                        if not self._matches(entry, filters, since_ts, until_ts, match):
+                            continue
+                        if offset <= total < offset + limit:
+                            events.append(entry)
+                        total += 1
+        return events, total
+
+    @staticmethod
+    def _index_filters(filters: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        return {
+            field: str(value) for field, value in (filters or {}).items()
+            if field in INDEXED_FIELDS and _index_value(value) is not None
+        }
+
+    @staticmethod
+    def _matches(
+        entry: Dict[str, Any],
+        filters: Dict[str, str],
+        since: Optional[float],
+        until: Optional[float],
+        match: Optional[AuditMatch]
+    ) -> bool:
+        for field, value in filters.items():
+            if _index_value(entry.get(field)) != value:
+                return False
+        if since is not None or until is not None:
+            ts = _entry_time(entry)
+            if (since is not None and ts < since) or (until is not None and ts > until):
+                return False
+        return match is None or match(entry)
+
+    async def query_async(self, **kwargs) -> Tuple[List[Dict[str, Any]], int]:
+        return await asyncio.get_running_loop().run_in_executor(None, lambda: self.query(**kwargs))
+
+    def iter_entries(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        match: Optional[AuditMatch] = None,
+        cursor: Optional[str] = None
+    ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Yield (cursor, entry) for matching entries oldest-first, holding one block
+        in memory at a time. The cursor ("<segment>:<offset>") points just past
+        its entry; passing it back resumes the scan after that entry. The scan
+        covers what was written when it started.
+        """
+        filters = self._index_filters(filters)
+        since_ts = since.timestamp() if since else None
+        until_ts = until.timestamp() if until else None
+        cursor_segment, cursor_offset = None, 0
+        if cursor:
+            cursor_segment, _, offset = cursor.rpartition(":")
+            cursor_offset = int(offset)
+
+        with self._locked(exclusive=None):
+            plans = [
+                (segment, [list(block) for block, _ in reversed(segment.index.candidates(filters, since_ts, until_ts))])
+                for segment in self._load()
+                if cursor_segment is None or segment.name >= cursor_segment
+            ]
+
+        for segment, blocks in plans:
+            resume_at = cursor_offset if segment.name == cursor_segment else 0
+            blocks = [block for block in blocks if block[0] + block[1] > resume_at]
+            if not blocks:
+                continue
+            with open(segment.path, "rb") as handle:
+                for block in blocks:
+                    self.blocks_read += 1
+                    for position, entry in segment.iter_block(handle, block):
+                        if position > resume_at and self._matches(entry, filters, since_ts, until_ts, match):
+                            yield f"{segment.name}:{position}", entry
+
+    def estimate(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None
+    ) -> int:
+        """Upper bound of the matching entries from the indexes (exact for at most one filter and no time range)."""
+        filters = self._index_filters(filters)
+        since_ts = since.timestamp() if since else None
+        until_ts = until.timestamp() if until else None
+        with self._locked(exclusive=None):
+            return sum(
+                block[4] if count is None else count
+                for segment in self._load()
+                for block, count in segment.index.candidates(filters, since_ts, until_ts)
+            )
+
+    # Integrity ----------------------------------------------------------------
+
+    def verify(
+        self,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        summarize: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Verify the entries of a time range in one streaming pass.
+
+        Each block overlapping the range is read once: entry checksums are
+        recomputed, prev_hash links checked and the block's Merkle root rebuilt.
+        Per sealed segment the rebuilt roots plus a range proof from the index
+        must give the checkpointed root; the active segment is checked against
+        its in-memory index. The checkpoint log's own chain, the links between
+        segments and missing segment files are checked as well. With summarize,
+        the same pass counts the range's events by type and severity and its
+        distinct users.
+        """
+        since_ts = since.timestamp() if since else None
+        until_ts = until.timestamp() if until else None
+        with self._locked(exclusive=None):
+            segments = [(segment, segment.index.snapshot_blocks()) for segment in self._load()]
+            checkpoints = list(self._checkpoints)
+
+        report: Dict[str, Any] = {
+            "verified": True,
+            "events": 0,
+            "segments": 0,
+            "segments_checkpointed": 0,
+            "blocks_read": 0,
+            "proof_hashes": 0,
+            "unchained_events": 0,
+            "errors": []
+        }
+        event_types: Counter = Counter()
+        severities: Counter = Counter()
+        users = set()
+
+        def fail(message: str):
+            report["verified"] = False
+            if len(report["errors"]) < 20:
+                report["errors"].append(message)
+
+        def overlaps(min_ts: Optional[float], max_ts: Optional[float]) -> bool:
+            return min_ts is not None and (since_ts is None or max_ts >= since_ts) \
+                and (until_ts is None or min_ts <= until_ts)
+
+        # The checkpoint log is a chain of its own
+        previous = GENESIS_HASH
+        by_segment = {}
+        present = {segment.name for segment, _ in segments}
+        for checkpoint in checkpoints:
+            if checkpoint.get("prev_hash") != previous or checkpoint.get("checksum") != entry_checksum(checkpoint):
+                fail(f"Checkpoint log tampered at {checkpoint.get('segment')}")
+            previous = checkpoint.get("checksum")
+            by_segment[checkpoint.get("segment")] = checkpoint
+            if checkpoint.get("segment") not in present and overlaps(checkpoint.get("min_ts"), checkpoint.get("max_ts")):
+                fail(f"Segment {checkpoint.get('segment')} is missing")
+
+        previous_segment: Optional[AuditSegment] = None
+        for segment, blocks in segments:
+            index = segment.index
+            run = [i for i, block in enumerate(blocks) if overlaps(block[2], block[3])]
+            if not run:
+                previous_segment = segment
+                continue
+            start, end = run[0], run[-1] + 1
+            if start == 0 and previous_segment is not None and index.first_prev is not None \
+                    and index.first_prev != previous_segment.index.last_hash:
+                fail(f"Chain broken between {previous_segment.name} and {segment.name}")
+
+            prev_hash = None  # Unknown when the range starts inside the segment
+            roots = []
+            with open(segment.path, "rb") as handle:
+                for block in blocks[start:end]:
+                    leaves = []
+                    for entry in reversed(segment.read_block(handle, block)):
+                        checksum = entry.get("checksum")
+                        if checksum != entry_checksum(entry):
+                            fail(f"Entry {entry.get('id')} in {segment.name} was modified")
+                        if "prev_hash" not in entry:
+                            report["unchained_events"] += 1
+                        elif prev_hash is not None and entry["prev_hash"] != prev_hash:
+                            fail(f"Chain broken before entry {entry.get('id')} in {segment.name}")
+                        prev_hash = checksum
+                        leaves.append(checksum or "")
+                        if overlaps(_entry_time(entry), _entry_time(entry)):
+                            report["events"] += 1
+                            if summarize:
+                                event_types[entry.get("event_type")] += 1
+                                severities[entry.get("severity")] += 1
+                                if entry.get("user_id"):
+                                    users.add(entry["user_id"])
+                    if len(leaves) != block[4]:
+                        fail(f"{segment.name} block at {block[0]}: {len(leaves)} entries, index has {block[4]}")
+                    root = merkle_root(leaves)
+                    if len(block) > 5 and block[5] != root:
+                        fail(f"{segment.name} block at {block[0]} does not match its Merkle root")
+                    roots.append(root)
+            report["blocks_read"] += end - start
+
+            checkpoint = by_segment.get(segment.name)
+            if segment.sealed:
+                if checkpoint is None:
+                    fail(f"Segment {segment.name} has no checkpoint")
+                else:
+                    sealed_roots = [block[5] for block in index.blocks]
+                    proof = range_proof(sealed_roots, start, end)
+                    report["proof_hashes"] += len(proof)
+                    if len(sealed_roots) != checkpoint.get("blocks") or \
+                            root_from_range(len(sealed_roots), start, end, roots, proof) != checkpoint.get("root"):
+                        fail(f"Segment {segment.name} does not match its checkpoint")
+                    else:
+                        report["segments_checkpointed"] += 1
+            report["segments"] += 1
+            previous_segment = segment
+        if summarize:
+            report["event_types"] = dict(event_types)
+            report["severities"] = dict(severities)
+            report["unique_users"] = len(users)
+        return report
+
+    async def verify_async(
+        self,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        summarize: bool = False
+    ) -> Dict[str, Any]:
+        return await asyncio.get_running_loop().run_in_executor(None, self.verify, since, until, summarize)
+
+    def get_stats(self) -> Dict[str, Any]:
+        segments = self._segments or []
+        return {
+            "directory": self.directory,
+            "segments": len(segments),
+            "events": sum(segment.index.count for segment in segments),
+            "bytes": sum(segment.index.size for segment in segments),
+            "segments_sealed": self.segments_sealed,
+            "checkpoints_written": self.checkpoints_written,
+            "appends": self.appends,
+            "entries_written": self.entries_written,
+            "fsyncs": self.fsyncs,
+            "queries": self.queries,
+            "blocks_read": self.blocks_read,
+            "blocks_skipped": self.blocks_skipped
+        }
@@ -0,0 +1,352 @@
+"""
+Bounded in-process queue that takes audit writes off the request path.
+
+log_event() only builds the entry and enqueues it; a background task on the
+application's event loop drains the queue in batches and hands each batch to
+a sink (cache pipeline + grouped file append). When the queue is full the
+overflow policy decides what happens:
+- block: the caller waits for space (callers on other threads spill instead)
+- drop_info: INFO events are dropped first - the incoming one, or the oldest
+  queued one to make room for a more severe event; blocks if none is queued
+- spill: the event is appended to a spill file and replayed once the queue
+  has drained
+A batch the sink fails to write goes back to the head of the queue and is
+retried with exponential backoff; a replayed spill file shrinks to what is
+still unwritten and is deleted only once empty. If the writer ends for any
+reason, queued and in-flight events are spilled (when a spill path is set)
+and blocked callers are released to write inline. Processes that never
+start the pipeline (Celery workers, scripts) keep writing inline - submit()
+returns False there.
+"""
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+OVERFLOW_BLOCK = "block"
+OVERFLOW_DROP_INFO = "drop_info"
+OVERFLOW_SPILL = "spill"
+OVERFLOW_POLICIES = (OVERFLOW_BLOCK, OVERFLOW_DROP_INFO, OVERFLOW_SPILL)
+
+AuditSink = Callable[[List[Dict[str, Any]]], Awaitable[Any]]
+
+
+class AuditPipeline:
+    """Queues audit entries and writes them in batches from a background task."""
+
+    LAG_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 30.0)
+
+    def __init__(
+        self,
+        sink: AuditSink,
+        max_size: int = 10000,
+        batch_size: int = 500,
+        flush_interval: float = 0.05,
+        overflow: str = OVERFLOW_DROP_INFO,
+        spill_path: Optional[str] = None,
+        retry_initial: float = 0.5,
+        retry_max: float = 30.0
+    ):
+        if overflow not in OVERFLOW_POLICIES:
+            logger.warning(f"Unknown audit overflow policy '{overflow}', using {OVERFLOW_DROP_INFO}")
+            overflow = OVERFLOW_DROP_INFO
+        if overflow == OVERFLOW_SPILL and not spill_path:
+            overflow = OVERFLOW_BLOCK
+        self.sink = sink
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+        self.spill_path = spill_path
+        self.retry_initial = retry_initial
+        self.retry_max = retry_max
+
+        self._queue: Deque[Tuple[float, Dict[str, Any]]] = deque()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._not_empty: Optional[asyncio.Event] = None
+        self._space: Optional[asyncio.Event] = None
+        self._stopping = False
+        self._inflight: List[Tuple[float, Dict[str, Any]]] = []
+        self._retry_delay = 0.0
+
+        self.enqueued = 0
+        self.written = 0
+        self.failed = 0     # Events in failed write attempts (retried, not lost)
+        self.retries = 0
+        self.dropped = 0
+        self.spilled = 0
+        self.blocked = 0
+        self.batches = 0
+        self.max_depth = 0
+        self.last_lag_seconds = 0.0
+        self.max_lag_seconds = 0.0
+        self.lag_seconds_total = 0.0
+        self.lag_buckets = [0] * len(self.LAG_BUCKETS)
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def depth(self) -> int:
+        return len(self._queue)
+
+    async def start(self):
+        """Start the writer on the current event loop. Idempotent."""
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._not_empty = asyncio.Event()
+        self._space = asyncio.Event()
+        self._stopping = False
+        self._task = self._loop.create_task(self._run(), name="audit-pipeline")
+        logger.info(f"Audit pipeline started (max {self.max_size} queued, overflow={self.overflow})")
+
+    async def stop(self, timeout: float = 10.0):
+        """Drain the queue (and spill file) and stop the writer."""
+        if not self.running:
+            return
+        self._stopping = True
+        self._not_empty.set()
+        try:
+            await asyncio.wait_for(asyncio.shield(self._task), timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"Audit pipeline did not drain within {timeout}s, {self.depth} events left")
+            self._task.cancel()
+            # Let the writer spill what it still holds before returning
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    async def submit(self, entry: Dict[str, Any]) -> bool:
+        """
+        Queue an entry for writing. Returns False if the pipeline is not running,
+        in which case the caller should write the entry itself.
+        """
+        if not self.running or self._stopping:
+            return False
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        enqueued_at = time.monotonic()
+        if loop is self._loop:
+            while not self._offer(entry, enqueued_at, can_block=True):
+                self.blocked += 1
+                self._space.clear()
+                await self._space.wait()
+                if not self.running:
+                    # The writer ended while we waited; write inline instead
+                    return False
+            return True
+
+        # Another thread or event loop: hand the entry over without waiting for space
+        try:
+            self._loop.call_soon_threadsafe(self._offer, entry, enqueued_at, False)
+        except RuntimeError:
+            return False
+        return True
+
+    def _offer(self, entry: Dict[str, Any], enqueued_at: float, can_block: bool) -> bool:
+        """Queue an entry under the overflow policy; False means the caller has to wait for space."""
+        if len(self._queue) < self.max_size:
+            self._append(entry, enqueued_at)
+            return True
+
+        if self.overflow == OVERFLOW_DROP_INFO:
+            if entry.get("severity") == "info":
+                self.dropped += 1
+                return True
+            for index, (_, queued) in enumerate(self._queue):
+                if queued.get("severity") == "info":
+                    del self._queue[index]
+                    self.dropped += 1
+                    self._append(entry, enqueued_at)
+                    return True
+
+        if self.overflow == OVERFLOW_SPILL or not can_block:
+            self._spill(entry)
+            return True
+        return False
+
+    def _append(self, entry: Dict[str, Any], enqueued_at: float):
+        self._queue.append((enqueued_at, entry))
+        self.enqueued += 1
+        if len(self._queue) > self.max_depth:
+            self.max_depth = len(self._queue)
+        self._not_empty.set()
+
+    def _spill(self, entry: Dict[str, Any]):
+        self._spill_entries([entry])
+
+    def _spill_entries(self, entries: List[Dict[str, Any]]):
+        if not self.spill_path:
+            self.dropped += len(entries)
+            return
+        try:
+            with open(self.spill_path, "a", encoding="utf-8") as spill:
+                spill.writelines(json.dumps(entry, separators=(",", ":"), default=str) + "\n" for entry in entries)
+            self.spilled += len(entries)
+        except OSError as e:
+            self.dropped += len(entries)
+            logger.error(f"Audit spill write failed, {len(entries)} events dropped: {e}")
+
+    @property
+    def _replay_path(self) -> str:
+        return f"{self.spill_path}.replay"
+
+    def _has_spill(self) -> bool:
+        return bool(self.spill_path) and (os.path.exists(self.spill_path) or os.path.exists(self._replay_path))
+
+    async def _replay_spill(self) -> bool:
+        """
+        Write back events spilled to disk, in batches. On a failed batch the replay
+        file is cut down to the unwritten events and False is returned.
+        """
+        replay_path = self._replay_path
+        if not os.path.exists(replay_path):
+            os.replace(self.spill_path, replay_path)
+        with open(replay_path, "r", encoding="utf-8") as replay:
+            lines = replay.readlines()
+
+        entries = []
+        for line in lines:
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                continue
+        for start in range(0, len(entries), self.batch_size):
+            if not await self._flush([(time.monotonic(), entry) for entry in entries[start:start + self.batch_size]]):
+                if start:
+                    remaining_path = f"{replay_path}.tmp"
+                    with open(remaining_path, "w", encoding="utf-8") as remaining:
+                        remaining.writelines(
+                            json.dumps(entry, separators=(",", ":"), default=str) + "\n" for entry in entries[start:]
+                        )
+                    os.replace(remaining_path, replay_path)
+                return False
+        os.remove(replay_path)
+        logger.info(f"Replayed {len(entries)} spilled audit events")
+        return True
+
+    async def _backoff(self):
+        """Wait before retrying a failed write; the delay doubles up to retry_max."""
+        self.retries += 1
+        self._retry_delay = min(self._retry_delay * 2, self.retry_max) if self._retry_delay else self.retry_initial
+        await asyncio.sleep(self._retry_delay)
+
+    async def _run(self):
+        try:
+            while True:
+                try:
+                    if not self._queue:
+                        if self._has_spill():
+                            if not await self._replay_spill():
+                                await self._backoff()
+                            continue
+                        if self._stopping:
+                            break
+                        self._not_empty.clear()
+                        await self._not_empty.wait()
+                        continue
+
+                    # Let a partial batch fill up a little; under load batches are full anyway
+                    if len(self._queue) < self.batch_size and not self._stopping:
+                        await asyncio.sleep(self.flush_interval)
+
+                    batch = self._inflight = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+                    self._space.set()
+                    written = await self._flush(batch)
+                    self._inflight = []
+                    if not written:
+                        # Back to the head of the queue, in order, and retried after a pause
+                        self._queue.extendleft(reversed(batch))
+                        await self._backoff()
+                except Exception as e:
+                    logger.error(f"Audit pipeline error, retrying: {e}", exc_info=True)
+                    await self._backoff()
+        finally:
+            # Whatever is still held would be lost with the task: keep it on disk for the next start
+            pending = [entry for _, entry in self._inflight] + [entry for _, entry in self._queue]
+            self._inflight = []
+            self._queue.clear()
+            if pending:
+                logger.error(f"Audit pipeline stopped with {len(pending)} unwritten events")
+                self._spill_entries(pending)
+            # Release callers waiting for space; submit() sees the writer gone and they write inline
+            self._space.set()
+            self._not_empty.set()
+
+    async def _flush(self, batch: List[Tuple[float, Dict[str, Any]]]) -> bool:
+        """Hand a batch to the sink; True once it is written."""
+        try:
+            await self.sink([entry for _, entry in batch])
+        except Exception as e:
+            self.failed += len(batch)
+            logger.error(f"Audit batch write failed ({len(batch)} events), will retry: {e}")
+            return False
+
+        self._retry_delay = 0.0
+        now = time.monotonic()
+        self.batches += 1
+        self.written += len(batch)
+        for enqueued_at, _ in batch:
+            lag = now - enqueued_at
+            self.lag_seconds_total += lag
+            for i, bound in enumerate(self.LAG_BUCKETS):
+                if lag <= bound:
+                    self.lag_buckets[i] += 1
+                    break
+        self.last_lag_seconds = now - batch[0][0]
+        self.max_lag_seconds = max(self.max_lag_seconds, self.last_lag_seconds)
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "overflow": self.overflow,
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "max_size": self.max_size,
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "failed": self.failed,
+            "retries": self.retries,
+            "dropped": self.dropped,
+            "spilled": self.spilled,
+            "blocked": self.blocked,
+            "batches": self.batches,
+            "avg_batch_size": round(self.written / self.batches, 1) if self.batches else 0.0,
+            "last_lag_ms": round(self.last_lag_seconds * 1000, 3),
+            "max_lag_ms": round(self.max_lag_seconds * 1000, 3),
+            "avg_lag_ms": round(self.lag_seconds_total / self.written * 1000, 3) if self.written else 0.0
+        }
+
+    def prometheus_lines(self) -> List[str]:
+        lines = [
+            f"opsconductor_audit_queue_depth {self.depth}",
+            f"opsconductor_audit_queue_max_depth {self.max_depth}",
+            f"opsconductor_audit_events_enqueued_total {self.enqueued}",
+            f"opsconductor_audit_events_written_total {self.written}",
+            f"opsconductor_audit_events_failed_total {self.failed}",
+            f"opsconductor_audit_write_retries_total {self.retries}",
+            f"opsconductor_audit_events_dropped_total {self.dropped}",
+            f"opsconductor_audit_events_spilled_total {self.spilled}",
+            f"opsconductor_audit_batches_total {self.batches}",
+        ]
+        cumulative = 0
+        for bound, count in zip(self.LAG_BUCKETS, self.lag_buckets):
+            cumulative += count
+            lines.append(f'opsconductor_audit_write_lag_seconds_bucket{{le="{bound}"}} {cumulative}')
+        lines.extend([
+            f'opsconductor_audit_write_lag_seconds_bucket{{le="+Inf"}} {self.written}',
+            f"opsconductor_audit_write_lag_seconds_sum {self.lag_seconds_total}",
+            f"opsconductor_audit_write_lag_seconds_count {self.written}",
+        ])
+        return lines
@@ -2,16 +2,24 @@
 Audit Service for security and compliance logging.
 """
 import json
-import hashlib
-from typing import Dict, Any, List, Optional
+import logging
+from typing import AsyncIterator, Dict, Any, List, Optional
 from datetime import datetime, timezone, timedelta
 from sqlalchemy.orm import Session
 from sqlalchemy import func, and_, or_, desc
 from enum import Enum
 
+from app.core.config import settings
 from app.shared.infrastructure.container import injectable
 from app.shared.infrastructure.cache import cached
 from app.models.user_models import User
+from app.domains.audit.services.audit_log_store import AuditLogStore
+from app.domains.audit.services.audit_pipeline import AuditPipeline
+from app.domains.audit.services.audit_stream import AuditStream
+from app.domains.audit.services.audit_integrity import entry_checksum
+from app.domains.audit.services.audit_export import AuditExportManager, stream_export
+
+logger = logging.getLogger(__name__)
 
 
 class AuditEventType(Enum):
@@ -87,6 +95,7 @@ class AuditEventType(Enum):
     # API Events
     API_ACCESS = "api_access"
     API_ERROR = "api_error"
+    API_ACCESS_ROLLUP = "api_access_rollup"
     
     # Discovery Events
     DISCOVERY_JOB_CREATED = "discovery_job_created"
@@ -130,7 +139,13 @@ class AuditService:
         ip_address: Optional[str] = None,
         user_agent: Optional[str] = None
     ) -> Dict[str, Any]:
-        """Log an audit event."""
+        """
+        Log an audit event.
+        
+        The entry is queued for the audit pipeline, which chains it into the
+        audit log (adding prev_hash and the checksum) and caches it in batches. Where the pipeline
+        is not running (Celery workers, scripts) it is written inline.
+        """
         try:
             # Create audit log entry
             audit_entry = {
@@ -148,14 +163,9 @@ class AuditService:
                 "checksum": None
             }
             
-            # Calculate checksum for integrity
-            audit_entry["checksum"] = self._calculate_checksum(audit_entry)
-            
-            # Store in cache for immediate access
-            await self._store_audit_entry(audit_entry)
-            
-            # Log to file for persistence
-            await self._log_to_file(audit_entry)
+            # Hand off to the background writer - checksum, cache and file happen there
+            if not await audit_pipeline.submit(audit_entry):
+                await write_audit_batch([audit_entry])
             
             return audit_entry
             
@@ -169,92 +179,26 @@ class AuditService:
         timestamp = datetime.now(timezone.utc).timestamp()
         return f"audit_{int(timestamp * 1000000)}"
     
-    def _calculate_checksum(self, entry: Dict[str, Any]) -> str:
-        """Calculate checksum for audit entry integrity."""
-        # Remove checksum field for calculation
-        entry_copy = entry.copy()
-        entry_copy.pop("checksum", None)
-        
-        # Create deterministic string
-        entry_str = json.dumps(entry_copy, sort_keys=True, separators=(',', ':'))
-        
-        # Calculate SHA-256 hash
-        return hashlib.sha256(entry_str.encode()).hexdigest()
+    @staticmethod
+    def _calculate_checksum(entry: Dict[str, Any]) -> str:
+        """Calculate checksum for audit entry integrity (covers the chain link)."""
+        return entry_checksum(entry)
     
-    async def _store_audit_entry(self, entry: Dict[str, Any]):
-        """Store audit entry in cache."""
+    @staticmethod
+    async def _store_audit_entries(entries: List[Dict[str, Any]]):
+        """Store a batch of audit entries and update the recent stream and counters in one pipeline."""
         from app.shared.infrastructure.cache import cache_service
         
-        # Store individual entry
-        await cache_service.set(
-            f"audit_entry:{entry['id']}", 
-            entry, 
-            ttl=86400  # 24 hours
-        )
-        
-        # Add to recent entries list
-        recent_key = "audit_recent_entries"
-        recent_entries = await cache_service.get(recent_key) or []
-        recent_entries.insert(0, entry['id'])
-        
-        # Keep only last 1000 entries
-        recent_entries = recent_entries[:1000]
-        await cache_service.set(recent_key, recent_entries, ttl=86400)
-    
-    async def _log_to_file(self, entry: Dict[str, Any]):
-        """Log audit entry to file."""
-        import logging
-        
-        # Configure audit logger
-        audit_logger = logging.getLogger('audit')
-        if not audit_logger.handlers:
-            handler = logging.FileHandler('/app/logs/audit.log')
-            formatter = logging.Formatter('%(message)s')
-            handler.setFormatter(formatter)
-            audit_logger.addHandler(handler)
-            audit_logger.setLevel(logging.INFO)
-        
-        # Log as JSON
-        audit_logger.info(json.dumps(entry, separators=(',', ':')))
-    
-    async def _read_audit_log_file(
-        self, 
-        event_type: Optional[AuditEventType] = None,
-        user_id: Optional[int] = None,
-        severity: Optional[AuditSeverity] = None
-    ) -> List[Dict[str, Any]]:
-        """Read audit events from the log file."""
-        import os
-        
-        events = []
-        log_file_path = '/app/logs/audit.log'
-        
-        try:
-            if os.path.exists(log_file_path):
-                with open(log_file_path, 'r') as f:
-                    for line in f:
-                        try:
-                            event = json.loads(line.strip())
-                            
-                            # Apply filters
-                            if event_type and event.get("event_type") != event_type.value:
-                                continue
-                            if user_id and event.get("user_id") != user_id:
-                                continue
-                            if severity and event.get("severity") != severity.value:
-                                continue
-                            
-                            events.append(event)
-                        except json.JSONDecodeError:
-                            continue
-                            
-            # Sort by timestamp (newest first)
-            events.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
-            
-        except Exception as e:
-            print(f"Error reading audit log file: {e}")
-            
-        return events
+        async with cache_service.batch() as batch:
+            for entry in entries:
+                # Kept by id for integrity verification
+                batch.set(
+                    f"audit_entry:{entry['id']}", 
+                    entry, 
+                    ttl=86400,  # 24 hours
+                    memory_cache=False
+                )
+            audit_stream.queue_append(batch, entries)
     
     async def get_recent_events(
         self, 
@@ -265,39 +209,36 @@ class AuditService:
         severity: Optional[AuditSeverity] = None
     ) -> Dict[str, Any]:
         """Get recent audit events with pagination."""
-        from app.shared.infrastructure.cache import cache_service
+        def matches(entry: Dict[str, Any]) -> bool:
+            if event_type and entry.get("event_type") != event_type.value:
+                return False
+            if user_id and entry.get("user_id") != user_id:
+                return False
+            if severity and entry.get("severity") != severity.value:
+                return False
+            return True
         
         try:
-            recent_key = "audit_recent_entries"
-            recent_entry_ids = await cache_service.get(recent_key) or []
-            
-            # Filter events first
-            filtered_events = []
-            for entry_id in recent_entry_ids:
-                entry = await cache_service.get(f"audit_entry:{entry_id}")
-                if entry:
-                    # Apply filters
-                    if event_type and entry.get("event_type") != event_type.value:
-                        continue
-                    if user_id and entry.get("user_id") != user_id:
-                        continue
-                    if severity and entry.get("severity") != severity.value:
-                        continue
-                    
-                    filtered_events.append(entry)
-            
-            # If no events in cache, read from audit log file
-            if not filtered_events:
-                filtered_events = await self._read_audit_log_file(event_type, user_id, severity)
-            
-            # Calculate pagination
-            total = len(filtered_events)
-            total_pages = (total + limit - 1) // limit if total > 0 else 1
-            start_idx = (page - 1) * limit
-            end_idx = start_idx + limit
+            filtered = event_type or user_id or severity
+            page_result = await audit_stream.read_page(
+                (page - 1) * limit, limit, match=matches if filtered else None
+            )
             
-            # Get page of events
-            events = filtered_events[start_idx:end_idx]
+            if page_result and page_result[1]:
+                events, total = page_result
+            else:
+                # If no events in the stream, read from the indexed audit log
+                events, total = await audit_log_store.query_async(
+                    filters={
+                        "event_type": event_type.value if event_type else None,
+                        "user_id": user_id,
+                        "severity": severity.value if severity else None
+                    },
+                    offset=(page - 1) * limit,
+                    limit=limit
+                )
+            
+            total_pages = (total + limit - 1) // limit if total > 0 else 1
             
             return {
                 "events": events,
@@ -317,39 +258,18 @@ class AuditService:
             }
     
     async def get_audit_statistics(self) -> Dict[str, Any]:
-        """Get audit statistics."""
+        """Get audit statistics from the per-day counters."""
         try:
-            from app.shared.infrastructure.cache import cache_service
-            
-            recent_key = "audit_recent_entries"
-            recent_entry_ids = await cache_service.get(recent_key) or []
-            
-            # Count events by type
-            event_counts = {}
-            severity_counts = {}
-            user_activity = {}
-            
-            for entry_id in recent_entry_ids[:1000]:  # Last 1000 events
-                entry = await cache_service.get(f"audit_entry:{entry_id}")
-                if entry:
-                    # Count by event type
-                    event_type = entry.get("event_type", "unknown")
-                    event_counts[event_type] = event_counts.get(event_type, 0) + 1
-                    
-                    # Count by severity
-                    severity = entry.get("severity", "unknown")
-                    severity_counts[severity] = severity_counts.get(severity, 0) + 1
-                    
-                    # Count by user
-                    user_id = entry.get("user_id")
-                    if user_id:
-                        user_activity[str(user_id)] = user_activity.get(str(user_id), 0) + 1
+            stats = await audit_stream.get_statistics()
+            if stats is None:
+                return {"error": "Audit statistics unavailable: cache is not connected"}
             
             return {
-                "total_events": len(recent_entry_ids),
-                "event_type_distribution": event_counts,
-                "severity_distribution": severity_counts,
-                "top_active_users": dict(sorted(user_activity.items(), key=lambda x: x[1], reverse=True)[:10]),
+                "total_events": stats["total"],
+                "event_type_distribution": stats["event_types"],
+                "severity_distribution": stats["severities"],
+                "top_active_users": dict(sorted(stats["users"].items(), key=lambda x: x[1], reverse=True)[:10]),
+                "period_days": stats["days"],
                 "timestamp": datetime.now(timezone.utc).isoformat()
             }
             
@@ -367,53 +287,38 @@ class AuditService:
         user_ids: Optional[List[int]] = None
     ) -> Dict[str, Any]:
         """Search audit events."""
+        event_type_values = [et.value for et in event_types] if event_types else None
+        query = query.lower() if query else ""
+        
+        def matches(entry: Dict[str, Any]) -> bool:
+            # Date range filter
+            if start_date or end_date:
+                entry_time = datetime.fromisoformat(entry["timestamp"].replace('Z', '+00:00'))
+                if start_date and entry_time < start_date:
+                    return False
+                if end_date and entry_time > end_date:
+                    return False
+            
+            # Event type filter
+            if event_type_values and entry.get("event_type") not in event_type_values:
+                return False
+            
+            # User filter
+            if user_ids and entry.get("user_id") not in user_ids:
+                return False
+            
+            # Text search
+            if query and query not in json.dumps(entry).lower():
+                return False
+            
+            return True
+        
         try:
-            from app.shared.infrastructure.cache import cache_service
-            
-            recent_key = "audit_recent_entries"
-            recent_entry_ids = await cache_service.get(recent_key) or []
-            
-            matching_events = []
-            
-            for entry_id in recent_entry_ids:
-                entry = await cache_service.get(f"audit_entry:{entry_id}")
-                if not entry:
-                    continue
-                
-                # Date range filter
-                if start_date or end_date:
-                    entry_time = datetime.fromisoformat(entry["timestamp"].replace('Z', '+00:00'))
-                    if start_date and entry_time < start_date:
-                        continue
-                    if end_date and entry_time > end_date:
-                        continue
-                
-                # Event type filter
-                if event_types:
-                    event_type_values = [et.value for et in event_types]
-                    if entry.get("event_type") not in event_type_values:
-                        continue
-                
-                # User filter
-                if user_ids and entry.get("user_id") not in user_ids:
-                    continue
-                
-                # Text search
-                if query:
-                    entry_text = json.dumps(entry).lower()
-                    if query.lower() not in entry_text:
-                        continue
-                
-                matching_events.append(entry)
-            
-            # Calculate pagination
-            total = len(matching_events)
+            page_result = await audit_stream.read_page(
+                (page - 1) * limit, limit, match=matches, since=start_date
+            )
+            events, total = page_result or ([], 0)
             total_pages = (total + limit - 1) // limit if total > 0 else 1
-            start_idx = (page - 1) * limit
-            end_idx = start_idx + limit
-            
-            # Get page of events
-            events = matching_events[start_idx:end_idx]
             
             return {
                 "events": events,
@@ -437,7 +342,7 @@ class AuditService:
         try:
             from app.shared.infrastructure.cache import cache_service
             
-            entry = await cache_service.get(f"audit_entry:{entry_id}")
+            entry = await cache_service.get(f"audit_entry:{entry_id}") or await self.get_audit_event(entry_id)
             if not entry:
                 return {"valid": False, "error": "Entry not found"}
             
@@ -464,28 +369,22 @@ class AuditService:
     ) -> Dict[str, Any]:
         """Generate compliance report."""
         try:
-            # Get events in date range
-            result = await self.search_audit_events(
-                query="",
-                page=1,
-                limit=10000,
-                start_date=start_date,
-                end_date=end_date
-            )
-            
-            events = result["events"]
+            # One pass over the audit log attests the whole period and counts its events
+            integrity = await audit_log_store.verify_async(since=start_date, until=end_date, summarize=True)
+            event_types = integrity.pop("event_types")
+            severities = integrity.pop("severities")
+            unique_users = integrity.pop("unique_users")
+            total_events = integrity["events"]
             
             # Analyze events for compliance
-            user_logins = len([e for e in events if e.get("event_type") == AuditEventType.USER_LOGIN.value])
-            failed_logins = len([e for e in events if e.get("event_type") == AuditEventType.SECURITY_VIOLATION.value])
-            data_exports = len([e for e in events if e.get("event_type") == AuditEventType.DATA_EXPORT.value])
-            config_changes = len([e for e in events if e.get("event_type") == AuditEventType.SYSTEM_CONFIG_CHANGED.value])
+            user_logins = event_types.get(AuditEventType.USER_LOGIN.value, 0)
+            failed_logins = event_types.get(AuditEventType.SECURITY_VIOLATION.value, 0)
+            data_exports = event_types.get(AuditEventType.DATA_EXPORT.value, 0)
+            config_changes = event_types.get(AuditEventType.SYSTEM_CONFIG_CHANGED.value, 0)
             
             # Security metrics
-            security_events = [e for e in events if e.get("severity") in ["high", "critical"]]
-            
-            # User activity
-            unique_users = len(set(e.get("user_id") for e in events if e.get("user_id")))
+            high_severity_events = severities.get("high", 0)
+            critical_events = severities.get("critical", 0)
             
             return {
                 "report_period": {
@@ -493,22 +392,23 @@ class AuditService:
                     "end_date": end_date.isoformat()
                 },
                 "summary": {
-                    "total_events": len(events),
+                    "total_events": total_events,
                     "unique_users": unique_users,
                     "user_logins": user_logins,
                     "failed_logins": failed_logins,
                     "data_exports": data_exports,
                     "config_changes": config_changes,
-                    "security_events": len(security_events)
+                    "security_events": high_severity_events + critical_events
                 },
                 "security_analysis": {
-                    "high_severity_events": len([e for e in security_events if e.get("severity") == "high"]),
-                    "critical_events": len([e for e in security_events if e.get("severity") == "critical"]),
+                    "high_severity_events": high_severity_events,
+                    "critical_events": critical_events,
                     "security_violations": failed_logins
                 },
+                "integrity": integrity,
                 "compliance_indicators": {
-                    "audit_coverage": "complete" if len(events) > 0 else "incomplete",
-                    "data_integrity": "verified",  # Would check checksums in real implementation
+                    "audit_coverage": "complete" if total_events > 0 else "incomplete",
+                    "data_integrity": "verified" if integrity["verified"] else "failed",
                     "access_monitoring": "active" if user_logins > 0 else "inactive"
                 },
                 "generated_at": datetime.now(timezone.utc).isoformat()
@@ -520,24 +420,15 @@ class AuditService:
     async def get_audit_events(self, skip: int = 0, limit: int = 100, filters: Dict[str, Any] = None) -> List[Dict[str, Any]]:
         """Get audit events with filtering and pagination."""
         try:
-            # Read from actual audit log file
-            all_events = await self._read_audit_log_file()
-            
-            # Apply filters if provided
-            filtered_events = []
-            for event in all_events:
-                if filters:
-                    if filters.get('event_type') and event.get('event_type') != filters['event_type']:
-                        continue
-                    if filters.get('severity') and event.get('severity') != filters['severity']:
-                        continue
-                    if filters.get('user_id') and event.get('user_id') != filters['user_id']:
-                        continue
-                
-                filtered_events.append(event)
-            
-            # Apply pagination
-            return filtered_events[skip:skip + limit]
+            # Read from the audit log; the indexes select the blocks holding matches
+            filters = filters or {}
+            events, _ = await audit_log_store.query_async(
+                filters={field: filters.get(field) for field in ('event_type', 'severity', 'user_id')},
+                offset=skip,
+                limit=limit,
+                count_total=False
+            )
+            return events
             
         except Exception as e:
             return []
@@ -545,15 +436,22 @@ class AuditService:
     async def get_audit_event(self, event_id: str) -> Optional[Dict[str, Any]]:
         """Get a specific audit event by ID."""
         try:
-            # Read from actual audit log file
-            all_events = await self._read_audit_log_file()
-            
-            # Find event by ID
-            for event in all_events:
-                if event.get('id') == event_id:
-                    return event
-                    
-            return None
+            # IDs carry their creation time, which bounds the blocks to read
+            since = until = None
+            try:
+                created = datetime.fromtimestamp(int(event_id.split('_', 1)[1]) / 1000000, tz=timezone.utc)
+                since, until = created - timedelta(minutes=1), created + timedelta(minutes=1)
+            except (IndexError, ValueError):
+                pass
+            
+            events, _ = await audit_log_store.query_async(
+                since=since,
+                until=until,
+                limit=1,
+                match=lambda event: event.get('id') == event_id,
+                count_total=False
+            )
+            return events[0] if events else None
         except Exception:
             return None
 
@@ -561,50 +459,24 @@ class AuditService:
                                    skip: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
         """Get audit events for a specific user."""
         try:
-            # Read from actual audit log file
-            all_events = await self._read_audit_log_file()
-            
-            # Filter by user_id and date range
-            filtered_events = []
-            for event in all_events:
-                if event.get('user_id') != user_id:
-                    continue
-                    
-                event_timestamp = event.get('timestamp')
-                if event_timestamp:
-                    try:
-                        event_date = datetime.fromisoformat(event_timestamp.replace('Z', '+00:00'))
-                        if not (start_date <= event_date <= end_date):
-                            continue
-                    except:
-                        continue
-                
-                filtered_events.append(event)
-            
-            # Apply pagination
-            return filtered_events[skip:skip + limit]
+            events, _ = await audit_log_store.query_async(
+                filters={'user_id': user_id},
+                since=start_date,
+                until=end_date,
+                offset=skip,
+                limit=limit,
+                count_total=False
+            )
+            return events
             
         except Exception:
             return []
 
-    async def export_audit_events(self, format: str, filters: Dict[str, Any]) -> Any:
-        """Export audit events in the specified format."""
-        try:
-            # For exports, allow much larger limits - up to 50,000 events
-            events = await self.get_audit_events(skip=0, limit=50000, filters=filters)
-            
-            if format == "json":
-                return events
-            elif format == "csv":
-                # Convert to CSV format (simplified)
-                csv_data = "id,event_type,user_id,resource_type,action,severity,timestamp\n"
-                for event in events:
-                    csv_data += f"{event['id']},{event['event_type']},{event['user_id']},{event['resource_type']},{event['action']},{event['severity']},{event['timestamp']}\n"
-                return csv_data
-            else:
-                return events
-        except Exception:
-            return []
+    def export_audit_events(self, format: str, filters: Dict[str, Any], compress: bool = False) -> AsyncIterator[bytes]:
+        """Stream matching audit events as CSV, JSON or JSON lines, oldest first."""
+        return stream_export(
+            audit_log_store, format, filters, compress=compress, chunk_size=settings.AUDIT_EXPORT_CHUNK_ROWS
+        )
 
     async def count_old_audit_events(self, cutoff_date: datetime) -> int:
         """Count audit events older than the cutoff date."""
@@ -629,60 +501,81 @@ class AuditService:
         filters: Optional[Dict[str, Any]] = None
     ) -> List[Dict[str, Any]]:
         """Get audit events with pagination and filtering."""
+        filters = filters or {}
+        
+        def matches(entry: Dict[str, Any]) -> bool:
+            # Event type filter
+            if filters.get('event_type') and entry.get('event_type') != filters['event_type']:
+                return False
+            
+            # User ID filter
+            if filters.get('user_id') and entry.get('user_id') != filters['user_id']:
+                return False
+            
+            # Resource type filter
+            if filters.get('resource_type') and entry.get('resource_type') != filters['resource_type']:
+                return False
+            
+            # Severity filter
+            if filters.get('severity') and entry.get('severity') != filters['severity']:
+                return False
+            
+            # Date range filters
+            if filters.get('start_date') or filters.get('end_date'):
+                entry_time = datetime.fromisoformat(entry["timestamp"].replace('Z', '+00:00'))
+                if filters.get('start_date') and entry_time < filters['start_date']:
+                    return False
+                if filters.get('end_date') and entry_time > filters['end_date']:
+                    return False
+            
+            return True
+        
         try:
-            from app.shared.infrastructure.cache import cache_service
-            
-            recent_key = "audit_recent_entries"
-            recent_entry_ids = await cache_service.get(recent_key) or []
-            
-            matching_events = []
-            
-            for entry_id in recent_entry_ids:
-                entry = await cache_service.get(f"audit_entry:{entry_id}")
-                if not entry:
-                    continue
-                
-                # Apply filters if provided
-                if filters:
-                    # Event type filter
-                    if filters.get('event_type') and entry.get('event_type') != filters['event_type']:
-                        continue
-                    
-                    # User ID filter
-                    if filters.get('user_id') and entry.get('user_id') != filters['user_id']:
-                        continue
-                    
-                    # Resource type filter
-                    if filters.get('resource_type') and entry.get('resource_type') != filters['resource_type']:
-                        continue
-                    
-                    # Severity filter
-                    if filters.get('severity') and entry.get('severity') != filters['severity']:
-                        continue
-                    
-                    # Date range filters
-                    if filters.get('start_date') or filters.get('end_date'):
-                        entry_time = datetime.fromisoformat(entry["timestamp"].replace('Z', '+00:00'))
-                        if filters.get('start_date') and entry_time < filters['start_date']:
-                            continue
-                        if filters.get('end_date') and entry_time > filters['end_date']:
-                            continue
-                
-                matching_events.append(entry)
-            
-            # Sort by timestamp (newest first)
-            matching_events.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
-            
-            # Apply pagination
-            paginated_events = matching_events[skip:skip + limit]
-            
-            return paginated_events
+            page_result = await audit_stream.read_page(
+                skip, limit,
+                match=matches if any(filters.values()) else None,
+                since=filters.get('start_date')
+            )
+            return page_result[0] if page_result else []
             
         except Exception as e:
             logger.error(f"Failed to get audit events: {str(e)}")
             return []
 
 
+async def write_audit_batch(entries: List[Dict[str, Any]]):
+    """Chain a batch of entries into the audit log, then cache them."""
+    # The log assigns prev_hash and checksum, so it is written first (one write + one fsync)
+    await audit_log_store.append_async(entries)
+    try:
+        await AuditService._store_audit_entries(entries)
+    except Exception as e:
+        # The file is the system of record - a cache failure only loses the fast path
+        logger.error(f"Audit batch cache write failed: {e}")
+
+
+# Audit log, recent-event stream and the background writer feeding them (started by the application lifespan)
+audit_log_store = AuditLogStore(
+    settings.AUDIT_LOG_DIR,
+    fsync=settings.AUDIT_FSYNC,
+    segment_max_bytes=settings.AUDIT_SEGMENT_MAX_BYTES,
+    segment_span_seconds=settings.AUDIT_SEGMENT_SPAN_SECONDS,
+    legacy_path=settings.AUDIT_LOG_PATH
+)
+audit_stream = AuditStream(maxlen=settings.AUDIT_STREAM_MAXLEN, stats_days=settings.AUDIT_STATS_DAYS)
+audit_pipeline = AuditPipeline(
+    sink=write_audit_batch,
+    max_size=settings.AUDIT_QUEUE_MAX_SIZE,
+    batch_size=settings.AUDIT_BATCH_SIZE,
+    flush_interval=settings.AUDIT_FLUSH_INTERVAL_MS / 1000,
+    overflow=settings.AUDIT_QUEUE_OVERFLOW,
+    spill_path=settings.AUDIT_SPILL_PATH
+)
+audit_export_manager = AuditExportManager(
+    audit_log_store, settings.AUDIT_EXPORT_DIR, chunk_size=settings.AUDIT_EXPORT_CHUNK_ROWS
+)
+
+
 # Convenience functions for common audit events
 async def audit_user_login(user_id: int, ip_address: str, user_agent: str, audit_service: AuditService):
     """Log user login event."""
@@ -0,0 +1,166 @@
+"""
+Recent audit events in a Redis Stream, with incrementally kept statistics.
+
+Each written batch costs one pipeline: an XADD per entry on audit:stream,
+capped with MAXLEN ~ so Redis trims whole nodes instead of the application
+rewriting an id list, plus HINCRBY on per-day counter hashes
+(audit:stats:<YYYY-MM-DD>, fields t:<event type>, s:<severity>, u:<user id>
+and total). Reads page through the stream newest-first with XREVRANGE in
+chunks, so a page view is a handful of round-trips no matter how many events
+it skips, and statistics are a few HGETALLs instead of reading every event.
+All methods return None when Redis is unavailable so callers can fall back
+to the audit log file.
+"""
+import logging
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.shared.infrastructure.cache import cache_service
+from app.shared.infrastructure.codec import CodecError
+
+logger = logging.getLogger(__name__)
+
+STREAM_KEY = "audit:stream"
+STATS_PREFIX = "audit:stats:"
+ENTRY_FIELD = b"e"
+
+AuditFilter = Callable[[Dict[str, Any]], bool]
+
+
+def _stats_key(day: str) -> str:
+    return f"{STATS_PREFIX}{day}"
+
+
+class AuditStream:
+    """Capped stream of recent audit entries plus per-day counters."""
+
+    READ_CHUNK = 500
+
+    def __init__(self, maxlen: int = 10000, stats_days: int = 7):
+        self.maxlen = maxlen
+        self.stats_days = stats_days
+
+    def queue_append(self, batch, entries: List[Dict[str, Any]]):
+        """Queue XADDs and counter updates for a batch of entries on a cache batch."""
+        counters: Dict[str, Counter] = {}
+        for entry in entries:
+            try:
+                encoded = cache_service.codec.encode(entry)
+            except CodecError as e:
+                logger.warning(f"Audit entry {entry.get('id')} not serializable for the stream: {e}")
+                continue
+            batch.call("xadd", STREAM_KEY, {ENTRY_FIELD: encoded}, maxlen=self.maxlen, approximate=True)
+
+            day = (entry.get("timestamp") or datetime.now(timezone.utc).isoformat())[:10]
+            counts = counters.setdefault(day, Counter())
+            counts["total"] += 1
+            counts[f"t:{entry.get('event_type', 'unknown')}"] += 1
+            counts[f"s:{entry.get('severity', 'unknown')}"] += 1
+            if entry.get("user_id"):
+                counts[f"u:{entry['user_id']}"] += 1
+
+        # Keep a day's counters for the whole statistics window plus a day of slack
+        ttl = (self.stats_days + 1) * 86400
+        for day, counts in counters.items():
+            for field, amount in counts.items():
+                batch.call("hincrby", _stats_key(day), field, amount)
+            batch.call("expire", _stats_key(day), ttl)
+
+    def _decode(self, fields: Dict[bytes, bytes]) -> Optional[Dict[str, Any]]:
+        value = fields.get(ENTRY_FIELD)
+        if value is None:
+            return None
+        try:
+            return cache_service.codec.decode(value)
+        except CodecError as e:
+            logger.warning(f"Undecodable audit stream entry, skipping: {e}")
+            return None
+
+    async def read_page(
+        self,
+        offset: int,
+        limit: int,
+        match: Optional[AuditFilter] = None,
+        since: Optional[datetime] = None
+    ) -> Optional[Tuple[List[Dict[str, Any]], int]]:
+        """
+        Return (events, total) for a page of entries, newest first.
+
+        Without a filter the total is XLEN and only offset + limit entries are
+        read. With one the stream is scanned in chunks to count all matches;
+        since bounds the scan by stream id. Entries are added to the stream
+        after their timestamp, so the bound never skips a matching entry -
+        match still has to check the timestamp itself.
+        """
+        await cache_service.initialize()
+        client = cache_service.redis_client
+        if not client:
+            return None
+
+        try:
+            if match is None and since is None:
+                async with cache_service.batch() as batch:
+                    length = batch.call("xlen", STREAM_KEY)
+                    chunk = batch.call("xrevrange", STREAM_KEY, "+", "-", count=offset + limit)
+                if length.error or chunk.error:
+                    return None
+                events = [self._decode(fields) for _, fields in (chunk.value or [])[offset:]]
+                return [event for event in events if event], int(length.value or 0)
+
+            min_id = f"{int(since.timestamp() * 1000)}-0" if since else "-"
+            max_id = "+"
+            events: List[Dict[str, Any]] = []
+            total = 0
+            while True:
+                cache_service._note_round_trip()
+                chunk = await client.xrevrange(STREAM_KEY, max_id, min_id, count=self.READ_CHUNK)
+                for stream_id, fields in chunk:
+                    event = self._decode(fields)
+                    if event is None or (match and not match(event)):
+                        continue
+                    if offset <= total < offset + limit:
+                        events.append(event)
+                    total += 1
+                if len(chunk) < self.READ_CHUNK:
+                    break
+                # Continue below the last id of this chunk (exclusive range)
+                last_id = chunk[-1][0]
+                max_id = f"({last_id.decode() if isinstance(last_id, bytes) else last_id}"
+            return events, total
+        except Exception as e:
+            logger.error(f"Audit stream read failed: {e}")
+            return None
+
+    async def get_statistics(self, days: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """Sum the per-day counters of the last `days` days (today included)."""
+        await cache_service.initialize()
+        if not cache_service.redis_client:
+            return None
+
+        days = days or self.stats_days
+        today = datetime.now(timezone.utc).date()
+        async with cache_service.batch() as batch:
+            replies = [
+                batch.call("hgetall", _stats_key((today - timedelta(days=offset)).isoformat()))
+                for offset in range(days)
+            ]
+        if any(reply.error for reply in replies):
+            return None
+
+        totals: Counter = Counter()
+        for reply in replies:
+            for field, value in (reply.value or {}).items():
+                field = field.decode() if isinstance(field, bytes) else field
+                totals[field] += int(value)
+
+        def section(prefix: str) -> Dict[str, int]:
+            return {field[len(prefix):]: count for field, count in totals.items() if field.startswith(prefix)}
+
+        return {
+            "total": totals["total"],
+            "event_types": section("t:"),
+            "severities": section("s:"),
+            "users": section("u:"),
+            "days": days
+        }
@@ -7,13 +7,14 @@ import asyncio
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timezone, timedelta
 from sqlalchemy.orm import Session
-from sqlalchemy import func, text
+from sqlalchemy import text
 
 from app.shared.infrastructure.container import injectable
 from app.shared.infrastructure.cache import cache_service, cached
 from app.models.job_models import Job, JobExecution, ExecutionStatus, JobStatus
 from app.models.universal_target_models import UniversalTarget
 from app.models.user_models import User
+from app.services.execution_rollup_service import ExecutionRollupService
 
 
 @injectable()
@@ -220,69 +221,33 @@ class MetricsService:
             return {"error": f"Failed to collect database metrics: {str(e)}"}
     
     async def _get_performance_metrics(self) -> Dict[str, Any]:
-        """Get performance metrics."""
+        """Get performance metrics from the execution rollups (cost independent of history size)."""
         try:
-            # Execution performance
-            last_24h = datetime.now(timezone.utc) - timedelta(hours=24)
+            rollups = ExecutionRollupService(self.db)
+            now = datetime.now(timezone.utc)
             
-            # Check if we have recent data, if not, use historical data
-            recent_executions_count = self.db.query(JobExecution).filter(
-                JobExecution.started_at >= last_24h
-            ).count()
-            
-            # If no recent data, expand to last 7 days for historical context
-            time_window = last_24h
+            # Last 24 hours; without recent data, the last 7 days for historical context
             time_period = "24h"
-            if recent_executions_count == 0:
-                time_window = datetime.now(timezone.utc) - timedelta(days=7)
+            buckets = rollups.buckets("hour", now - timedelta(hours=24), now)
+            stats = rollups.combine(buckets)
+            if stats.total == 0:
                 time_period = "7d"
-            
-            # Average execution time
-            avg_execution_time = self.db.query(
-                func.avg(
-                    func.extract('epoch', JobExecution.completed_at - JobExecution.started_at)
-                )
-            ).filter(
-                JobExecution.completed_at.isnot(None),
-                JobExecution.started_at >= time_window
-            ).scalar() or 0
-            
-            # Success rate
-            total_executions = self.db.query(JobExecution).filter(
-                JobExecution.started_at >= time_window
-            ).count()
-            
-            successful_executions = self.db.query(JobExecution).filter(
-                JobExecution.started_at >= time_window,
-                JobExecution.status == ExecutionStatus.COMPLETED
-            ).count()
-            
-            success_rate = (successful_executions / total_executions * 100) if total_executions > 0 else 0
-            
-            # Error rate by hour (or day if using 7-day window)
-            time_trunc = 'hour' if time_period == "24h" else 'day'
-            hourly_errors = self.db.query(
-                func.date_trunc(time_trunc, JobExecution.started_at).label('period'),
-                func.count(JobExecution.id).label('count')
-            ).filter(
-                JobExecution.started_at >= time_window,
-                JobExecution.status == ExecutionStatus.FAILED
-            ).group_by(
-                func.date_trunc(time_trunc, JobExecution.started_at)
-            ).all()
+                buckets = rollups.buckets("day", now - timedelta(days=7), now)
+                stats = rollups.combine(buckets)
             
             return {
-                "avg_execution_time_seconds": round(avg_execution_time, 2),
-                "success_rate_24h": round(success_rate, 2),
-                "total_executions_24h": total_executions,
-                "successful_executions_24h": successful_executions,
+                "avg_execution_time_seconds": round(stats.avg_seconds, 2),
+                "p95_execution_time_seconds": round(stats.percentile_seconds(0.95) or 0, 2),
+                "success_rate_24h": round(stats.success_rate, 2),
+                "total_executions_24h": stats.total,
+                "successful_executions_24h": stats.completed,
                 "time_period": time_period,
                 "data_source": "recent" if time_period == "24h" else "historical",
                 "hourly_errors_24h": [
                     {
-                        "hour": period.isoformat(),
-                        "error_count": count
-                    } for period, count in hourly_errors
+                        "hour": bucket.isoformat(),
+                        "error_count": bucket_stats.failed
+                    } for bucket, bucket_stats in buckets if bucket_stats.failed
                 ]
             }
         except Exception as e:
@@ -415,6 +380,20 @@ class MetricsService:
                     f"opsconductor_executions_total_24h {perf['total_executions_24h']}",
                 ])
             
+            # Authentication overhead, separate from endpoint latency
+            from app.core.auth_dependencies import auth_latency
+            from app.core.security import password_hasher
+            prometheus_metrics.extend(auth_latency.prometheus_lines())
+            prometheus_metrics.extend(password_hasher.prometheus_lines())
+            
+            # Audit pipeline queue depth and write lag
+            from app.domains.audit.services.audit_service import audit_pipeline
+            prometheus_metrics.extend(audit_pipeline.prometheus_lines())
+            from app.core.audit_policy import api_access_aggregator
+            prometheus_metrics.extend(api_access_aggregator.prometheus_lines())
+            from app.domains.security.services.ip_blocklist import ip_blocklist
+            prometheus_metrics.extend(ip_blocklist.prometheus_lines())
+            
             # Health score
             prometheus_metrics.append(f"opsconductor_health_score {health['health_score']}")
             
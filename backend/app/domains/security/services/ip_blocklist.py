@@ -0,0 +1,426 @@
+"""
+CIDR-aware IP blocklist held in memory by every process.
+
+Blocks are single addresses or networks, each with its own expiry. They are
+stored in the Redis hash security:ip_blocklist (field: network, value: JSON
+entry), which is the source of truth. Every process mirrors the hash in a
+compressed binary radix (Patricia) tree per address family, so a check walks
+at most 32 or 128 bits without any I/O and is cheap enough for middleware on
+every request.
+
+Writers update the hash and publish the changed networks on an
+InvalidationBus channel in the same pipeline. Receivers re-read those
+networks from the hash, or the whole hash after a (re)subscribe. Lookups
+ignore expired entries, and a periodic sweep drops them from the trees and
+the hash.
+"""
+import asyncio
+import ipaddress
+import json
+import logging
+import socket
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+import redis
+
+from app.core.config import settings
+from app.shared.infrastructure.cache import cache_service
+from app.shared.infrastructure.invalidation import InvalidationBus
+
+logger = logging.getLogger(__name__)
+
+BLOCKLIST_KEY = "security:ip_blocklist"
+
+# KEYS: blocklist hash; ARGV: now, fields to check. Deletes the fields whose
+# stored entry has expired (a field re-blocked meanwhile is kept); returns the count.
+_SWEEP_SCRIPT = """
+local removed = 0
+for i = 2, #ARGV do
+    local value = redis.call('HGET', KEYS[1], ARGV[i])
+    if value and tonumber(cjson.decode(value)['expires_ts']) <= tonumber(ARGV[1]) then
+        redis.call('HDEL', KEYS[1], ARGV[i])
+        removed = removed + 1
+    end
+end
+return removed
+"""
+
+IPNetwork = Union[ipaddress.IPv4Network, ipaddress.IPv6Network]
+
+
+class _Node:
+    __slots__ = ("prefix", "length", "entry", "children")
+
+    def __init__(self, prefix: int, length: int, entry: Optional[Dict[str, Any]] = None):
+        self.prefix = prefix
+        self.length = length
+        self.entry = entry
+        self.children: List[Optional["_Node"]] = [None, None]
+
+
+class RadixTree:
+    """
+    Compressed binary trie (Patricia tree) over fixed-width integer keys.
+
+    Nodes are only created where prefixes branch or end, so a lookup visits at
+    most one node per stored prefix length on the path. Inserts link a fully
+    built node as their last step, so lookups need no lock; writers must be
+    serialized by the caller.
+    """
+
+    def __init__(self, width: int):
+        self.width = width
+        self.root = _Node(0, 0)
+        self.size = 0
+
+    def _bit(self, key: int, index: int) -> int:
+        return (key >> (self.width - 1 - index)) & 1
+
+    def _common(self, a: int, b: int, limit: int) -> int:
+        """Number of leading bits (at most limit) that a and b share."""
+        if limit == 0:
+            return 0
+        return limit - ((a ^ b) >> (self.width - limit)).bit_length()
+
+    def _mask(self, key: int, length: int) -> int:
+        return key >> (self.width - length) << (self.width - length) if length else 0
+
+    def insert(self, prefix: int, length: int, entry: Dict[str, Any]):
+        node = self.root
+        while True:
+            if node.length == length:
+                if node.entry is None:
+                    self.size += 1
+                node.entry = entry
+                return
+            bit = self._bit(prefix, node.length)
+            child = node.children[bit]
+            if child is None:
+                node.children[bit] = _Node(prefix, length, entry)
+                self.size += 1
+                return
+            common = self._common(prefix, child.prefix, min(length, child.length))
+            if common == child.length:
+                node = child
+                continue
+            if common == length:
+                branch = _Node(prefix, length, entry)
+            else:
+                branch = _Node(self._mask(prefix, common), common)
+                branch.children[self._bit(prefix, common)] = _Node(prefix, length, entry)
+            branch.children[self._bit(child.prefix, common)] = child
+            node.children[bit] = branch
+            self.size += 1
+            return
+
+    def remove(self, prefix: int, length: int) -> bool:
+        """Clear the entry of an exact prefix; empty nodes stay until the next rebuild."""
+        node = self.root
+        while node is not None and node.length < length:
+            node = node.children[self._bit(prefix, node.length)]
+            if node is not None and self._common(prefix, node.prefix, min(length, node.length)) < node.length:
+                return False
+        if node is None or node.length != length or node.entry is None:
+            return False
+        node.entry = None
+        self.size -= 1
+        return True
+
+    def lookup(self, key: int, valid: Callable[[Dict[str, Any]], bool]) -> Optional[Dict[str, Any]]:
+        """The most specific valid entry whose prefix contains key."""
+        best = None
+        node = self.root
+        while node is not None:
+            if node.length and self._common(key, node.prefix, node.length) < node.length:
+                break
+            if node.entry is not None and valid(node.entry):
+                best = node.entry
+            if node.length == self.width:
+                break
+            node = node.children[self._bit(key, node.length)]
+        return best
+
+    def entries(self) -> Iterator[Dict[str, Any]]:
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node.entry is not None:
+                yield node.entry
+            stack.extend(child for child in node.children if child is not None)
+
+
+def parse_network(network: str) -> IPNetwork:
+    """An address or CIDR; host bits are masked and IPv4-mapped IPv6 addresses become IPv4."""
+    parsed = ipaddress.ip_network(network.strip(), strict=False)
+    if parsed.version == 6 and parsed.network_address.ipv4_mapped and parsed.prefixlen >= 96:
+        return ipaddress.ip_network(f"{parsed.network_address.ipv4_mapped}/{parsed.prefixlen - 96}")
+    return parsed
+
+
+_IPV4_MAPPED = bytes(10) + b"\xff\xff"
+
+
+def _address_key(ip_address: str) -> Optional[Tuple[int, int]]:
+    """(family, integer) of an address; inet_pton is several times faster than ipaddress."""
+    try:
+        return 4, int.from_bytes(socket.inet_pton(socket.AF_INET, ip_address), "big")
+    except OSError:
+        pass
+    try:
+        packed = socket.inet_pton(socket.AF_INET6, ip_address)
+    except OSError:
+        return None
+    if packed[:12] == _IPV4_MAPPED:
+        return 4, int.from_bytes(packed[12:], "big")
+    return 6, int.from_bytes(packed, "big")
+
+
+class NetworkSet:
+    """Fixed set of addresses/CIDRs with the same radix-tree membership test as the blocklist."""
+
+    def __init__(self, networks: Iterator[str] = ()):
+        self._trees = {4: RadixTree(32), 6: RadixTree(128)}
+        for network in networks:
+            parsed = parse_network(network)
+            self._trees[parsed.version].insert(int(parsed.network_address), parsed.prefixlen, {"network": str(parsed)})
+
+    @classmethod
+    def from_setting(cls, value: Optional[str]) -> "NetworkSet":
+        """From a comma-separated setting such as "10.0.0.0/8, 172.16.0.0/12"."""
+        return cls(part for part in (value or "").split(",") if part.strip())
+
+    def __bool__(self) -> bool:
+        return any(tree.size for tree in self._trees.values())
+
+    def __contains__(self, ip_address: str) -> bool:
+        key = _address_key(ip_address)
+        return key is not None and self._trees[key[0]].lookup(key[1], lambda entry: True) is not None
+
+
+class IpBlocklist:
+    """Per-process radix-tree mirror of the Redis blocklist, kept in sync over pub/sub."""
+
+    def __init__(self, redis_url: str, channel: str = "security:ip_blocklist", sweep_interval: float = 60.0,
+                 enabled: bool = True):
+        self.redis_url = redis_url
+        self.sweep_interval = sweep_interval
+        self.enabled = enabled
+        self._trees = {4: RadixTree(32), 6: RadixTree(128)}
+        self._lock = threading.Lock()
+        self._sync_client = None
+        self._sweep_script = None
+        self._sweep_script_client = None
+        self._task: Optional[asyncio.Task] = None
+        self.bus = InvalidationBus(redis_url, channel=channel, enabled=enabled)
+        self.bus.register(self._on_change)
+
+        self.checks = 0
+        self.blocked = 0
+        self.reloads = 0
+        self.expired = 0
+
+    # Lookups ------------------------------------------------------------------
+
+    def check(self, ip_address: str) -> Optional[Dict[str, Any]]:
+        """The active block covering an address (most specific first), or None."""
+        self.checks += 1
+        key = _address_key(ip_address)
+        if key is None:
+            return None
+        now = time.time()
+        entry = self._trees[key[0]].lookup(key[1], lambda e: e["expires_ts"] > now)
+        if entry is not None:
+            self.blocked += 1
+        return entry
+
+    def list_blocks(self) -> List[Dict[str, Any]]:
+        now = time.time()
+        return sorted(
+            (entry for tree in self._trees.values() for entry in tree.entries() if entry["expires_ts"] > now),
+            key=lambda entry: entry["blocked_at"],
+            reverse=True
+        )
+
+    # Local mirror ---------------------------------------------------------------
+
+    def _apply(self, network: str, entry: Optional[Dict[str, Any]]):
+        parsed = parse_network(network)
+        tree = self._trees[parsed.version]
+        with self._lock:
+            if entry is None:
+                tree.remove(int(parsed.network_address), parsed.prefixlen)
+            else:
+                tree.insert(int(parsed.network_address), parsed.prefixlen, entry)
+
+    def _rebuild(self, entries: List[Dict[str, Any]]):
+        """Replace the trees with fresh ones holding the unexpired entries (caller holds the lock)."""
+        now = time.time()
+        trees = {4: RadixTree(32), 6: RadixTree(128)}
+        for entry in entries:
+            if entry["expires_ts"] > now:
+                parsed = parse_network(entry["network"])
+                trees[parsed.version].insert(int(parsed.network_address), parsed.prefixlen, entry)
+        self._trees = trees
+
+    @staticmethod
+    def _decode(value: Optional[bytes]) -> Optional[Dict[str, Any]]:
+        if value is None:
+            return None
+        try:
+            return json.loads(value)
+        except ValueError:
+            return None
+
+    def _on_change(self, keys: List[str], patterns: List[str], tags: List[str], flush: bool):
+        """Bus thread: re-read the announced networks (or everything) from Redis."""
+        if self._sync_client is None:
+            self._sync_client = redis.Redis.from_url(self.redis_url, decode_responses=False)
+        if flush:
+            values = self._sync_client.hvals(BLOCKLIST_KEY)
+            with self._lock:
+                self._rebuild([entry for entry in map(self._decode, values) if entry])
+            self.reloads += 1
+            return
+        if keys:
+            for network, value in zip(keys, self._sync_client.hmget(BLOCKLIST_KEY, keys)):
+                self._apply(network, self._decode(value))
+
+    # Writes -------------------------------------------------------------------
+
+    async def block(self, network: str, reason: str, duration_hours: float = 24) -> Dict[str, Any]:
+        """Block an address or CIDR range; raises ValueError for an invalid one."""
+        parsed = str(parse_network(network))
+        now = datetime.now(timezone.utc)
+        expires_at = now + timedelta(hours=duration_hours)
+        entry = {
+            "network": parsed,
+            "reason": reason,
+            "blocked_at": now.isoformat(),
+            "expires_at": expires_at.isoformat(),
+            "expires_ts": expires_at.timestamp(),
+            "duration_hours": duration_hours
+        }
+        self._apply(parsed, entry)
+        await self._write(parsed, entry)
+        logger.info(f"Blocked {parsed} for {duration_hours}h: {reason}")
+        return entry
+
+    async def unblock(self, network: str) -> bool:
+        parsed = str(parse_network(network))
+        self._apply(parsed, None)
+        return bool(await self._write(parsed, None))
+
+    async def _write(self, network: str, entry: Optional[Dict[str, Any]]) -> Optional[int]:
+        await cache_service.initialize()
+        if not cache_service.redis_client:
+            logger.warning(f"Redis unavailable - blocklist change for {network} is local to this process")
+            return None
+        async with cache_service.batch() as batch:
+            if entry is None:
+                result = batch.call("hdel", BLOCKLIST_KEY, network)
+            else:
+                result = batch.call("hset", BLOCKLIST_KEY, network, json.dumps(entry, separators=(",", ":")))
+            if self.enabled:
+                batch.call("publish", self.bus.channel, self.bus.message(keys=[network]))
+        if result.error:
+            logger.error(f"Blocklist write failed for {network}: {result.error}")
+            return None
+        return int(result.value or 0)
+
+    # Lifecycle ----------------------------------------------------------------
+
+    async def load(self):
+        """Rebuild the trees from the Redis hash."""
+        await cache_service.initialize()
+        if not cache_service.redis_client:
+            return
+        async with cache_service.batch() as batch:
+            values = batch.call("hvals", BLOCKLIST_KEY)
+        if values.error:
+            logger.error(f"Blocklist load failed: {values.error}")
+            return
+        with self._lock:
+            self._rebuild([entry for entry in map(self._decode, values.value or ()) if entry])
+        self.reloads += 1
+
+    async def sweep(self) -> int:
+        """Drop expired blocks from this process and from Redis."""
+        now = time.time()
+        with self._lock:
+            entries = [entry for tree in self._trees.values() for entry in tree.entries()]
+            expired = [entry["network"] for entry in entries if entry["expires_ts"] <= now]
+            if not expired:
+                return 0
+            self._rebuild(entries)
+        self.expired += len(expired)
+        client = cache_service.redis_client
+        if client:
+            try:
+                if self._sweep_script_client is not client:
+                    self._sweep_script = client.register_script(_SWEEP_SCRIPT)
+                    self._sweep_script_client = client
+                cache_service._note_round_trip()
+                await self._sweep_script(keys=[BLOCKLIST_KEY], args=[now, *expired])
+            except Exception as e:
+                logger.warning(f"Blocklist sweep failed: {e}")
+        return len(expired)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            try:
+                await self.sweep()
+            except Exception as e:
+                logger.error(f"Blocklist sweep failed: {e}")
+
+    async def start(self):
+        """Load the blocklist, subscribe to changes and start the expiry sweep."""
+        if not self.enabled:
+            return
+        await self.load()
+        self.bus.start()
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run(), name="ip-blocklist-sweep")
+
+    async def stop(self):
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        self.bus.stop()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "ipv4_entries": self._trees[4].size,
+            "ipv6_entries": self._trees[6].size,
+            "checks": self.checks,
+            "blocked": self.blocked,
+            "reloads": self.reloads,
+            "expired": self.expired,
+            "bus": self.bus.get_stats()
+        }
+
+    def prometheus_lines(self) -> List[str]:
+        return [
+            f'opsconductor_ip_blocklist_entries{{family="ipv4"}} {self._trees[4].size}',
+            f'opsconductor_ip_blocklist_entries{{family="ipv6"}} {self._trees[6].size}',
+            f"opsconductor_ip_blocklist_checks_total {self.checks}",
+            f"opsconductor_ip_blocklist_blocked_total {self.blocked}",
+            f"opsconductor_ip_blocklist_reloads_total {self.reloads}",
+        ]
+
+
+# Global blocklist instance (loaded and subscribed by the application lifespan)
+ip_blocklist = IpBlocklist(
+    settings.REDIS_URL,
+    channel=settings.IP_BLOCKLIST_CHANNEL,
+    sweep_interval=settings.IP_BLOCKLIST_SWEEP_INTERVAL,
+    enabled=settings.IP_BLOCKLIST_ENABLED
+)
@@ -0,0 +1,198 @@
+"""
+Sliding-window login attempt counters on Redis sorted sets.
+
+Every attempt is recorded and all windows are counted by one Lua script, so a
+login costs a single round-trip and concurrent attempts never race:
+- login_attempts:ip:<ip>:all / :failed - attempts scored by time (O(log n) insert)
+- login_attempts:ip:<ip>:users - usernames tried from the IP, scored by last try
+- login_attempts:user:<username>:failed - failures against the account from anywhere
+- login_attempts:recent - capped list of recent attempts for the dashboard
+Members older than the retention period are trimmed on every write and the
+keys expire with it, so nothing grows without bound. Redis errors fail open
+(all counts zero).
+"""
+import json
+import logging
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from app.shared.infrastructure.cache import cache_service
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "login_attempts"
+RECENT_KEY = f"{KEY_PREFIX}:recent"
+
+# KEYS: ip all, ip failed, ip users, user failed, recent list
+# ARGV: now, member, failed (0/1), username, attempt json, failure window,
+#       username window, retention, recent max
+# Returns: ip failures in window, username failures in window, usernames from ip
+#          in window, ip attempts in retention, ip failures in retention,
+#          followed by the most recent usernames from the ip (up to 20)
+_RECORD_SCRIPT = """
+local now = tonumber(ARGV[1])
+local failed = ARGV[3] == '1'
+local retention = tonumber(ARGV[8])
+local horizon = now - retention
+for i = 1, 4 do
+    redis.call('ZREMRANGEBYSCORE', KEYS[i], '-inf', horizon)
+end
+redis.call('ZADD', KEYS[1], now, ARGV[2])
+redis.call('ZADD', KEYS[3], now, ARGV[4])
+if failed then
+    redis.call('ZADD', KEYS[2], now, ARGV[2])
+    redis.call('ZADD', KEYS[4], now, ARGV[2])
+end
+for i = 1, 4 do
+    redis.call('EXPIRE', KEYS[i], retention)
+end
+redis.call('LPUSH', KEYS[5], ARGV[5])
+redis.call('LTRIM', KEYS[5], 0, tonumber(ARGV[9]) - 1)
+redis.call('EXPIRE', KEYS[5], retention)
+
+local failure_since = now - tonumber(ARGV[6])
+local username_since = now - tonumber(ARGV[7])
+local result = {
+    redis.call('ZCOUNT', KEYS[2], failure_since, '+inf'),
+    redis.call('ZCOUNT', KEYS[4], failure_since, '+inf'),
+    redis.call('ZCOUNT', KEYS[3], username_since, '+inf'),
+    redis.call('ZCARD', KEYS[1]),
+    redis.call('ZCARD', KEYS[2])
+}
+local usernames = redis.call('ZREVRANGEBYSCORE', KEYS[3], '+inf', username_since, 'LIMIT', 0, 20)
+for _, username in ipairs(usernames) do
+    table.insert(result, username)
+end
+return result
+"""
+
+
+def _ip_key(ip_address: str, kind: str) -> str:
+    return f"{KEY_PREFIX}:ip:{ip_address}:{kind}"
+
+
+def _user_key(username: str) -> str:
+    return f"{KEY_PREFIX}:user:{username}:failed"
+
+
+class LoginAttemptTracker:
+    """Records login attempts and returns their sliding-window counts."""
+
+    FAILURE_WINDOW_SECONDS = 15 * 60    # Brute force: failures per IP / per username
+    USERNAME_WINDOW_SECONDS = 60 * 60   # Credential stuffing: distinct usernames per IP
+    RETENTION_SECONDS = 24 * 60 * 60
+    RECENT_MAX = 1000
+
+    def __init__(self):
+        self._script = None
+        self._script_client = None
+
+    def _record_script(self, client):
+        # The client is recreated per event loop; scripts are bound to it
+        if self._script_client is not client:
+            self._script = client.register_script(_RECORD_SCRIPT)
+            self._script_client = client
+        return self._script
+
+    @staticmethod
+    def _empty_counts() -> Dict[str, Any]:
+        return {
+            "ip_failures": 0,
+            "username_failures": 0,
+            "ip_usernames": 0,
+            "ip_attempts_total": 0,
+            "ip_failures_total": 0,
+            "usernames": []
+        }
+
+    async def record(
+        self,
+        username: str,
+        ip_address: str,
+        user_agent: str,
+        success: bool,
+        timestamp: datetime
+    ) -> Dict[str, Any]:
+        """Record an attempt and return the per-IP and per-username window counts (one round-trip)."""
+        await cache_service.initialize()
+        client = cache_service.redis_client
+        if not client:
+            return self._empty_counts()
+
+        now = timestamp.timestamp()
+        attempt = json.dumps({
+            "username": username,
+            "ip_address": ip_address,
+            "user_agent": user_agent,
+            "success": success,
+            "timestamp": timestamp.isoformat()
+        }, separators=(",", ":"))
+        try:
+            cache_service._note_round_trip()
+            reply = await self._record_script(client)(
+                keys=[
+                    _ip_key(ip_address, "all"),
+                    _ip_key(ip_address, "failed"),
+                    _ip_key(ip_address, "users"),
+                    _user_key(username),
+                    RECENT_KEY
+                ],
+                args=[
+                    now,
+                    f"{now}:{uuid.uuid4().hex[:8]}",
+                    0 if success else 1,
+                    username,
+                    attempt,
+                    self.FAILURE_WINDOW_SECONDS,
+                    self.USERNAME_WINDOW_SECONDS,
+                    self.RETENTION_SECONDS,
+                    self.RECENT_MAX
+                ]
+            )
+        except Exception as e:
+            logger.warning(f"Login attempt tracking failed for {ip_address}: {e}")
+            return self._empty_counts()
+
+        return {
+            "ip_failures": int(reply[0]),
+            "username_failures": int(reply[1]),
+            "ip_usernames": int(reply[2]),
+            "ip_attempts_total": int(reply[3]),
+            "ip_failures_total": int(reply[4]),
+            "usernames": [name.decode() if isinstance(name, bytes) else name for name in reply[5:]]
+        }
+
+    async def get_ip_counts(self, ip_address: str, now: Optional[float] = None) -> Dict[str, int]:
+        """Attempts and failures of an IP within the retention period."""
+        await cache_service.initialize()
+        client = cache_service.redis_client
+        if not client:
+            return {"attempts": 0, "failures": 0}
+
+        since = (now or time.time()) - self.RETENTION_SECONDS
+        async with cache_service.batch() as batch:
+            attempts = batch.call("zcount", _ip_key(ip_address, "all"), since, "+inf")
+            failures = batch.call("zcount", _ip_key(ip_address, "failed"), since, "+inf")
+        return {"attempts": int(attempts.value or 0), "failures": int(failures.value or 0)}
+
+    async def get_recent(self) -> List[Dict[str, Any]]:
+        """The most recent attempts across all IPs, newest first."""
+        await cache_service.initialize()
+        if not cache_service.redis_client:
+            return []
+
+        async with cache_service.batch() as batch:
+            entries = batch.call("lrange", RECENT_KEY, 0, -1)
+        attempts = []
+        for entry in entries.value or ():
+            try:
+                attempts.append(json.loads(entry))
+            except ValueError:
+                continue
+        return attempts
+
+
+# Global login attempt tracker instance
+login_attempt_tracker = LoginAttemptTracker()
@@ -1,17 +1,21 @@
 """
 Security Service for threat detection and security monitoring.
 """
-import re
 import hashlib
 import ipaddress
-from typing import Dict, Any, List, Optional, Set
+from typing import Dict, Any, AsyncIterator, List, Optional, Set, Union
 from datetime import datetime, timezone, timedelta
 from sqlalchemy.orm import Session
 from collections import defaultdict, Counter
 from enum import Enum
 
 from app.shared.infrastructure.container import injectable
-from app.shared.infrastructure.cache import cache_service, cached
+from app.shared.infrastructure.cache import cached
+from app.domains.security.services.login_attempts import LoginAttemptTracker, login_attempt_tracker
+from app.domains.security.services.ip_blocklist import ip_blocklist
+from app.domains.security.services.threat_signatures import (
+    ThreatScanResult, request_content_matcher, user_agent_matcher
+)
 from app.models.user_models import User
 
 
@@ -46,25 +50,12 @@ class SecurityService:
         self.threat_indicators = self._load_threat_indicators()
     
     def _load_threat_indicators(self) -> Dict[str, Set[str]]:
-        """Load threat indicators (IPs, patterns, etc.)."""
+        """Load threat indicators (IPs); content and user agent signatures are compiled in threat_signatures."""
         return {
             "malicious_ips": {
                 # Example malicious IPs (in real implementation, load from threat feeds)
                 "192.168.1.100",  # Example
                 "10.0.0.1",       # Example
-            },
-            "suspicious_user_agents": {
-                "sqlmap",
-                "nikto",
-                "nmap",
-                "masscan",
-                "curl/7.0",  # Very old curl versions
-            },
-            "malicious_patterns": {
-                r"(?i)(union|select|insert|delete|drop|create|alter)\s+",  # SQL injection
-                r"(?i)<script[^>]*>.*?</script>",  # XSS
-                r"(?i)javascript:",  # JavaScript injection
-                r"(?i)eval\s*\(",  # Code injection
             }
         }
     
@@ -93,18 +84,20 @@ class SecurityService:
             threat_level = ThreatLevel.HIGH
         
         # Check for suspicious user agent
-        for suspicious_ua in self.threat_indicators["suspicious_user_agents"]:
-            if suspicious_ua.lower() in user_agent.lower():
-                threats.append({
-                    "type": SecurityEventType.SUSPICIOUS_LOGIN.value,
-                    "description": f"Suspicious user agent detected: {user_agent}",
-                    "severity": ThreatLevel.MEDIUM.value
-                })
-                if threat_level == ThreatLevel.LOW:
-                    threat_level = ThreatLevel.MEDIUM
+        if user_agent_matcher.is_match(user_agent):
+            threats.append({
+                "type": SecurityEventType.SUSPICIOUS_LOGIN.value,
+                "description": f"Suspicious user agent detected: {user_agent}",
+                "severity": ThreatLevel.MEDIUM.value
+            })
+            if threat_level == ThreatLevel.LOW:
+                threat_level = ThreatLevel.MEDIUM
+        
+        # Record the attempt and get every sliding window in one round-trip
+        counts = await login_attempt_tracker.record(username, ip_address, user_agent, success, timestamp)
         
         # Check for brute force attempts
-        brute_force_check = await self._check_brute_force(ip_address, username, success, timestamp)
+        brute_force_check = self._check_brute_force(counts)
         if brute_force_check["is_brute_force"]:
             threats.append({
                 "type": SecurityEventType.BRUTE_FORCE_ATTEMPT.value,
@@ -114,8 +107,18 @@ class SecurityService:
             })
             threat_level = ThreatLevel.HIGH
         
+        # Check for brute force against the account from any IPs
+        if brute_force_check["is_account_targeted"]:
+            threats.append({
+                "type": SecurityEventType.BRUTE_FORCE_ATTEMPT.value,
+                "description": f"Repeated failed logins for user {username}",
+                "severity": ThreatLevel.HIGH.value,
+                "details": brute_force_check
+            })
+            threat_level = ThreatLevel.HIGH
+        
         # Check for credential stuffing
-        credential_stuffing_check = await self._check_credential_stuffing(ip_address, timestamp)
+        credential_stuffing_check = self._check_credential_stuffing(counts)
         if credential_stuffing_check["is_credential_stuffing"]:
             threats.append({
                 "type": SecurityEventType.CREDENTIAL_STUFFING.value,
@@ -125,9 +128,6 @@ class SecurityService:
             })
             threat_level = ThreatLevel.HIGH
         
-        # Store login attempt for analysis
-        await self._store_login_attempt(username, ip_address, user_agent, success, timestamp)
-        
         return {
             "threat_detected": len(threats) > 0,
             "threat_level": threat_level.value,
@@ -138,106 +138,36 @@ class SecurityService:
             "recommendations": self._get_security_recommendations(threats)
         }
     
-    async def _check_brute_force(
-        self,
-        ip_address: str,
-        username: str,
-        success: bool,
-        timestamp: datetime
-    ) -> Dict[str, Any]:
-        """Check for brute force attacks."""
-        # Get recent failed attempts from this IP
-        recent_attempts_key = f"login_attempts:{ip_address}"
-        recent_attempts = await cache_service.get(recent_attempts_key) or []
-        
-        # Count failed attempts in last 15 minutes
-        cutoff_time = timestamp - timedelta(minutes=15)
-        recent_failures = [
-            attempt for attempt in recent_attempts
-            if not attempt["success"] and 
-            datetime.fromisoformat(attempt["timestamp"]) > cutoff_time
-        ]
-        
+    def _check_brute_force(self, counts: Dict[str, Any]) -> Dict[str, Any]:
+        """Check for brute force attacks, per IP and per targeted username."""
         # Brute force thresholds
-        failed_threshold = 5  # 5 failed attempts
-        time_window = 15      # in 15 minutes
-        
-        is_brute_force = len(recent_failures) >= failed_threshold
+        failed_threshold = 5            # 5 failed attempts from one IP
+        username_failed_threshold = 10  # 10 failed attempts against one account
+        time_window = LoginAttemptTracker.FAILURE_WINDOW_SECONDS // 60
         
         return {
-            "is_brute_force": is_brute_force,
-            "failed_attempts": len(recent_failures),
+            "is_brute_force": counts["ip_failures"] >= failed_threshold,
+            "is_account_targeted": counts["username_failures"] >= username_failed_threshold,
+            "failed_attempts": counts["ip_failures"],
+            "username_failed_attempts": counts["username_failures"],
             "threshold": failed_threshold,
-            "time_window_minutes": time_window,
-            "recent_attempts": recent_failures[-10:]  # Last 10 attempts
+            "username_threshold": username_failed_threshold,
+            "time_window_minutes": time_window
         }
     
-    async def _check_credential_stuffing(
-        self,
-        ip_address: str,
-        timestamp: datetime
-    ) -> Dict[str, Any]:
-        """Check for credential stuffing attacks."""
-        # Get recent attempts from this IP across different usernames
-        recent_attempts_key = f"login_attempts:{ip_address}"
-        recent_attempts = await cache_service.get(recent_attempts_key) or []
-        
-        # Count unique usernames attempted in last hour
-        cutoff_time = timestamp - timedelta(hours=1)
-        recent_usernames = set()
-        
-        for attempt in recent_attempts:
-            if datetime.fromisoformat(attempt["timestamp"]) > cutoff_time:
-                recent_usernames.add(attempt["username"])
-        
+    def _check_credential_stuffing(self, counts: Dict[str, Any]) -> Dict[str, Any]:
+        """Check for credential stuffing attacks (many usernames from one IP)."""
         # Credential stuffing thresholds
         username_threshold = 10  # 10 different usernames
-        time_window = 60         # in 60 minutes
-        
-        is_credential_stuffing = len(recent_usernames) >= username_threshold
+        time_window = LoginAttemptTracker.USERNAME_WINDOW_SECONDS // 60
         
         return {
-            "is_credential_stuffing": is_credential_stuffing,
-            "unique_usernames": len(recent_usernames),
+            "is_credential_stuffing": counts["ip_usernames"] >= username_threshold,
+            "unique_usernames": counts["ip_usernames"],
             "threshold": username_threshold,
             "time_window_minutes": time_window,
-            "attempted_usernames": list(recent_usernames)[:20]  # First 20 usernames
-        }
-    
-    async def _store_login_attempt(
-        self,
-        username: str,
-        ip_address: str,
-        user_agent: str,
-        success: bool,
-        timestamp: datetime
-    ):
-        """Store login attempt for analysis."""
-        attempt = {
-            "username": username,
-            "ip_address": ip_address,
-            "user_agent": user_agent,
-            "success": success,
-            "timestamp": timestamp.isoformat()
+            "attempted_usernames": counts["usernames"]  # Most recent 20 usernames
         }
-        
-        # Store in IP-specific list
-        ip_key = f"login_attempts:{ip_address}"
-        ip_attempts = await cache_service.get(ip_key) or []
-        ip_attempts.append(attempt)
-        
-        # Keep only last 100 attempts per IP
-        ip_attempts = ip_attempts[-100:]
-        await cache_service.set(ip_key, ip_attempts, ttl=86400)  # 24 hours
-        
-        # Store in global list for analysis
-        global_key = "all_login_attempts"
-        all_attempts = await cache_service.get(global_key) or []
-        all_attempts.append(attempt)
-        
-        # Keep only last 1000 attempts globally
-        all_attempts = all_attempts[-1000:]
-        await cache_service.set(global_key, all_attempts, ttl=86400)
     
     def _get_security_recommendations(self, threats: List[Dict[str, Any]]) -> List[str]:
         """Get security recommendations based on detected threats."""
@@ -280,7 +210,7 @@ class SecurityService:
         """Get security dashboard data."""
         try:
             # Get recent login attempts
-            all_attempts = await cache_service.get("all_login_attempts") or []
+            all_attempts = await login_attempt_tracker.get_recent()
             
             # Analyze last 24 hours
             cutoff_time = datetime.now(timezone.utc) - timedelta(hours=24)
@@ -334,29 +264,57 @@ class SecurityService:
         except Exception as e:
             return {"error": f"Failed to generate security dashboard: {str(e)}"}
     
-    async def analyze_request_content(self, content: str, content_type: str = "text") -> Dict[str, Any]:
-        """Analyze request content for malicious patterns."""
+    async def analyze_request_content(
+        self,
+        content: Union[str, bytes],
+        content_type: str = "text",
+        first_only: bool = False
+    ) -> Dict[str, Any]:
+        """Analyze request content for malicious patterns in one pass (first_only stops at the first match)."""
+        return self._content_analysis(
+            request_content_matcher.scan(content, first_only=first_only), len(content), content_type
+        )
+    
+    async def analyze_request_stream(
+        self,
+        chunks: AsyncIterator[Union[str, bytes]],
+        content_type: str = "text",
+        first_only: bool = False
+    ) -> Dict[str, Any]:
+        """Analyze content as it arrives (e.g. a request body); stops reading once the size cap is reached."""
+        scan = request_content_matcher.stream(first_only=first_only)
+        size = 0
+        async for chunk in chunks:
+            size += len(chunk)
+            if scan.feed(chunk):
+                break
+        return self._content_analysis(scan.close(), size, content_type)
+    
+    def _content_analysis(self, result: ThreatScanResult, content_size: int, content_type: str) -> Dict[str, Any]:
         threats = []
         threat_level = ThreatLevel.LOW
+        levels = list(ThreatLevel)
         
-        # Check for malicious patterns
-        for pattern in self.threat_indicators["malicious_patterns"]:
-            matches = re.findall(pattern, content)
-            if matches:
-                threats.append({
-                    "type": "malicious_pattern",
-                    "pattern": pattern,
-                    "matches": matches[:5],  # First 5 matches
-                    "description": f"Malicious pattern detected in {content_type}",
-                    "severity": ThreatLevel.HIGH.value
-                })
-                threat_level = ThreatLevel.HIGH
+        # Matched signatures
+        for match in result.matches:
+            threats.append({
+                "type": "malicious_pattern",
+                "signature": match.signature.id,
+                "category": match.signature.category,
+                "matches": match.samples,  # First 5 matches
+                "match_count": match.count,
+                "description": f"{match.signature.description} detected in {content_type}",
+                "severity": match.signature.severity
+            })
+            severity = ThreatLevel(match.signature.severity)
+            if levels.index(severity) > levels.index(threat_level):
+                threat_level = severity
         
         # Check content length (potential DoS)
-        if len(content) > 1000000:  # 1MB
+        if content_size > 1000000:  # 1MB
             threats.append({
                 "type": "large_payload",
-                "size": len(content),
+                "size": content_size,
                 "description": "Unusually large payload detected",
                 "severity": ThreatLevel.MEDIUM.value
             })
@@ -367,7 +325,9 @@ class SecurityService:
             "threat_detected": len(threats) > 0,
             "threat_level": threat_level.value,
             "threats": threats,
-            "content_size": len(content),
+            "content_size": content_size,
+            "scanned_size": result.scanned_chars,
+            "scan_truncated": result.truncated,
             "analysis_timestamp": datetime.now(timezone.utc).isoformat()
         }
     
@@ -397,31 +357,28 @@ class SecurityService:
                 })
             
             # Check recent activity
-            recent_attempts_key = f"login_attempts:{ip_address}"
-            recent_attempts = await cache_service.get(recent_attempts_key) or []
+            ip_counts = await login_attempt_tracker.get_ip_counts(ip_address)
+            failed_attempts = ip_counts["failures"]
+            total_attempts = ip_counts["attempts"]
             
-            if recent_attempts:
-                failed_attempts = len([a for a in recent_attempts if not a["success"]])
-                total_attempts = len(recent_attempts)
+            if total_attempts > 0:
+                failure_rate = failed_attempts / total_attempts
+                
+                if failure_rate > 0.8:  # 80% failure rate
+                    reputation["reputation_score"] -= 50
+                    reputation["threat_indicators"].append({
+                        "type": "high_failure_rate",
+                        "description": f"High login failure rate: {failure_rate:.1%}",
+                        "severity": ThreatLevel.HIGH.value
+                    })
                 
-                if total_attempts > 0:
-                    failure_rate = failed_attempts / total_attempts
-                    
-                    if failure_rate > 0.8:  # 80% failure rate
-                        reputation["reputation_score"] -= 50
-                        reputation["threat_indicators"].append({
-                            "type": "high_failure_rate",
-                            "description": f"High login failure rate: {failure_rate:.1%}",
-                            "severity": ThreatLevel.HIGH.value
-                        })
-                    
-                    if total_attempts > 50:  # High volume
-                        reputation["reputation_score"] -= 30
-                        reputation["threat_indicators"].append({
-                            "type": "high_volume",
-                            "description": f"High volume of attempts: {total_attempts}",
-                            "severity": ThreatLevel.MEDIUM.value
-                        })
+                if total_attempts > 50:  # High volume
+                    reputation["reputation_score"] -= 30
+                    reputation["threat_indicators"].append({
+                        "type": "high_volume",
+                        "description": f"High volume of attempts: {total_attempts}",
+                        "severity": ThreatLevel.MEDIUM.value
+                    })
             
             reputation["reputation_score"] = max(0, reputation["reputation_score"])
             
@@ -434,55 +391,43 @@ class SecurityService:
             }
     
     async def block_ip(self, ip_address: str, reason: str, duration_hours: int = 24) -> Dict[str, Any]:
-        """Block an IP address."""
+        """Block an IP address or CIDR range (e.g. 203.0.113.0/24) until its own expiry."""
         try:
-            # Validate IP
-            ipaddress.ip_address(ip_address)
-            
-            block_entry = {
-                "ip_address": ip_address,
-                "reason": reason,
-                "blocked_at": datetime.now(timezone.utc).isoformat(),
-                "expires_at": (datetime.now(timezone.utc) + timedelta(hours=duration_hours)).isoformat(),
-                "duration_hours": duration_hours
-            }
-            
-            # Store in blocked IPs list
-            blocked_ips_key = "blocked_ips"
-            blocked_ips = await cache_service.get(blocked_ips_key) or {}
-            blocked_ips[ip_address] = block_entry
-            
-            await cache_service.set(blocked_ips_key, blocked_ips, ttl=duration_hours * 3600)
+            block_entry = await ip_blocklist.block(ip_address, reason, duration_hours)
             
             return {
                 "success": True,
-                "message": f"IP {ip_address} blocked for {duration_hours} hours",
+                "message": f"{block_entry['network']} blocked for {duration_hours} hours",
                 "block_details": block_entry
             }
             
         except ValueError:
             return {
                 "success": False,
-                "error": f"Invalid IP address: {ip_address}"
+                "error": f"Invalid IP address or network: {ip_address}"
+            }
+    
+    async def unblock_ip(self, ip_address: str) -> Dict[str, Any]:
+        """Remove the block of an IP address or CIDR range."""
+        try:
+            removed = await ip_blocklist.unblock(ip_address)
+            return {"success": True, "removed": removed}
+        except ValueError:
+            return {
+                "success": False,
+                "error": f"Invalid IP address or network: {ip_address}"
             }
     
     async def is_ip_blocked(self, ip_address: str) -> Dict[str, Any]:
-        """Check if an IP address is blocked."""
-        blocked_ips = await cache_service.get("blocked_ips") or {}
+        """Check if an IP address is blocked, directly or by a range containing it."""
+        block_info = ip_blocklist.check(ip_address)
         
-        if ip_address in blocked_ips:
-            block_info = blocked_ips[ip_address]
+        if block_info is not None:
             expires_at = datetime.fromisoformat(block_info["expires_at"])
-            
-            if datetime.now(timezone.utc) < expires_at:
-                return {
-                    "is_blocked": True,
-                    "block_info": block_info,
-                    "time_remaining": str(expires_at - datetime.now(timezone.utc))
-                }
-            else:
-                # Block expired, remove it
-                del blocked_ips[ip_address]
-                await cache_service.set("blocked_ips", blocked_ips, ttl=86400)
+            return {
+                "is_blocked": True,
+                "block_info": block_info,
+                "time_remaining": str(expires_at - datetime.now(timezone.utc))
+            }
         
-        return {"is_blocked": False}
\ No newline at end of file
+        return {"is_blocked": False}
@@ -0,0 +1,225 @@
+"""
+Threat signatures compiled into one matcher and evaluated in a single pass.
+
+A signature is either a set of literals (case-insensitive substrings) or a
+regex with anchors, the literals every match starts with. All literals and
+anchors of a signature set are merged into one automaton: an alternation
+shaped like their prefix trie, which re runs in C. The automaton makes one
+pass over the lowercased content. A literal hit is a match. An anchor hit
+is confirmed by running only its signature's regex at that position,
+bounded to MAX_MATCH_SPAN characters. Cost therefore grows with the content
+size, not with the number of signatures.
+
+Content beyond max_chars is not scanned (the result says so). ThreatScan
+takes content in chunks, e.g. a request body as it arrives, and keeps an
+overlap so matches that span chunk boundaries are still found.
+"""
+import codecs
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional, Pattern, Tuple, Union
+
+from app.core.config import settings
+
+
+class Signature(NamedTuple):
+    id: str
+    category: str
+    severity: str                   # ThreatLevel value
+    description: str
+    literals: Tuple[str, ...]       # The match itself, or the anchors a regex match starts with
+    pattern: Optional[str] = None   # Confirmed on the lowercased content at an anchor hit
+
+
+class SignatureMatch(NamedTuple):
+    signature: Signature
+    samples: List[str]              # First matched texts (lowercased)
+    count: int
+
+
+class ThreatScanResult(NamedTuple):
+    matches: List[SignatureMatch]
+    scanned_chars: int
+    truncated: bool                 # Content beyond the size cap was not scanned
+
+
+REQUEST_CONTENT_SIGNATURES = [
+    Signature("sql_statement", "sql_injection", "high", "SQL statement keyword",
+              ("union", "select", "insert", "delete", "drop", "create", "alter"),
+              r"(?:union|select|insert|delete|drop|create|alter)\s+"),
+    Signature("sql_probe", "sql_injection", "high", "SQL injection probe",
+              ("information_schema", "xp_cmdshell", "waitfor delay", "pg_sleep(")),
+    Signature("xss_script_tag", "xss", "high", "Script tag", ("<script",), r"<script[^>]*>.*?</script>"),
+    Signature("xss_javascript_uri", "xss", "high", "JavaScript URI", ("javascript:",)),
+    Signature("code_eval", "code_injection", "high", "eval() call", ("eval",), r"eval\s*\("),
+    Signature("command_injection", "command_injection", "high", "Shell or system file access",
+              ("/etc/passwd", "/etc/shadow", "cmd.exe /c", "powershell -enc", "/bin/sh -c")),
+    Signature("path_traversal", "path_traversal", "medium", "Directory traversal", ("../../", "..%2f..%2f")),
+    Signature("jndi_lookup", "code_injection", "critical", "JNDI lookup (Log4Shell)", ("${jndi:",)),
+]
+
+USER_AGENT_SIGNATURES = [
+    Signature("scanner_user_agent", "scanner", "medium", "Security scanner user agent",
+              ("sqlmap", "nikto", "nmap", "masscan")),
+    Signature("outdated_client", "scanner", "medium", "Very old curl version", ("curl/7.0",)),
+]
+
+
+def _trie_pattern(literals: Iterable[str]) -> str:
+    """An alternation shaped like the literals' prefix trie (longest literal preferred)."""
+    trie: Dict[str, dict] = {}
+    for literal in literals:
+        node = trie
+        for char in literal:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        group = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        if "" in node:
+            return f"(?:{group})?"
+        return group
+
+    return build(trie)
+
+
+class ThreatMatcher:
+    """One compiled automaton for a signature set."""
+
+    MAX_MATCH_SPAN = 4096   # Longest text a regex signature may match; also the streaming overlap
+
+    def __init__(self, signatures: Iterable[Signature], max_chars: int = 1048576):
+        self.signatures = list(signatures)
+        self.max_chars = max_chars
+        self._by_literal: Dict[str, List[Tuple[Signature, Optional[Pattern]]]] = {}
+        for signature in self.signatures:
+            compiled = re.compile(signature.pattern, re.S) if signature.pattern else None
+            for literal in signature.literals:
+                self._by_literal.setdefault(literal.lower(), []).append((signature, compiled))
+        # The automaton reports the longest literal at a position; shorter ones starting there match too
+        self._prefixes = {
+            literal: [other for other in self._by_literal if other != literal and literal.startswith(other)]
+            for literal in self._by_literal
+        }
+        self._automaton = re.compile(_trie_pattern(self._by_literal))
+        self.overlap = max(self.MAX_MATCH_SPAN, max(map(len, self._by_literal), default=0))
+
+        self.scans = 0
+        self.chars_scanned = 0
+        self.hits = 0
+
+    def stream(self, first_only: bool = False, max_samples: int = 5) -> "ThreatScan":
+        """Start an incremental scan; feed() it chunks, then close() it."""
+        self.scans += 1
+        return ThreatScan(self, first_only, max_samples)
+
+    def scan(self, content: Union[str, bytes], first_only: bool = False, max_samples: int = 5) -> ThreatScanResult:
+        scan = self.stream(first_only, max_samples)
+        scan.feed(content)
+        return scan.close()
+
+    def is_match(self, content: Union[str, bytes]) -> bool:
+        """Whether any signature matches; stops at the first match."""
+        return bool(self.scan(content, first_only=True).matches)
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "signatures": len(self.signatures),
+            "literals": len(self._by_literal),
+            "scans": self.scans,
+            "chars_scanned": self.chars_scanned,
+            "hits": self.hits
+        }
+
+
+class ThreatScan:
+    """Incremental single-pass scan of one piece of content."""
+
+    def __init__(self, matcher: ThreatMatcher, first_only: bool, max_samples: int):
+        self.matcher = matcher
+        self.first_only = first_only
+        self.max_samples = max_samples
+        self.consumed = 0
+        self.truncated = False
+        self.done = False
+        self._buffer = ""
+        self._decoder = None
+        self._samples: Dict[str, List[str]] = {}
+        self._counts: Dict[str, int] = {}
+
+    def feed(self, chunk: Union[str, bytes]) -> bool:
+        """Scan the next chunk; returns True once nothing more needs to be fed."""
+        if self.done:
+            return True
+        if isinstance(chunk, bytes):
+            if self._decoder is None:
+                self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+            chunk = self._decoder.decode(chunk)
+        remaining = self.matcher.max_chars - self.consumed
+        if len(chunk) > remaining:
+            chunk = chunk[:remaining]
+            self.truncated = True
+        self.consumed += len(chunk)
+        self._buffer += chunk.lower()
+        self._scan(final=self.truncated)
+        if self.truncated:
+            self.done = True
+        return self.done
+
+    def close(self) -> ThreatScanResult:
+        if not self.done:
+            if self._decoder is not None:
+                self._buffer += self._decoder.decode(b"", final=True).lower()
+            self._scan(final=True)
+            self.done = True
+        self.matcher.chars_scanned += self.consumed
+        by_id = {signature.id: signature for signature in self.matcher.signatures}
+        return ThreatScanResult(
+            [SignatureMatch(by_id[sig_id], self._samples[sig_id], count) for sig_id, count in self._counts.items()],
+            self.consumed,
+            self.truncated
+        )
+
+    def _scan(self, final: bool):
+        """Match at every start position below the limit; the rest waits for more content."""
+        matcher = self.matcher
+        buffer = self._buffer
+        limit = len(buffer) if final else len(buffer) - matcher.overlap
+        position = 0
+        while position < limit:
+            found = matcher._automaton.search(buffer, position)
+            if found is None or found.start() >= limit:
+                break
+            start = found.start()
+            for literal in (found.group(), *matcher._prefixes[found.group()]):
+                for signature, compiled in matcher._by_literal[literal]:
+                    if compiled is None:
+                        text = literal
+                    else:
+                        confirmed = compiled.match(buffer, start, start + matcher.MAX_MATCH_SPAN)
+                        if confirmed is None:
+                            continue
+                        text = confirmed.group()
+                    self._record(signature, text)
+                    if self.first_only:
+                        self.done = True
+                        self._buffer = ""
+                        return
+            position = start + 1
+        self._buffer = "" if final else buffer[max(limit, 0):]
+
+    def _record(self, signature: Signature, text: str):
+        self.matcher.hits += 1
+        count = self._counts.get(signature.id, 0)
+        if count == 0:
+            self._samples[signature.id] = []
+        if count < self.max_samples:
+            self._samples[signature.id].append(text)
+        self._counts[signature.id] = count + 1
+
+
+# Compiled once per process and shared by all SecurityService instances
+request_content_matcher = ThreatMatcher(REQUEST_CONTENT_SIGNATURES, max_chars=settings.THREAT_SCAN_MAX_CHARS)
+user_agent_matcher = ThreatMatcher(USER_AGENT_SIGNATURES, max_chars=4096)
@@ -7,7 +7,8 @@ from datetime import datetime, timezone
 from app.shared.exceptions.base import ValidationException, ConflictError, NotFoundError
 from app.domains.user_management.repositories.user_repository import UserRepository
 from app.models.user_models import User
-from app.core.security import get_password_hash, verify_password
+from app.core.security import password_hasher
+from app.core.session_manager import SessionManager
 from app.shared.infrastructure.container import injectable
 
 
@@ -40,7 +41,7 @@ class UserDomainService:
         user_data = {
             "username": username,
             "email": email,
-            "password_hash": get_password_hash(password),
+            "password_hash": await password_hasher.hash(password),
             "role": role,
             "is_active": True,
             "created_at": datetime.now(timezone.utc),
@@ -59,9 +60,14 @@ class UserDomainService:
         if not user.is_active:
             raise ValidationException("User account is deactivated")
         
-        if not verify_password(password, user.password_hash):
+        verified, new_hash = await password_hasher.verify_and_update(password, user.password_hash)
+        if not verified:
             return None
         
+        # Upgrade a hash made under an older policy (e.g. lower bcrypt cost)
+        if new_hash:
+            await self.user_repository.update(user.id, {"password_hash": new_hash})
+        
         # Update last login
         await self.user_repository.update_last_login(user.id)
         
@@ -88,35 +94,44 @@ class UserDomainService:
             self._validate_role(update_data["role"])
         
         if "password" in update_data:
-            update_data["password_hash"] = get_password_hash(update_data.pop("password"))
+            update_data["password_hash"] = await password_hasher.hash(update_data.pop("password"))
         
         update_data["updated_at"] = datetime.now(timezone.utc)
         
-        return await self.user_repository.update(user_id, update_data)
+        user = await self.user_repository.update(user_id, update_data)
+        await SessionManager.invalidate_principals(user_id)
+        return user
     
     async def change_password(self, user_id: int, current_password: str, new_password: str) -> User:
         """Change user password with current password verification."""
         user = await self.user_repository.get_by_id_or_raise(user_id)
         
-        if not verify_password(current_password, user.password_hash):
+        if not await password_hasher.verify(current_password, user.password_hash):
             raise ValidationException("Current password is incorrect")
         
         self._validate_password(new_password)
         
         update_data = {
-            "password_hash": get_password_hash(new_password),
+            "password_hash": await password_hasher.hash(new_password),
             "updated_at": datetime.now(timezone.utc)
         }
         
-        return await self.user_repository.update(user_id, update_data)
+        user = await self.user_repository.update(user_id, update_data)
+        await SessionManager.invalidate_principals(user_id)
+        return user
     
     async def deactivate_user(self, user_id: int) -> User:
         """Deactivate a user account."""
-        return await self.user_repository.deactivate_user(user_id)
+        user = await self.user_repository.deactivate_user(user_id)
+        await SessionManager.invalidate_principals(user_id)
+        await SessionManager.revoke_user_sessions(user_id, reason="user_deactivated")
+        return user
     
     async def activate_user(self, user_id: int) -> User:
         """Activate a user account."""
-        return await self.user_repository.activate_user(user_id)
+        user = await self.user_repository.activate_user(user_id)
+        await SessionManager.invalidate_principals(user_id)
+        return user
     
     async def get_user_by_id(self, user_id: int) -> User:
         """Get user by ID."""
@@ -6,7 +6,7 @@ from .notification_models import (
     NotificationTemplate, NotificationLog, AlertRule, AlertLog
 )
 from .analytics_models import (
-    PerformanceMetric, SystemHealthSnapshot, ReportTemplate, GeneratedReport
+    PerformanceMetric, SystemHealthSnapshot, ExecutionRollup, ReportTemplate, GeneratedReport
 )
 from .job_models import (
     Job, JobTarget, JobAction, JobExecution, JobExecutionResult
@@ -2,8 +2,8 @@
 Analytics data models for OpsConductor Platform.
 These models store aggregated metrics and performance data for reporting.
 """
-from sqlalchemy import Column, Integer, String, DateTime, Float, ForeignKey, Index
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, Float, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database.database import Base
@@ -26,6 +26,11 @@ class AggregationPeriod(str, enum.Enum):
     MONTH = "month"
 
 
+class RollupScope(str, enum.Enum):
+    JOB = "job"          # From job_executions; scope_id is the job (0 for all jobs)
+    TARGET = "target"    # From job_execution_results; scope_id is the target (0 for all targets)
+
+
 class PerformanceMetric(Base):
     """
     Time-series performance metrics for analytics and reporting.
@@ -102,6 +107,41 @@ class SystemHealthSnapshot(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
 
+class ExecutionRollup(Base):
+    """
+    Execution statistics per UTC hour or day, per job, per target and overall.
+    Updated incrementally by ExecutionRollupService; every column merges by
+    addition (min/max by least/greatest), so ranges are read by merging rows.
+    """
+    __tablename__ = "execution_rollups"
+
+    id = Column(Integer, primary_key=True)
+    scope = Column(String(10), nullable=False)          # RollupScope
+    scope_id = Column(Integer, nullable=False)          # Job or target ID, 0 for all of them
+    grain = Column(String(10), nullable=False)          # AggregationPeriod.HOUR or DAY
+    bucket = Column(DateTime(timezone=True), nullable=False)  # Start of the UTC hour or day
+
+    # By created_at of the execution / result
+    total = Column(Integer, nullable=False, default=0)
+    completed = Column(Integer, nullable=False, default=0)
+    failed = Column(Integer, nullable=False, default=0)
+    cancelled = Column(Integer, nullable=False, default=0)
+
+    # Durations of completed rows, in milliseconds
+    timed = Column(Integer, nullable=False, default=0)
+    duration_sum_ms = Column(BigInteger, nullable=False, default=0)
+    duration_min_ms = Column(BigInteger, nullable=True)
+    duration_max_ms = Column(BigInteger, nullable=True)
+    duration_histogram = Column(ARRAY(BigInteger), nullable=False)  # Log-scale bins, see execution_rollup_service
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        Index('uq_execution_rollups_key', 'scope', 'scope_id', 'grain', 'bucket', unique=True),
+        Index('idx_execution_rollups_grain_bucket', 'grain', 'bucket'),
+    )
+
+
 class AnalyticsAlertRule(Base):
     """
     Configurable alert rules for monitoring and notifications.
@@ -1,5 +1,5 @@
 from sqlalchemy import (
-    Column, Integer, String, Text, DateTime, JSON, ForeignKey, Enum, Boolean
+    Column, Integer, String, Text, DateTime, JSON, ForeignKey, Enum, Boolean, Index, text
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -124,11 +124,16 @@ class JobExecution(Base):
     successful_targets = Column(Integer, nullable=False, default=0)
     failed_targets = Column(Integer, nullable=False, default=0)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    rolled_up = Column(Boolean, nullable=False, default=False, server_default=text('false'))  # Counted in execution_rollups
 
     # Relationships
     job = relationship("Job", back_populates="executions")
     results = relationship("JobExecutionResult", back_populates="execution", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        Index('idx_job_executions_rollup_pending', 'id', postgresql_where=text('NOT rolled_up')),
+    )
+
 
 class JobExecutionResult(Base):
     """One record per target per action per execution - FLAT and SIMPLE"""
@@ -157,8 +162,13 @@ class JobExecutionResult(Base):
     exit_code = Column(Integer, nullable=True)
     command_executed = Column(Text, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    rolled_up = Column(Boolean, nullable=False, default=False, server_default=text('false'))  # Counted in execution_rollups
 
     # Relationships
     execution = relationship("JobExecution", back_populates="results")
     target = relationship("UniversalTarget")
-    action = relationship("JobAction")
\ No newline at end of file
+    action = relationship("JobAction")
+
+    __table_args__ = (
+        Index('idx_job_execution_results_rollup_pending', 'id', postgresql_where=text('NOT rolled_up')),
+    )
\ No newline at end of file
@@ -43,6 +43,7 @@ class CommunicationMethodResponse(CommunicationMethodBase):
     created_at: datetime
     updated_at: Optional[datetime] = None
     credentials: List[TargetCredentialResponse] = []
+    circuit_breaker: Optional[Dict[str, Any]] = Field(None, description="Per-host circuit breaker state: closed, open or half_open")
     
     class Config:
         from_attributes = True
@@ -381,6 +382,7 @@ class TargetSummary(BaseModel):
     primary_method: Optional[str]
     communication_methods_count: int
     is_valid: bool
+    circuit_breaker: Optional[Dict[str, Any]] = None
     created_at: datetime
     updated_at: Optional[datetime] = None
 
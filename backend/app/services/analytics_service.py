@@ -1,16 +1,15 @@
 from datetime import datetime, timedelta, timezone
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_
-import json
+from sqlalchemy import func, select
 import logging
 
 logger = logging.getLogger(__name__)
 
-from app.models.job_models import Job, JobExecution, JobStatus, ExecutionStatus, JobExecutionBranch, JobExecutionLog
+from app.models.job_models import Job, JobExecution, JobExecutionResult, ExecutionStatus
 from app.models.universal_target_models import UniversalTarget
-from app.models.analytics_models import PerformanceMetric, SystemHealthSnapshot, MetricType, AggregationPeriod
-from app.utils.target_utils import getTargetSummary
+from app.models.analytics_models import RollupScope
+from app.services.execution_rollup_service import ExecutionRollupService, ExecutionStats, ALL
 
 
 class AnalyticsService:
@@ -22,279 +21,6 @@ class AnalyticsService:
     def __init__(self, db: Session):
         self.db = db
 
-    def get_realtime_dashboard_metrics(self) -> Dict[str, Any]:
-        """Get real-time dashboard metrics for the analytics dashboard."""
-        try:
-            # Get job metrics
-            job_metrics = self._get_job_metrics()
-            
-            # Get target metrics  
-            target_metrics = self._get_target_metrics()
-            
-            # Get system metrics
-            system_metrics = self._get_system_metrics()
-            
-            # Get performance trends
-            performance_trends = self._get_performance_trends(hours=24)
-            
-            # Get error summary
-            error_summary = self._get_error_summary(hours=24)
-            
-            # Get recent activity
-            recent_activity = self._get_recent_activity(limit=50)
-            
-            return {
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-                "job_metrics": job_metrics,
-                "target_metrics": target_metrics,
-                "system_metrics": system_metrics,
-                "performance_trends": performance_trends,
-                "error_summary": error_summary,
-                "recent_activity": recent_activity
-            }
-        except Exception as e:
-            logger.error(f"Error getting dashboard metrics: {e}")
-            # Return default structure with empty data
-            return {
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-                "job_metrics": {
-                    "active_jobs": 0,
-                    "success_rate_24h": 0,
-                    "avg_duration_24h": 0,
-                    "total_executions_24h": 0
-                },
-                "target_metrics": {
-                    "total_targets": 0,
-                    "online_targets": 0,
-                    "healthy_targets": 0,
-                    "warning_targets": 0,
-                    "critical_targets": 0,
-                    "unknown_targets": 0,
-                    "availability_rate": 0
-                },
-                "system_metrics": {
-                    "cpu_usage": 0,
-                    "memory_usage": 0,
-                    "queue_size": 0
-                },
-                "performance_trends": {
-                    "hourly_data": []
-                },
-                "error_summary": {
-                    "total_errors": 0,
-                    "error_categories": {}
-                },
-                "recent_activity": []
-            }
-
-    def _get_job_metrics(self) -> Dict[str, Any]:
-        """Get current job metrics."""
-        try:
-            # Active jobs (running status)
-            active_jobs = self.db.query(JobExecution).filter(
-                JobExecution.status == ExecutionStatus.RUNNING
-            ).count()
-            
-            # 24h metrics
-            end_time = datetime.now(timezone.utc)
-            start_time = end_time - timedelta(hours=24)
-            
-            executions_24h = self.db.query(JobExecution).filter(
-                and_(
-                    JobExecution.created_at >= start_time,
-                    JobExecution.created_at <= end_time
-                )
-            ).all()
-            
-            total_24h = len(executions_24h)
-            successful_24h = len([e for e in executions_24h if e.status == ExecutionStatus.COMPLETED])
-            success_rate_24h = (successful_24h / total_24h * 100) if total_24h > 0 else 0
-            
-            # Average duration for completed jobs in 24h
-            completed_executions = [e for e in executions_24h if e.status == ExecutionStatus.COMPLETED and e.started_at and e.completed_at]
-            avg_duration_24h = 0
-            if completed_executions:
-                durations = [(e.completed_at - e.started_at).total_seconds() for e in completed_executions]
-                avg_duration_24h = sum(durations) / len(durations)
-            
-            return {
-                "active_jobs": active_jobs,
-                "success_rate_24h": round(success_rate_24h, 1),
-                "avg_duration_24h": round(avg_duration_24h, 1),
-                "total_executions_24h": total_24h
-            }
-        except Exception as e:
-            logger.error(f"Error getting job metrics: {e}")
-            return {
-                "active_jobs": 0,
-                "success_rate_24h": 0,
-                "avg_duration_24h": 0,
-                "total_executions_24h": 0
-            }
-
-    def _get_target_metrics(self) -> Dict[str, Any]:
-        """Get current target metrics."""
-        try:
-            # Get all active targets
-            targets = self.db.query(UniversalTarget).filter(UniversalTarget.is_active == True).all()
-            total_targets = len(targets)
-            
-            # Count by health status
-            healthy_targets = len([t for t in targets if t.health_status == 'healthy'])
-            warning_targets = len([t for t in targets if t.health_status == 'warning'])
-            critical_targets = len([t for t in targets if t.health_status == 'critical"])
-            unknown_targets = len([t for t in targets if t.health_status not in ['healthy', 'warning', 'critical"]])
-            
-            # Online targets (healthy + warning)
-            online_targets = healthy_targets + warning_targets
-            
-            # Availability rate
-            availability_rate = (online_targets / total_targets * 100) if total_targets > 0 else 0
-            
-            return {
-                "total_targets": total_targets,
-                "online_targets": online_targets,
-                "healthy_targets": healthy_targets,
-                "warning_targets": warning_targets,
-                "critical_targets": critical_targets,
-                "unknown_targets": unknown_targets,
-                "availability_rate": round(availability_rate, 1)
-            }
-        except Exception as e:
-            logger.error(f"Error getting target metrics: {e}")
-            return {
-                "total_targets": 0,
-                "online_targets": 0,
-                "healthy_targets": 0,
-                "warning_targets": 0,
-                "critical_targets": 0,
-                "unknown_targets": 0,
-                "availability_rate": 0
-            }
-
-    def _get_system_metrics(self) -> Dict[str, Any]:
-        """Get current system metrics."""
-        try:
-            # Queue size (running jobs)
-            queue_size = self.db.query(JobExecution).filter(
-                JobExecution.status.in_([ExecutionStatus.SCHEDULED, ExecutionStatus.RUNNING])
-            ).count()
-            
-            return {
-                "cpu_usage": 0,  # Placeholder - would need psutil
-                "memory_usage": 0,  # Placeholder - would need psutil
-                "queue_size": queue_size
-            }
-        except Exception as e:
-            logger.error(f"Error getting system metrics: {e}")
-            return {
-                "cpu_usage": 0,
-                "memory_usage": 0,
-                "queue_size": 0
-            }
-
-    def _get_recent_activity(self, limit: int = 10) -> List[Dict[str, Any]]:
-        """Get recent job execution activity."""
-        try:
-            recent_executions = self.db.query(JobExecution).join(Job).order_by(
-                JobExecution.created_at.desc()
-            ).limit(limit).all()
-            
-            activity = []
-            for execution in recent_executions:
-                activity.append({
-                    "job_name": execution.job.name,
-                    "status": execution.status.value,
-                    "created_at": execution.created_at.isoformat() if execution.created_at else None,
-                    "duration": (execution.completed_at - execution.started_at).total_seconds() 
-                               if execution.completed_at and execution.started_at else None
-                })
-            
-            return activity
-        except Exception as e:
-            logger.error(f"Error getting recent activity: {e}")
-            return []
-
-    def _get_performance_trends(self, hours: int = 24) -> Dict[str, Any]:
-        """Get performance trends for the specified time period."""
-        try:
-            end_time = datetime.now(timezone.utc)
-            start_time = end_time - timedelta(hours=hours)
-            
-            # Get hourly data
-            hourly_data = []
-            current_time = start_time
-            
-            while current_time < end_time:
-                hour_end = current_time + timedelta(hours=1)
-                
-                executions = self.db.query(JobExecution).filter(
-                    and_(
-                        JobExecution.created_at >= current_time,
-                        JobExecution.created_at < hour_end
-                    )
-                ).all()
-                
-                total = len(executions)
-                successful = len([e for e in executions if e.status == ExecutionStatus.COMPLETED])
-                failed = len([e for e in executions if e.status == ExecutionStatus.FAILED])
-                success_rate = (successful / total * 100) if total > 0 else 0
-                
-                hourly_data.append({
-                    "timestamp": current_time.isoformat(),
-                    "total_executions": total,
-                    "successful_executions": successful,
-                    "failed_executions": failed,
-                    "success_rate": round(success_rate, 1)
-                })
-                
-                current_time = hour_end
-            
-            return {
-                "hourly_data": hourly_data
-            }
-        except Exception as e:
-            logger.error(f"Error getting performance trends: {e}")
-            return {
-                "hourly_data": []
-            }
-
-    def _get_error_summary(self, hours: int = 24) -> Dict[str, Any]:
-        """Get error summary for the specified time period."""
-        try:
-            end_time = datetime.now(timezone.utc)
-            start_time = end_time - timedelta(hours=hours)
-            
-            failed_executions = self.db.query(JobExecution).filter(
-                and_(
-                    JobExecution.created_at >= start_time,
-                    JobExecution.created_at <= end_time,
-                    JobExecution.status == ExecutionStatus.FAILED
-                )
-            ).all()
-            
-            total_errors = len(failed_executions)
-            
-            # Categorize errors (simplified)
-            error_categories = {
-                "authentication": 0,
-                "communication": 0,
-                "command_execution": 0,
-                "timeout": 0,
-                "other": total_errors
-            }
-            
-            return {
-                "total_errors": total_errors,
-                "error_categories": error_categories
-            }
-        except Exception as e:
-            logger.error(f"Error getting error summary: {e}")
-            return {
-                "total_errors": 0,
-                "error_categories": {}
-            }
-
     # ---------------------------------------------------------------------
     # Executive summary (jobs run, average duration, etc.)
     # ---------------------------------------------------------------------
@@ -310,15 +36,7 @@ class AnalyticsService:
         # Last 7 days counts
         summary["last_7d"] = self._build_job_stats_since(week_ago)
 
-        # Most active targets (by job count in last 7d)
-        from app.models.job_models import JobTarget  # local import to avoid circular
-        target_counts = (
-            self.db.query(JobTarget.target_id, JobTarget.target_id.label("id"))
-            .join(JobExecution, JobExecution.job_id == JobTarget.job_id)
-            .filter(JobExecution.created_at >= week_ago)
-            .count()
-        )
-        # Simple placeholder (actual aggregation later)
+        # Most active targets: placeholder until per-target aggregation exists
         summary["top_targets"] = []
 
         # System uptime placeholder (would come from container start time)
@@ -329,38 +47,14 @@ class AnalyticsService:
         return summary
 
     def _build_job_stats_since(self, since: datetime) -> Dict[str, Any]:
-        qe = JobExecution
-        executions = (
-            self.db.query(qe)
-            .filter(qe.created_at >= since)
-            .all()
-        )
-        total = len(executions)
-        status_counts = {
-            "completed": 0,
-            "failed": 0,
-            "cancelled": 0,
-        }
-        durations = []
-        for ex in executions:
-            if ex.status == ExecutionStatus.COMPLETED:
-                status_counts["completed"] += 1
-            elif ex.status == ExecutionStatus.FAILED:
-                status_counts["failed"] += 1
-            elif ex.status == ExecutionStatus.CANCELLED:
-                status_counts["cancelled"] += 1
-            if ex.started_at and ex.completed_at:
-                durations.append((ex.completed_at - ex.started_at).total_seconds())
-        avg_duration = sum(durations) / len(durations) if durations else 0
-        p95_duration = 0
-        if durations:
-            sorted_dur = sorted(durations)
-            p95_duration = sorted_dur[int(len(sorted_dur)*0.95)-1]
+        stats = ExecutionRollupService(self.db).summary(since)
         return {
-            "total": total,
-            **status_counts,
-            "avg_duration_seconds": round(avg_duration, 2),
-            "p95_duration_seconds": round(p95_duration, 2),
+            "total": stats.total,
+            "completed": stats.completed,
+            "failed": stats.failed,
+            "cancelled": stats.cancelled,
+            "avg_duration_seconds": round(stats.avg_seconds, 2),
+            "p95_duration_seconds": round(stats.percentile_seconds(0.95) or 0, 2),
         }
 
     # ---------------------------------------------------------------------
@@ -392,27 +86,15 @@ class AnalyticsService:
             JobExecution.status == ExecutionStatus.SCHEDULED
         ).count()
         
-        # Success rate (last 24 hours)
-        day_ago = datetime.now(timezone.utc) - timedelta(days=1)
-        recent_executions = self.db.query(JobExecution).filter(
-            JobExecution.created_at >= day_ago
-        ).all()
-        
-        total_recent = len(recent_executions)
-        successful_recent = len([e for e in recent_executions if e.status == ExecutionStatus.COMPLETED])
-        success_rate = (successful_recent / total_recent * 100) if total_recent > 0 else 0
-        
-        # Average duration (last 24 hours)
-        completed_executions = [e for e in recent_executions if e.status == ExecutionStatus.COMPLETED and e.started_at and e.completed_at]
-        durations = [(e.completed_at - e.started_at).total_seconds() for e in completed_executions]
-        avg_duration = sum(durations) / len(durations) if durations else 0
+        # Success rate and average duration (last 24 hours)
+        recent = ExecutionRollupService(self.db).summary(datetime.now(timezone.utc) - timedelta(days=1))
         
         return {
             "active_jobs": active_jobs,
             "queued_jobs": queued_jobs,
-            "success_rate_24h": round(success_rate, 1),
-            "avg_duration_24h": round(avg_duration, 2),
-            "total_executions_24h": total_recent
+            "success_rate_24h": round(recent.success_rate, 1),
+            "avg_duration_24h": round(recent.avg_seconds, 2),
+            "total_executions_24h": recent.total
         }
 
     def _get_target_metrics(self) -> Dict[str, Any]:
@@ -473,34 +155,14 @@ class AnalyticsService:
         return activity
 
     def _get_performance_trends(self, hours: int = 24) -> Dict[str, Any]:
-        """Get performance trends over the specified time period."""
+        """Get hourly performance trends over the specified time period, from the hourly rollups."""
         end_time = datetime.now(timezone.utc)
         start_time = end_time - timedelta(hours=hours)
         
-        # Get hourly execution counts
-        hourly_data = []
-        for i in range(hours):
-            hour_start = start_time + timedelta(hours=i)
-            hour_end = hour_start + timedelta(hours=1)
-            
-            executions = self.db.query(JobExecution).filter(
-                and_(
-                    JobExecution.created_at >= hour_start,
-                    JobExecution.created_at < hour_end
-                )
-            ).all()
-            
-            total = len(executions)
-            successful = len([e for e in executions if e.status == ExecutionStatus.COMPLETED])
-            failed = len([e for e in executions if e.status == ExecutionStatus.FAILED])
-            
-            hourly_data.append({
-                "timestamp": hour_start.isoformat(),
-                "total_executions": total,
-                "successful_executions": successful,
-                "failed_executions": failed,
-                "success_rate": (successful / total * 100) if total > 0 else 0
-            })
+        hourly_data = [
+            {"timestamp": bucket.isoformat(), **self._trend_counts(stats)}
+            for bucket, stats in ExecutionRollupService(self.db).buckets("hour", start_time, end_time)
+        ]
         
         return {
             "period_hours": hours,
@@ -508,209 +170,88 @@ class AnalyticsService:
         }
 
     def _get_error_summary(self, hours: int = 24) -> Dict[str, Any]:
-        """Get error summary and categorization."""
-        end_time = datetime.now(timezone.utc)
-        start_time = end_time - timedelta(hours=hours)
-        
-        # Get error logs from the specified period
-        error_logs = self.db.query(JobExecutionLog).filter(
-            and_(
-                JobExecutionLog.log_level == "error",
-                JobExecutionLog.timestamp >= start_time
+        """Get failed target results of the period, categorized by action type (one query)."""
+        start_time = datetime.now(timezone.utc) - timedelta(hours=hours)
+        
+        rows = self.db.execute(
+            select(JobExecutionResult.action_type, func.count().label("errors"))
+            .where(
+                JobExecutionResult.status == ExecutionStatus.FAILED,
+                JobExecutionResult.created_at >= start_time
             )
+            .group_by(JobExecutionResult.action_type)
         ).all()
         
-        # Categorize errors
-        error_categories = {}
-        for log in error_logs:
-            category = log.log_category.value if log.log_category else "unknown"
-            error_categories[category] = error_categories.get(category, 0) + 1
+        error_categories = {
+            row.action_type.value if row.action_type else "unknown": row.errors for row in rows
+        }
         
         return {
-            "total_errors": len(error_logs),
+            "total_errors": sum(error_categories.values()),
             "error_categories": error_categories,
             "period_hours": hours
         }
 
+    @staticmethod
+    def _trend_counts(stats: ExecutionStats) -> Dict[str, Any]:
+        return {
+            "total_executions": stats.total,
+            "successful_executions": stats.completed,
+            "failed_executions": stats.failed,
+            "success_rate": stats.success_rate
+        }
+
+    def _daily_trends(self, buckets: List[Tuple[datetime, ExecutionStats]]) -> List[Dict[str, Any]]:
+        return [{"date": bucket.date().isoformat(), **self._trend_counts(stats)} for bucket, stats in buckets]
+
     # ---------------------------------------------------------------------
-    # Historical Analytics
+    # Historical Analytics - read from the daily rollups, one query per period
     # ---------------------------------------------------------------------
     def get_job_performance_analytics(self, job_id: Optional[int] = None, days: int = 30) -> Dict[str, Any]:
         """Get detailed job performance analytics."""
         end_time = datetime.now(timezone.utc)
         start_time = end_time - timedelta(days=days)
         
-        query = self.db.query(JobExecution).filter(
-            JobExecution.created_at >= start_time
-        )
-        
-        if job_id:
-            query = query.filter(JobExecution.job_id == job_id)
-        
-        executions = query.all()
-        
-        # Calculate metrics
-        total_executions = len(executions)
-        successful = len([e for e in executions if e.status == ExecutionStatus.COMPLETED])
-        failed = len([e for e in executions if e.status == ExecutionStatus.FAILED])
-        cancelled = len([e for e in executions if e.status == ExecutionStatus.CANCELLED])
-        
-        # Duration analysis
-        completed_executions = [e for e in executions if e.status == ExecutionStatus.COMPLETED and e.started_at and e.completed_at]
-        durations = [(e.completed_at - e.started_at).total_seconds() for e in completed_executions]
-        
-        duration_stats = {}
-        if durations:
-            durations.sort()
-            duration_stats = {
-                "min": durations[0],
-                "max": durations[-1],
-                "avg": sum(durations) / len(durations),
-                "median": durations[len(durations) // 2],
-                "p95": durations[int(len(durations) * 0.95) - 1] if len(durations) > 1 else durations[0]
-            }
+        daily = ExecutionRollupService(self.db).buckets("day", start_time, end_time, RollupScope.JOB.value, job_id or ALL)
+        summary = ExecutionRollupService.combine(daily)
         
         return {
             "period_days": days,
             "job_id": job_id,
-            "total_executions": total_executions,
-            "successful_executions": successful,
-            "failed_executions": failed,
-            "cancelled_executions": cancelled,
-            "success_rate": (successful / total_executions * 100) if total_executions > 0 else 0,
-            "duration_stats": duration_stats,
-            "daily_trends": self._get_daily_execution_trends(start_time, end_time, job_id)
+            "total_executions": summary.total,
+            "successful_executions": summary.completed,
+            "failed_executions": summary.failed,
+            "cancelled_executions": summary.cancelled,
+            "success_rate": summary.success_rate,
+            "duration_stats": summary.duration_stats(),
+            "daily_trends": self._daily_trends(daily)
         }
 
     def get_target_performance_analytics(self, target_id: Optional[int] = None, days: int = 30) -> Dict[str, Any]:
-        """Get detailed target performance analytics."""
+        """Get detailed target performance analytics from per-target results."""
         end_time = datetime.now(timezone.utc)
         start_time = end_time - timedelta(days=days)
         
-        # Get executions that involved the target(s)
-        query = self.db.query(JobExecutionBranch).filter(
-            JobExecutionBranch.created_at >= start_time
-        )
-        
-        if target_id:
-            query = query.filter(JobExecutionBranch.target_id == target_id)
-        
-        branches = query.all()
-        
-        # Calculate target-specific metrics
-        total_executions = len(branches)
-        successful = len([b for b in branches if b.status == ExecutionStatus.COMPLETED])
-        failed = len([b for b in branches if b.status == ExecutionStatus.FAILED])
-        
-        # Response time analysis
-        completed_branches = [b for b in branches if b.status == ExecutionStatus.COMPLETED and b.started_at and b.completed_at]
-        response_times = [(b.completed_at - b.started_at).total_seconds() for b in completed_branches]
-        
-        response_time_stats = {}
-        if response_times:
-            response_times.sort()
-            response_time_stats = {
-                "min": response_times[0],
-                "max": response_times[-1],
-                "avg": sum(response_times) / len(response_times),
-                "median": response_times[len(response_times) // 2],
-                "p95": response_times[int(len(response_times) * 0.95) - 1] if len(response_times) > 1 else response_times[0]
-            }
+        daily = ExecutionRollupService(self.db).buckets("day", start_time, end_time, RollupScope.TARGET.value, target_id or ALL)
+        summary = ExecutionRollupService.combine(daily)
         
         return {
             "period_days": days,
             "target_id": target_id,
-            "total_executions": total_executions,
-            "successful_executions": successful,
-            "failed_executions": failed,
-            "success_rate": (successful / total_executions * 100) if total_executions > 0 else 0,
-            "response_time_stats": response_time_stats,
-            "daily_trends": self._get_daily_target_trends(start_time, end_time, target_id)
+            "total_executions": summary.total,
+            "successful_executions": summary.completed,
+            "failed_executions": summary.failed,
+            "success_rate": summary.success_rate,
+            "response_time_stats": summary.duration_stats(),
+            "daily_trends": self._daily_trends(daily)
         }
 
-    def _get_daily_execution_trends(self, start_time: datetime, end_time: datetime, job_id: Optional[int] = None) -> List[Dict[str, Any]]:
-        """Get daily execution trends for jobs."""
-        daily_data = []
-        current_date = start_time.date()
-        end_date = end_time.date()
-        
-        while current_date <= end_date:
-            day_start = datetime.combine(current_date, datetime.min.time()).replace(tzinfo=timezone.utc)
-            day_end = day_start + timedelta(days=1)
-            
-            query = self.db.query(JobExecution).filter(
-                and_(
-                    JobExecution.created_at >= day_start,
-                    JobExecution.created_at < day_end
-                )
-            )
-            
-            if job_id:
-                query = query.filter(JobExecution.job_id == job_id)
-            
-            executions = query.all()
-            
-            total = len(executions)
-            successful = len([e for e in executions if e.status == ExecutionStatus.COMPLETED])
-            failed = len([e for e in executions if e.status == ExecutionStatus.FAILED])
-            
-            daily_data.append({
-                "date": current_date.isoformat(),
-                "total_executions": total,
-                "successful_executions": successful,
-                "failed_executions": failed,
-                "success_rate": (successful / total * 100) if total > 0 else 0
-            })
-            
-            current_date += timedelta(days=1)
-        
-        return daily_data
-
-    def _get_daily_target_trends(self, start_time: datetime, end_time: datetime, target_id: Optional[int] = None) -> List[Dict[str, Any]]:
-        """Get daily execution trends for targets."""
-        daily_data = []
-        current_date = start_time.date()
-        end_date = end_time.date()
-        
-        while current_date <= end_date:
-            day_start = datetime.combine(current_date, datetime.min.time()).replace(tzinfo=timezone.utc)
-            day_end = day_start + timedelta(days=1)
-            
-            query = self.db.query(JobExecutionBranch).filter(
-                and_(
-                    JobExecutionBranch.created_at >= day_start,
-                    JobExecutionBranch.created_at < day_end
-                )
-            )
-            
-            if target_id:
-                query = query.filter(JobExecutionBranch.target_id == target_id)
-            
-            branches = query.all()
-            
-            total = len(branches)
-            successful = len([b for b in branches if b.status == ExecutionStatus.COMPLETED])
-            failed = len([b for b in branches if b.status == ExecutionStatus.FAILED])
-            
-            daily_data.append({
-                "date": current_date.isoformat(),
-                "total_executions": total,
-                "successful_executions": successful,
-                "failed_executions": failed,
-                "success_rate": (successful / total * 100) if total > 0 else 0
-            })
-            
-            current_date += timedelta(days=1)
-        
-        return daily_data
-
     # ---------------------------------------------------------------------
     # Reporting Functions
     # ---------------------------------------------------------------------
     def generate_executive_report(self, days: int = 30) -> Dict[str, Any]:
         """Generate executive summary report."""
         end_time = datetime.now(timezone.utc)
-        start_time = end_time - timedelta(days=days)
         
         # High-level KPIs
         job_analytics = self.get_job_performance_analytics(days=days)
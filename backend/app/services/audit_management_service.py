@@ -24,6 +24,7 @@ from functools import wraps
 from sqlalchemy.orm import Session
 
 from app.core.cache import get_redis_client
+from app.core.caching import cached_operation
 from app.core.logging import get_structured_logger
 from app.core.config import settings
 from app.domains.audit.services.audit_service import AuditService, AuditEventType, AuditSeverity
@@ -80,72 +81,9 @@ def with_performance_logging(func):
     return wrapper
 
 
-def with_caching(cache_key_func, ttl=CACHE_TTL):
+def with_caching(cache_key_func, ttl=CACHE_TTL, tags=None):
     """Caching decorator for audit management operations"""
-    def decorator(func):
-        @wraps(func)
-        async def wrapper(*args, **kwargs):
-            # Generate cache key
-            cache_key = f"{CACHE_PREFIX}{cache_key_func(*args, **kwargs)}"
-            
-            # Try to get from cache
-            redis_client = get_redis_client()
-            if redis_client:
-                try:
-                    cached_result = await redis_client.get(cache_key)
-                    if cached_result:
-                        logger.info(
-                            "Cache hit for audit management operation",
-                            extra={
-                                "cache_key": cache_key,
-                                "operation": func.__name__
-                            }
-                        )
-                        return json.loads(cached_result)
-                except Exception as e:
-                    logger.warning(
-                        "Cache read failed, proceeding without cache",
-                        extra={
-                            "cache_key": cache_key,
-                            "error": str(e),
-                            "operation": func.__name__
-                        }
-                    )
-            
-            # Execute function
-            start_time = time.time()
-            result = await func(*args, **kwargs)
-            execution_time = time.time() - start_time
-            
-            # Cache the result
-            if redis_client:
-                try:
-                    await redis_client.setex(
-                        cache_key, 
-                        ttl, 
-                        json.dumps(result, default=str)
-                    )
-                    logger.info(
-                        "Cached audit management operation result",
-                        extra={
-                            "cache_key": cache_key,
-                            "operation": func.__name__,
-                            "execution_time": execution_time
-                        }
-                    )
-                except Exception as e:
-                    logger.warning(
-                        "Cache write failed",
-                        extra={
-                            "cache_key": cache_key,
-                            "error": str(e),
-                            "operation": func.__name__
-                        }
-                    )
-            
-            return result
-        return wrapper
-    return decorator
+    return cached_operation(CACHE_PREFIX, cache_key_func, ttl=ttl, tags=tags)
 
 
 class AuditManagementService:
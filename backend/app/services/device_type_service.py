@@ -14,14 +14,14 @@ import logging
 import time
 from typing import List, Dict, Optional, Set
 from functools import wraps
-import json
 
 from app.core.device_types import (
     device_registry, 
     DeviceCategory, 
     DeviceType
 )
-from app.core.cache import get_redis_client
+from app.core.cache import get_redis_client, scan_delete
+from app.core.caching import cached_operation, invalidate_tags
 from app.core.logging import get_structured_logger
 
 # Configure structured logger
@@ -32,82 +32,9 @@ CACHE_TTL = 3600  # 1 hour
 CACHE_PREFIX = "device_types:"
 
 
-def with_caching(cache_key_func, ttl=CACHE_TTL):
+def with_caching(cache_key_func, ttl=CACHE_TTL, tags=None):
     """Decorator for caching service method results"""
-    def decorator(func):
-        @wraps(func)
-        async def wrapper(*args, **kwargs):
-            # Generate cache key
-            cache_key = f"{CACHE_PREFIX}{cache_key_func(*args, **kwargs)}"
-            
-            # Try to get from cache
-            redis_client = get_redis_client()
-            if redis_client:
-                try:
-                    cached_result = await redis_client.get(cache_key)
-                    if cached_result:
-                        logger.info(
-                            "Cache hit for device types operation",
-                            extra={
-                                "cache_key": cache_key,
-                                "operation": func.__name__
-                            }
-                        )
-                        return json.loads(cached_result)
-                except Exception as e:
-                    logger.warning(
-                        "Cache read failed, proceeding without cache",
-                        extra={
-                            "cache_key": cache_key,
-                            "error": str(e),
-                            "operation": func.__name__
-                        }
-                    )
-            
-            # Execute function
-            start_time = time.time()
-            result = await func(*args, **kwargs)
-            execution_time = time.time() - start_time
-            
-            # Cache the result
-            if redis_client:
-                try:
-                    await redis_client.setex(
-                        cache_key, 
-                        ttl, 
-                        json.dumps(result, default=str)
-                    )
-                    logger.info(
-                        "Cached device types operation result",
-                        extra={
-                            "cache_key": cache_key,
-                            "operation": func.__name__,
-                            "execution_time": execution_time
-                        }
-                    )
-                except Exception as e:
-                    logger.warning(
-                        "Cache write failed",
-                        extra={
-                            "cache_key": cache_key,
-                            "error": str(e),
-                            "operation": func.__name__
-                        }
-                    )
-            
-            # Log performance metrics
-            logger.info(
-                "Device types operation completed",
-                extra={
-                    "operation": func.__name__,
-                    "execution_time": execution_time,
-                    "result_count": len(result) if isinstance(result, list) else 1
-                }
-            )
-            
-            return result
-        return wrapper
-    return decorator
+    return cached_operation(CACHE_PREFIX, cache_key_func, ttl=ttl, tags=tags)
 
 
 def with_performance_logging(func):
@@ -426,20 +353,22 @@ class DeviceTypeService:
             return
         
         try:
-            if pattern:
-                cache_pattern = f"{CACHE_PREFIX}{pattern}"
-            else:
-                cache_pattern = f"{CACHE_PREFIX}*"
+            if not pattern:
+                # Every entry of this service carries the prefix tag
+                deleted = await invalidate_tags(CACHE_PREFIX.rstrip(":"))
+                logger.info("Cache invalidated", extra={"tag": CACHE_PREFIX.rstrip(":"), "keys_deleted": deleted})
+                return
+            
+            cache_pattern = f"{CACHE_PREFIX}{pattern}"
             
-            # Get all matching keys
-            keys = await redis_client.keys(cache_pattern)
-            if keys:
-                await redis_client.delete(*keys)
+            # Incremental sweep - KEYS would block Redis for every client
+            deleted = await scan_delete(redis_client, cache_pattern)
+            if deleted:
                 logger.info(
                     "Cache invalidated",
                     extra={
                         "pattern": cache_pattern,
-                        "keys_deleted": len(keys)
+                        "keys_deleted": deleted
                     }
                 )
             else:
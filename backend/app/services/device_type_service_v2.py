@@ -14,11 +14,11 @@ import logging
 import time
 from typing import List, Dict, Optional, Set, Tuple
 from functools import wraps
-import json
 
 from app.repositories.device_type_repository import DeviceTypeRepository, get_device_type_repository
 from app.core.device_types import device_registry, DeviceCategory
-from app.core.cache import get_redis_client
+from app.core.cache import get_redis_client, scan_delete
+from app.core.caching import cached_operation, invalidate_tags
 from app.core.logging import get_structured_logger
 from app.database.database import get_db
 from sqlalchemy.orm import Session
@@ -31,82 +31,9 @@ CACHE_TTL = 3600  # 1 hour
 CACHE_PREFIX = "device_types_v2:"
 
 
-def with_caching_v2(cache_key_func, ttl=CACHE_TTL):
+def with_caching(cache_key_func, ttl=CACHE_TTL, tags=None):
     """Enhanced caching decorator for V2 service"""
-    def decorator(func):
-        @wraps(func)
-        async def wrapper(*args, **kwargs):
-            # Generate cache key
-            cache_key = f"{CACHE_PREFIX}{cache_key_func(*args, **kwargs)}"
-            
-            # Try to get from cache
-            redis_client = get_redis_client()
-            if redis_client:
-                try:
-                    cached_result = await redis_client.get(cache_key)
-                    if cached_result:
-                        logger.info(
-                            "Cache hit for device types V2 operation",
-                            extra={
-                                "cache_key": cache_key,
-                                "operation": func.__name__
-                            }
-                        )
-                        return json.loads(cached_result)
-                except Exception as e:
-                    logger.warning(
-                        "Cache read failed, proceeding without cache",
-                        extra={
-                            "cache_key": cache_key,
-                            "error": str(e),
-                            "operation": func.__name__
-                        }
-                    )
-            
-            # Execute function
-            start_time = time.time()
-            result = await func(*args, **kwargs)
-            execution_time = time.time() - start_time
-            
-            # Cache the result
-            if redis_client:
-                try:
-                    await redis_client.setex(
-                        cache_key, 
-                        ttl, 
-                        json.dumps(result, default=str)
-                    )
-                    logger.info(
-                        "Cached device types V2 operation result",
-                        extra={
-                            "cache_key": cache_key,
-                            "operation": func.__name__,
-                            "execution_time": execution_time
-                        }
-                    )
-                except Exception as e:
-                    logger.warning(
-                        "Cache write failed",
-                        extra={
-                            "cache_key": cache_key,
-                            "error": str(e),
-                            "operation": func.__name__
-                        }
-                    )
-            
-            # Log performance metrics
-            logger.info(
-                "Device types V2 operation completed",
-                extra={
-                    "operation": func.__name__,
-                    "execution_time": execution_time,
-                    "result_count": len(result) if isinstance(result, list) else 1
-                }
-            )
-            
-            return result
-        return wrapper
-    return decorator
+    return cached_operation(CACHE_PREFIX, cache_key_func, ttl=ttl, tags=tags)
 
 
 def with_performance_logging_v2(func):
@@ -246,7 +173,7 @@ class DeviceTypeServiceV2:
     
     # Enhanced Read Operations
     
-    @with_caching_v2(lambda self, **kwargs: f"search_{hash(str(sorted(kwargs.items())))}")
+    @with_caching(lambda self, **kwargs: f"search_{hash(str(sorted(kwargs.items())))}")
     @with_performance_logging_v2
     async def search_device_types(
         self,
@@ -310,7 +237,7 @@ class DeviceTypeServiceV2:
             "has_more": (offset + len(device_types)) < total_count
         }
     
-    @with_caching_v2(lambda self, include_stats=False: f"all_device_types_stats_{include_stats}")
+    @with_caching(lambda self, include_stats=False: f"all_device_types_stats_{include_stats}")
     @with_performance_logging_v2
     async def get_all_device_types(self, include_stats: bool = False) -> List[Dict]:
         """Get all device types with optional statistics"""
@@ -359,7 +286,7 @@ class DeviceTypeServiceV2:
         
         return result
     
-    @with_caching_v2(lambda self: "device_categories_with_stats")
+    @with_caching(lambda self: "device_categories_with_stats")
     @with_performance_logging_v2
     async def get_device_categories(self) -> List[Dict]:
         """Get all device categories with statistics"""
@@ -418,7 +345,7 @@ class DeviceTypeServiceV2:
             }
         )
     
-    @with_caching_v2(lambda self, limit=10: f"popular_device_types_{limit}")
+    @with_caching(lambda self, limit=10: f"popular_device_types_{limit}")
     @with_performance_logging_v2
     async def get_popular_device_types(self, limit: int = 10) -> List[Dict]:
         """Get most popular device types"""
@@ -550,20 +477,22 @@ class DeviceTypeServiceV2:
             return
         
         try:
-            if pattern:
-                cache_pattern = f"{CACHE_PREFIX}{pattern}"
-            else:
-                cache_pattern = f"{CACHE_PREFIX}*"
+            if not pattern:
+                # Every entry of this service carries the prefix tag
+                deleted = await invalidate_tags(CACHE_PREFIX.rstrip(":"))
+                logger.info("Cache invalidated", extra={"tag": CACHE_PREFIX.rstrip(":"), "keys_deleted": deleted})
+                return
+            
+            cache_pattern = f"{CACHE_PREFIX}{pattern}"
             
-            # Get all matching keys
-            keys = await redis_client.keys(cache_pattern)
-            if keys:
-                await redis_client.delete(*keys)
+            # Incremental sweep - KEYS would block Redis for every client
+            deleted = await scan_delete(redis_client, cache_pattern)
+            if deleted:
                 logger.info(
                     "Cache invalidated",
                     extra={
                         "pattern": cache_pattern,
-                        "keys_deleted": len(keys)
+                        "keys_deleted": deleted
                     }
                 )
             else:
@@ -0,0 +1,378 @@
+"""
+Execution Rollup Service
+Hourly and daily execution statistics, maintained incrementally.
+
+One execution_rollups row per (scope, scope_id, grain, bucket):
+- job scope:    from job_executions, per job and for all jobs (scope_id 0)
+- target scope: from job_execution_results, per target and for all targets (scope_id 0)
+Each row holds counts by status, the count/sum/min/max of completed durations and a
+log-scale duration histogram (4 bins per doubling, so percentiles are within ~9%).
+All of it merges by addition, so rows are updated in place by one INSERT ... ON CONFLICT
+per batch, and any range is answered by merging its hourly or daily rows: dashboard
+cost depends on the range, not on how much history there is.
+
+apply_execution() folds an execution and its results in as soon as it finishes;
+catch_up(), run from Celery beat, folds in whatever finished some other way and
+backfills history. A source row is claimed by setting its rolled_up flag in the
+same transaction as the upsert, so it is counted once whichever path gets it first.
+"""
+import logging
+import math
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, func, literal_column, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.analytics_models import AggregationPeriod, ExecutionRollup, RollupScope
+from app.models.job_models import JobExecution, JobExecutionResult, ExecutionStatus
+
+logger = logging.getLogger(__name__)
+
+ALL = 0  # scope_id of the rows covering every job / every target
+
+TERMINAL_STATUSES = (ExecutionStatus.COMPLETED, ExecutionStatus.FAILED, ExecutionStatus.CANCELLED)
+
+GRAINS = {
+    AggregationPeriod.HOUR.value: timedelta(hours=1),
+    AggregationPeriod.DAY.value: timedelta(days=1)
+}
+
+# Bin 0 is <1ms, bin n covers [2^((n-1)/4), 2^(n/4)) ms, the last bin (from ~37h) is open-ended
+BINS_PER_OCTAVE = 4
+DURATION_BINS = 1 + BINS_PER_OCTAVE * 27
+
+# Element-wise sum of the stored and the incoming histogram
+_MERGE_HISTOGRAMS = literal_column(
+    "ARRAY(SELECT h.a + h.b FROM unnest(execution_rollups.duration_histogram, excluded.duration_histogram)"
+    " WITH ORDINALITY AS h(a, b, i) ORDER BY h.i)"
+)
+
+RollupKey = Tuple[str, int, str, datetime]
+
+
+def bucket_start(moment: datetime, grain: str) -> datetime:
+    """Start of the UTC hour or day containing moment (naive values are taken as UTC)."""
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    moment = moment.astimezone(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    return moment.replace(hour=0) if grain == AggregationPeriod.DAY.value else moment
+
+
+def _duration_bin(duration_ms: float) -> int:
+    if duration_ms < 1:
+        return 0
+    return min(int(math.log2(duration_ms) * BINS_PER_OCTAVE) + 1, DURATION_BINS - 1)
+
+
+def _bin_midpoint(bin_index: int) -> float:
+    """Geometric middle of a bin, in milliseconds."""
+    if bin_index == 0:
+        return 0.5
+    return 2 ** ((bin_index - 0.5) / BINS_PER_OCTAVE)
+
+
+class ExecutionStats:
+    """Counts and duration statistics of a set of executions or results; merges by addition."""
+
+    def __init__(self):
+        self.total = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.timed = 0
+        self.duration_sum_ms = 0
+        self.duration_min_ms: Optional[int] = None
+        self.duration_max_ms: Optional[int] = None
+        self.histogram = [0] * DURATION_BINS
+
+    def add(self, status: ExecutionStatus, duration_ms: Optional[int]):
+        self.total += 1
+        if status == ExecutionStatus.COMPLETED:
+            self.completed += 1
+            if duration_ms is not None:
+                duration_ms = max(int(duration_ms), 0)
+                self.timed += 1
+                self.duration_sum_ms += duration_ms
+                self.duration_min_ms = duration_ms if self.duration_min_ms is None else min(self.duration_min_ms, duration_ms)
+                self.duration_max_ms = duration_ms if self.duration_max_ms is None else max(self.duration_max_ms, duration_ms)
+                self.histogram[_duration_bin(duration_ms)] += 1
+        elif status == ExecutionStatus.FAILED:
+            self.failed += 1
+        elif status == ExecutionStatus.CANCELLED:
+            self.cancelled += 1
+
+    def merge(self, other):
+        """Add another ExecutionStats or an ExecutionRollup row."""
+        self.total += other.total
+        self.completed += other.completed
+        self.failed += other.failed
+        self.cancelled += other.cancelled
+        self.timed += other.timed
+        self.duration_sum_ms += other.duration_sum_ms
+        if other.duration_min_ms is not None:
+            self.duration_min_ms = other.duration_min_ms if self.duration_min_ms is None else min(self.duration_min_ms, other.duration_min_ms)
+        if other.duration_max_ms is not None:
+            self.duration_max_ms = other.duration_max_ms if self.duration_max_ms is None else max(self.duration_max_ms, other.duration_max_ms)
+        histogram = other.histogram if isinstance(other, ExecutionStats) else other.duration_histogram
+        for bin_index, count in enumerate(histogram[:DURATION_BINS]):
+            self.histogram[bin_index] += count
+
+    @property
+    def success_rate(self) -> float:
+        return self.completed / self.total * 100 if self.total else 0
+
+    @property
+    def avg_seconds(self) -> float:
+        return self.duration_sum_ms / self.timed / 1000 if self.timed else 0
+
+    def percentile_seconds(self, fraction: float) -> Optional[float]:
+        """Nearest-rank percentile estimate from the histogram, kept within the observed min/max."""
+        if not self.timed:
+            return None
+        rank = max(math.ceil(fraction * self.timed), 1)
+        running = 0
+        for bin_index, count in enumerate(self.histogram):
+            running += count
+            if running >= rank:
+                estimate = min(max(_bin_midpoint(bin_index), self.duration_min_ms), self.duration_max_ms)
+                return estimate / 1000
+        return self.duration_max_ms / 1000
+
+    def duration_stats(self) -> Dict[str, float]:
+        """Seconds: min, max, avg, median and p95 of completed durations ({} when there are none)."""
+        if not self.timed:
+            return {}
+        return {
+            "min": self.duration_min_ms / 1000,
+            "max": self.duration_max_ms / 1000,
+            "avg": self.avg_seconds,
+            "median": self.percentile_seconds(0.5),
+            "p95": self.percentile_seconds(0.95)
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total": self.total,
+            "completed": self.completed,
+            "failed": self.failed,
+            "cancelled": self.cancelled,
+            "success_rate": round(self.success_rate, 2),
+            "duration_seconds": {stat: round(value, 3) for stat, value in self.duration_stats().items()}
+        }
+
+    def to_values(self) -> Dict[str, Any]:
+        return {
+            "total": self.total,
+            "completed": self.completed,
+            "failed": self.failed,
+            "cancelled": self.cancelled,
+            "timed": self.timed,
+            "duration_sum_ms": self.duration_sum_ms,
+            "duration_min_ms": self.duration_min_ms,
+            "duration_max_ms": self.duration_max_ms,
+            "duration_histogram": self.histogram
+        }
+
+
+def _elapsed_ms(started_at: Optional[datetime], completed_at: Optional[datetime]) -> Optional[int]:
+    if started_at is None or completed_at is None:
+        return None
+    return int((completed_at - started_at).total_seconds() * 1000)
+
+
+class ExecutionRollupService:
+    """Maintain and read the execution_rollups table."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    # ------------------------------------------------------------------ write path
+
+    def apply_execution(self, execution_id: int) -> int:
+        """
+        Fold one finished execution and its finished results into the rollups and commit.
+        Safe to call more than once; returns the number of source rows newly counted.
+        """
+        try:
+            counted = self._apply(
+                [JobExecution.id == execution_id],
+                [JobExecutionResult.execution_id == execution_id]
+            )
+            self.db.commit()
+            return counted
+        except Exception:
+            self.db.rollback()
+            raise
+
+    def catch_up(self, batch_size: Optional[int] = None, max_batches: Optional[int] = None) -> Dict[str, int]:
+        """Fold in finished rows not counted yet, one committed batch at a time, then prune old hourly rows."""
+        batch_size = batch_size or settings.EXECUTION_ROLLUP_BATCH_SIZE
+        max_batches = max_batches or settings.EXECUTION_ROLLUP_MAX_BATCHES
+        counted = batches = 0
+        try:
+            while batches < max_batches:
+                executions = self._claim_executions([], batch_size)
+                results = self._claim_results([], batch_size)
+                self._upsert(self._stats_by_key(executions, results))
+                self.db.commit()
+                batches += 1
+                counted += len(executions) + len(results)
+                if len(executions) < batch_size and len(results) < batch_size:
+                    break
+
+            cutoff = datetime.now(timezone.utc) - timedelta(days=settings.EXECUTION_ROLLUP_HOURLY_RETENTION_DAYS)
+            pruned = self.db.execute(
+                delete(ExecutionRollup).where(
+                    ExecutionRollup.grain == AggregationPeriod.HOUR.value,
+                    ExecutionRollup.bucket < bucket_start(cutoff, AggregationPeriod.HOUR.value)
+                )
+            ).rowcount
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return {"counted": counted, "batches": batches, "pruned_hourly": pruned}
+
+    def _apply(self, execution_criteria: list, result_criteria: list) -> int:
+        executions = self._claim_executions(execution_criteria)
+        results = self._claim_results(result_criteria)
+        self._upsert(self._stats_by_key(executions, results))
+        return len(executions) + len(results)
+
+    def _claim(self, model, columns: list, criteria: list, limit: Optional[int]) -> List[Any]:
+        """Flag finished, not yet counted rows as rolled up and return them (rows locked elsewhere are skipped)."""
+        pending = (
+            select(model.id)
+            .where(model.rolled_up.is_(False), model.status.in_(TERMINAL_STATUSES), *criteria)
+            .order_by(model.id)
+            .with_for_update(skip_locked=True)
+        )
+        if limit:
+            pending = pending.limit(limit)
+        return self.db.execute(
+            update(model)
+            .where(model.id.in_(pending.scalar_subquery()))
+            .values(rolled_up=True)
+            .returning(*columns),
+            execution_options={"synchronize_session": False}
+        ).all()
+
+    def _claim_executions(self, criteria: list, limit: Optional[int] = None) -> List[Any]:
+        return self._claim(JobExecution, [
+            JobExecution.job_id, JobExecution.status, JobExecution.created_at,
+            JobExecution.started_at, JobExecution.completed_at
+        ], criteria, limit)
+
+    def _claim_results(self, criteria: list, limit: Optional[int] = None) -> List[Any]:
+        return self._claim(JobExecutionResult, [
+            JobExecutionResult.target_id, JobExecutionResult.status, JobExecutionResult.created_at,
+            JobExecutionResult.started_at, JobExecutionResult.completed_at, JobExecutionResult.execution_time_ms
+        ], criteria, limit)
+
+    @staticmethod
+    def _stats_by_key(executions: Iterable[Any], results: Iterable[Any]) -> Dict[RollupKey, ExecutionStats]:
+        stats: Dict[RollupKey, ExecutionStats] = {}
+
+        def add(scope: str, scope_id: int, row, duration_ms: Optional[int]):
+            moment = row.created_at or row.completed_at or datetime.now(timezone.utc)
+            for grain in GRAINS:
+                bucket = bucket_start(moment, grain)
+                for key_id in (scope_id, ALL):
+                    key = (scope, key_id, grain, bucket)
+                    if key not in stats:
+                        stats[key] = ExecutionStats()
+                    stats[key].add(row.status, duration_ms)
+
+        for row in executions:
+            add(RollupScope.JOB.value, row.job_id, row, _elapsed_ms(row.started_at, row.completed_at))
+        for row in results:
+            duration_ms = row.execution_time_ms
+            if duration_ms is None:
+                duration_ms = _elapsed_ms(row.started_at, row.completed_at)
+            add(RollupScope.TARGET.value, row.target_id, row, duration_ms)
+        return stats
+
+    def _upsert(self, stats: Dict[RollupKey, ExecutionStats]):
+        if not stats:
+            return
+        # Sorted, so concurrent writers lock shared rows in the same order
+        rows = []
+        for key in sorted(stats):
+            scope, scope_id, grain, bucket = key
+            rows.append({"scope": scope, "scope_id": scope_id, "grain": grain, "bucket": bucket, **stats[key].to_values()})
+        table = ExecutionRollup.__table__
+        statement = pg_insert(table).values(rows)
+        excluded = statement.excluded
+        self.db.execute(statement.on_conflict_do_update(
+            index_elements=[table.c.scope, table.c.scope_id, table.c.grain, table.c.bucket],
+            set_={
+                "total": table.c.total + excluded.total,
+                "completed": table.c.completed + excluded.completed,
+                "failed": table.c.failed + excluded.failed,
+                "cancelled": table.c.cancelled + excluded.cancelled,
+                "timed": table.c.timed + excluded.timed,
+                "duration_sum_ms": table.c.duration_sum_ms + excluded.duration_sum_ms,
+                # least/greatest ignore NULLs
+                "duration_min_ms": func.least(table.c.duration_min_ms, excluded.duration_min_ms),
+                "duration_max_ms": func.greatest(table.c.duration_max_ms, excluded.duration_max_ms),
+                "duration_histogram": _MERGE_HISTOGRAMS,
+                "updated_at": func.now()
+            }
+        ))
+
+    # ------------------------------------------------------------------ read path
+
+    def buckets(
+        self,
+        grain: str,
+        start_time: datetime,
+        end_time: Optional[datetime] = None,
+        scope: str = RollupScope.JOB.value,
+        scope_id: int = ALL
+    ) -> List[Tuple[datetime, ExecutionStats]]:
+        """Stats per hour or day from the bucket of start_time through that of end_time, empty buckets included (one query)."""
+        step = GRAINS[grain]
+        first = bucket_start(start_time, grain)
+        last = bucket_start(end_time or datetime.now(timezone.utc), grain)
+        rows = self.db.execute(
+            select(ExecutionRollup).where(
+                ExecutionRollup.scope == scope,
+                ExecutionRollup.scope_id == scope_id,
+                ExecutionRollup.grain == grain,
+                ExecutionRollup.bucket >= first,
+                ExecutionRollup.bucket <= last
+            )
+        ).scalars().all()
+        by_bucket = {bucket_start(row.bucket, grain): row for row in rows}
+
+        series = []
+        bucket = first
+        while bucket <= last:
+            stats = ExecutionStats()
+            if bucket in by_bucket:
+                stats.merge(by_bucket[bucket])
+            series.append((bucket, stats))
+            bucket += step
+        return series
+
+    @staticmethod
+    def combine(buckets: Iterable[Tuple[datetime, ExecutionStats]]) -> ExecutionStats:
+        total = ExecutionStats()
+        for _, stats in buckets:
+            total.merge(stats)
+        return total
+
+    def summary(
+        self,
+        start_time: datetime,
+        end_time: Optional[datetime] = None,
+        scope: str = RollupScope.JOB.value,
+        scope_id: int = ALL
+    ) -> ExecutionStats:
+        """Merged stats since start_time: hourly rows for up to two days, daily rows beyond."""
+        end_time = end_time or datetime.now(timezone.utc)
+        grain = AggregationPeriod.HOUR.value if end_time - start_time <= timedelta(days=2) else AggregationPeriod.DAY.value
+        return self.combine(self.buckets(grain, start_time, end_time, scope, scope_id))
@@ -0,0 +1,186 @@
+"""
+Health Check Scheduler
+Keeps per-target next-check times in a Redis sorted set and applies hysteresis
+before health status changes are committed.
+
+- Stable targets back off towards HEALTH_SCHEDULING['max_backoff_factor'] x their base interval
+- Targets with a pending status change are re-checked quickly until it is confirmed or dropped
+- A status change is only committed after get_required_confirmations() identical results
+"""
+import logging
+import random
+import time
+from typing import Dict, Any, List, Optional, Tuple
+
+from app.core.cache import get_sync_redis_client
+from app.config.health_monitoring import (
+    get_health_check_interval,
+    get_required_confirmations,
+    HEALTH_SCHEDULING
+)
+
+logger = logging.getLogger(__name__)
+
+# Sorted set of target_id scored by the epoch time of its next check
+SCHEDULE_KEY = "health:schedule"
+# Hash of target_id -> "<status>:<count>" for a status change awaiting confirmation
+PENDING_KEY = "health:pending"
+# Hash of target_id -> number of consecutive checks that confirmed the stored status
+STREAK_KEY = "health:stable_streak"
+
+
+class HealthCheckScheduler:
+    """Adaptive per-target health check scheduling backed by Redis."""
+
+    def __init__(self, redis_client=None):
+        self._redis = redis_client
+
+    @property
+    def redis(self):
+        """Blocking Redis client, resolved on first use."""
+        if self._redis is None:
+            self._redis = get_sync_redis_client()
+        return self._redis
+
+    @property
+    def available(self) -> bool:
+        """Whether scheduling state can be stored (otherwise callers fall back to fixed batches)."""
+        return self.redis is not None
+
+    def sync_targets(self, active_target_ids: List[int], now: Optional[float] = None):
+        """
+        Add newly active targets (due immediately) and drop targets that are no longer active.
+
+        Args:
+            active_target_ids: IDs of every target that should be monitored
+            now: Current epoch time
+        """
+        now = now or time.time()
+        active = {str(target_id) for target_id in active_target_ids}
+
+        scheduled = set(self.redis.zrange(SCHEDULE_KEY, 0, -1))
+        stale = list(scheduled - active)
+        new = {member: now for member in active - scheduled}
+
+        pipe = self.redis.pipeline(transaction=False)
+        if new:
+            pipe.zadd(SCHEDULE_KEY, new, nx=True)
+        if stale:
+            pipe.zrem(SCHEDULE_KEY, *stale)
+            pipe.hdel(PENDING_KEY, *stale)
+            pipe.hdel(STREAK_KEY, *stale)
+        pipe.execute()
+
+        if new or stale:
+            logger.info(f"📅 Health schedule synced: {len(new)} added, {len(stale)} removed")
+
+    def due_target_ids(self, limit: int, now: Optional[float] = None) -> List[int]:
+        """
+        Get IDs of targets whose next check time has passed, most overdue first.
+
+        Args:
+            limit: Maximum number of IDs to return
+            now: Current epoch time
+        """
+        now = now or time.time()
+        members = self.redis.zrangebyscore(SCHEDULE_KEY, '-inf', now, start=0, num=limit)
+        return [int(member) for member in members]
+
+    def load_state(self, target_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """Fetch pending transitions and stability streaks for a batch in one round-trip."""
+        state = {target_id: {'pending_status': None, 'pending_count': 0, 'streak': 0} for target_id in target_ids}
+        if not target_ids:
+            return state
+
+        fields = [str(target_id) for target_id in target_ids]
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.hmget(PENDING_KEY, fields)
+        pipe.hmget(STREAK_KEY, fields)
+        pending_values, streak_values = pipe.execute()
+
+        for target_id, pending, streak in zip(target_ids, pending_values, streak_values):
+            if pending:
+                pending_status, _, count = pending.rpartition(':')
+                state[target_id]['pending_status'] = pending_status
+                state[target_id]['pending_count'] = int(count)
+            if streak:
+                state[target_id]['streak'] = int(streak)
+
+        return state
+
+    def evaluate(self, stored_status: str, observed_status: str, state: Dict[str, Any]) -> Tuple[Optional[str], Dict[str, Any]]:
+        """
+        Apply hysteresis to one observation.
+
+        Args:
+            stored_status: Health status currently committed for the target
+            observed_status: Status produced by the latest check
+            state: Target state from load_state()
+
+        Returns:
+            tuple: (status to commit or None, updated state)
+        """
+        if observed_status == stored_status:
+            return None, {'pending_status': None, 'pending_count': 0, 'streak': state['streak'] + 1}
+
+        count = state['pending_count'] + 1 if state['pending_status'] == observed_status else 1
+
+        if count >= get_required_confirmations(stored_status, observed_status):
+            return observed_status, {'pending_status': None, 'pending_count': 0, 'streak': 0}
+
+        return None, {'pending_status': observed_status, 'pending_count': count, 'streak': 0}
+
+    def next_interval(self, environment: str, status: str, state: Dict[str, Any]) -> float:
+        """
+        Compute seconds until the next check of a target.
+
+        The base is the configured health check interval split into several
+        liveness probes. Pending transitions shrink it so they resolve quickly;
+        each run of stable checks doubles it up to the backoff cap.
+        """
+        base = get_health_check_interval(environment or 'development', status or 'unknown')
+        interval = base / HEALTH_SCHEDULING['probe_interval_divisor']
+
+        if state['pending_status']:
+            interval *= HEALTH_SCHEDULING['transition_interval_factor']
+        else:
+            doublings = state['streak'] // HEALTH_SCHEDULING['stable_checks_per_doubling']
+            interval *= min(2 ** doublings, HEALTH_SCHEDULING['max_backoff_factor'])
+
+        jitter = HEALTH_SCHEDULING['jitter']
+        interval *= random.uniform(1 - jitter, 1 + jitter)
+        return max(interval, HEALTH_SCHEDULING['min_interval'])
+
+    def save(self, updates: Dict[int, Tuple[Dict[str, Any], float]]):
+        """
+        Persist updated state and next check times for a batch in one round-trip.
+
+        Args:
+            updates: target_id -> (state from evaluate(), next check epoch time)
+        """
+        if not updates:
+            return
+
+        pending = {}
+        cleared = []
+        streaks = {}
+        schedule = {}
+
+        for target_id, (state, next_check) in updates.items():
+            field = str(target_id)
+            if state['pending_status']:
+                pending[field] = f"{state['pending_status']}:{state['pending_count']}"
+            else:
+                cleared.append(field)
+            streaks[field] = state['streak']
+            schedule[field] = next_check
+
+        pipe = self.redis.pipeline(transaction=False)
+        if pending:
+            pipe.hset(PENDING_KEY, mapping=pending)
+        if cleared:
+            pipe.hdel(PENDING_KEY, *cleared)
+        pipe.hset(STREAK_KEY, mapping=streaks)
+        # XX: never resurrect a target removed by sync_targets() while it was being checked
+        pipe.zadd(SCHEDULE_KEY, schedule, xx=True)
+        pipe.execute()
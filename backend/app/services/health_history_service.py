@@ -0,0 +1,385 @@
+"""
+Health History Service
+Compact per-target health history kept in fixed-size Redis rings.
+
+Three tiers per target, each a capped Redis list of packed binary records:
+- raw: one 7 byte record per check (timestamp, status, latency)
+- 5m:  one 43 byte bucket per 5 minutes (counts, transitions, worst status, latency histogram)
+- 1h:  same bucket layout per hour
+Raw samples are rolled into 5m buckets and 5m into 1h by downsample(), run from Celery beat.
+Storage per target is bounded by the ring capacities no matter how long history runs.
+"""
+import logging
+import math
+import struct
+import time
+from typing import Dict, Any, List, Optional, Tuple
+
+from app.core.cache import get_sync_redis_client
+from app.config.health_monitoring import HEALTH_HISTORY_SETTINGS
+
+logger = logging.getLogger(__name__)
+
+HISTORY_KEY_PREFIX = "health:history"
+# Set of target IDs that have recorded history
+HISTORY_TARGETS_KEY = f"{HISTORY_KEY_PREFIX}:targets"
+# Hash of "<target_id>:<tier>" -> epoch time up to which the source tier has been rolled up
+HISTORY_WATERMARK_KEY = f"{HISTORY_KEY_PREFIX}:watermark"
+
+STATUS_CODES = {'unknown': 0, 'healthy': 1, 'warning': 2, 'critical': 3}
+STATUS_NAMES = {code: name for name, code in STATUS_CODES.items()}
+AVAILABLE_CODES = {STATUS_CODES['healthy'], STATUS_CODES['warning']}
+
+# epoch seconds, status code, latency in ms (NO_LATENCY when the check failed)
+RAW_RECORD = struct.Struct('<IBH')
+# bucket start, samples, available samples, transitions, worst status, latency histogram
+HISTOGRAM_BINS = 16
+BUCKET_RECORD = struct.Struct(f'<IHHHB{HISTOGRAM_BINS}H')
+NO_LATENCY = 0xFFFF
+MAX_COUNT = 0xFFFF
+
+# tier -> (bucket width in seconds, source tier, capacity setting)
+TIERS = {
+    'raw': (None, None, 'raw_capacity'),
+    '5m': (300, 'raw', 'bucket_5m_capacity'),
+    '1h': (3600, '5m', 'bucket_1h_capacity')
+}
+
+
+def _history_key(tier: str, target_id: int) -> str:
+    return f"{HISTORY_KEY_PREFIX}:{tier}:{target_id}"
+
+
+def _latency_bin(latency_ms: int) -> int:
+    """Log2 histogram bin: bin 0 is <1ms, bin n covers [2^(n-1), 2^n) ms, the last bin is open-ended."""
+    return min(int(latency_ms).bit_length(), HISTOGRAM_BINS - 1)
+
+
+def _bin_upper_bound(bin_index: int) -> int:
+    return 2 ** bin_index
+
+
+def _percentile(sorted_values: List[int], fraction: float) -> Optional[int]:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(math.ceil(fraction * len(sorted_values)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def _histogram_percentile(histogram: List[int], fraction: float) -> Optional[int]:
+    """Percentile estimate (bin upper bound) from a latency histogram."""
+    total = sum(histogram)
+    if not total:
+        return None
+    threshold = fraction * total
+    running = 0
+    for bin_index, count in enumerate(histogram):
+        running += count
+        if running >= threshold:
+            return _bin_upper_bound(bin_index)
+    return _bin_upper_bound(HISTOGRAM_BINS - 1)
+
+
+class _Summary:
+    """Accumulates samples or buckets into availability and latency statistics."""
+
+    def __init__(self):
+        self.samples = 0
+        self.available = 0
+        self.transitions = 0
+        self.worst = 0
+        self.histogram = [0] * HISTOGRAM_BINS
+        self.latencies: Optional[List[int]] = []
+
+    def add_sample(self, status: int, latency_ms: int, previous_status: Optional[int]):
+        self.samples += 1
+        self.worst = max(self.worst, status)
+        if status in AVAILABLE_CODES:
+            self.available += 1
+        if previous_status is not None and previous_status != status:
+            self.transitions += 1
+        if latency_ms != NO_LATENCY:
+            self.histogram[_latency_bin(latency_ms)] += 1
+            if self.latencies is not None:
+                self.latencies.append(latency_ms)
+
+    def add_bucket(self, bucket: Dict[str, Any]):
+        self.samples += bucket['samples']
+        self.available += bucket['available']
+        self.transitions += bucket['transitions']
+        self.worst = max(self.worst, bucket['worst'])
+        for bin_index, count in enumerate(bucket['histogram']):
+            self.histogram[bin_index] += count
+        # Buckets only carry histograms, so percentiles become estimates
+        self.latencies = None
+
+    def merge(self, other: '_Summary'):
+        self.samples += other.samples
+        self.available += other.available
+        self.transitions += other.transitions
+        self.worst = max(self.worst, other.worst)
+        for bin_index, count in enumerate(other.histogram):
+            self.histogram[bin_index] += count
+        if self.latencies is not None and other.latencies is not None:
+            self.latencies.extend(other.latencies)
+        else:
+            self.latencies = None
+
+    def to_bucket(self, start: int) -> bytes:
+        return BUCKET_RECORD.pack(
+            start,
+            min(self.samples, MAX_COUNT),
+            min(self.available, MAX_COUNT),
+            min(self.transitions, MAX_COUNT),
+            self.worst,
+            *[min(count, MAX_COUNT) for count in self.histogram]
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        if self.latencies is not None:
+            ordered = sorted(self.latencies)
+            latency = {name: _percentile(ordered, fraction) for name, fraction in (('p50', 0.5), ('p95', 0.95), ('p99', 0.99))}
+        else:
+            latency = {name: _histogram_percentile(self.histogram, fraction) for name, fraction in (('p50', 0.5), ('p95', 0.95), ('p99', 0.99))}
+
+        return {
+            'samples': self.samples,
+            'availability_percent': round(self.available / self.samples * 100, 3) if self.samples else None,
+            'transitions': self.transitions,
+            'worst_status': STATUS_NAMES.get(self.worst, 'unknown') if self.samples else None,
+            'latency_ms': latency,
+            'latency_exact': self.latencies is not None
+        }
+
+
+class HealthHistoryService:
+    """Record, downsample and query per-target health history."""
+
+    def __init__(self, redis_client=None):
+        self._redis = redis_client
+
+    @property
+    def redis(self):
+        """Binary blocking Redis client, resolved on first use."""
+        if self._redis is None:
+            self._redis = get_sync_redis_client(decode_responses=False)
+        return self._redis
+
+    @property
+    def available(self) -> bool:
+        return HEALTH_HISTORY_SETTINGS['enabled'] and self.redis is not None
+
+    # ------------------------------------------------------------------ write path
+
+    def record_samples(self, samples: List[Tuple[int, str, Optional[float], float]]):
+        """
+        Append check results to the raw rings in one round-trip.
+
+        Args:
+            samples: (target_id, health_status, response_time in seconds or None, epoch time)
+        """
+        if not samples or not self.available:
+            return
+
+        capacity = HEALTH_HISTORY_SETTINGS['raw_capacity']
+        pipe = self.redis.pipeline(transaction=False)
+        for target_id, status, response_time, timestamp in samples:
+            latency_ms = NO_LATENCY if response_time is None else min(int(response_time * 1000), NO_LATENCY - 1)
+            record = RAW_RECORD.pack(int(timestamp), STATUS_CODES.get(status, 0), latency_ms)
+            key = _history_key('raw', target_id)
+            pipe.rpush(key, record)
+            pipe.ltrim(key, -capacity, -1)
+        pipe.sadd(HISTORY_TARGETS_KEY, *[target_id for target_id, _, _, _ in samples])
+
+        try:
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f"Failed to record health history: {str(e)}")
+
+    def forget_target(self, target_id: int):
+        """Drop a deleted target's rings, watermarks and membership in the sweep set."""
+        if not self.available:
+            return
+
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.delete(*[_history_key(tier, target_id) for tier in TIERS])
+        pipe.hdel(HISTORY_WATERMARK_KEY, *[f"{target_id}:{tier}" for tier, (width, _, _) in TIERS.items() if width])
+        pipe.srem(HISTORY_TARGETS_KEY, target_id)
+
+        try:
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f"Failed to remove health history for target {target_id}: {str(e)}")
+
+    # ------------------------------------------------------------------ downsampling
+
+    def downsample(self, now: Optional[float] = None) -> Dict[str, int]:
+        """
+        Roll complete raw periods into 5m buckets and complete 5m periods into 1h buckets.
+
+        Returns:
+            dict: Number of buckets written per tier
+        """
+        written = {'5m': 0, '1h': 0}
+        if not self.available:
+            return written
+
+        now = now or time.time()
+        target_ids = [int(member) for member in self.redis.smembers(HISTORY_TARGETS_KEY)]
+
+        # Targets whose raw ring is gone have nothing left to roll up; stop visiting them
+        pipe = self.redis.pipeline(transaction=False)
+        for target_id in target_ids:
+            pipe.exists(_history_key('raw', target_id))
+        missing = [target_id for target_id, exists in zip(target_ids, pipe.execute()) if not exists]
+        if missing:
+            self.redis.srem(HISTORY_TARGETS_KEY, *missing)
+            missing = set(missing)
+            target_ids = [target_id for target_id in target_ids if target_id not in missing]
+
+        for target_id in target_ids:
+            try:
+                # 5m before 1h so an hour is complete before it is rolled up
+                for tier in ('5m', '1h'):
+                    written[tier] += self._roll_up(target_id, tier, now)
+            except Exception as e:
+                logger.error(f"Health history downsampling failed for target {target_id}: {str(e)}")
+
+        return written
+
+    def _roll_up(self, target_id: int, tier: str, now: float) -> int:
+        width, source_tier, capacity_setting = TIERS[tier]
+        boundary = int(now // width * width)
+        watermark_field = f"{target_id}:{tier}"
+
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.lrange(_history_key(source_tier, target_id), 0, -1)
+        pipe.hget(HISTORY_WATERMARK_KEY, watermark_field)
+        records, watermark = pipe.execute()
+        watermark = int(watermark) if watermark is not None else 0
+
+        buckets: Dict[int, _Summary] = {}
+        if source_tier == 'raw':
+            previous_status = None
+            for timestamp, status, latency_ms in (RAW_RECORD.unpack(record) for record in records):
+                if watermark <= timestamp < boundary:
+                    start = timestamp // width * width
+                    buckets.setdefault(start, _Summary()).add_sample(status, latency_ms, previous_status)
+                previous_status = status
+        else:
+            source_width = TIERS[source_tier][0]
+            for bucket in (self._unpack_bucket(record) for record in records):
+                if bucket['start'] >= watermark and bucket['start'] + source_width <= boundary:
+                    start = bucket['start'] // width * width
+                    buckets.setdefault(start, _Summary()).add_bucket(bucket)
+
+        if not buckets and watermark >= boundary:
+            return 0
+
+        key = _history_key(tier, target_id)
+        pipe = self.redis.pipeline(transaction=True)
+        if buckets:
+            pipe.rpush(key, *[buckets[start].to_bucket(start) for start in sorted(buckets)])
+            pipe.ltrim(key, -HEALTH_HISTORY_SETTINGS[capacity_setting], -1)
+        pipe.hset(HISTORY_WATERMARK_KEY, watermark_field, boundary)
+        pipe.execute()
+
+        return len(buckets)
+
+    def _unpack_bucket(self, record: bytes) -> Dict[str, Any]:
+        start, samples, available, transitions, worst, *histogram = BUCKET_RECORD.unpack(record)
+        return {
+            'start': start,
+            'samples': samples,
+            'available': available,
+            'transitions': transitions,
+            'worst': worst,
+            'histogram': histogram
+        }
+
+    # ------------------------------------------------------------------ queries
+
+    def _select_tier(self, start: float, end: float) -> str:
+        span = end - start
+        if span <= 3600:
+            return 'raw'
+        if span <= 7 * 86400:
+            return '5m'
+        return '1h'
+
+    def _summarize(self, tier: str, records: List[bytes], start: float, end: float) -> _Summary:
+        summary = _Summary()
+        if tier == 'raw':
+            previous_status = None
+            for timestamp, status, latency_ms in (RAW_RECORD.unpack(record) for record in records):
+                if start <= timestamp < end:
+                    summary.add_sample(status, latency_ms, previous_status)
+                    previous_status = status
+                elif timestamp < start:
+                    previous_status = status
+        else:
+            width = TIERS[tier][0]
+            for bucket in (self._unpack_bucket(record) for record in records):
+                if bucket['start'] + width > start and bucket['start'] < end:
+                    summary.add_bucket(bucket)
+        return summary
+
+    def get_target_summary(
+        self,
+        target_id: int,
+        start: float,
+        end: Optional[float] = None,
+        resolution: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Availability, transition count and latency percentiles for one target.
+
+        Args:
+            target_id: Target ID
+            start: Range start (epoch seconds)
+            end: Range end (epoch seconds), defaults to now
+            resolution: 'raw', '5m' or '1h'; picked from the range length when omitted
+        """
+        return self.get_group_summary([target_id], start, end, resolution)['targets'][0]
+
+    def get_group_summary(
+        self,
+        target_ids: List[int],
+        start: float,
+        end: Optional[float] = None,
+        resolution: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Per-target and aggregate statistics for a group of targets, most transitions first.
+
+        All rings are fetched in a single pipelined round-trip.
+        """
+        end = end or time.time()
+        tier = resolution or self._select_tier(start, end)
+        if tier not in TIERS:
+            raise ValueError(f"Unknown resolution: {tier}")
+
+        records_per_target: List[List[bytes]] = [[] for _ in target_ids]
+        if self.available and target_ids:
+            pipe = self.redis.pipeline(transaction=False)
+            for target_id in target_ids:
+                pipe.lrange(_history_key(tier, target_id), 0, -1)
+            records_per_target = pipe.execute()
+
+        aggregate = _Summary()
+        targets = []
+        for target_id, records in zip(target_ids, records_per_target):
+            summary = self._summarize(tier, records, start, end)
+            aggregate.merge(summary)
+            targets.append(dict(summary.to_dict(), target_id=target_id))
+
+        targets.sort(key=lambda item: item['transitions'], reverse=True)
+
+        return {
+            'resolution': tier,
+            'start': int(start),
+            'end': int(end),
+            'targets': targets,
+            'aggregate': aggregate.to_dict()
+        }
@@ -1,7 +1,16 @@
 """
 Health Monitoring Service
 Handles target health checks and status updates.
+
+Checks are tiered so routine monitoring costs sockets, not logins:
+- Tier 0 (liveness): async TCP connect to the primary method port, every cycle
+- Tier 1 (auth): protocol-level authenticated check, on the per-status interval
+- Tier 2 (deep): authenticated check plus a remote command, on demand
+A target escalates from tier 0 to tier 1 when its reachability changed since
+the last cycle, when tier 0 cannot tell (UDP methods) or when its tier 1
+interval elapsed. Unreachable targets are marked critical without a login.
 """
+import asyncio
 import logging
 import time
 from datetime import datetime, timedelta
@@ -10,32 +19,76 @@ from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_
 
 from app.models.universal_target_models import UniversalTarget, TargetCommunicationMethod
-from app.utils.connection_test_utils import test_ssh_connection, test_winrm_connection
+from app.utils.connection_test_utils import (
+    test_ssh_connection,
+    test_winrm_connection,
+    test_rest_api_connection,
+    test_elasticsearch_connection,
+    check_rest_api_async,
+    check_elasticsearch_async,
+    execute_ssh_command,
+    execute_winrm_command
+)
 from app.utils.encryption_utils import decrypt_credentials
+from app.core.cache import get_sync_redis_client
+from app.utils.circuit_breaker import host_circuit_breaker
+from app.utils.http_client import target_http_client
+from app.services.health_check_scheduler import HealthCheckScheduler
+from app.services.health_history_service import HealthHistoryService
 from app.config.health_monitoring import (
     get_health_check_interval,
     get_health_check_timeout,
+    get_health_check_port,
     should_escalate_to_warning,
     should_escalate_to_critical,
     should_recover_to_healthy,
-    HEALTH_MONITORING_SETTINGS
+    HEALTH_MONITORING_SETTINGS,
+    HEALTH_THRESHOLDS,
+    HEALTH_SCHEDULING,
+    HEALTH_CHECK_UDP_METHODS,
+    HEALTH_TIER_LIVENESS,
+    HEALTH_TIER_AUTH,
+    HEALTH_TIER_DEEP
 )
 
 logger = logging.getLogger(__name__)
 
+# Redis hash of target_id -> epoch seconds of the last tier 1 (authenticated) check
+AUTH_CHECK_TIMESTAMPS_KEY = "health:auth_checked_at"
+# Redis hash of target_id -> "1"/"0" outcome of the last tier 0 probe
+LIVENESS_STATE_KEY = "health:reachable"
+
+# Commands run by tier 2 deep checks, per method type
+DEEP_CHECK_COMMANDS = {
+    'ssh': 'uptime',
+    'winrm': 'hostname'
+}
+
+# Method types checked over HTTP; a batch runs their tier 1 checks concurrently on the shared pool
+HTTP_CHECK_METHODS = {
+    'rest_api': check_rest_api_async,
+    'elasticsearch': check_elasticsearch_async
+}
+
 
 class HealthMonitoringService:
     """Service for monitoring target health and updating status."""
     
     def __init__(self, db: Session):
         self.db = db
+        self.scheduler = HealthCheckScheduler()
+        self.history = HealthHistoryService()
     
-    def check_target_health(self, target: UniversalTarget) -> Dict[str, Any]:
+    def check_target_health(self, target: UniversalTarget, tier: int = HEALTH_TIER_AUTH,
+                            prefetched: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Check the health of a single target using its primary communication method.
         
         Args:
             target: UniversalTarget instance with loaded communication methods
+            tier: HEALTH_TIER_AUTH for a protocol-level check, HEALTH_TIER_DEEP to
+                  additionally run a remote command (SSH/WinRM only)
+            prefetched: Result of an HTTP check already run by prefetch_http_checks()
             
         Returns:
             dict: Health check result with status, response_time, and details
@@ -56,22 +109,7 @@ class HealthMonitoringService:
         timeout = get_health_check_timeout(primary_method.method_type)
         
         try:
-            # Get primary credential for this method
-            primary_credential = None
-            if primary_method.credentials:
-                # Look for primary credential first
-                for cred in primary_method.credentials:
-                    if cred.is_primary and cred.is_active:
-                        primary_credential = cred
-                        break
-                
-                # If no primary, get first active credential
-                if not primary_credential:
-                    for cred in primary_method.credentials:
-                        if cred.is_active:
-                            primary_credential = cred
-                            break
-            
+            primary_credential = self._get_primary_credential(primary_method)
             if not primary_credential:
                 return {
                     'success': False,
@@ -79,13 +117,28 @@ class HealthMonitoringService:
                     'health_status': 'critical'
                 }
             
+            # Fail fast while other subsystems have found the host unreachable
+            host = (primary_method.config or {}).get('host')
+            port = get_health_check_port(primary_method.method_type, primary_method.config)
+            # A prefetched check already went through the breaker
+            if prefetched is None and not host_circuit_breaker.allow(host, port):
+                return {
+                    'success': False,
+                    'message': f'Circuit open for {host}:{port} - skipping authenticated check',
+                    'health_status': 'critical',
+                    'response_time': None,
+                    'tier': tier
+                }
+            
             # Decrypt credentials
             decrypted_creds = decrypt_credentials(primary_credential.encrypted_credentials)
             
             # Perform health check based on method type
             start_time = time.time()
             
-            if primary_method.method_type == 'ssh':
+            if prefetched is not None:
+                result = prefetched
+            elif primary_method.method_type == 'ssh':
                 result = self._check_ssh_health(primary_method, decrypted_creds, timeout)
             elif primary_method.method_type == 'winrm':
                 result = self._check_winrm_health(primary_method, decrypted_creds, timeout)
@@ -95,6 +148,8 @@ class HealthMonitoringService:
                 result = self._check_telnet_health(primary_method, decrypted_creds, timeout)
             elif primary_method.method_type == 'rest_api':
                 result = self._check_rest_api_health(primary_method, decrypted_creds, timeout)
+            elif primary_method.method_type == 'elasticsearch':
+                result = self._check_elasticsearch_health(primary_method, decrypted_creds, timeout)
             elif primary_method.method_type == 'smtp':
                 result = self._check_smtp_health(primary_method, decrypted_creds, timeout)
             else:
@@ -104,19 +159,17 @@ class HealthMonitoringService:
                     'health_status': 'unknown'
                 }
             
+            if result['success'] and tier >= HEALTH_TIER_DEEP:
+                result = self._run_deep_check(primary_method, decrypted_creds, timeout, result)
+            
             response_time = time.time() - start_time
+            if result.get('timing') and tier < HEALTH_TIER_DEEP:
+                # Time spent on the wire, excluding any wait for a pooled connection slot
+                response_time = result['timing']['total_ms'] / 1000
+            host_circuit_breaker.record_result(host, port, result['success'], result.get('message'))
             result['response_time'] = response_time
-            
-            # Determine health status based on result and response time
-            if result['success']:
-                if response_time <= 5.0:
-                    result['health_status'] = 'healthy'
-                elif response_time <= 10.0:
-                    result['health_status'] = 'warning'
-                else:
-                    result['health_status'] = 'critical'
-            else:
-                result['health_status'] = 'critical'
+            result['tier'] = tier
+            result['health_status'] = self._status_from_response(result['success'], response_time)
             
             return result
             
@@ -129,6 +182,171 @@ class HealthMonitoringService:
                 'response_time': None
             }
     
+    def _status_from_response(self, success: bool, response_time: Optional[float]) -> str:
+        """Map a check outcome and its response time to a health status."""
+        if not success:
+            return 'critical'
+        if response_time is None or response_time <= HEALTH_THRESHOLDS['response_time_warning']:
+            return 'healthy'
+        if response_time <= HEALTH_THRESHOLDS['response_time_critical']:
+            return 'warning'
+        return 'critical'
+    
+    def _run_deep_check(self, method: TargetCommunicationMethod, credentials: Dict[str, Any], timeout: int, auth_result: Dict[str, Any]) -> Dict[str, Any]:
+        """Run a remote command on top of a successful authenticated check (tier 2)."""
+        command = DEEP_CHECK_COMMANDS.get(method.method_type)
+        if not command:
+            auth_result['message'] = f"{auth_result.get('message', '')} (no deep check for {method.method_type})"
+            return auth_result
+        
+        host = method.config.get('host')
+        port = get_health_check_port(method.method_type, method.config)
+        
+        if method.method_type == 'ssh':
+            output = execute_ssh_command(host, port, credentials, command, timeout)
+        else:
+            output = execute_winrm_command(host, port, credentials, command, timeout)
+        
+        if output.get('success'):
+            return {
+                'success': True,
+                'message': f"Deep check passed: {command} -> {(output.get('output') or '')[:200]}"
+            }
+        return {
+            'success': False,
+            'message': f"Deep check failed: {command} -> {(output.get('error') or '')[:200]}"
+        }
+    
+    def _get_probe_endpoint(self, target: UniversalTarget) -> Optional[Tuple[str, str, int]]:
+        """Resolve (method_type, host, port) probed by the tier 0 liveness check."""
+        method = self._get_primary_communication_method(target)
+        if not method or not method.config:
+            return None
+        
+        host = method.config.get('host')
+        port = get_health_check_port(method.method_type, method.config)
+        if not host or not port:
+            return None
+        
+        return method.method_type, host, port
+    
+    async def _probe_tcp(self, host: str, port: int, timeout: float) -> Dict[str, Any]:
+        """Open and immediately close a TCP connection, timing the handshake."""
+        start_time = time.perf_counter()
+        try:
+            _, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout=timeout)
+        except asyncio.TimeoutError:
+            return {'success': False, 'message': f'Port {port} on {host} timed out after {timeout}s', 'response_time': None}
+        except OSError as e:
+            return {'success': False, 'message': f'Port {port} on {host} unreachable: {str(e)}', 'response_time': None}
+        
+        response_time = time.perf_counter() - start_time
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except Exception:
+            pass
+        
+        return {'success': True, 'message': f'Port {port} on {host} is accepting connections', 'response_time': response_time}
+    
+    async def check_targets_liveness(self, targets: List[UniversalTarget]) -> Dict[int, Dict[str, Any]]:
+        """
+        Run tier 0 liveness probes for many targets concurrently.
+        
+        Args:
+            targets: Targets with loaded communication methods
+            
+        Returns:
+            dict: target_id -> probe result. Targets without a TCP endpoint
+                  (no host, UDP-only method) get a result with success=None.
+        """
+        timeout = HEALTH_MONITORING_SETTINGS['liveness_timeout']
+        semaphore = asyncio.Semaphore(HEALTH_MONITORING_SETTINGS['max_concurrent_probes'])
+        
+        # Resolve endpoints up front so the coroutines never touch the DB session
+        endpoints = {target.id: self._get_probe_endpoint(target) for target in targets}
+        
+        async def probe(target_id: int) -> Tuple[int, Dict[str, Any]]:
+            endpoint = endpoints[target_id]
+            if endpoint is None or endpoint[0] in HEALTH_CHECK_UDP_METHODS:
+                return target_id, {'success': None, 'message': 'No TCP endpoint to probe'}
+            
+            _, host, port = endpoint
+            async with semaphore:
+                result = await self._probe_tcp(host, port, timeout)
+            result.update(tier=HEALTH_TIER_LIVENESS, host=host, port=port)
+            return target_id, result
+        
+        results = await asyncio.gather(*(probe(target_id) for target_id in endpoints))
+        return dict(results)
+    
+    def _get_tier_state(self, target_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Fetch per-target tier state: last tier 1 check time and last tier 0 outcome.
+        Targets without recorded state (or with Redis unavailable) get None values.
+        """
+        state = {target_id: {'auth_checked_at': None, 'reachable': None} for target_id in target_ids}
+        redis_client = get_sync_redis_client()
+        if not redis_client or not target_ids:
+            return state
+        
+        fields = [str(target_id) for target_id in target_ids]
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            pipe.hmget(AUTH_CHECK_TIMESTAMPS_KEY, fields)
+            pipe.hmget(LIVENESS_STATE_KEY, fields)
+            checked_at_values, reachable_values = pipe.execute()
+        except Exception as e:
+            logger.warning(f"Failed to read health tier state: {str(e)}")
+            return state
+        
+        for target_id, checked_at, reachable in zip(target_ids, checked_at_values, reachable_values):
+            if checked_at is not None:
+                state[target_id]['auth_checked_at'] = float(checked_at)
+            if reachable is not None:
+                state[target_id]['reachable'] = reachable == '1'
+        
+        return state
+    
+    def _record_tier_state(self, liveness_results: Dict[int, Dict[str, Any]], auth_checked_ids: List[int], checked_at: float):
+        """Persist tier 0 outcomes and tier 1 check times for the next cycle."""
+        redis_client = get_sync_redis_client()
+        if not redis_client:
+            return
+        
+        reachable = {
+            str(target_id): '1' if result['success'] else '0'
+            for target_id, result in liveness_results.items()
+            if result.get('success') is not None
+        }
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            if reachable:
+                pipe.hset(LIVENESS_STATE_KEY, mapping=reachable)
+            if auth_checked_ids:
+                pipe.hset(AUTH_CHECK_TIMESTAMPS_KEY, mapping={str(target_id): checked_at for target_id in auth_checked_ids})
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f"Failed to record health tier state: {str(e)}")
+    
+    def _needs_auth_check(self, target: UniversalTarget, liveness: Dict[str, Any], tier_state: Dict[str, Any], now: float) -> bool:
+        """
+        Decide whether a target escalates from tier 0 to tier 1 this cycle.
+        
+        Unreachable targets never escalate. Reachable targets escalate when tier 0
+        has nothing to say (UDP method), when reachability changed since the last
+        cycle, or when the tier 1 interval for their environment and status elapsed.
+        """
+        if liveness.get('success') is None:
+            return True
+        if not liveness['success']:
+            return False
+        if tier_state['reachable'] is not True or tier_state['auth_checked_at'] is None:
+            return True
+        
+        interval = get_health_check_interval(target.environment or 'development', target.health_status or 'unknown')
+        return now - tier_state['auth_checked_at'] >= interval
+    
     def _check_ssh_health(self, method: TargetCommunicationMethod, credentials: Dict[str, Any], timeout: int) -> Dict[str, Any]:
         """Check SSH connectivity for health monitoring."""
         host = method.config.get('host')
@@ -212,26 +430,21 @@ class HealthMonitoringService:
         """Check REST API connectivity for health monitoring."""
         host = method.config.get('host')
         port = method.config.get('port', 80)
-        protocol = method.config.get('protocol', 'http')
-        base_path = method.config.get('base_path', '/')
         
         if not host:
             return {'success': False, 'message': 'No host configured'}
         
-        try:
-            import requests
-            url = f"{protocol}://{host}:{port}{base_path}"
-            
-            # Simple GET request to check if API is responding
-            response = requests.get(url, timeout=timeout, verify=method.config.get('verify_ssl', True))
-            
-            if response.status_code < 500:  # Any response under 500 means the API is responding
-                return {'success': True, 'message': f'REST API responding at {url} (status: {response.status_code})'}
-            else:
-                return {'success': False, 'message': f'REST API error at {url} (status: {response.status_code})'}
-                
-        except Exception as e:
-            return {'success': False, 'message': f'REST API health check failed: {str(e)}'}
+        return test_rest_api_connection(host, port, credentials, method.config, timeout)
+    
+    def _check_elasticsearch_health(self, method: TargetCommunicationMethod, credentials: Dict[str, Any], timeout: int) -> Dict[str, Any]:
+        """Check Elasticsearch cluster reachability for health monitoring."""
+        host = method.config.get('host')
+        port = method.config.get('port', 9200)
+        
+        if not host:
+            return {'success': False, 'message': 'No host configured'}
+        
+        return test_elasticsearch_connection(host, port, credentials, method.config, timeout)
     
     def _check_smtp_health(self, method: TargetCommunicationMethod, credentials: Dict[str, Any], timeout: int) -> Dict[str, Any]:
         """Check SMTP connectivity for health monitoring - CONNECTIVITY ONLY, NO EMAILS SENT."""
@@ -255,6 +468,65 @@ class HealthMonitoringService:
         
         return result
     
+    def _get_primary_credential(self, method: TargetCommunicationMethod):
+        """Get the primary active credential of a method, falling back to the first active one."""
+        active = [cred for cred in (method.credentials or []) if cred.is_active]
+        for cred in active:
+            if cred.is_primary:
+                return cred
+        return active[0] if active else None
+    
+    def prefetch_http_checks(self, targets: List[UniversalTarget]) -> Dict[int, Dict[str, Any]]:
+        """
+        Run tier 1 checks of HTTP-based targets concurrently on the shared HTTP client.
+        
+        Targets that are not HTTP-based, lack credentials or have an open circuit
+        are left out and get checked the normal way.
+        
+        Returns:
+            dict: target_id -> check result, to be passed to check_target_health()
+        """
+        if not target_http_client.available:
+            return {}
+        
+        target_ids = []
+        checks = []
+        for target in targets:
+            method = self._get_primary_communication_method(target)
+            if not method or method.method_type not in HTTP_CHECK_METHODS or not (method.config or {}).get('host'):
+                continue
+            credential = self._get_primary_credential(method)
+            if not credential:
+                continue
+            
+            host = method.config['host']
+            if not host_circuit_breaker.allow(host, get_health_check_port(method.method_type, method.config)):
+                continue
+            
+            try:
+                credentials = decrypt_credentials(credential.encrypted_credentials)
+            except Exception as e:
+                logger.error(f"Could not decrypt credentials for target {target.id}: {str(e)}")
+                continue
+            
+            check = HTTP_CHECK_METHODS[method.method_type]
+            target_ids.append(target.id)
+            checks.append(check(host, get_health_check_port(method.method_type, method.config), credentials,
+                                method.config, get_health_check_timeout(method.method_type)))
+        
+        if not checks:
+            return {}
+        
+        outcomes = target_http_client.run_many(checks)
+        prefetched = {}
+        for target_id, outcome in zip(target_ids, outcomes):
+            if isinstance(outcome, Exception):
+                outcome = {'success': False, 'message': f'HTTP health check failed: {str(outcome) or type(outcome).__name__}'}
+            prefetched[target_id] = outcome
+        
+        logger.info(f"🌐 Ran {len(prefetched)} HTTP health checks concurrently")
+        return prefetched
+    
     def _get_primary_communication_method(self, target: UniversalTarget) -> Optional[TargetCommunicationMethod]:
         """Get the primary communication method for a target."""
         if not target.communication_methods:
@@ -336,7 +608,9 @@ class HealthMonitoringService:
     
     def get_targets_for_health_check(self, batch_size: int = None) -> List[UniversalTarget]:
         """
-        Get targets that need health checks based on their last check time and intervals.
+        Get targets whose scheduled next check time has passed, most overdue first.
+        
+        Falls back to the first active targets when the scheduler has no Redis.
         
         Args:
             batch_size: Maximum number of targets to return
@@ -347,25 +621,32 @@ class HealthMonitoringService:
         if batch_size is None:
             batch_size = HEALTH_MONITORING_SETTINGS['batch_size']
         
-        # Get active targets that need health checks
-        # For now, we'll check all active targets - in future we can add last_health_check timestamp
-        targets = (
-            self.db.query(UniversalTarget)
-            .filter(
-                and_(
-                    UniversalTarget.is_active == True,
-                    UniversalTarget.status == 'active'
-                )
-            )
-            .limit(batch_size)
-            .all()
+        active_filter = and_(
+            UniversalTarget.is_active == True,
+            UniversalTarget.status == 'active'
         )
         
-        return targets
+        if not self.scheduler.available:
+            return self.db.query(UniversalTarget).filter(active_filter).limit(batch_size).all()
+        
+        now = time.time()
+        active_ids = [row.id for row in self.db.query(UniversalTarget.id).filter(active_filter).all()]
+        self.scheduler.sync_targets(active_ids, now)
+        
+        due_ids = self.scheduler.due_target_ids(batch_size, now)
+        if not due_ids:
+            return []
+        
+        targets = self.db.query(UniversalTarget).filter(UniversalTarget.id.in_(due_ids)).all()
+        order = {target_id: position for position, target_id in enumerate(due_ids)}
+        return sorted(targets, key=lambda target: order[target.id])
     
     def run_health_check_batch(self, batch_size: int = None) -> Dict[str, Any]:
         """
-        Run health checks on a batch of targets.
+        Run health checks on a batch of due targets.
+        
+        Observations pass through the scheduler's hysteresis; only confirmed
+        status changes are written to the database.
         
         Args:
             batch_size: Number of targets to check in this batch
@@ -388,33 +669,93 @@ class HealthMonitoringService:
             'critical': 0,
             'unknown': 0,
             'errors': 0,
-            'status_changes': 0
+            'status_changes': 0,
+            'pending_changes': 0,
+            'liveness_probes': 0,
+            'auth_checks': 0
         }
         
         logger.info(f"🏥 Starting health check batch for {len(targets)} targets")
         
+        # Tier 0 for every target, concurrently
+        liveness_results = asyncio.run(self.check_targets_liveness(targets))
+        results['liveness_probes'] = sum(1 for r in liveness_results.values() if r.get('success') is not None)
+        
+        # Liveness probes double as out-of-band circuit breaker probes
+        host_circuit_breaker.record_results([
+            (r['host'], r['port'], r['success'])
+            for r in liveness_results.values()
+            if r.get('success') is not None
+        ])
+        
+        now = time.time()
+        target_ids = [target.id for target in targets]
+        tier_state = self._get_tier_state(target_ids)
+        schedule_state = self.scheduler.load_state(target_ids) if self.scheduler.available else {}
+        schedule_updates = {}
+        history_samples = []
+        auth_checked_ids = []
+        
+        needs_auth = {
+            target.id: self._needs_auth_check(target, liveness_results.get(target.id, {'success': None}), tier_state[target.id], now)
+            for target in targets
+        }
+        # HTTP-based tier 1 checks don't wait on each other
+        prefetched = self.prefetch_http_checks([target for target in targets if needs_auth[target.id]])
+        
         for target in targets:
             try:
-                # Check target health
-                health_result = self.check_target_health(target)
+                liveness = liveness_results.get(target.id, {'success': None})
+                
+                if needs_auth[target.id]:
+                    # Tier 1: authenticated protocol check
+                    health_result = self.check_target_health(target, tier=HEALTH_TIER_AUTH, prefetched=prefetched.get(target.id))
+                    auth_checked_ids.append(target.id)
+                    results['auth_checks'] += 1
+                elif liveness['success']:
+                    # Reachable and auth check not due yet - keep the stored status
+                    health_result = dict(liveness, health_status=target.health_status)
+                else:
+                    # Port closed or host down - no point attempting a login
+                    health_result = dict(liveness, health_status='critical')
                 
-                # Update status in database
                 old_status = target.health_status
-                status_updated = self.update_target_health_status(target.id, health_result)
+                observed_status = health_result.get('health_status', 'unknown')
+                history_samples.append((target.id, observed_status, health_result.get('response_time'), now))
                 
-                if status_updated:
-                    results['checked'] += 1
-                    new_status = health_result.get('health_status', 'unknown')
-                    results[new_status] += 1
-                    
-                    if old_status != new_status:
-                        results['status_changes'] += 1
+                if target.id in schedule_state:
+                    new_status, state = self.scheduler.evaluate(old_status, observed_status, schedule_state[target.id])
+                    next_check = now + self.scheduler.next_interval(target.environment, new_status or old_status, state)
+                    schedule_updates[target.id] = (state, next_check)
+                    if state['pending_status']:
+                        results['pending_changes'] += 1
                 else:
-                    results['errors'] += 1
+                    # No schedule state (Redis unavailable): every check is written, as before scheduling
+                    new_status = observed_status
+                
+                results['checked'] += 1
+                # A NULL or unrecognised stored status must not abort the target's update
+                counted_status = new_status or old_status
+                results[counted_status if counted_status in ('healthy', 'warning', 'critical') else 'unknown'] += 1
+                
+                # Scheduled targets are written only on confirmed transitions
+                if new_status:
+                    if not self.update_target_health_status(target.id, dict(health_result, health_status=new_status)):
+                        results['errors'] += 1
+                    elif new_status != old_status:
+                        results['status_changes'] += 1
                     
             except Exception as e:
                 logger.error(f"Error checking health for target {target.id}: {str(e)}")
                 results['errors'] += 1
+                if target.id in schedule_state and target.id not in schedule_updates:
+                    # Push failing targets back so they cannot starve the rest of the schedule
+                    schedule_updates[target.id] = (schedule_state[target.id], now + HEALTH_SCHEDULING['min_interval'])
+        
+        self._record_tier_state(liveness_results, auth_checked_ids, now)
+        if schedule_updates:
+            self.scheduler.save(schedule_updates)
+        self.history.record_samples(history_samples)
         
         logger.info(f"✅ Health check batch completed: {results}")
         return results
\ No newline at end of file
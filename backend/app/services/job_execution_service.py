@@ -11,6 +11,7 @@ from app.models.universal_target_models import UniversalTarget
 from app.services.job_service import JobService
 from app.utils.target_utils import getTargetIpAddress
 from app.utils.connection_test_utils import test_ssh_connection, test_winrm_connection, execute_ssh_command, execute_winrm_command
+from app.utils.circuit_breaker import host_circuit_breaker, is_connect_failure, CircuitOpenError
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -75,6 +76,7 @@ class JobExecutionService:
             
         execution.completed_at = datetime.now(timezone.utc)
         self.job_service.db.commit()
+        self.job_service.roll_up_execution(execution.id)
 
         execution_time = time.time() - execution_start_time
         logger.info(f"✅ Execution {execution.id} completed in {execution_time:.2f}s: {successful_targets} success, {failed_targets} failed")
@@ -276,10 +278,32 @@ class JobExecutionService:
         """
         start_time = time.time()
         credentials = None
+        host = getTargetIpAddress(target)
+        port = comm_method.config.get('port', 5985 if comm_method.method_type == 'winrm' else 22)
         
         try:
             logger.info(f"🔧 Executing action '{action.action_name}' on {target.name}")
             
+            # Fail fast if the host is known to be unreachable - don't wait out the connection timeout
+            try:
+                host_circuit_breaker.guard(host, port)
+            except CircuitOpenError as circuit_error:
+                logger.warning(f"🔌 {str(circuit_error)}")
+                self.job_service.create_execution_result(
+                    execution_id=execution.id,
+                    target_id=target.id,
+                    target_name=target.name,
+                    action_id=action.id,
+                    action_order=action.action_order,
+                    action_name=action.action_name,
+                    action_type=action.action_type,
+                    status=ExecutionStatus.FAILED,
+                    error_text=f"Connection error: {str(circuit_error)}",
+                    execution_time_ms=int((time.time() - start_time) * 1000),
+                    command_executed="N/A - Circuit open"
+                )
+                return {"success": False, "error": str(circuit_error), "circuit_open": True, "retriable": False}
+            
             # Get credentials first - fail early if credentials are not available
             try:
                 credentials = self._get_credentials(comm_method)
@@ -336,13 +360,10 @@ class JobExecutionService:
             # Determine if this error is retriable
             retriable = False
             if not result.get('success', False):
-                error_text = result.get('error', '').lower()
                 # Connection timeouts, network errors are retriable
-                retriable = any(term in error_text for term in [
-                    'timeout', 'connection refused', 'network', 'unreachable', 
-                    'temporary failure', 'reset by peer', 'broken pipe'
-                ])
+                retriable = is_connect_failure(result.get('error', ''))
                 result['retriable'] = retriable
+            host_circuit_breaker.record_result(host, port, result.get('success', False), result.get('error', ''))
             
             # Create result record only if this is not a retry or it's the final attempt
             if not self.enable_retry or not retriable:
@@ -371,10 +392,9 @@ class JobExecutionService:
             
             # Determine if this error is retriable
             error_text = str(e).lower()
-            retriable = any(term in error_text for term in [
-                'timeout', 'connection refused', 'network', 'unreachable', 
-                'temporary failure', 'reset by peer', 'broken pipe'
-            ])
+            retriable = is_connect_failure(error_text)
+            # Non-connect errors prove the host reachable and release a half-open probe
+            host_circuit_breaker.record_result(host, port, False, error_text)
             
             # Create failed result record with detailed error information
             error_category = "Authentication error" if "credential" in error_text else "Execution error"
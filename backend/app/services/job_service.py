@@ -13,6 +13,7 @@ from app.schemas.job_schemas import (
 )
 from app.models.universal_target_models import UniversalTarget
 from app.services.notification_service import NotificationService
+from app.services.execution_rollup_service import ExecutionRollupService, TERMINAL_STATUSES
 from app.models.job_models import JobTarget
 from app.core.audit_utils import log_audit_event_sync
 from app.domains.audit.services.audit_service import AuditEventType, AuditSeverity
@@ -241,6 +242,15 @@ class JobService:
             elif status in [ExecutionStatus.COMPLETED, ExecutionStatus.FAILED] and not execution.completed_at:
                 execution.completed_at = datetime.now(timezone.utc)
             self.db.commit()
+            if status in TERMINAL_STATUSES:
+                self.roll_up_execution(execution_id)
+
+    def roll_up_execution(self, execution_id: int):
+        """Count a finished execution in the analytics rollups; on failure the catch-up task counts it later."""
+        try:
+            ExecutionRollupService(self.db).apply_execution(execution_id)
+        except Exception as e:
+            logger.warning(f"Rollup of execution {execution_id} deferred to catch-up: {str(e)}")
 
     def create_execution_result(
         self, 
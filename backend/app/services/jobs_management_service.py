@@ -21,9 +21,11 @@ import asyncio
 from typing import Optional, Dict, Any, List
 from datetime import datetime, timedelta
 from functools import wraps
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from app.core.cache import get_redis_client
+from app.core.caching import cached_operation
 from app.core.logging import get_structured_logger
 from app.core.config import settings
 from app.services.job_service import JobService
@@ -39,7 +41,6 @@ logger = get_structured_logger(__name__)
 # Cache configuration
 CACHE_TTL = 1800  # 30 minutes
 CACHE_PREFIX = "jobs_mgmt:"
-JOB_CACHE_PREFIX = "job:"
 JOB_EXECUTION_CACHE_PREFIX = "job_execution:"
 JOB_STATS_CACHE_PREFIX = "job_stats:"
 JOB_SCHEDULE_CACHE_PREFIX = "job_schedule:"
@@ -85,72 +86,9 @@ def with_performance_logging(func):
     return wrapper
 
 
-def with_caching(cache_key_func, ttl=CACHE_TTL):
+def with_caching(cache_key_func, ttl=CACHE_TTL, tags=None):
     """Caching decorator for job management operations"""
-    def decorator(func):
-        @wraps(func)
-        async def wrapper(*args, **kwargs):
-            # Generate cache key
-            cache_key = f"{CACHE_PREFIX}{cache_key_func(*args, **kwargs)}"
-            
-            # Try to get from cache
-            redis_client = get_redis_client()
-            if redis_client:
-                try:
-                    cached_result = await redis_client.get(cache_key)
-                    if cached_result:
-                        logger.info(
-                            "Cache hit for job management operation",
-                            extra={
-                                "cache_key": cache_key,
-                                "operation": func.__name__
-                            }
-                        )
-                        return json.loads(cached_result)
-                except Exception as e:
-                    logger.warning(
-                        "Cache read failed, proceeding without cache",
-                        extra={
-                            "cache_key": cache_key,
-                            "error": str(e),
-                            "operation": func.__name__
-                        }
-                    )
-            
-            # Execute function
-            start_time = time.time()
-            result = await func(*args, **kwargs)
-            execution_time = time.time() - start_time
-            
-            # Cache the result
-            if redis_client:
-                try:
-                    await redis_client.setex(
-                        cache_key, 
-                        ttl, 
-                        json.dumps(result, default=str)
-                    )
-                    logger.info(
-                        "Cached job management operation result",
-                        extra={
-                            "cache_key": cache_key,
-                            "operation": func.__name__,
-                            "execution_time": execution_time
-                        }
-                    )
-                except Exception as e:
-                    logger.warning(
-                        "Cache write failed",
-                        extra={
-                            "cache_key": cache_key,
-                            "error": str(e),
-                            "operation": func.__name__
-                        }
-                    )
-            
-            return result
-        return wrapper
-    return decorator
+    return cached_operation(CACHE_PREFIX, cache_key_func, ttl=ttl, tags=tags)
 
 
 class JobsManagementService:
@@ -220,9 +158,6 @@ class JobsManagementService:
             # Enhanced job data
             enhanced_job = await self._enhance_job_data(job)
             
-            # Cache job data
-            await self._cache_job_data(job.id, enhanced_job)
-            
             # Track job creation
             await self._track_job_activity(
                 current_user_id, "job_created", 
@@ -339,11 +274,8 @@ class JobsManagementService:
             # Get total count for pagination (simplified for now)
             total_jobs = len(jobs_list)  # This is not accurate for pagination, but works for now
             
-            # Enhance job data
-            enhanced_jobs = []
-            for job in jobs_list:
-                enhanced_job = await self._enhance_job_data(job)
-                enhanced_jobs.append(enhanced_job)
+            # Enhance job data with one query per related table for the whole page
+            enhanced_jobs = await self._enhance_jobs(jobs_list)
             
             # Calculate total pages
             total_pages = (total_jobs + limit - 1) // limit
@@ -400,7 +332,7 @@ class JobsManagementService:
         current_username: str
     ) -> Dict[str, Any]:
         """
-        Enhanced job retrieval by ID with caching and validation
+        Enhanced job retrieval by ID with validation
         """
         logger.info(
             "Job retrieval by ID attempt",
@@ -411,18 +343,6 @@ class JobsManagementService:
         )
         
         try:
-            # Try to get from cache first
-            cached_job = await self._get_cached_job_data(job_id)
-            if cached_job:
-                logger.info(
-                    "Job retrieved from cache",
-                    extra={
-                        "job_id": job_id,
-                        "requested_by": current_username
-                    }
-                )
-                return cached_job
-            
             # Get job through existing service
             job = self.job_service.get_job_by_id(self.db, job_id)
             if not job:
@@ -434,9 +354,6 @@ class JobsManagementService:
             # Enhance job data
             enhanced_job = await self._enhance_job_data(job)
             
-            # Cache job data
-            await self._cache_job_data(job_id, enhanced_job)
-            
             logger.info(
                 "Job retrieval by ID successful",
                 extra={
@@ -1077,71 +994,54 @@ class JobsManagementService:
     
     async def _enhance_job_data(self, job) -> Dict[str, Any]:
         """Enhance job data with additional information"""
+        return (await self._enhance_jobs([job]))[0]
+    
+    async def _enhance_jobs(self, jobs) -> List[Dict[str, Any]]:
+        """Enhance jobs with actions, last execution, execution count and schedule - one query each for all jobs"""
+        job_ids = [job.id for job in jobs]
+        actions_by_job = await self._get_job_actions(job_ids)
+        last_executions = await self._get_last_job_executions(job_ids)
+        execution_counts = await self._get_job_execution_counts(job_ids)
+        schedules = await self._get_job_schedules_data(job_ids)
         
-        # Get job actions manually from database using the job service
-        actions = []
-        try:
-            from app.models.job_models import JobAction
-            job_actions = self.db.query(JobAction).filter(JobAction.job_id == job.id).order_by(JobAction.action_order).all()
-            logger.info(f"Found {len(job_actions)} actions for job {job.id}")
-            for action in job_actions:
-                action_dict = {
-                    "id": action.id,
-                    "action_order": action.action_order,
-                    "action_type": action.action_type,
-                    "action_name": action.action_name,
-                    "action_parameters": action.action_parameters or {},
-                    "action_config": action.action_config or {}
-                }
-                actions.append(action_dict)
-                logger.info(f"Added action: {action.action_name} with params: {action.action_parameters}")
-        except Exception as e:
-            logger.error(f"Error loading actions for job {job.id}: {str(e)}")
-            actions = []
-        
-        
-        # Get job targets
-        targets = []
-        try:
-            targets = self.job_service.get_job_targets(job.id)
-            logger.info(f"Found {len(targets)} targets for job {job.id}")
-        except Exception as e:
-            logger.error(f"Error loading targets for job {job.id}: {str(e)}")
+        enhanced_jobs = []
+        for job in jobs:
+            # Get job targets
             targets = []
-        
-        # Get last execution data
-        last_execution_data = await self._get_last_job_execution(job.id)
-        
-        # Get schedule data
-        schedule_data = await self._get_job_schedule_data(job.id)
-        
-        enhanced_data = {
-            "id": job.id,
-            "name": job.name,
-            "job_type": job.job_type,
-            "description": getattr(job, "description", ""),
-            "status": str(getattr(job, "status", "unknown")),
-            "created_at": self._datetime_to_iso(job.created_at if hasattr(job, "created_at") and job.created_at else datetime.utcnow()),
-            "updated_at": self._datetime_to_iso(job.updated_at if hasattr(job, "updated_at") else None),
-            "created_by": getattr(job, "created_by", 1),
-            "parameters": getattr(job, "parameters", {}),
-            "actions": actions,
-            "targets": targets,
-            "scheduled_at": self._datetime_to_iso(getattr(job, "scheduled_at", None)),
-            "priority": getattr(job, "priority", 5),
-            "timeout": getattr(job, "timeout", None),
-            "retry_count": getattr(job, "retry_count", 0),
-            "last_execution": last_execution_data,
-            # Add schedule data to the main job object
-            **schedule_data,
-            "metadata": {
-                "enhanced": True,
-                "last_enhanced": datetime.utcnow().isoformat(),
-                "execution_count": await self._get_job_execution_count(job.id),
-                "target_count": len(targets)
-            }
-        }
-        return enhanced_data
+            try:
+                targets = self.job_service.get_job_targets(job.id)
+                logger.info(f"Found {len(targets)} targets for job {job.id}")
+            except Exception as e:
+                logger.error(f"Error loading targets for job {job.id}: {str(e)}")
+                targets = []
+            
+            enhanced_jobs.append({
+                "id": job.id,
+                "name": job.name,
+                "job_type": job.job_type,
+                "description": getattr(job, "description", ""),
+                "status": str(getattr(job, "status", "unknown")),
+                "created_at": self._datetime_to_iso(job.created_at if hasattr(job, "created_at") and job.created_at else datetime.utcnow()),
+                "updated_at": self._datetime_to_iso(job.updated_at if hasattr(job, "updated_at") else None),
+                "created_by": getattr(job, "created_by", 1),
+                "parameters": getattr(job, "parameters", {}),
+                "actions": actions_by_job.get(job.id, []),
+                "targets": targets,
+                "scheduled_at": self._datetime_to_iso(getattr(job, "scheduled_at", None)),
+                "priority": getattr(job, "priority", 5),
+                "timeout": getattr(job, "timeout", None),
+                "retry_count": getattr(job, "retry_count", 0),
+                "last_execution": last_executions.get(job.id),
+                # Add schedule data to the main job object
+                **schedules.get(job.id, self._default_schedule_data()),
+                "metadata": {
+                    "enhanced": True,
+                    "last_enhanced": datetime.utcnow().isoformat(),
+                    "execution_count": execution_counts.get(job.id, 0),
+                    "target_count": len(targets)
+                }
+            })
+        return enhanced_jobs
     
     async def _enhance_jobs_statistics(self, basic_stats: Dict[str, Any]) -> Dict[str, Any]:
         """Enhance jobs statistics with additional analytics"""
@@ -1166,29 +1066,6 @@ class JobsManagementService:
         })
         return enhanced_stats
     
-    async def _cache_job_data(self, job_id: int, job_data: Dict[str, Any]):
-        """Cache job data in Redis"""
-        redis_client = get_redis_client()
-        if redis_client:
-            try:
-                key = f"{JOB_CACHE_PREFIX}{job_id}"
-                await redis_client.setex(key, CACHE_TTL, json.dumps(job_data, default=str))
-            except Exception as e:
-                logger.warning(f"Failed to cache job data: {e}")
-    
-    async def _get_cached_job_data(self, job_id: int) -> Optional[Dict[str, Any]]:
-        """Get cached job data from Redis"""
-        redis_client = get_redis_client()
-        if redis_client:
-            try:
-                key = f"{JOB_CACHE_PREFIX}{job_id}"
-                cached_data = await redis_client.get(key)
-                if cached_data:
-                    return json.loads(cached_data)
-            except Exception as e:
-                logger.warning(f"Failed to get cached job data: {e}")
-        return None
-    
     async def _cache_job_execution_data(self, task_id: str, execution_data: Dict[str, Any]):
         """Cache job execution data in Redis"""
         redis_client = get_redis_client()
@@ -1224,30 +1101,63 @@ class JobsManagementService:
         pass
     
     # Analytics methods for job execution data
-    async def _get_job_execution_count(self, job_id: int) -> int:
-        """Get the total number of executions for a job"""
+    async def _get_job_actions(self, job_ids: List[int]) -> Dict[int, List[Dict[str, Any]]]:
+        """Actions of each job in execution order"""
+        actions_by_job: Dict[int, List[Dict[str, Any]]] = {}
+        if not job_ids:
+            return actions_by_job
+        try:
+            from app.models.job_models import JobAction
+            job_actions = (self.db.query(JobAction)
+                           .filter(JobAction.job_id.in_(job_ids))
+                           .order_by(JobAction.job_id, JobAction.action_order)
+                           .all())
+            for action in job_actions:
+                actions_by_job.setdefault(action.job_id, []).append({
+                    "id": action.id,
+                    "action_order": action.action_order,
+                    "action_type": action.action_type,
+                    "action_name": action.action_name,
+                    "action_parameters": action.action_parameters or {},
+                    "action_config": action.action_config or {}
+                })
+        except Exception as e:
+            logger.error(f"Error loading actions for jobs {job_ids}: {str(e)}")
+        return actions_by_job
+    
+    async def _get_job_execution_counts(self, job_ids: List[int]) -> Dict[int, int]:
+        """Total number of executions of each job"""
+        if not job_ids:
+            return {}
         try:
             from app.models.job_models import JobExecution
-            count = self.db.query(JobExecution).filter(JobExecution.job_id == job_id).count()
-            return count
+            rows = (self.db.query(JobExecution.job_id, func.count(JobExecution.id))
+                    .filter(JobExecution.job_id.in_(job_ids))
+                    .group_by(JobExecution.job_id)
+                    .all())
+            return {job_id: count for job_id, count in rows}
         except Exception as e:
-            logger.warning(f"Failed to get execution count for job {job_id}: {e}")
-            return 0
+            logger.warning(f"Failed to get execution counts for jobs {job_ids}: {e}")
+            return {}
     
-    async def _get_last_job_execution(self, job_id: int) -> Optional[Dict[str, Any]]:
-        """Get the last execution object for a job"""
+    async def _get_last_job_executions(self, job_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """The last execution object of each job that has run"""
+        if not job_ids:
+            return {}
         try:
             from app.models.job_models import JobExecution
-            last_execution = (self.db.query(JobExecution)
-                            .filter(JobExecution.job_id == job_id)
-                            .order_by(JobExecution.execution_number.desc())
-                            .first())
+            last_executions = (self.db.query(JobExecution)
+                               .filter(JobExecution.job_id.in_(job_ids))
+                               .order_by(JobExecution.job_id, JobExecution.execution_number.desc())
+                               .distinct(JobExecution.job_id)
+                               .all())
             
-            if last_execution:
-                execution_data = {
+            return {
+                last_execution.job_id: {
                     "id": last_execution.id,
-                    "execution_uuid": str(last_execution.execution_uuid) if last_execution.execution_uuid else None,
-                    "execution_serial": last_execution.execution_serial,
+                    # Not columns of JobExecution (yet); read defensively so the rest still comes through
+                    "execution_uuid": str(getattr(last_execution, "execution_uuid", None) or "") or None,
+                    "execution_serial": getattr(last_execution, "execution_serial", None),
                     "execution_number": last_execution.execution_number,
                     "status": last_execution.status.value if last_execution.status else "unknown",
                     "scheduled_at": self._datetime_to_iso(last_execution.scheduled_at),
@@ -1256,11 +1166,11 @@ class JobsManagementService:
                     "created_at": self._datetime_to_iso(last_execution.created_at),
                     "branches": []  # Add empty branches list as required by schema
                 }
-                return execution_data
-            return None
+                for last_execution in last_executions
+            }
         except Exception as e:
-            logger.warning(f"Failed to get last execution for job {job_id}: {e}")
-            return None
+            logger.warning(f"Failed to get last executions for jobs {job_ids}: {e}")
+            return {}
     async def _calculate_jobs_per_day(self) -> float: return 0.0
     async def _calculate_average_execution_time(self) -> float: return 0.0
     async def _calculate_job_success_rate(self) -> float: return 100.0
@@ -1364,14 +1274,35 @@ class JobsManagementService:
         else:
             return f"{minute} {hour} * * *"  # Default to daily
     
-    async def _get_job_schedule_data(self, job_id: int) -> Dict[str, Any]:
-        """Get schedule data for a job"""
+    def _default_schedule_data(self) -> Dict[str, Any]:
+        """Schedule fields of a job without a recurring schedule"""
+        return {
+            'schedule_type': 'once',
+            'recurring_type': None,
+            'interval': None,
+            'time': None,
+            'days_of_week': [],
+            'day_of_month': None,
+            'max_executions': None,
+            'cron_expression': None,
+            'schedule_enabled': None,
+            'next_run': None,
+            'last_run': None,
+            'execution_count': 0
+        }
+    
+    async def _get_job_schedules_data(self, job_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """Schedule data of each job that has a recurring schedule"""
+        if not job_ids:
+            return {}
         try:
             from app.models.job_schedule_models import JobSchedule
             
-            schedule = self.db.query(JobSchedule).filter(JobSchedule.job_id == job_id).first()
-            
-            if schedule:
+            schedules_data = {}
+            for schedule in self.db.query(JobSchedule).filter(JobSchedule.job_id.in_(job_ids)).all():
+                if schedule.job_id in schedules_data:
+                    continue
+                
                 # Parse days_of_week string back to list
                 days_of_week = []
                 if schedule.days_of_week:
@@ -1380,7 +1311,7 @@ class JobsManagementService:
                     except:
                         days_of_week = []
                 
-                return {
+                schedules_data[schedule.job_id] = {
                     'schedule_type': schedule.schedule_type,
                     'recurring_type': schedule.recurring_type,
                     'interval': schedule.interval,
@@ -1394,39 +1325,11 @@ class JobsManagementService:
                     'last_run': self._datetime_to_iso(schedule.last_run),
                     'execution_count': schedule.execution_count or 0
                 }
-            else:
-                # No recurring schedule, return defaults
-                return {
-                    'schedule_type': 'once',
-                    'recurring_type': None,
-                    'interval': None,
-                    'time': None,
-                    'days_of_week': [],
-                    'day_of_month': None,
-                    'max_executions': None,
-                    'cron_expression': None,
-                    'schedule_enabled': None,
-                    'next_run': None,
-                    'last_run': None,
-                    'execution_count': 0
-                }
+            return schedules_data
                 
         except Exception as e:
-            logger.warning(f"Failed to get schedule data for job {job_id}: {e}")
-            return {
-                'schedule_type': 'once',
-                'recurring_type': None,
-                'interval': None,
-                'time': None,
-                'days_of_week': [],
-                'day_of_month': None,
-                'max_executions': None,
-                'cron_expression': None,
-                'schedule_enabled': None,
-                'next_run': None,
-                'last_run': None,
-                'execution_count': 0
-            }
+            logger.warning(f"Failed to get schedule data for jobs {job_ids}: {e}")
+            return {}
 
 
 class JobsManagementError(Exception):
@@ -17,6 +17,7 @@ from ..models.notification_models import (
 )
 from ..models.universal_target_models import UniversalTarget
 from ..models.system_models import SystemSetting
+from ..utils.circuit_breaker import host_circuit_breaker
 
 logger = logging.getLogger(__name__)
 
@@ -358,6 +359,9 @@ class NotificationService:
         if not host:
             raise ValueError("SMTP host not configured in target")
         
+        # Don't queue every recipient behind a 30s timeout when the relay is down
+        host_circuit_breaker.guard(host, port)
+        
         # Use the working SMTP connection from connection_test_utils
         from ..utils.connection_test_utils import test_smtp_connection
         
@@ -369,6 +373,7 @@ class NotificationService:
         
         # Use the connection test function which we know works
         result = test_smtp_connection(host, port, credentials, test_config, timeout=30)
+        host_circuit_breaker.record_result(host, port, result['success'], result.get('message'))
         
         if not result['success']:
             raise Exception(result['message'])
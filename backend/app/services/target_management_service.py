@@ -24,6 +24,7 @@ from functools import wraps
 from sqlalchemy.orm import Session
 
 from app.core.cache import get_redis_client
+from app.core.caching import cached_operation, invalidate_tags
 from app.core.logging import get_structured_logger
 from app.core.config import settings
 from app.services.universal_target_service import UniversalTargetService
@@ -47,6 +48,7 @@ TARGET_LIST_CACHE_PREFIX = "target_list:"
 TARGET_SEARCH_CACHE_PREFIX = "target_search:"
 CONNECTION_CACHE_PREFIX = "connection:"
 HEALTH_CACHE_PREFIX = "health:"
+ACTIVITY_INDEX_PREFIX = "target_activity_index:"
 DISCOVERY_CACHE_PREFIX = "discovery:"
 
 
@@ -89,72 +91,9 @@ def with_performance_logging(func):
     return wrapper
 
 
-def with_caching(cache_key_func, ttl=CACHE_TTL):
+def with_caching(cache_key_func, ttl=CACHE_TTL, tags=None):
     """Caching decorator for target management operations"""
-    def decorator(func):
-        @wraps(func)
-        async def wrapper(*args, **kwargs):
-            # Generate cache key
-            cache_key = f"{CACHE_PREFIX}{cache_key_func(*args, **kwargs)}"
-            
-            # Try to get from cache
-            redis_client = get_redis_client()
-            if redis_client:
-                try:
-                    cached_result = await redis_client.get(cache_key)
-                    if cached_result:
-                        logger.info(
-                            "Cache hit for target management operation",
-                            extra={
-                                "cache_key": cache_key,
-                                "operation": func.__name__
-                            }
-                        )
-                        return json.loads(cached_result)
-                except Exception as e:
-                    logger.warning(
-                        "Cache read failed, proceeding without cache",
-                        extra={
-                            "cache_key": cache_key,
-                            "error": str(e),
-                            "operation": func.__name__
-                        }
-                    )
-            
-            # Execute function
-            start_time = time.time()
-            result = await func(*args, **kwargs)
-            execution_time = time.time() - start_time
-            
-            # Cache the result
-            if redis_client:
-                try:
-                    await redis_client.setex(
-                        cache_key, 
-                        ttl, 
-                        json.dumps(result, default=str)
-                    )
-                    logger.info(
-                        "Cached target management operation result",
-                        extra={
-                            "cache_key": cache_key,
-                            "operation": func.__name__,
-                            "execution_time": execution_time
-                        }
-                    )
-                except Exception as e:
-                    logger.warning(
-                        "Cache write failed",
-                        extra={
-                            "cache_key": cache_key,
-                            "error": str(e),
-                            "operation": func.__name__
-                        }
-                    )
-            
-            return result
-        return wrapper
-    return decorator
+    return cached_operation(CACHE_PREFIX, cache_key_func, ttl=ttl, tags=tags)
 
 
 class TargetManagementService:
@@ -287,7 +226,7 @@ class TargetManagementService:
                 error_code="internal_error"
             )
     
-    @with_caching(lambda self, skip, limit, search, os_type, environment: f"target_list_{skip}_{limit}_{search or 'all'}_{os_type or 'all'}_{environment or 'all'}", ttl=900)
+    @with_caching(lambda self, skip, limit, search, os_type, environment: f"target_list_{skip}_{limit}_{search or 'all'}_{os_type or 'all'}_{environment or 'all'}", ttl=900, tags=["target_list"])
     @with_performance_logging
     async def get_targets(
         self, 
@@ -396,7 +335,7 @@ class TargetManagementService:
                 error_code="retrieval_error"
             )
     
-    @with_caching(lambda self, target_id: f"target_{target_id}", ttl=1800)
+    @with_caching(lambda self, target_id: f"target_{target_id}", ttl=1800, tags=lambda self, target_id: [f"target:{target_id}"])
     @with_performance_logging
     async def get_target_by_id(self, target_id: int) -> Dict[str, Any]:
         """
@@ -818,13 +757,11 @@ class TargetManagementService:
         redis_client = get_redis_client()
         if redis_client:
             try:
-                pattern = f"target_activity:{target_id}:*"
-                keys = await redis_client.keys(pattern)
-                activities = []
-                for key in keys[-10:]:  # Get last 10 activities
-                    activity_data = await redis_client.get(key)
-                    if activity_data:
-                        activities.append(json.loads(activity_data))
+                # Newest 10 activity keys from the per-target index, fetched in one MGET
+                keys = await redis_client.zrevrange(f"{ACTIVITY_INDEX_PREFIX}{target_id}", 0, 9)
+                if not keys:
+                    return []
+                activities = [json.loads(data) for data in await redis_client.mget(keys) if data]
                 return sorted(activities, key=lambda x: x.get('timestamp', ''), reverse=True)
             except Exception as e:
                 logger.warning(f"Failed to get recent activity: {e}")
@@ -851,26 +788,17 @@ class TargetManagementService:
         redis_client = get_redis_client()
         if redis_client:
             try:
-                keys_to_delete = [
-                    f"{CACHE_PREFIX}target_{target_id}",
+                await invalidate_tags(f"target:{target_id}")
+                await redis_client.delete(
                     f"{CONNECTION_CACHE_PREFIX}{target_id}",
                     f"{HEALTH_CACHE_PREFIX}{target_id}"
-                ]
-                await redis_client.delete(*keys_to_delete)
+                )
             except Exception as e:
                 logger.warning(f"Failed to invalidate target cache: {e}")
     
     async def _invalidate_target_list_cache(self):
         """Invalidate target list cache entries"""
-        redis_client = get_redis_client()
-        if redis_client:
-            try:
-                pattern = f"{CACHE_PREFIX}target_list_*"
-                keys = await redis_client.keys(pattern)
-                if keys:
-                    await redis_client.delete(*keys)
-            except Exception as e:
-                logger.warning(f"Failed to invalidate target list cache: {e}")
+        await invalidate_tags("target_list")
     
     async def _track_target_activity(self, user_id: int, activity: str, details: Dict[str, Any]):
         """Track target activity for analytics"""
@@ -885,8 +813,17 @@ class TargetManagementService:
                 }
                 
                 target_id = details.get("target_id")
-                key = f"target_activity:{target_id}:{int(datetime.utcnow().timestamp())}"
-                await redis_client.setex(key, 86400, json.dumps(activity_data, default=str))  # 24 hours
+                timestamp = datetime.utcnow().timestamp()
+                key = f"target_activity:{target_id}:{int(timestamp)}"
+                index_key = f"{ACTIVITY_INDEX_PREFIX}{target_id}"
+                
+                # Register the key in the target's index so reads never scan the keyspace
+                pipe = redis_client.pipeline(transaction=False)
+                pipe.setex(key, 86400, json.dumps(activity_data, default=str))  # 24 hours
+                pipe.zadd(index_key, {key: timestamp})
+                pipe.zremrangebyscore(index_key, 0, timestamp - 86400)  # Entries already expired
+                pipe.expire(index_key, 86400)
+                await pipe.execute()
                 
             except Exception as e:
                 logger.warning(f"Failed to track target activity: {e}")
@@ -912,10 +849,8 @@ class TargetManagementService:
         redis_client = get_redis_client()
         if redis_client:
             try:
-                pattern = f"{HEALTH_CACHE_PREFIX}{target_id}*"
-                keys = await redis_client.keys(pattern)
-                if keys:
-                    await redis_client.delete(*keys)
+                # The only health key per target - no pattern sweep needed
+                await redis_client.delete(f"{HEALTH_CACHE_PREFIX}{target_id}")
             except Exception as e:
                 logger.warning(f"Failed to clear health cache: {e}")
     
@@ -20,6 +20,9 @@ from app.utils.target_utils import (
 )
 from app.utils.encryption_utils import encrypt_password_credentials, encrypt_ssh_key_credentials, decrypt_credentials
 from app.utils.connection_test_utils import perform_connection_test
+from app.utils.circuit_breaker import host_circuit_breaker
+from app.services.health_history_service import HealthHistoryService
+from app.config.health_monitoring import get_health_check_port
 from app.core.audit_utils import log_audit_event_sync
 from app.domains.audit.services.audit_service import AuditEventType, AuditSeverity
 
@@ -580,6 +583,9 @@ class UniversalTargetService:
             target.is_active = False
             self.db.commit()
             
+            # Deleted targets are no longer checked, so their history would only linger
+            HealthHistoryService().forget_target(target_id)
+            
             # Log audit event for target deletion
             log_audit_event_sync(
                 db=self.db,
@@ -606,7 +612,34 @@ class UniversalTargetService:
             List[Dict]: List of target summaries
         """
         targets = self.get_all_targets()
-        return [getTargetSummary(target) for target in targets]
+        summaries = [getTargetSummary(target) for target in targets]
+        
+        # Attach the primary endpoint's circuit breaker state, fetched in one round-trip
+        endpoints = [self._get_method_endpoint(getTargetPrimaryCommunicationMethod(target)) for target in targets]
+        states = host_circuit_breaker.get_states([endpoint for endpoint in set(endpoints) if endpoint])
+        for summary, endpoint in zip(summaries, endpoints):
+            summary['circuit_breaker'] = states.get(endpoint) if endpoint else None
+        
+        return summaries
+    
+    def _get_method_endpoint(self, method: Optional[TargetCommunicationMethod]) -> Optional[tuple]:
+        """(host, port) a communication method connects to, if configured."""
+        if not method or not method.config or not method.config.get('host'):
+            return None
+        port = get_health_check_port(method.method_type, method.config)
+        return (method.config['host'], port) if port else None
+    
+    def attach_circuit_breaker_states(self, target: UniversalTarget) -> UniversalTarget:
+        """
+        Set a transient circuit_breaker attribute on each communication method of a target
+        so it is serialized with the target response.
+        """
+        methods = target.communication_methods or []
+        endpoints = [self._get_method_endpoint(method) for method in methods]
+        states = host_circuit_breaker.get_states([endpoint for endpoint in set(endpoints) if endpoint])
+        for method, endpoint in zip(methods, endpoints):
+            method.circuit_breaker = states.get(endpoint) if endpoint else None
+        return target
     
     def test_target_connection(self, target_id: int) -> Dict[str, Any]:
         """
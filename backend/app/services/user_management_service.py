@@ -22,8 +22,10 @@ from functools import wraps
 from sqlalchemy.orm import Session
 
 from app.core.cache import get_redis_client
+from app.core.caching import cached_operation, invalidate_tags
 from app.core.logging import get_structured_logger
 from app.core.config import settings
+from app.core.session_manager import session_manager
 from app.services.user_service import UserService
 from app.domains.audit.services.audit_service import AuditService, AuditEventType, AuditSeverity
 from app.schemas.user_schemas import UserCreate, UserUpdate, UserResponse
@@ -79,72 +81,9 @@ def with_performance_logging(func):
     return wrapper
 
 
-def with_caching(cache_key_func, ttl=CACHE_TTL):
+def with_caching(cache_key_func, ttl=CACHE_TTL, tags=None):
     """Caching decorator for user management operations"""
-    def decorator(func):
-        @wraps(func)
-        async def wrapper(*args, **kwargs):
-            # Generate cache key
-            cache_key = f"{CACHE_PREFIX}{cache_key_func(*args, **kwargs)}"
-            
-            # Try to get from cache
-            redis_client = get_redis_client()
-            if redis_client:
-                try:
-                    cached_result = await redis_client.get(cache_key)
-                    if cached_result:
-                        logger.info(
-                            "Cache hit for user management operation",
-                            extra={
-                                "cache_key": cache_key,
-                                "operation": func.__name__
-                            }
-                        )
-                        return json.loads(cached_result)
-                except Exception as e:
-                    logger.warning(
-                        "Cache read failed, proceeding without cache",
-                        extra={
-                            "cache_key": cache_key,
-                            "error": str(e),
-                            "operation": func.__name__
-                        }
-                    )
-            
-            # Execute function
-            start_time = time.time()
-            result = await func(*args, **kwargs)
-            execution_time = time.time() - start_time
-            
-            # Cache the result
-            if redis_client:
-                try:
-                    await redis_client.setex(
-                        cache_key, 
-                        ttl, 
-                        json.dumps(result, default=str)
-                    )
-                    logger.info(
-                        "Cached user management operation result",
-                        extra={
-                            "cache_key": cache_key,
-                            "operation": func.__name__,
-                            "execution_time": execution_time
-                        }
-                    )
-                except Exception as e:
-                    logger.warning(
-                        "Cache write failed",
-                        extra={
-                            "cache_key": cache_key,
-                            "error": str(e),
-                            "operation": func.__name__
-                        }
-                    )
-            
-            return result
-        return wrapper
-    return decorator
+    return cached_operation(CACHE_PREFIX, cache_key_func, ttl=ttl, tags=tags)
 
 
 class UserManagementService:
@@ -259,7 +198,7 @@ class UserManagementService:
                 error_code="internal_error"
             )
     
-    @with_caching(lambda self, skip, limit, search, role: f"user_list_{skip}_{limit}_{search or 'all'}_{role or 'all'}", ttl=900)
+    @with_caching(lambda self, skip, limit, search, role: f"user_list_{skip}_{limit}_{search or 'all'}_{role or 'all'}", ttl=900, tags=["user_list"])
     @with_performance_logging
     async def get_users(
         self, 
@@ -353,7 +292,7 @@ class UserManagementService:
                 error_code="retrieval_error"
             )
     
-    @with_caching(lambda self, user_id: f"user_{user_id}", ttl=1800)
+    @with_caching(lambda self, user_id: f"user_{user_id}", ttl=1800, tags=lambda self, user_id: [f"user:{user_id}"])
     @with_performance_logging
     async def get_user_by_id(self, user_id: int) -> Dict[str, Any]:
         """
@@ -645,7 +584,7 @@ class UserManagementService:
                 error_code="deletion_error"
             )
     
-    @with_caching(lambda self, user_id: f"user_sessions_{user_id}", ttl=300)
+    @with_caching(lambda self, user_id: f"user_sessions_{user_id}", ttl=300, tags=lambda self, user_id: [f"user:{user_id}"])
     @with_performance_logging
     async def get_user_sessions(self, user_id: int) -> List[Dict[str, Any]]:
         """
@@ -657,32 +596,24 @@ class UserManagementService:
         )
         
         try:
-            # Get sessions from cache or database
-            redis_client = get_redis_client()
+            # Sessions are indexed per user at creation - no keyspace scan
             sessions = []
-            
-            if redis_client:
-                try:
-                    # Look for session data in Redis
-                    pattern = f"session:sess_{user_id}_*"
-                    session_keys = await redis_client.keys(pattern)
-                    
-                    for key in session_keys:
-                        session_data = await redis_client.get(key)
-                        if session_data:
-                            session_info = json.loads(session_data)
-                            sessions.append({
-                                "session_id": key.split(":")[-1],
-                                "ip_address": session_info.get("ip_address"),
-                                "user_agent": session_info.get("user_agent"),
-                                "login_time": session_info.get("login_time"),
-                                "is_active": True
-                            })
-                except Exception as e:
-                    logger.warning(
-                        "Failed to retrieve sessions from cache",
-                        extra={"user_id": user_id, "error": str(e)}
-                    )
+            try:
+                for session_data in await session_manager.get_user_sessions(user_id):
+                    user_data = session_data.get("user_data", {})
+                    sessions.append({
+                        "session_id": session_data.get("session_id"),
+                        "ip_address": user_data.get("client_ip"),
+                        "user_agent": user_data.get("user_agent"),
+                        "login_time": session_data.get("created_at"),
+                        "last_activity": session_data.get("last_activity"),
+                        "is_active": True
+                    })
+            except Exception as e:
+                logger.warning(
+                    "Failed to retrieve sessions from cache",
+                    extra={"user_id": user_id, "error": str(e)}
+                )
             
             logger.info(
                 "User sessions retrieval successful",
@@ -711,34 +642,11 @@ class UserManagementService:
     
     async def _invalidate_user_cache(self, user_id: int):
         """Invalidate user-specific cache entries"""
-        redis_client = get_redis_client()
-        if redis_client:
-            try:
-                keys_to_delete = [
-                    f"{CACHE_PREFIX}user_{user_id}",
-                    f"{CACHE_PREFIX}user_sessions_{user_id}"
-                ]
-                await redis_client.delete(*keys_to_delete)
-            except Exception as e:
-                logger.warning(
-                    "Failed to invalidate user cache",
-                    extra={"user_id": user_id, "error": str(e)}
-                )
+        await invalidate_tags(f"user:{user_id}")
     
     async def _invalidate_user_list_cache(self):
         """Invalidate user list cache entries"""
-        redis_client = get_redis_client()
-        if redis_client:
-            try:
-                pattern = f"{CACHE_PREFIX}user_list_*"
-                keys = await redis_client.keys(pattern)
-                if keys:
-                    await redis_client.delete(*keys)
-            except Exception as e:
-                logger.warning(
-                    "Failed to invalidate user list cache",
-                    extra={"error": str(e)}
-                )
+        await invalidate_tags("user_list")
     
     async def _get_user_profile(self, user_id: int) -> Dict[str, Any]:
         """Get user profile information"""
@@ -7,9 +7,10 @@ import logging
 
 from app.models.user_models import User, UserSession
 from app.schemas.user_schemas import UserCreate, UserUpdate
-from app.core.security import get_password_hash, verify_password
+from app.core.security import get_password_hash, pwd_context, password_hasher
 from app.core.config import settings
 from app.core.audit_utils import log_audit_event_sync
+from app.core.session_manager import SessionManager
 from app.domains.audit.services.audit_service import AuditEventType, AuditSeverity
 
 logger = logging.getLogger(__name__)
@@ -167,6 +168,13 @@ class UserService:
         
         # Log audit event if fields were changed
         if changed_fields:
+            if "is_active" in changed_fields and not db_user.is_active:
+                # A deactivated user loses every live session
+                SessionManager.revoke_user_sessions_sync(db, user_id, reason="user_deactivated")
+            else:
+                # Sessions of this user must not keep serving the old identity
+                SessionManager.invalidate_principals_sync(user_id)
+            
             log_audit_event_sync(
                 db=db,
                 event_type=AuditEventType.USER_UPDATED,
@@ -209,6 +217,7 @@ class UserService:
 
         db_user.is_active = False
         db.commit()
+        SessionManager.revoke_user_sessions_sync(db, user_id, reason="user_deleted")
         
         # Log audit event
         log_audit_event_sync(
@@ -224,11 +233,57 @@ class UserService:
         
         return True
 
+    @staticmethod
+    def deactivate_user(db: Session, user_id: int) -> Optional[User]:
+        """
+        Deactivate a user and revoke all of their sessions.
+        
+        Args:
+            db: Database session
+            user_id: ID of the user to deactivate
+            
+        Returns:
+            Updated user object or None if user not found
+        """
+        db_user = UserService.get_user_by_id(db, user_id)
+        if not db_user:
+            return None
+
+        db_user.is_active = False
+        db.commit()
+        db.refresh(db_user)
+        SessionManager.revoke_user_sessions_sync(db, user_id, reason="user_deactivated")
+        return db_user
+
+    @staticmethod
+    def activate_user(db: Session, user_id: int) -> Optional[User]:
+        """
+        Activate a user.
+        
+        Args:
+            db: Database session
+            user_id: ID of the user to activate
+            
+        Returns:
+            Updated user object or None if user not found
+        """
+        db_user = UserService.get_user_by_id(db, user_id)
+        if not db_user:
+            return None
+
+        db_user.is_active = True
+        db.commit()
+        db.refresh(db_user)
+        SessionManager.invalidate_principals_sync(user_id)
+        return db_user
+
     @staticmethod
     def authenticate_user(db: Session, username: str, password: str, ip_address: Optional[str] = None, user_agent: Optional[str] = None) -> Optional[User]:
         """
         Authenticate user with username and password.
         
+        Blocks on bcrypt - async code should use authenticate_user_async.
+        
         Args:
             db: Database session
             username: Username to authenticate
@@ -239,6 +294,34 @@ class UserService:
         Returns:
             User object if authentication successful, None otherwise
         """
+        user = UserService._get_login_candidate(db, username, ip_address, user_agent)
+        if not user:
+            return None
+        
+        logger.debug(f"User found, verifying password")
+        verified, new_hash = pwd_context.verify_and_update(password, user.password_hash)
+        return UserService._finish_authentication(db, user, username, verified, new_hash, ip_address, user_agent)
+
+    @staticmethod
+    async def authenticate_user_async(db: Session, username: str, password: str, ip_address: Optional[str] = None, user_agent: Optional[str] = None) -> Optional[User]:
+        """
+        authenticate_user with the password check on the password hashing pool,
+        so the event loop keeps serving other requests during a login burst.
+        
+        Raises:
+            PasswordHasherBusy: The hashing queue is full
+        """
+        user = UserService._get_login_candidate(db, username, ip_address, user_agent)
+        if not user:
+            return None
+        
+        logger.debug(f"User found, verifying password")
+        verified, new_hash = await password_hasher.verify_and_update(password, user.password_hash)
+        return UserService._finish_authentication(db, user, username, verified, new_hash, ip_address, user_agent)
+
+    @staticmethod
+    def _get_login_candidate(db: Session, username: str, ip_address: Optional[str] = None, user_agent: Optional[str] = None) -> Optional[User]:
+        """Look up an active user for a login attempt, auditing the failures."""
         logger.debug(f"Attempting to authenticate user '{username}'")
         user = UserService.get_user_by_username(db, username)
         
@@ -284,10 +367,13 @@ class UserService:
             )
             return None
         
-        logger.debug(f"User found, verifying password")
-        
+        return user
+
+    @staticmethod
+    def _finish_authentication(db: Session, user: User, username: str, verified: bool, new_hash: Optional[str] = None, ip_address: Optional[str] = None, user_agent: Optional[str] = None) -> Optional[User]:
+        """Audit the outcome of a password check and store a rehash if one was produced."""
         # Authentication failure - invalid password
-        if not verify_password(password, user.password_hash):
+        if not verified:
             logger.debug(f"Password verification failed for user '{username}'")
             # Log failed login attempt
             log_audit_event_sync(
@@ -309,6 +395,12 @@ class UserService:
         
         logger.debug(f"Authentication successful for user '{username}'")
         
+        # Upgrade hashes made under an older policy (e.g. lower bcrypt cost) now that we have the password
+        if new_hash:
+            user.password_hash = new_hash
+            db.commit()
+            logger.info(f"Upgraded password hash of user '{username}' to the current policy")
+        
         # Log successful login
         log_audit_event_sync(
             db=db,
@@ -455,45 +547,3 @@ class UserService:
             
             return True
         return False
-
-    @staticmethod
-    def cleanup_expired_sessions(db: Session):
-        """
-        Clean up expired user sessions.
-        
-        Args:
-            db: Database session
-        """
-        expired_sessions = db.query(UserSession).filter(
-            UserSession.expires_at <= datetime.utcnow()
-        ).all()
-        
-        if not expired_sessions:
-            return
-            
-        # Log batch session cleanup
-        session_details = []
-        for session in expired_sessions:
-            session_details.append({
-                "session_id": session.id,
-                "user_id": session.user_id,
-                "expires_at": session.expires_at.isoformat() if session.expires_at else None
-            })
-            db.delete(session)
-            
-        db.commit()
-        
-        # Log audit event for session cleanup
-        log_audit_event_sync(
-            db=db,
-            event_type=AuditEventType.SYSTEM_MAINTENANCE,
-            user_id=None,  # System operation
-            resource_type="session",
-            resource_id="batch_cleanup",
-            action="cleanup_expired_sessions",
-            details={
-                "expired_sessions_count": len(expired_sessions),
-                "expired_sessions": session_details
-            },
-            severity=AuditSeverity.INFO
-        )
\ No newline at end of file
@@ -1,60 +1,546 @@
 """
 Caching infrastructure for ENABLEDRM platform.
 """
-import json
-import pickle
 import asyncio
-from typing import Any, Optional, Union, Callable, Dict
-from datetime import datetime, timedelta
+import sys
+import time
+from fnmatch import fnmatchcase
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from itertools import islice
+from typing import Any, Optional, Union, Callable, Dict, Iterable, List, Tuple
 import redis.asyncio as redis
 import logging
 
+from app.shared.infrastructure.codec import CacheCodec, CodecError
+from app.shared.infrastructure.invalidation import InvalidationBus
+from app.core.cache import scan_delete
+
 logger = logging.getLogger(__name__)
 
+_MISSING = object()
+
+# Redis sorted sets of keys per tag, scored by each entry's expiry time; shared with
+# app.core.caching. Every write drops members that have expired, so a tag refreshed
+# forever stays as small as its live entries. (Renamed from cache_tag:, which held
+# plain sets, so leftovers from before age out instead of raising WRONGTYPE.)
+TAG_PREFIX = "cache_tags:"
+TAG_TTL = 86400  # Tag sets outlive any entry they index
+
+# Containers larger than this are sized from a sample of their items
+_SIZE_SAMPLE = 16
+_SIZE_MAX_DEPTH = 3
+_FLAT_TYPES = frozenset((str, bytes, bytearray, int, float, bool, type(None)))
+_SEQUENCE_TYPES = frozenset((list, tuple, set, frozenset))
+
+
+def estimate_size(value: Any, _depth: int = 0) -> int:
+    """Approximate in-memory size of a value in bytes (cheap, not exact)."""
+    size = sys.getsizeof(value)
+    value_type = type(value)
+    if value_type in _FLAT_TYPES or _depth >= _SIZE_MAX_DEPTH:
+        return size
+
+    _depth += 1
+    if value_type is dict or isinstance(value, dict):
+        sample = [sys.getsizeof(k) + estimate_size(v, _depth) for k, v in islice(value.items(), _SIZE_SAMPLE)]
+    elif value_type in _SEQUENCE_TYPES:
+        sample = [estimate_size(item, _depth) for item in islice(value, _SIZE_SAMPLE)]
+    elif hasattr(value, '__dict__'):
+        return size + estimate_size(vars(value), _depth)
+    else:
+        return size
+
+    if not sample:
+        return size
+    return size + sum(sample) * len(value) // len(sample)
+
+
+def _namespace(key: str) -> str:
+    """Namespace of a cache key - the part before the first ':'."""
+    return key.split(":", 1)[0]
+
+
+class _MemoryEntry:
+    __slots__ = ("value", "expires_at", "size", "namespace", "tags")
+
+    def __init__(self, value: Any, expires_at: float, size: int, namespace: str, tags: Tuple[str, ...] = ()):
+        self.value = value
+        self.expires_at = expires_at
+        self.size = size
+        self.namespace = namespace
+        self.tags = tags
+
+
+class MemoryCache:
+    """
+    Size-bounded in-process LRU cache.
+
+    Entries expire on a monotonic clock. The cache is bounded both by entry
+    count and by an approximate byte budget, and each namespace (key prefix
+    before the first ':') may only use its quota of that budget, so one noisy
+    namespace evicts its own entries instead of everyone else's.
+    All operations are O(1) apart from purge_expired() and pattern clears.
+
+    Invalidations from other threads (the invalidation bus subscriber) are
+    queued with defer_invalidation() and applied by the owning thread before
+    its next access.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1000,
+        max_bytes: int = 64 * 1024 * 1024,
+        namespace_quota: float = 0.5,
+        namespace_quotas: Optional[Dict[str, float]] = None
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.namespace_quota = namespace_quota
+        self.namespace_quotas = namespace_quotas or {}
+
+        self._entries: "OrderedDict[str, _MemoryEntry]" = OrderedDict()
+        self._namespaces: Dict[str, "OrderedDict[str, None]"] = {}
+        self._namespace_bytes: Dict[str, int] = {}
+        self._tags: Dict[str, set] = {}
+        self._pending: deque = deque()
+        self.bytes_used = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.rejections = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        if self._pending:
+            self._apply_pending()
+        return self._live_entry(key) is not None
+
+    def keys(self):
+        if self._pending:
+            self._apply_pending()
+        return list(self._entries.keys())
+
+    def _namespace_limit(self, namespace: str) -> int:
+        return int(self.max_bytes * self.namespace_quotas.get(namespace, self.namespace_quota))
+
+    def _live_entry(self, key: str) -> Optional[_MemoryEntry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            return None
+        return entry
+
+    def _remove(self, key: str) -> Optional[_MemoryEntry]:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return None
+        namespace_keys = self._namespaces[entry.namespace]
+        del namespace_keys[key]
+        if not namespace_keys:
+            del self._namespaces[entry.namespace]
+            del self._namespace_bytes[entry.namespace]
+        else:
+            self._namespace_bytes[entry.namespace] -= entry.size
+        for tag in entry.tags:
+            tagged = self._tags.get(tag)
+            if tagged is not None:
+                tagged.discard(key)
+                if not tagged:
+                    del self._tags[tag]
+        self.bytes_used -= entry.size
+        return entry
+
+    def _evict_oldest(self, namespace: Optional[str] = None):
+        if namespace is None:
+            key = next(iter(self._entries))
+        else:
+            key = next(iter(self._namespaces[namespace]))
+        self._remove(key)
+        self.evictions += 1
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if self._pending:
+            self._apply_pending()
+        entry = self._live_entry(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        self._entries.move_to_end(key)
+        self._namespaces[entry.namespace].move_to_end(key)
+        self.hits += 1
+        return entry.value
+
+    def set(self, key: str, value: Any, ttl: float, tags: Iterable[str] = ()) -> bool:
+        """Store a value; returns False if it is too large to cache at all."""
+        if self._pending:
+            self._apply_pending()
+        namespace = _namespace(key)
+        size = sys.getsizeof(key) + estimate_size(value)
+        namespace_limit = self._namespace_limit(namespace)
+
+        self._remove(key)
+        if size > namespace_limit or size > self.max_bytes:
+            self.rejections += 1
+            return False
+
+        while self._namespace_bytes.get(namespace, 0) + size > namespace_limit:
+            self._evict_oldest(namespace)
+        while self._entries and (self.bytes_used + size > self.max_bytes or len(self._entries) >= self.max_entries):
+            self._evict_oldest()
+
+        tags = tuple(tags)
+        self._entries[key] = _MemoryEntry(value, time.monotonic() + ttl, size, namespace, tags)
+        self._namespaces.setdefault(namespace, OrderedDict())[key] = None
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+        self._namespace_bytes[namespace] = self._namespace_bytes.get(namespace, 0) + size
+        self.bytes_used += size
+        return True
+
+    def delete(self, key: str) -> bool:
+        return self._remove(key) is not None
+
+    def expire(self, key: str, ttl: float) -> bool:
+        entry = self._live_entry(key)
+        if entry is None:
+            return False
+        entry.expires_at = time.monotonic() + ttl
+        return True
+
+    def ttl(self, key: str) -> int:
+        entry = self._live_entry(key)
+        if entry is None:
+            return 0
+        return max(0, int(entry.expires_at - time.monotonic()))
+
+    def purge_expired(self) -> int:
+        """Drop every expired entry."""
+        now = time.monotonic()
+        expired = [key for key, entry in self._entries.items() if entry.expires_at <= now]
+        for key in expired:
+            self._remove(key)
+        self.expirations += len(expired)
+        return len(expired)
+
+    def invalidate(self, keys: Iterable[str] = (), patterns: Iterable[str] = (), tags: Iterable[str] = ()) -> int:
+        """Drop entries by key, glob pattern or tag; returns the number removed."""
+        targets = set(keys)
+        for tag in tags:
+            targets.update(self._tags.get(tag, ()))
+        for pattern in patterns:
+            targets.update(key for key in self._entries if fnmatchcase(key, pattern))
+        removed = sum(self._remove(key) is not None for key in targets)
+        self.invalidations += removed
+        return removed
+
+    def tagged_keys(self, tag: str) -> List[str]:
+        return list(self._tags.get(tag, ()))
+
+    def defer_invalidation(self, keys: Iterable[str] = (), patterns: Iterable[str] = (),
+                           tags: Iterable[str] = (), flush: bool = False):
+        """Thread-safe: queue an invalidation for the owning thread to apply."""
+        self._pending.append((list(keys), list(patterns), list(tags), flush))
+
+    def _apply_pending(self):
+        while self._pending:
+            try:
+                keys, patterns, tags, flush = self._pending.popleft()
+            except IndexError:
+                break
+            if flush:
+                self.invalidations += len(self._entries)
+                self.clear()
+            else:
+                self.invalidate(keys, patterns, tags)
+
+    def clear(self):
+        self._entries.clear()
+        self._namespaces.clear()
+        self._namespace_bytes.clear()
+        self._tags.clear()
+        self.bytes_used = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "bytes_used": self.bytes_used,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "rejections": self.rejections,
+            "invalidations": self.invalidations,
+            "namespaces": dict(self._namespace_bytes)
+        }
+
+
+class RoundTripCounter:
+    """Redis round-trips and commands issued by CacheService on behalf of one request."""
+
+    __slots__ = ("round_trips", "commands")
+
+    def __init__(self):
+        self.round_trips = 0
+        self.commands = 0
+
+
+_request_round_trips: ContextVar[Optional[RoundTripCounter]] = ContextVar("cache_round_trips", default=None)
+
+
+def track_round_trips() -> RoundTripCounter:
+    """
+    Start counting CacheService round-trips for the current context.
+
+    Tasks created afterwards inherit the counter, so setting it in a middleware
+    before calling the endpoint counts everything the request does.
+    """
+    counter = RoundTripCounter()
+    _request_round_trips.set(counter)
+    return counter
+
+
+class BatchResult:
+    """Result of a batched operation; value is final once the batch has flushed."""
+
+    __slots__ = ("value", "done", "error")
+
+    def __init__(self, value: Any = None, done: bool = False):
+        self.value = value
+        self.done = done
+        self.error: Optional[Exception] = None
+
+
+class CacheBatch:
+    """
+    Collects cache operations and sends their Redis part as one pipeline.
+
+    Memory-tier reads and writes happen immediately; Redis commands are queued
+    until flush(). Reads served from memory are done right away, the others
+    hold their default until the flush.
+    """
+
+    def __init__(self, cache: "CacheService", transaction: bool = False):
+        self.cache = cache
+        self.transaction = transaction
+        self._ops: List[Tuple[str, tuple, BatchResult]] = []
+
+    def __len__(self) -> int:
+        return len(self._ops)
+
+    def get(self, key: str, default: Any = None) -> BatchResult:
+        # A transaction reads Redis only, so all values come from the same snapshot
+        if not self.transaction:
+            value = self.cache.memory_cache.get(key, _MISSING)
+            if value is not _MISSING:
+                return BatchResult(value, done=True)
+        result = BatchResult(default)
+        self._ops.append(("get", (key,), result))
+        return result
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None, memory_cache: bool = True,
+            tags: Iterable[str] = ()) -> BatchResult:
+        ttl = ttl or self.cache.default_ttl
+        tags = tuple(tags)
+        if memory_cache:
+            result = BatchResult(self.cache.memory_cache.set(key, value, ttl, tags))
+        else:
+            self.cache.memory_cache.delete(key)
+            result = BatchResult(False)
+
+        if self.cache.redis_client:
+            try:
+                self._ops.append(("setex", (key, ttl, self.cache.codec.encode(value)), result))
+            except CodecError as e:
+                # Unregistered types stay process-local rather than being pickled
+                logger.warning(f"Cache value for {key} not serializable, kept in memory only: {e}")
+                result.done = True
+                return result
+            now = time.time()
+            for tag in tags:
+                self._ops.append(("zadd", (f"{TAG_PREFIX}{tag}", {key: now + ttl}), BatchResult()))
+                self._ops.append(("zremrangebyscore", (f"{TAG_PREFIX}{tag}", "-inf", now), BatchResult()))
+                self._ops.append(("expire", (f"{TAG_PREFIX}{tag}", max(TAG_TTL, ttl)), BatchResult()))
+            return result
+        result.done = True
+        return result
+
+    def delete(self, *keys: str) -> BatchResult:
+        result = BatchResult(sum(self.cache.memory_cache.delete(key) for key in keys))
+        if keys:
+            self._ops.append(("delete", keys, result))
+        return result
+
+    def expire(self, key: str, ttl: int) -> BatchResult:
+        result = BatchResult(self.cache.memory_cache.expire(key, ttl))
+        self._ops.append(("expire", (key, ttl), result))
+        return result
+
+    def call(self, command: str, key: str, *args: Any, **kwargs: Any) -> BatchResult:
+        """
+        Queue a raw Redis command on a key outside the memory tier (hashes, sets).
+
+        The reply is returned as-is (bytes, not codec-decoded) and nothing is
+        published - only use it for keys that are never cached in memory.
+        """
+        result = BatchResult()
+        if self.cache.redis_client:
+            self._ops.append(("call", (key, command, args, kwargs), result))
+        else:
+            result.done = True
+        return result
+
+    async def flush(self) -> int:
+        """Send the queued commands in one round-trip; returns the number of commands sent."""
+        ops, self._ops = self._ops, []
+        if not ops:
+            return 0
+
+        redis_client = self.cache.redis_client
+        if not redis_client:
+            for _, _, result in ops:
+                result.done = True
+            return 0
+
+        try:
+            pipe = redis_client.pipeline(transaction=self.transaction)
+            changed = []
+            for command, args, _ in ops:
+                if command == "call":
+                    key, raw_command, raw_args, raw_kwargs = args
+                    getattr(pipe, raw_command)(key, *raw_args, **raw_kwargs)
+                    continue
+                getattr(pipe, command)(*args)
+                if command == "setex":
+                    changed.append(args[0])
+                elif command == "delete":
+                    changed.extend(args)
+            # Other processes drop their memory copies of whatever we wrote
+            published = self.cache._queue_invalidation(pipe, keys=changed) if changed else 0
+            self.cache._note_round_trip(len(ops) + published)
+            replies = await pipe.execute(raise_on_error=False)
+        except Exception as e:
+            logger.error(f"Redis batch error ({len(ops)} commands): {e}")
+            replies = [e] * len(ops)
+
+        for (command, args, result), reply in zip(ops, replies):
+            result.done = True
+            if isinstance(reply, Exception):
+                result.error = reply
+                logger.error(f"Redis {args[1] if command == 'call' else command} error for key {args[0]}: {reply}")
+                continue
+            if command == "call":
+                result.value = reply
+            elif command == "get":
+                if reply is not None:
+                    try:
+                        result.value = self.cache.codec.decode(reply)
+                    except CodecError as e:
+                        logger.warning(f"Undecodable cache entry {args[0]}, treating as miss: {e}")
+            elif command == "delete":
+                result.value = reply
+            else:
+                result.value = bool(reply) or result.value
+        return len(ops)
+
 
 class CacheService:
     """Multi-level caching service with Redis and in-memory cache."""
     
-    def __init__(self, redis_url: str = "redis://localhost:6379"):
+    def __init__(
+        self,
+        redis_url: str = "redis://localhost:6379",
+        memory_cache_max_size: int = 1000,
+        memory_cache_max_bytes: int = 64 * 1024 * 1024,
+        memory_cache_namespace_quota: float = 0.5,
+        codec: Optional[str] = None,
+        compression_threshold: int = 1024,
+        invalidation_bus: Optional[InvalidationBus] = None
+    ):
         self.redis_client: Optional[redis.Redis] = None
-        self.memory_cache: Dict[str, Dict[str, Any]] = {}
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
         self.redis_url = redis_url
         self.default_ttl = 3600  # 1 hour
-        self.memory_cache_max_size = 1000
-    
+        self.memory_cache_max_size = memory_cache_max_size
+        self.memory_cache = MemoryCache(
+            max_entries=memory_cache_max_size,
+            max_bytes=memory_cache_max_bytes,
+            namespace_quota=memory_cache_namespace_quota
+        )
+        self.codec = CacheCodec(codec, compression_threshold=compression_threshold)
+        self.round_trips = 0
+        self.commands = 0
+
+        # Other processes' writes evict our memory copies
+        self.invalidation_bus = invalidation_bus
+        if invalidation_bus is not None:
+            invalidation_bus.register(self.memory_cache.defer_invalidation)
+
+    def _queue_invalidation(self, pipe, keys: Iterable[str] = (), patterns: Iterable[str] = (),
+                            tags: Iterable[str] = ()) -> int:
+        """Add an invalidation publish to a pipeline; returns the number of commands added."""
+        if self.invalidation_bus is None or not self.invalidation_bus.enabled:
+            return 0
+        pipe.publish(self.invalidation_bus.channel, self.invalidation_bus.message(keys, patterns, tags))
+        return 1
+
+    def _note_round_trip(self, commands: int = 1):
+        """Account one Redis round-trip carrying the given number of commands."""
+        self.round_trips += 1
+        self.commands += commands
+        counter = _request_round_trips.get()
+        if counter is not None:
+            counter.round_trips += 1
+            counter.commands += commands
+
     async def initialize(self):
-        """Initialize Redis connection."""
+        """Initialize Redis connection (once per event loop) and the invalidation subscriber."""
+        loop = asyncio.get_running_loop()
+        if self.redis_client is not None and self._client_loop is loop:
+            return
         try:
             self.redis_client = redis.from_url(self.redis_url, decode_responses=False)
             await self.redis_client.ping()
+            self._client_loop = loop
             logger.info("Redis cache initialized successfully")
         except Exception as e:
             logger.warning(f"Redis not available, using memory cache only: {e}")
             self.redis_client = None
+            return
+        if self.invalidation_bus is not None:
+            self.invalidation_bus.start()
     
     async def get(self, key: str, default: Any = None) -> Any:
         """Get value from cache (memory first, then Redis)."""
         # Check memory cache first
-        if key in self.memory_cache:
-            cache_entry = self.memory_cache[key]
-            if cache_entry["expires_at"] > datetime.now():
-                logger.debug(f"Cache hit (memory): {key}")
-                return cache_entry["value"]
-            else:
-                # Expired, remove from memory cache
-                del self.memory_cache[key]
+        value = self.memory_cache.get(key, _MISSING)
+        if value is not _MISSING:
+            logger.debug(f"Cache hit (memory): {key}")
+            return value
         
         # Check Redis cache
         if self.redis_client:
             try:
+                self._note_round_trip()
                 value = await self.redis_client.get(key)
                 if value is not None:
                     logger.debug(f"Cache hit (Redis): {key}")
-                    # Deserialize value
-                    try:
-                        return json.loads(value)
-                    except json.JSONDecodeError:
-                        return pickle.loads(value)
+                    return self.codec.decode(value)
+            except CodecError as e:
+                logger.warning(f"Undecodable cache entry {key}, treating as miss: {e}")
             except Exception as e:
                 logger.error(f"Redis get error for key {key}: {e}")
         
@@ -66,69 +552,105 @@ class CacheService:
         key: str, 
         value: Any, 
         ttl: Optional[int] = None,
-        memory_cache: bool = True
+        memory_cache: bool = True,
+        tags: Iterable[str] = ()
     ) -> bool:
-        """Set value in cache."""
-        ttl = ttl or self.default_ttl
-        
-        # Store in memory cache
-        if memory_cache:
-            # Clean up memory cache if it's getting too large
-            if len(self.memory_cache) >= self.memory_cache_max_size:
-                await self._cleanup_memory_cache()
-            
-            self.memory_cache[key] = {
-                "value": value,
-                "expires_at": datetime.now() + timedelta(seconds=ttl)
-            }
+        """
+        Set value in cache.
         
-        # Store in Redis cache
-        if self.redis_client:
-            try:
-                # Serialize value
-                try:
-                    serialized_value = json.dumps(value)
-                except (TypeError, ValueError):
-                    serialized_value = pickle.dumps(value)
-                
-                await self.redis_client.setex(key, ttl, serialized_value)
-                logger.debug(f"Cache set: {key} (TTL: {ttl}s)")
-                return True
-            except Exception as e:
-                logger.error(f"Redis set error for key {key}: {e}")
-        
-        return memory_cache  # Return True if at least memory cache worked
+        Values too large for the memory tier, or not serializable for Redis, are
+        kept in the other tier only. Tagged entries can be dropped everywhere,
+        in every process, with invalidate_tags().
+        """
+        async with self.batch() as batch:
+            result = batch.set(key, value, ttl, memory_cache, tags)
+        logger.debug(f"Cache set: {key} (TTL: {ttl or self.default_ttl}s)")
+        return result.value  # True if at least one tier stored it
     
     async def delete(self, key: str) -> bool:
-        """Delete value from cache."""
-        # Remove from memory cache
-        if key in self.memory_cache:
-            del self.memory_cache[key]
-        
-        # Remove from Redis cache
-        if self.redis_client:
+        """Delete value from cache (in every process's memory tier too)."""
+        async with self.batch() as batch:
+            result = batch.delete(key)
+        logger.debug(f"Cache delete: {key}")
+        return bool(result.value) if self.redis_client else True
+
+    async def get_many(self, keys: Iterable[str], default: Any = None) -> Dict[str, Any]:
+        """Get several values: memory first, the rest in one Redis MGET. Missing keys map to default."""
+        keys = list(keys)
+        results: Dict[str, Any] = {}
+        pending = []
+        for key in keys:
+            value = self.memory_cache.get(key, _MISSING)
+            if value is _MISSING:
+                pending.append(key)
+            else:
+                results[key] = value
+
+        if pending and self.redis_client:
             try:
-                result = await self.redis_client.delete(key)
-                logger.debug(f"Cache delete: {key}")
-                return bool(result)
+                self._note_round_trip()
+                values = await self.redis_client.mget(pending)
+                for key, value in zip(pending, values):
+                    if value is None:
+                        continue
+                    try:
+                        results[key] = self.codec.decode(value)
+                    except CodecError as e:
+                        logger.warning(f"Undecodable cache entry {key}, treating as miss: {e}")
             except Exception as e:
-                logger.error(f"Redis delete error for key {key}: {e}")
-        
-        return True
-    
+                logger.error(f"Redis mget error for {len(pending)} keys: {e}")
+
+        logger.debug(f"Cache get_many: {len(results)}/{len(keys)} hits")
+        return {key: results.get(key, default) for key in keys}
+
+    async def set_many(
+        self,
+        mapping: Dict[str, Any],
+        ttl: Optional[int] = None,
+        memory_cache: bool = True
+    ) -> bool:
+        """Set several values with one Redis pipeline; True if every value was stored somewhere."""
+        async with self.batch() as batch:
+            results = [batch.set(key, value, ttl, memory_cache) for key, value in mapping.items()]
+        return all(result.value for result in results)
+
+    async def delete_many(self, keys: Iterable[str]) -> int:
+        """Delete several keys with one Redis DEL; returns the number of keys removed."""
+        keys = list(keys)
+        if not keys:
+            return 0
+        async with self.batch() as batch:
+            result = batch.delete(*keys)
+        return result.value
+
+    @asynccontextmanager
+    async def batch(self, transaction: bool = False):
+        """
+        Collect cache operations and flush them to Redis in one round-trip on exit.
+
+        Usage:
+            async with cache_service.batch() as batch:
+                session = batch.get(session_key)
+                batch.set(activity_key, now, ttl=timeout)
+            session.value
+
+        With transaction=True the pipeline runs as MULTI/EXEC and reads bypass the
+        memory tier. Nothing is sent to Redis if the block raises.
+        """
+        batch = CacheBatch(self, transaction=transaction)
+        yield batch
+        await batch.flush()
+
     async def exists(self, key: str) -> bool:
         """Check if key exists in cache."""
         # Check memory cache
         if key in self.memory_cache:
-            cache_entry = self.memory_cache[key]
-            if cache_entry["expires_at"] > datetime.now():
-                return True
-            else:
-                del self.memory_cache[key]
+            return True
         
         # Check Redis cache
         if self.redis_client:
             try:
+                self._note_round_trip()
                 return bool(await self.redis_client.exists(key))
             except Exception as e:
                 logger.error(f"Redis exists error for key {key}: {e}")
@@ -159,6 +681,7 @@ class CacheService:
         """Increment a numeric value in cache."""
         if self.redis_client:
             try:
+                self._note_round_trip()
                 return await self.redis_client.incrby(key, amount)
             except Exception as e:
                 logger.error(f"Redis increment error for key {key}: {e}")
@@ -173,67 +696,90 @@ class CacheService:
         """Set expiration time for a key."""
         if self.redis_client:
             try:
+                self._note_round_trip()
                 return bool(await self.redis_client.expire(key, ttl))
             except Exception as e:
                 logger.error(f"Redis expire error for key {key}: {e}")
         
         # Update memory cache expiration
-        if key in self.memory_cache:
-            self.memory_cache[key]["expires_at"] = datetime.now() + timedelta(seconds=ttl)
-            return True
-        
-        return False
+        return self.memory_cache.expire(key, ttl)
     
     async def get_ttl(self, key: str) -> int:
         """Get time to live for a key in seconds."""
         if self.redis_client:
             try:
+                self._note_round_trip()
                 ttl = await self.redis_client.ttl(key)
                 return ttl if ttl > 0 else 0
             except Exception as e:
                 logger.error(f"Redis TTL error for key {key}: {e}")
         
         # Check memory cache TTL
-        if key in self.memory_cache:
-            cache_entry = self.memory_cache[key]
-            remaining = (cache_entry["expires_at"] - datetime.now()).total_seconds()
-            return max(0, int(remaining))
-        
-        return 0
+        return self.memory_cache.ttl(key)
     
     async def clear_pattern(self, pattern: str) -> int:
-        """Clear all keys matching a pattern."""
-        count = 0
-        
-        # Clear from memory cache
-        keys_to_delete = []
-        for key in self.memory_cache.keys():
-            if self._match_pattern(key, pattern):
-                keys_to_delete.append(key)
+        """
+        Clear all keys matching a glob pattern.
         
-        for key in keys_to_delete:
-            del self.memory_cache[key]
-            count += 1
+        Redis is swept incrementally with SCAN + UNLINK. Prefer tags (set(tags=...)
+        and app.core.caching.invalidate_tags) where the keys are known at write time.
+        """
+        count = self.memory_cache.invalidate(patterns=[pattern])
         
-        # Clear from Redis cache
+        # Clear from Redis cache and tell other processes to clear their memory tier
         if self.redis_client:
             try:
-                keys = await self.redis_client.keys(pattern)
-                if keys:
-                    deleted = await self.redis_client.delete(*keys)
-                    count += deleted
+                self._note_round_trip()
+                count += await scan_delete(self.redis_client, pattern)
+                if self.invalidation_bus is not None:
+                    self._note_round_trip()
+                    await self.invalidation_bus.publish(self.redis_client, patterns=[pattern])
             except Exception as e:
                 logger.error(f"Redis clear pattern error for pattern {pattern}: {e}")
         
         logger.debug(f"Cleared {count} keys matching pattern: {pattern}")
         return count
+
+    async def get_tagged(self, tag: str) -> Dict[str, Any]:
+        """
+        Get every live entry registered under a tag with set(tags=...).
+        
+        Costs two round-trips regardless of keyspace size; members whose entry
+        is gone before its scored expiry (deleted) are pruned from the tag set on the way.
+        """
+        if not self.redis_client:
+            entries = {key: self.memory_cache.get(key) for key in self.memory_cache.tagged_keys(tag)}
+            return {key: value for key, value in entries.items() if value is not None}
+        
+        tag_key = f"{TAG_PREFIX}{tag}"
+        try:
+            self._note_round_trip()
+            members = [key.decode() if isinstance(key, bytes) else key
+                       for key in await self.redis_client.zrangebyscore(tag_key, time.time(), "+inf")]
+        except Exception as e:
+            logger.error(f"Redis zrangebyscore error for tag {tag}: {e}")
+            return {}
+        
+        entries = await self.get_many(members)
+        expired = [key for key, value in entries.items() if value is None]
+        if expired:
+            try:
+                self._note_round_trip()
+                await self.redis_client.zrem(tag_key, *expired)
+            except Exception as e:
+                logger.warning(f"Failed to prune tag {tag}: {e}")
+        return {key: value for key, value in entries.items() if value is not None}
     
     async def get_stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
         stats = {
             "memory_cache_size": len(self.memory_cache),
             "memory_cache_max_size": self.memory_cache_max_size,
-            "redis_available": self.redis_client is not None
+            "memory_cache": self.memory_cache.get_stats(),
+            "redis_available": self.redis_client is not None,
+            "redis_round_trips": self.round_trips,
+            "redis_commands": self.commands,
+            "invalidation_bus": self.invalidation_bus.get_stats() if self.invalidation_bus else None
         }
         
         if self.redis_client:
@@ -248,48 +794,24 @@ class CacheService:
                 logger.error(f"Error getting Redis stats: {e}")
         
         return stats
-    
-    async def _cleanup_memory_cache(self):
-        """Clean up expired entries from memory cache."""
-        now = datetime.now()
-        expired_keys = [
-            key for key, entry in self.memory_cache.items()
-            if entry["expires_at"] <= now
-        ]
-        
-        for key in expired_keys:
-            del self.memory_cache[key]
-        
-        # If still too large, remove oldest entries
-        if len(self.memory_cache) >= self.memory_cache_max_size:
-            # Sort by expiration time and remove oldest
-            sorted_items = sorted(
-                self.memory_cache.items(),
-                key=lambda x: x[1]["expires_at"]
-            )
-            
-            # Remove oldest 20% of entries
-            remove_count = len(sorted_items) // 5
-            for key, _ in sorted_items[:remove_count]:
-                del self.memory_cache[key]
-    
-    def _match_pattern(self, key: str, pattern: str) -> bool:
-        """Simple pattern matching for memory cache."""
-        if "*" not in pattern:
-            return key == pattern
-        
-        # Simple wildcard matching
-        parts = pattern.split("*")
-        if len(parts) == 2:
-            prefix, suffix = parts
-            return key.startswith(prefix) and key.endswith(suffix)
-        
-        return False
 
 
 # Global cache service instance
 from app.core.config import settings
-cache_service = CacheService(redis_url=settings.REDIS_URL)
+invalidation_bus = InvalidationBus(
+    settings.REDIS_URL,
+    channel=settings.CACHE_INVALIDATION_CHANNEL,
+    enabled=settings.CACHE_INVALIDATION_ENABLED
+)
+cache_service = CacheService(
+    redis_url=settings.REDIS_URL,
+    memory_cache_max_size=settings.MEMORY_CACHE_MAX_ENTRIES,
+    memory_cache_max_bytes=settings.MEMORY_CACHE_MAX_BYTES,
+    memory_cache_namespace_quota=settings.MEMORY_CACHE_NAMESPACE_QUOTA,
+    codec=settings.CACHE_CODEC,
+    compression_threshold=settings.CACHE_COMPRESSION_THRESHOLD,
+    invalidation_bus=invalidation_bus
+)
 
 
 def cache_key(*args, **kwargs) -> str:
@@ -0,0 +1,260 @@
+"""
+Binary serialization codecs for the cache and session stores.
+
+Every encoded value starts with a one-byte header:
+- low nibble: format (FORMAT_ORJSON, FORMAT_JSON, FORMAT_MSGPACK)
+- 0x10 bit: payload is zlib-compressed
+Header bytes live in 0xC0-0xDF, which never starts a JSON document (ASCII) or a
+pickle stream (0x80), so entries written before codecs existed still decode.
+
+Types outside plain JSON are only (de)serialized through the type registry -
+nothing is ever unpickled except legacy entries, and those through an
+allow-listed unpickler.
+"""
+import base64
+import io
+import json
+import logging
+import pickle
+import uuid
+import zlib
+from datetime import datetime, date, time as dt_time, timedelta
+from decimal import Decimal
+from typing import Any, Callable, Dict, Optional, Tuple, Type
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+HEADER_BASE = 0xC0
+COMPRESSED_FLAG = 0x10
+FORMAT_ORJSON = 0x01
+FORMAT_JSON = 0x02
+FORMAT_MSGPACK = 0x03
+
+# Marker key of a registry-encoded value: {"__t": name, "v": payload}
+TYPE_TAG = "__t"
+
+
+class CodecError(ValueError):
+    """Raised when a value cannot be encoded or a payload cannot be decoded."""
+
+
+# name -> (type, encode, decode); type -> name
+_registry: Dict[str, Tuple[Type, Callable[[Any], Any], Callable[[Any], Any]]] = {}
+_names_by_type: Dict[Type, str] = {}
+
+
+def register_type(cls: Type, name: str, encode: Callable[[Any], Any], decode: Callable[[Any], Any]):
+    """
+    Make a type cacheable.
+
+    Args:
+        cls: Type to register (exact type match, subclasses need their own entry)
+        name: Stable wire name - never reuse one for a different type
+        encode: Converts an instance to JSON-compatible data
+        decode: Rebuilds the instance from that data
+    """
+    _registry[name] = (cls, encode, decode)
+    _names_by_type[cls] = name
+
+
+register_type(datetime, "dt", datetime.isoformat, datetime.fromisoformat)
+register_type(date, "date", date.isoformat, date.fromisoformat)
+register_type(dt_time, "time", dt_time.isoformat, dt_time.fromisoformat)
+register_type(timedelta, "td", timedelta.total_seconds, lambda v: timedelta(seconds=v))
+register_type(Decimal, "dec", str, Decimal)
+register_type(uuid.UUID, "uuid", str, uuid.UUID)
+register_type(set, "set", list, set)
+register_type(frozenset, "fset", list, frozenset)
+register_type(bytes, "b", lambda v: base64.b64encode(v).decode("ascii"), base64.b64decode)
+
+
+def _encode_registered(value: Any) -> Dict[str, Any]:
+    name = _names_by_type.get(type(value))
+    if name is None:
+        raise TypeError(f"Type {type(value).__name__} is not registered for caching")
+    return {TYPE_TAG: name, "v": _registry[name][1](value)}
+
+
+def _decode_registered(obj: Dict[str, Any]) -> Any:
+    if len(obj) == 2 and TYPE_TAG in obj and "v" in obj:
+        entry = _registry.get(obj[TYPE_TAG])
+        if entry is not None:
+            return entry[2](obj["v"])
+    return obj
+
+
+def _revive_tagged(obj: Dict[str, Any]) -> Any:
+    if type(obj.get("v")) in (dict, list):
+        obj["v"] = _revive(obj["v"])
+    return _decode_registered(obj)
+
+
+def _revive(value: Any) -> Any:
+    """
+    Rebuild registry-encoded values in freshly decoded data (for decoders without
+    object hooks). Iterative and in place - this runs on every cache read of
+    tagged data, so it avoids a Python call per container.
+    """
+    if type(value) is dict and TYPE_TAG in value:
+        return _revive_tagged(value)
+
+    stack = [value]
+    while stack:
+        node = stack.pop()
+        items = node.items() if type(node) is dict else enumerate(node)
+        for key, item in items:
+            item_type = type(item)
+            if item_type is dict:
+                if TYPE_TAG in item:
+                    node[key] = _revive_tagged(item)
+                else:
+                    stack.append(item)
+            elif item_type is list:
+                stack.append(item)
+    return value
+
+
+class Codec:
+    """Serializes values to bytes and back."""
+
+    format_id: int = 0
+    name: str = ""
+
+    def dumps(self, value: Any) -> bytes:
+        raise NotImplementedError
+
+    def loads(self, data: bytes) -> Any:
+        raise NotImplementedError
+
+
+class OrjsonCodec(Codec):
+    format_id = FORMAT_ORJSON
+    name = "orjson"
+    # Route datetimes through the registry so they come back as datetimes, not strings
+    _options = (orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+                | orjson.OPT_NON_STR_KEYS) if ORJSON_AVAILABLE else 0
+
+    def dumps(self, value: Any) -> bytes:
+        return orjson.dumps(value, default=_encode_registered, option=self._options)
+
+    def loads(self, data: bytes) -> Any:
+        value = orjson.loads(data)
+        # Only pay for the walk when something was registry-encoded
+        if b'"__t"' in data:
+            return _revive(value)
+        return value
+
+
+class JsonCodec(Codec):
+    format_id = FORMAT_JSON
+    name = "json"
+
+    def dumps(self, value: Any) -> bytes:
+        return json.dumps(value, default=_encode_registered, separators=(",", ":")).encode("utf-8")
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data, object_hook=_decode_registered)
+
+
+class MsgpackCodec(Codec):
+    format_id = FORMAT_MSGPACK
+    name = "msgpack"
+
+    def dumps(self, value: Any) -> bytes:
+        return msgpack.packb(value, default=_encode_registered, use_bin_type=True, datetime=False)
+
+    def loads(self, data: bytes) -> Any:
+        return msgpack.unpackb(data, object_hook=_decode_registered, raw=False, strict_map_key=False)
+
+
+_CODECS: Dict[int, Codec] = {FORMAT_JSON: JsonCodec()}
+if ORJSON_AVAILABLE:
+    _CODECS[FORMAT_ORJSON] = OrjsonCodec()
+if MSGPACK_AVAILABLE:
+    _CODECS[FORMAT_MSGPACK] = MsgpackCodec()
+_CODECS_BY_NAME = {codec.name: codec for codec in _CODECS.values()}
+
+
+def get_codec(name: Optional[str] = None) -> Codec:
+    """Get a codec by name, falling back to the fastest available one."""
+    if name and name in _CODECS_BY_NAME:
+        return _CODECS_BY_NAME[name]
+    if name:
+        logger.warning(f"Cache codec '{name}' not available, using default")
+    return _CODECS.get(FORMAT_ORJSON) or _CODECS[FORMAT_JSON]
+
+
+class _LegacyUnpickler(pickle.Unpickler):
+    """Unpickler for pre-codec entries that only rebuilds builtins and registered types."""
+
+    _SAFE_BUILTINS = {"list", "dict", "set", "frozenset", "tuple", "str", "bytes", "int", "float", "bool", "complex"}
+
+    def find_class(self, module, name):
+        if module == "builtins" and name in self._SAFE_BUILTINS:
+            return super().find_class(module, name)
+        for cls in _names_by_type:
+            if cls.__module__ == module and cls.__qualname__ == name:
+                return cls
+        raise pickle.UnpicklingError(f"Refusing to unpickle {module}.{name}")
+
+
+class CacheCodec:
+    """Header-framed encoding with optional compression and legacy-tolerant decoding."""
+
+    def __init__(self, codec: Optional[str] = None, compression_threshold: int = 1024, compression_level: int = 1):
+        self.codec = get_codec(codec)
+        self.compression_threshold = compression_threshold
+        self.compression_level = compression_level
+
+    def encode(self, value: Any) -> bytes:
+        try:
+            payload = self.codec.dumps(value)
+        except (TypeError, ValueError, OverflowError) as e:
+            raise CodecError(f"Cannot encode value: {e}") from e
+
+        header = HEADER_BASE | self.codec.format_id
+        if self.compression_threshold and len(payload) >= self.compression_threshold:
+            compressed = zlib.compress(payload, self.compression_level)
+            if len(compressed) < len(payload):
+                payload = compressed
+                header |= COMPRESSED_FLAG
+        return bytes((header,)) + payload
+
+    def decode(self, data: bytes) -> Any:
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        if not data:
+            raise CodecError("Empty payload")
+
+        header = data[0]
+        if HEADER_BASE <= header < HEADER_BASE + 0x20:
+            codec = _CODECS.get(header & 0x0F)
+            if codec is None:
+                raise CodecError(f"No codec installed for format {header & 0x0F}")
+            payload = data[1:]
+            if header & COMPRESSED_FLAG:
+                payload = zlib.decompress(payload)
+            return codec.loads(payload)
+
+        # Entries written before codecs existed: raw JSON, or pickle
+        if header == 0x80:
+            try:
+                return _LegacyUnpickler(io.BytesIO(data)).load()
+            except Exception as e:
+                raise CodecError(f"Cannot decode legacy pickle entry: {e}") from e
+        try:
+            return json.loads(data)
+        except ValueError as e:
+            raise CodecError(f"Cannot decode legacy entry: {e}") from e
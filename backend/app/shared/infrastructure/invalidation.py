@@ -0,0 +1,170 @@
+"""
+Cross-process invalidation of in-process cache tiers over Redis pub/sub.
+
+Every process keeps its own memory tier, so a write in one process leaves
+the others serving stale copies until their TTL runs out. Writers publish
+an invalidation (by key, glob pattern or tag) on a shared channel, usually
+in the same pipeline as the write itself, and every subscribed process
+evicts its local copies as soon as the message arrives.
+
+The subscriber is a daemon thread on a blocking connection, so it works
+the same in uvicorn workers and in Celery processes (whose tasks run
+short-lived event loops). Handlers are called on that thread and must be
+thread-safe. When the subscription is (re)established, messages may have
+been missed, so handlers are told to flush everything.
+"""
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import redis
+
+logger = logging.getLogger(__name__)
+
+# Handler signature: handler(keys, patterns, tags, flush)
+InvalidationHandler = Callable[[List[str], List[str], List[str], bool], None]
+
+
+class InvalidationBus:
+    """Publishes invalidations and applies the ones published by other processes."""
+
+    def __init__(self, redis_url: str, channel: str = "cache:invalidate", enabled: bool = True):
+        self.redis_url = redis_url
+        self.channel = channel
+        self.enabled = enabled
+        self._handlers: List[InvalidationHandler] = []
+        self._origin: Optional[str] = None
+        self._pid: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._pubsub = None
+
+        self.published = 0
+        self.received = 0
+        self.reconnects = 0
+        self.last_lag_ms: Optional[float] = None
+
+    @property
+    def origin(self) -> str:
+        """Identity of this process; messages it published itself are skipped on receipt."""
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._origin = f"{socket.gethostname()}:{self._pid}:{uuid.uuid4().hex[:8]}"
+        return self._origin
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive() and self._pid == os.getpid()
+
+    def register(self, handler: InvalidationHandler):
+        """Register a local cache to be invalidated by messages from other processes."""
+        self._handlers.append(handler)
+
+    def message(self, keys: Iterable[str] = (), patterns: Iterable[str] = (), tags: Iterable[str] = ()) -> str:
+        """Encode an invalidation for publishing (e.g. inside a caller's pipeline)."""
+        self.published += 1
+        return json.dumps({
+            "o": self.origin,
+            "ts": time.time(),
+            "k": list(keys),
+            "p": list(patterns),
+            "t": list(tags)
+        }, separators=(",", ":"))
+
+    async def publish(self, redis_client, keys: Iterable[str] = (), patterns: Iterable[str] = (),
+                      tags: Iterable[str] = ()) -> bool:
+        """Publish an invalidation on its own round-trip."""
+        if not self.enabled or not redis_client:
+            return False
+        try:
+            await redis_client.publish(self.channel, self.message(keys, patterns, tags))
+            return True
+        except Exception as e:
+            logger.warning(f"Cache invalidation publish failed: {e}")
+            return False
+
+    def start(self):
+        """Start the subscriber thread (again, after a fork). Idempotent."""
+        if not self.enabled or self.running:
+            return
+        self._stop.clear()
+        self.origin  # Fix the identity for this process before messages arrive
+        self._thread = threading.Thread(target=self._listen, name="cache-invalidation", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        pubsub = self._pubsub
+        if pubsub is not None:
+            try:
+                pubsub.close()
+            except Exception:
+                pass
+
+    def _dispatch(self, keys: List[str], patterns: List[str], tags: List[str], flush: bool):
+        for handler in self._handlers:
+            try:
+                handler(keys, patterns, tags, flush)
+            except Exception as e:
+                logger.error(f"Cache invalidation handler failed: {e}")
+
+    def _handle(self, data: Any):
+        try:
+            payload: Dict[str, Any] = json.loads(data)
+        except (TypeError, ValueError):
+            logger.warning("Ignoring malformed cache invalidation message")
+            return
+        if payload.get("o") == self._origin:
+            return
+        self.received += 1
+        if payload.get("ts"):
+            self.last_lag_ms = round((time.time() - payload["ts"]) * 1000, 2)
+        self._dispatch(payload.get("k") or [], payload.get("p") or [], payload.get("t") or [], False)
+
+    def _listen(self):
+        delay = 0.5
+        while not self._stop.is_set():
+            try:
+                client = redis.Redis.from_url(self.redis_url, decode_responses=True, health_check_interval=30)
+                self._pubsub = client.pubsub()
+                self._pubsub.subscribe(self.channel)
+                for message in self._pubsub.listen():
+                    if self._stop.is_set():
+                        break
+                    if message["type"] == "subscribe":
+                        # Anything published while we were not subscribed is lost - start clean
+                        self.reconnects += 1
+                        self._dispatch([], [], [], True)
+                        delay = 0.5
+                        logger.info(f"Cache invalidation bus subscribed to {self.channel}")
+                    elif message["type"] == "message":
+                        self._handle(message["data"])
+            except Exception as e:
+                if self._stop.is_set():
+                    break
+                logger.warning(f"Cache invalidation subscriber disconnected, retrying in {delay}s: {e}")
+                self._stop.wait(delay)
+                delay = min(delay * 2, 30)
+            finally:
+                if self._pubsub is not None:
+                    try:
+                        self._pubsub.close()
+                    except Exception:
+                        pass
+                    self._pubsub = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "running": self.running,
+            "channel": self.channel,
+            "published": self.published,
+            "received": self.received,
+            "reconnects": self.reconnects,
+            "last_lag_ms": self.last_lag_ms
+        }
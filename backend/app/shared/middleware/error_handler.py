@@ -13,6 +13,7 @@ from app.shared.exceptions.base import (
     ENABLEDRMException, DomainException, InfrastructureException,
     ValidationException, NotFoundError, ConflictError, UnauthorizedError
 )
+from app.shared.infrastructure.cache import track_round_trips
 
 logger = logging.getLogger(__name__)
 
@@ -136,6 +137,9 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
             }
         )
         
+        # Count cache round-trips made while handling the request
+        round_trips = track_round_trips()
+        
         # Process request
         response = await call_next(request)
         
@@ -150,7 +154,9 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
                 "status_code": response.status_code,
                 "duration_seconds": duration,
                 "path": request.url.path,
-                "method": request.method
+                "method": request.method,
+                "cache_round_trips": round_trips.round_trips,
+                "cache_commands": round_trips.commands
             }
         )
         
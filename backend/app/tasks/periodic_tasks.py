@@ -7,6 +7,8 @@ from datetime import datetime, timezone, timedelta
 from app.core.celery_app import celery_app
 from app.tasks.cleanup_tasks import CleanupTasks
 from app.services.health_monitoring_service import HealthMonitoringService
+from app.services.health_history_service import HealthHistoryService
+from app.services.execution_rollup_service import ExecutionRollupService
 from app.services.celery_monitoring_service import CeleryMonitoringService
 from app.services.job_scheduling_service import JobSchedulingService
 from app.services.job_service import JobService
@@ -82,6 +84,38 @@ def target_health_monitoring_task(self):
         return {"status": "failed", "error": str(e)}
 
 
+@celery_app.task(bind=True, name="app.tasks.periodic_tasks.downsample_health_history_task")
+def downsample_health_history_task(self):
+    """Celery task to roll raw health samples into 5 minute and 1 hour buckets"""
+    logger.info("📉 Downsampling target health history...")
+    
+    try:
+        written = HealthHistoryService().downsample()
+        logger.info(f"✅ Health history downsampling completed: {written}")
+        return {"status": "success", "buckets_written": written}
+    except Exception as e:
+        logger.error(f"❌ Health history downsampling failed: {str(e)}")
+        return {"status": "failed", "error": str(e)}
+
+
+@celery_app.task(bind=True, name="app.tasks.periodic_tasks.rollup_executions_task")
+def rollup_executions_task(self):
+    """Celery task to fold finished executions not counted yet into the hourly/daily rollups"""
+    logger.info("📈 Catching up execution rollups...")
+    
+    try:
+        db = SessionLocal()
+        try:
+            counted = ExecutionRollupService(db).catch_up()
+        finally:
+            db.close()
+        logger.info(f"✅ Execution rollup catch-up completed: {counted}")
+        return {"status": "success", **counted}
+    except Exception as e:
+        logger.error(f"❌ Execution rollup catch-up failed: {str(e)}")
+        return {"status": "failed", "error": str(e)}
+
+
 @celery_app.task(bind=True, name="app.tasks.periodic_tasks.collect_celery_metrics_task")
 def collect_celery_metrics_task(self):
     """Celery task to collect and store metrics snapshots"""
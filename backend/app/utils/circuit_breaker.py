@@ -0,0 +1,263 @@
+"""
+Per-host circuit breaker shared by every subsystem that connects to targets.
+
+State lives in Redis so job execution, health monitoring, connection tests and
+notifications all see the same view of a (host, port):
+- closed: calls go through; connect failures are counted within a window
+- open: calls fail fast until the open period ends
+- half_open: exactly one caller is let through as a probe; reaching the host closes the
+  circuit, a connect failure re-opens it with a doubled open period
+Only connect-level failures (timeouts, refused, unreachable) count - an
+authentication error proves the host is alive. Redis errors fail open.
+"""
+import logging
+import time
+from typing import Dict, Any, List, Optional, Tuple
+
+from app.core.cache import get_sync_redis_client
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+CIRCUIT_KEY_PREFIX = "circuit"
+
+# Error fragments that mean the host could not be reached at all
+CONNECT_FAILURE_TERMS = [
+    'timeout', 'timed out', 'connection refused', 'network', 'unreachable',
+    'no route to host', 'temporary failure', 'reset by peer', 'broken pipe',
+    'cannot reach'
+]
+
+# KEYS[1] circuit key; ARGV: now, probe timeout
+# Returns 1 (closed, go ahead), 2 (half-open, caller is the probe) or 0 (open, fail fast)
+_ALLOW_SCRIPT = """
+local state = redis.call('HGET', KEYS[1], 'state')
+if not state then
+    return 1
+end
+local now = tonumber(ARGV[1])
+if state == 'open' then
+    if now < tonumber(redis.call('HGET', KEYS[1], 'open_until')) then
+        return 0
+    end
+    redis.call('HSET', KEYS[1], 'state', 'half_open', 'probe_until', now + tonumber(ARGV[2]))
+    return 2
+end
+if now >= tonumber(redis.call('HGET', KEYS[1], 'probe_until')) then
+    -- The previous probe never reported back; let this caller probe instead
+    redis.call('HSET', KEYS[1], 'probe_until', now + tonumber(ARGV[2]))
+    return 2
+end
+return 0
+"""
+
+# KEYS[1] circuit key; ARGV: now, threshold, window, open seconds, max open seconds
+# Returns the resulting state
+_FAILURE_SCRIPT = """
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[3])
+local max_open = tonumber(ARGV[5])
+local state = redis.call('HGET', KEYS[1], 'state')
+local failures = redis.call('HINCRBY', KEYS[1], 'failures', 1)
+redis.call('HSET', KEYS[1], 'last_failure', now)
+if state then
+    local open_for = tonumber(redis.call('HGET', KEYS[1], 'open_seconds'))
+    if state == 'half_open' then
+        open_for = math.min(open_for * 2, max_open)
+    end
+    redis.call('HSET', KEYS[1], 'state', 'open', 'open_until', now + open_for, 'open_seconds', open_for)
+    redis.call('EXPIRE', KEYS[1], max_open + window)
+    return 'open'
+end
+if failures == 1 then
+    redis.call('EXPIRE', KEYS[1], window)
+end
+if failures >= tonumber(ARGV[2]) then
+    local open_for = tonumber(ARGV[4])
+    redis.call('HSET', KEYS[1], 'state', 'open', 'opened_at', now, 'open_until', now + open_for, 'open_seconds', open_for)
+    redis.call('EXPIRE', KEYS[1], max_open + window)
+    return 'open'
+end
+return 'closed'
+"""
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the host's circuit is open."""
+
+    def __init__(self, host: str, port: int, retry_in: Optional[float] = None):
+        self.host = host
+        self.port = port
+        self.retry_in = retry_in
+        message = f"Circuit open for {host}:{port} - recent connection attempts failed"
+        if retry_in is not None:
+            message += f", next probe in {int(retry_in)}s"
+        super().__init__(message)
+
+
+def is_connect_failure(error_text: Optional[str]) -> bool:
+    """Whether an error message describes a failure to reach the host."""
+    error_text = (error_text or '').lower()
+    return any(term in error_text for term in CONNECT_FAILURE_TERMS)
+
+
+def _circuit_key(host: str, port: int) -> str:
+    return f"{CIRCUIT_KEY_PREFIX}:{host}:{port}"
+
+
+class HostCircuitBreaker:
+    """Redis-backed circuit breaker keyed by (host, port)."""
+
+    def __init__(self, redis_client=None):
+        self._redis = redis_client
+        self._scripts = None
+
+    @property
+    def redis(self):
+        """Blocking Redis client, resolved on first use."""
+        if self._redis is None:
+            self._redis = get_sync_redis_client()
+        return self._redis
+
+    @property
+    def enabled(self) -> bool:
+        return settings.CIRCUIT_BREAKER_ENABLED and self.redis is not None
+
+    def _script(self, name: str):
+        if self._scripts is None:
+            self._scripts = {
+                'allow': self.redis.register_script(_ALLOW_SCRIPT),
+                'failure': self.redis.register_script(_FAILURE_SCRIPT)
+            }
+        return self._scripts[name]
+
+    def _failure_args(self, now: float) -> list:
+        return [
+            now,
+            settings.CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+            settings.CIRCUIT_BREAKER_FAILURE_WINDOW,
+            settings.CIRCUIT_BREAKER_OPEN_SECONDS,
+            settings.CIRCUIT_BREAKER_MAX_OPEN_SECONDS
+        ]
+
+    def allow(self, host: str, port: int) -> bool:
+        """Whether a connection to host:port may be attempted now."""
+        if not self.enabled or not host:
+            return True
+
+        try:
+            decision = self._script('allow')(keys=[_circuit_key(host, port)], args=[time.time(), settings.CONNECTION_TIMEOUT])
+        except Exception as e:
+            logger.warning(f"Circuit breaker check failed for {host}:{port}, allowing call: {str(e)}")
+            return True
+
+        if decision == 2:
+            logger.info(f"🔌 Circuit half-open for {host}:{port}, sending probe")
+        return decision != 0
+
+    def guard(self, host: str, port: int):
+        """Raise CircuitOpenError if host:port is currently short-circuited."""
+        if not self.allow(host, port):
+            state = self.get_state(host, port)
+            raise CircuitOpenError(host, port, state.get('retry_in'))
+
+    def record_success(self, host: str, port: int):
+        """Close the circuit for host:port."""
+        if not self.enabled or not host:
+            return
+
+        try:
+            if self.redis.delete(_circuit_key(host, port)):
+                logger.debug(f"Circuit closed for {host}:{port}")
+        except Exception as e:
+            logger.warning(f"Circuit breaker update failed for {host}:{port}: {str(e)}")
+
+    def record_failure(self, host: str, port: int):
+        """Count a connect failure against host:port, opening the circuit at the threshold."""
+        if not self.enabled or not host:
+            return
+
+        try:
+            state = self._script('failure')(keys=[_circuit_key(host, port)], args=self._failure_args(time.time()))
+            if state == 'open':
+                logger.warning(f"🔌 Circuit open for {host}:{port}")
+        except Exception as e:
+            logger.warning(f"Circuit breaker update failed for {host}:{port}: {str(e)}")
+
+    def record_result(self, host: str, port: int, success: bool, error_text: Optional[str] = None):
+        """
+        Record a call outcome. Only connect failures count against the host; any other
+        outcome (success, auth or command error) proves it reachable and closes the
+        circuit, so a half-open probe that fails past the connect step still releases it.
+        """
+        if success or not is_connect_failure(error_text):
+            self.record_success(host, port)
+        else:
+            self.record_failure(host, port)
+
+    def record_results(self, results: List[Tuple[str, int, bool]]):
+        """
+        Record many probe outcomes in one round-trip.
+
+        Args:
+            results: (host, port, reachable) tuples from connect-level probes
+        """
+        if not self.enabled or not results:
+            return
+
+        now = time.time()
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            failure_script = self._script('failure')
+            for host, port, reachable in results:
+                if reachable:
+                    pipe.delete(_circuit_key(host, port))
+                else:
+                    failure_script(keys=[_circuit_key(host, port)], args=self._failure_args(now), client=pipe)
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f"Circuit breaker batch update failed: {str(e)}")
+
+    def get_states(self, endpoints: List[Tuple[str, int]]) -> Dict[Tuple[str, int], Dict[str, Any]]:
+        """
+        Current breaker state for many endpoints in one round-trip.
+
+        Returns:
+            dict: (host, port) -> {'state', 'failures', 'retry_in'}
+        """
+        states = {endpoint: {'state': 'closed', 'failures': 0, 'retry_in': None} for endpoint in endpoints}
+        if not self.enabled or not endpoints:
+            return states
+
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for host, port in endpoints:
+                pipe.hgetall(_circuit_key(host, port))
+            raw_states = pipe.execute()
+        except Exception as e:
+            logger.warning(f"Circuit breaker state lookup failed: {str(e)}")
+            return states
+
+        now = time.time()
+        for endpoint, raw in zip(endpoints, raw_states):
+            if not raw:
+                continue
+            state = raw.get('state', 'closed')
+            retry_in = None
+            if state == 'open':
+                retry_in = max(float(raw.get('open_until', now)) - now, 0)
+            states[endpoint] = {
+                'state': state,
+                'failures': int(raw.get('failures', 0)),
+                'retry_in': retry_in
+            }
+
+        return states
+
+    def get_state(self, host: str, port: int) -> Dict[str, Any]:
+        """Current breaker state for one endpoint."""
+        return self.get_states([(host, port)])[(host, port)]
+
+
+# Global breaker instance
+host_circuit_breaker = HostCircuitBreaker()
@@ -1,6 +1,7 @@
 """
 Connection test utilities for testing target connectivity.
 """
+import asyncio
 import socket
 import io
 import paramiko
@@ -8,6 +9,8 @@ import winrm
 import sqlite3
 from typing import Dict, Any, Optional
 from app.utils.encryption_utils import decrypt_credentials
+from app.utils.circuit_breaker import host_circuit_breaker, CircuitOpenError
+from app.utils.http_client import target_http_client
 
 
 def test_ssh_connection(host: str, port: int, credentials: Dict[str, Any], timeout: int = 10) -> Dict[str, Any]:
@@ -962,32 +965,50 @@ def test_telnet_connection(host: str, port: int, credentials: Dict[str, Any], ti
         return {'success': False, 'message': f'Telnet connection test failed: {str(e)}'}
 
 
-def test_rest_api_connection(host: str, port: int, credentials: Dict[str, Any], config: Dict[str, Any] = None, timeout: int = 30) -> Dict[str, Any]:
-    """Test REST API connectivity."""
+async def check_rest_api_async(host: str, port: int, credentials: Dict[str, Any], config: Dict[str, Any] = None, timeout: int = 30) -> Dict[str, Any]:
+    """
+    Check REST API connectivity on the shared HTTP client pool.
+    Must run on the client loop - use target_http_client.run()/run_many().
+    """
+    config = config or {}
+    protocol = config.get('protocol', 'http')
+    base_path = config.get('base_path', '/')
+    verify_ssl = config.get('verify_ssl', True)
+
+    url = f"{protocol}://{host}:{port}{base_path}"
+
     try:
-        import requests
-        
-        config = config or {}
-        protocol = config.get('protocol', 'http')
-        base_path = config.get('base_path', '/')
-        verify_ssl = config.get('verify_ssl', True)
-        
-        url = f"{protocol}://{host}:{port}{base_path}"
-        
         # Simple GET request to check if API is responding
-        response = requests.get(url, timeout=timeout, verify=verify_ssl)
-        
+        result = await target_http_client.request_async('GET', url, verify=verify_ssl, timeout=timeout)
+        response = result['response']
+
         if response.status_code < 500:  # Any response under 500 means the API is responding
             return {
-                'success': True, 
+                'success': True,
                 'message': f'REST API responding at {url} (status: {response.status_code})',
-                'details': f'Protocol: {protocol.upper()}, SSL Verify: {verify_ssl}'
+                'details': f'Protocol: {protocol.upper()}, SSL Verify: {verify_ssl}, HTTP: {result["http_version"]}',
+                'timing': result['timing']
             }
         else:
-            return {'success': False, 'message': f'REST API error at {url} (status: {response.status_code})'}
-            
+            return {
+                'success': False,
+                'message': f'REST API error at {url} (status: {response.status_code})',
+                'timing': result['timing']
+            }
+
     except Exception as e:
-        return {'success': False, 'message': f'REST API connection test failed: {str(e)}'}
+        return {'success': False, 'message': f'REST API connection test failed: {str(e) or type(e).__name__}'}
+
+
+def test_rest_api_connection(host: str, port: int, credentials: Dict[str, Any], config: Dict[str, Any] = None, timeout: int = 30) -> Dict[str, Any]:
+    """Test REST API connectivity."""
+    if not target_http_client.available:
+        return {'success': False, 'message': 'httpx library not installed - cannot test REST API connections'}
+
+    try:
+        return target_http_client.run(check_rest_api_async(host, port, credentials, config, timeout), timeout + 5)
+    except Exception as e:
+        return {'success': False, 'message': f'REST API connection test failed: {str(e) or type(e).__name__}'}
 
 
 # ============================================================================
@@ -1516,6 +1537,56 @@ def test_redis_connection(host: str, port: int, credentials: Dict[str, Any], con
         return {'success': False, 'message': f'Redis connection test failed: {str(e)}'}
 
 
+async def check_elasticsearch_async(host: str, port: int, credentials: Dict[str, Any], config: Dict[str, Any] = None, timeout: int = 10) -> Dict[str, Any]:
+    """
+    Check Elasticsearch over its REST API on the shared HTTP client pool.
+    Must run on the client loop - use target_http_client.run()/run_many().
+    """
+    config = config or {}
+    use_ssl = config.get('ssl', False)
+    verify_certs = config.get('verify_certs', True)
+
+    username = credentials.get('username')
+    password = credentials.get('password')
+    auth = (username, password) if username and password else None
+
+    scheme = 'https' if use_ssl else 'http'
+    base_url = f"{scheme}://{host}:{port}"
+
+    try:
+        info_result = await target_http_client.request_async('GET', f"{base_url}/", verify=verify_certs, timeout=timeout, auth=auth)
+        info_response = info_result['response']
+        if info_response.status_code in (401, 403):
+            return {'success': False, 'message': 'Elasticsearch authentication failed - check username/password', 'timing': info_result['timing']}
+        info_response.raise_for_status()
+        info = info_response.json()
+        version = info['version']['number']
+        cluster_name = info['cluster_name']
+
+        # Test cluster health
+        health_result = await target_http_client.request_async('GET', f"{base_url}/_cluster/health", verify=verify_certs, timeout=timeout, auth=auth)
+        health_result['response'].raise_for_status()
+        status = health_result['response'].json()['status']
+
+        return {
+            'success': True,
+            'message': f'Elasticsearch connection successful to {host}:{port}',
+            'details': f'Version: {version}, Cluster: {cluster_name}, Status: {status}, SSL: {use_ssl}',
+            'timing': info_result['timing']
+        }
+
+    except Exception as e:
+        error_msg = str(e).lower()
+        if 'unauthorized' in error_msg or 'authentication' in error_msg:
+            return {'success': False, 'message': 'Elasticsearch authentication failed - check username/password'}
+        elif 'connect' in error_msg and 'refused' in error_msg:
+            return {'success': False, 'message': f'Elasticsearch server not reachable at {host}:{port}'}
+        elif 'timeout' in error_msg or 'timed out' in error_msg or isinstance(e, asyncio.TimeoutError):
+            return {'success': False, 'message': f'Elasticsearch connection timeout to {host}:{port}'}
+        else:
+            return {'success': False, 'message': f'Elasticsearch error: {str(e) or type(e).__name__}'}
+
+
 def test_elasticsearch_connection(host: str, port: int, credentials: Dict[str, Any], config: Dict[str, Any] = None, timeout: int = 10) -> Dict[str, Any]:
     """
     Test Elasticsearch connection.
@@ -1530,65 +1601,48 @@ def test_elasticsearch_connection(host: str, port: int, credentials: Dict[str, A
     Returns:
         dict: Test result with success status and message
     """
+    if not target_http_client.available:
+        return {'success': False, 'message': 'httpx library not installed - cannot test Elasticsearch connections'}
+
     try:
-        from elasticsearch import Elasticsearch
-        
-        config = config or {}
-        use_ssl = config.get('ssl', False)
-        verify_certs = config.get('verify_certs', True)
-        
-        username = credentials.get('username')
-        password = credentials.get('password')
-        
-        # Build connection parameters
-        scheme = 'https' if use_ssl else 'http'
-        hosts = [f"{scheme}://{host}:{port}"]
-        
-        es_config = {
-            'hosts': hosts,
-            'timeout': timeout,
-            'verify_certs': verify_certs
-        }
-        
-        if username and password:
-            es_config['http_auth'] = (username, password)
-        
-        try:
-            es = Elasticsearch(**es_config)
-            
-            # Test connection
-            info = es.info()
-            version = info['version']['number']
-            cluster_name = info['cluster_name']
-            
-            # Test cluster health
-            health = es.cluster.health()
-            status = health['status']
-            
-            return {
-                'success': True,
-                'message': f'Elasticsearch connection successful to {host}:{port}',
-                'details': f'Version: {version}, Cluster: {cluster_name}, Status: {status}, SSL: {use_ssl}'
-            }
-            
-        except Exception as e:
-            error_msg = str(e).lower()
-            if 'unauthorized' in error_msg or 'authentication' in error_msg:
-                return {'success': False, 'message': 'Elasticsearch authentication failed - check username/password'}
-            elif 'connection' in error_msg and 'refused' in error_msg:
-                return {'success': False, 'message': f'Elasticsearch server not reachable at {host}:{port}'}
-            elif 'timeout' in error_msg:
-                return {'success': False, 'message': f'Elasticsearch connection timeout to {host}:{port}'}
-            else:
-                return {'success': False, 'message': f'Elasticsearch error: {str(e)}'}
-                
-    except ImportError:
-        return {'success': False, 'message': 'elasticsearch library not installed - cannot test Elasticsearch connections'}
+        # Two sequential requests, so allow for both
+        return target_http_client.run(check_elasticsearch_async(host, port, credentials, config, timeout), timeout * 2 + 5)
     except Exception as e:
-        return {'success': False, 'message': f'Elasticsearch connection test failed: {str(e)}'}
+        return {'success': False, 'message': f'Elasticsearch connection test failed: {str(e) or type(e).__name__}'}
 
 
 def perform_connection_test(target, method, credentials_data) -> Dict[str, Any]:
+    """
+    Perform connection test based on method type, honouring the per-host circuit breaker.
+    
+    Args:
+        target: Target object
+        method: Communication method object
+        credentials_data: Decrypted credentials dictionary
+        
+    Returns:
+        dict: Test result with success status and message
+    """
+    host = (method.config or {}).get('host')
+    port = (method.config or {}).get('port')
+    
+    if host and port and not host_circuit_breaker.allow(host, port):
+        state = host_circuit_breaker.get_state(host, port)
+        return {
+            'success': False,
+            'message': str(CircuitOpenError(host, port, state.get('retry_in'))),
+            'circuit_breaker': state
+        }
+    
+    result = _perform_connection_test(target, method, credentials_data)
+    
+    if host and port:
+        host_circuit_breaker.record_result(host, port, result.get('success', False), result.get('message'))
+    
+    return result
+
+
+def _perform_connection_test(target, method, credentials_data) -> Dict[str, Any]:
     """
     Perform connection test based on method type.
     
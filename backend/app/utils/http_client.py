@@ -0,0 +1,203 @@
+"""
+Shared async HTTP client for REST-type target checks and calls.
+
+One process-wide httpx client pool runs on a dedicated background event loop,
+so sync callers (services, Celery tasks) and async callers on other loops all
+reuse the same keep-alive connections:
+- connection pooling with keep-alive, HTTP/2 when the h2 package is installed
+- a per-host connection cap on top of the global pool limit
+- a timing breakdown per request (DNS, connect, TLS, TTFB, total)
+Coroutines that call request_async() must run on the client loop - submit them
+with run() or run_many().
+"""
+import asyncio
+import ipaddress
+import logging
+import os
+import threading
+import time
+from typing import Dict, Any, List, Optional, Tuple, Coroutine
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+try:
+    import h2  # noqa: F401 - only probed so HTTP/2 is enabled when available
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+MAX_CONNECTIONS = int(os.getenv('TARGET_HTTP_MAX_CONNECTIONS', '200'))
+MAX_CONNECTIONS_PER_HOST = int(os.getenv('TARGET_HTTP_MAX_CONNECTIONS_PER_HOST', '4'))
+KEEPALIVE_EXPIRY = float(os.getenv('TARGET_HTTP_KEEPALIVE_EXPIRY', '60'))
+DNS_CACHE_TTL = 60
+
+
+class _RequestTimer:
+    """httpcore trace callback that records when each connection phase starts and ends."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.marks: Dict[str, float] = {}
+
+    async def __call__(self, event_name: str, info: Dict[str, Any]):
+        self.marks.setdefault(event_name, time.perf_counter())
+
+    def _mark(self, suffix: str) -> Optional[float]:
+        for event_name, mark in self.marks.items():
+            if event_name.endswith(suffix):
+                return mark
+        return None
+
+    def _span_ms(self, start_suffix: str, end_suffix: str) -> Optional[float]:
+        start, end = self._mark(start_suffix), self._mark(end_suffix)
+        if start is None or end is None:
+            return None
+        return round((end - start) * 1000, 2)
+
+    def breakdown(self, dns_ms: Optional[float]) -> Dict[str, Any]:
+        connect_ms = self._span_ms('connect_tcp.started', 'connect_tcp.complete')
+        return {
+            'dns_ms': dns_ms,
+            'connect_ms': connect_ms,
+            'tls_ms': self._span_ms('start_tls.started', 'start_tls.complete'),
+            'ttfb_ms': self._span_ms('send_request_headers.started', 'receive_response_headers.complete'),
+            'total_ms': round((time.perf_counter() - self.started) * 1000, 2),
+            'connection_reused': connect_ms is None
+        }
+
+
+class TargetHttpClient:
+    """Process-wide pooled async HTTP client running on its own event loop thread."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pid = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._clients: Dict[bool, Any] = {}
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+        self._dns_cache: Dict[Tuple[str, int], float] = {}
+
+    @property
+    def available(self) -> bool:
+        return HTTPX_AVAILABLE
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        """Start the client loop lazily, and again in forked children (Celery prefork)."""
+        with self._lock:
+            if self._loop is None or self._pid != os.getpid():
+                self._loop = asyncio.new_event_loop()
+                self._clients = {}
+                self._host_limits = {}
+                self._dns_cache = {}
+                self._pid = os.getpid()
+                threading.Thread(target=self._loop.run_forever, name='target-http-client', daemon=True).start()
+            return self._loop
+
+    def _client(self, verify: bool):
+        # SSL verification is a client-level setting in httpx, so keep one pool per mode
+        if verify not in self._clients:
+            self._clients[verify] = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE,
+                verify=verify,
+                limits=httpx.Limits(
+                    max_connections=MAX_CONNECTIONS,
+                    max_keepalive_connections=MAX_CONNECTIONS,
+                    keepalive_expiry=KEEPALIVE_EXPIRY
+                ),
+                follow_redirects=False
+            )
+        return self._clients[verify]
+
+    async def _resolve(self, host: str, port: int) -> Optional[float]:
+        """Time name resolution; cached so keep-alive requests don't pay for it again."""
+        try:
+            ipaddress.ip_address(host)
+            return None
+        except ValueError:
+            pass
+
+        if self._dns_cache.get((host, port), 0) > time.monotonic():
+            return 0.0
+
+        started = time.perf_counter()
+        await asyncio.get_running_loop().getaddrinfo(host, port)
+        self._dns_cache[(host, port)] = time.monotonic() + DNS_CACHE_TTL
+        return round((time.perf_counter() - started) * 1000, 2)
+
+    async def request_async(
+        self,
+        method: str,
+        url: str,
+        *,
+        verify: bool = True,
+        timeout: float = 30,
+        headers: Optional[Dict[str, str]] = None,
+        auth: Optional[Tuple[str, str]] = None,
+        json: Any = None
+    ) -> Dict[str, Any]:
+        """
+        Send a request on the shared pool. Must run on the client loop.
+
+        Returns:
+            dict: {'response': httpx.Response (body read), 'http_version': str, 'timing': dict}
+        """
+        parsed = httpx.URL(url)
+        origin = f"{parsed.scheme}://{parsed.host}:{parsed.port}"
+        limit = self._host_limits.setdefault(origin, asyncio.Semaphore(MAX_CONNECTIONS_PER_HOST))
+
+        async with limit:
+            timer = _RequestTimer()
+            dns_ms = await asyncio.wait_for(self._resolve(parsed.host, parsed.port or 80), timeout)
+            response = await self._client(verify).request(
+                method,
+                url,
+                headers=headers,
+                auth=auth,
+                json=json,
+                timeout=timeout,
+                extensions={'trace': timer}
+            )
+
+        return {
+            'response': response,
+            'http_version': response.http_version,
+            'timing': timer.breakdown(dns_ms)
+        }
+
+    def run(self, coro: Coroutine, timeout: Optional[float] = None) -> Any:
+        """Run a coroutine on the client loop and block until it finishes."""
+        future = asyncio.run_coroutine_threadsafe(coro, self._get_loop())
+        return future.result(timeout)
+
+    def run_many(self, coros: List[Coroutine], timeout: Optional[float] = None) -> List[Any]:
+        """Run coroutines concurrently on the client loop; exceptions are returned, not raised."""
+        if not coros:
+            return []
+
+        async def gather():
+            return await asyncio.gather(*coros, return_exceptions=True)
+
+        return self.run(gather(), timeout)
+
+    async def run_async(self, coro: Coroutine) -> Any:
+        """Await a coroutine on the client loop from any other event loop."""
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, self._get_loop()))
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'httpx_available': HTTPX_AVAILABLE,
+            'http2_enabled': HTTP2_AVAILABLE,
+            'max_connections': MAX_CONNECTIONS,
+            'max_connections_per_host': MAX_CONNECTIONS_PER_HOST,
+            'hosts_seen': len(self._host_limits)
+        }
+
+
+# Global client instance
+target_http_client = TargetHttpClient()
@@ -16,7 +16,7 @@ from typing import List
 # Import new middleware
 from app.shared.middleware.error_handler import ErrorHandlingMiddleware, RequestLoggingMiddleware
 
-from app.database.database import engine, Base
+from app.database.database import engine, Base, ensure_execution_rollup_columns
 # LEGACY ROUTERS REMOVED - Using v3 only
 # Legacy routers removed - consolidated into V2 APIs
 # Legacy system_health and system_management removed - consolidated into V2 APIs
@@ -29,6 +29,8 @@ from app.models import notification_models, user_models, job_models, analytics_m
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
+# Columns added to existing tables since they were created (see alembic revision 7c3e91d5a2b4)
+ensure_execution_rollup_columns()
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -39,6 +41,17 @@ async def lifespan(app: FastAPI):
     from app.shared.infrastructure.cache import cache_service
     await cache_service.initialize()
     
+    # Start the background audit writer
+    from app.domains.audit.services.audit_service import audit_pipeline, audit_export_manager
+    await audit_pipeline.start()
+    await audit_export_manager.resume_interrupted()
+    from app.core.audit_policy import api_access_aggregator
+    await api_access_aggregator.start()
+    
+    # Load the IP blocklist and follow changes made by other workers
+    from app.domains.security.services.ip_blocklist import ip_blocklist
+    await ip_blocklist.start()
+    
     # Initialize Phase 2 improvements - Redis cache for device types
     try:
         from app.core.cache import initialize_redis
@@ -138,6 +151,14 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         print(f"⚠️  Failed to log system shutdown event: {e}")
     
+    # Park running exports (resumed on the next start), write the open API access rollups,
+    # then drain queued audit events before the connections go away
+    await audit_export_manager.stop()
+    await api_access_aggregator.stop()
+    await audit_pipeline.stop()
+    print("✅ Audit pipeline drained")
+    await ip_blocklist.stop()
+    
     # Close Redis connections
     try:
         from app.core.cache import close_redis
@@ -146,6 +167,10 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         print(f"⚠️  Redis cache cleanup failed: {e}")
 
+    # Stop the cache invalidation subscriber
+    from app.shared.infrastructure.cache import invalidation_bus
+    invalidation_bus.stop()
+
 app = FastAPI(
     title="OpsConductor Enterprise Automation Orchestration Platform",
     description="Job-centric automation platform for orchestrating tasks across any type of target system",
@@ -181,6 +206,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Reject blocked addresses first (added last, so it is the outermost middleware)
+from app.core.ip_blocklist_middleware import IpBlocklistMiddleware
+app.add_middleware(IpBlocklistMiddleware)
+
 # Authentication is now handled by centralized auth_dependencies module
 
 # LEGACY ROUTERS REMOVED - Using v3 only
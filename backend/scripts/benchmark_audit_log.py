@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Benchmark: indexed, segmented audit log (AuditLogStore) vs. the single-file scan.
+
+Writes --size-mb of synthetic audit events (spread over --days, --users users)
+both to one JSON-lines file and to an AuditLogStore, then times typical
+queries and a verification of the hash chain and checkpoints. The baseline is
+how the file was read before segmentation: parse every line, filter, sort by
+timestamp and slice the page. Run from the backend directory (the data is
+kept under --dir; pass --reuse to skip writing it):
+
+    python scripts/benchmark_audit_log.py --size-mb 2048 --dir /tmp/audit-bench
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.domains.audit.services.audit_log_store import AuditLogStore  # noqa: E402
+
+EVENT_TYPES = ["user_login", "user_logout", "target_created", "target_updated", "job_executed",
+               "job_created", "system_config_changed", "security_violation", "data_export"]
+SEVERITIES = ["info", "low", "medium", "high", "critical"]
+SEVERITY_WEIGHTS = [50, 25, 15, 8, 2]
+RESOURCE_TYPES = ["user", "target", "job", "system", "security"]
+
+
+def generate(args, legacy_path: str, store: AuditLogStore):
+    rng = random.Random(args.seed)
+    start = datetime.now(timezone.utc) - timedelta(days=args.days)
+    target_bytes = args.size_mb * 1024 * 1024
+    # Rough entry size to spread the timestamps evenly over the period
+    step = timedelta(days=args.days) / max(1, target_bytes // 420)
+    written = 0
+    count = 0
+    batch = []
+    with open(legacy_path, "w", encoding="utf-8") as legacy:
+        while written < target_bytes:
+            timestamp = start + step * count
+            entry = {
+                "id": f"audit_{int(timestamp.timestamp() * 1000000)}",
+                "timestamp": timestamp.isoformat(),
+                "event_type": rng.choice(EVENT_TYPES),
+                "user_id": rng.randint(1, args.users),
+                "resource_type": rng.choice(RESOURCE_TYPES),
+                "resource_id": str(rng.randint(1, 5000)),
+                "action": "update",
+                "details": {"field": "status", "old": "active", "new": "inactive", "request_id": rng.getrandbits(64)},
+                "severity": rng.choices(SEVERITIES, SEVERITY_WEIGHTS)[0],
+                "ip_address": f"10.0.{rng.randint(0, 255)}.{rng.randint(1, 254)}",
+                "user_agent": "Mozilla/5.0 (X11; Linux x86_64)",
+                "checksum": "%064x" % rng.getrandbits(256)
+            }
+            line = json.dumps(entry, separators=(",", ":"))
+            legacy.write(line + "\n")
+            written += len(line) + 1
+            count += 1
+            batch.append(entry)
+            if len(batch) >= 1000:
+                store.append(batch)
+                batch = []
+    if batch:
+        store.append(batch)
+    return count
+
+
+def legacy_query(path: str, filters, since, until, offset: int, limit: int):
+    """The pre-segmentation read: parse everything, filter, sort, slice."""
+    events = []
+    with open(path, "r") as f:
+        for line in f:
+            try:
+                event = json.loads(line.strip())
+            except json.JSONDecodeError:
+                continue
+            if any(str(event.get(field)) != str(value) for field, value in filters.items()):
+                continue
+            if since or until:
+                ts = datetime.fromisoformat(event["timestamp"])
+                if (since and ts < since) or (until and ts > until):
+                    continue
+            events.append(event)
+    events.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
+    return events[offset:offset + limit], len(events)
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - started) * 1000
+
+
+def main(args) -> int:
+    legacy_path = os.path.join(args.dir, "audit.log")
+    store_dir = os.path.join(args.dir, "segments")
+    if not args.reuse:
+        shutil.rmtree(args.dir, ignore_errors=True)
+        os.makedirs(args.dir)
+    store = AuditLogStore(store_dir, fsync=False, segment_max_bytes=args.segment_mb * 1024 * 1024)
+    if not args.reuse:
+        count, ms = timed(lambda: generate(args, legacy_path, store))
+        print(f"wrote {count} events ({args.size_mb} MB) in {ms / 1000:.1f}s")
+    store.close()
+
+    # Reopen so the store starts from the on-disk indexes like after a restart
+    store = AuditLogStore(store_dir, fsync=False, segment_max_bytes=args.segment_mb * 1024 * 1024)
+    _, load_ms = timed(lambda: store.query(limit=1))
+    stats = store.get_stats()
+    print(f"{stats['segments']} segments, {stats['events']} events; opened in {load_ms:.1f} ms")
+
+    now = datetime.now(timezone.utc)
+    one_hour = (now - timedelta(days=args.days / 2), now - timedelta(days=args.days / 2) + timedelta(hours=1))
+    queries = [
+        ("page 1, all events", {}, None, None, 0),
+        ("page 1, one user", {"user_id": 7}, None, None, 0),
+        ("page 20, one user", {"user_id": 7}, None, None, 19 * args.limit),
+        ("user + event type", {"user_id": 7, "event_type": "data_export"}, None, None, 0),
+        ("critical, one hour", {"severity": "critical"}, one_hour[0], one_hour[1], 0),
+    ]
+    print(f"{'query':<22} {'legacy ms':>12} {'indexed ms':>12} {'blocks read':>12} {'total':>10}")
+    failures = 0
+    for label, filters, since, until, offset in queries:
+        blocks_before = store.blocks_read
+        (events, total), indexed_ms = timed(lambda: store.query(
+            filters=filters, since=since, until=until, offset=offset, limit=args.limit))
+        blocks = store.blocks_read - blocks_before
+        legacy_ms = float("nan")
+        if not args.skip_legacy:
+            (legacy_events, legacy_total), legacy_ms = timed(
+                lambda: legacy_query(legacy_path, filters, since, until, offset, args.limit))
+            if legacy_total != total or [e["id"] for e in legacy_events] != [e["id"] for e in events]:
+                print(f"  MISMATCH for {label}: {legacy_total} vs {total}")
+                failures += 1
+        print(f"{label:<22} {legacy_ms:>12.1f} {indexed_ms:>12.1f} {blocks:>12} {total:>10}")
+
+    report, verify_ms = timed(store.verify)
+    print(f"verify whole log: {report['events']} events, {report['segments']} segments in {verify_ms / 1000:.1f}s "
+          f"({'verified' if report['verified'] else report['errors']})")
+    report, verify_ms = timed(lambda: store.verify(since=one_hour[0], until=one_hour[1]))
+    print(f"verify one hour: {report['events']} events, {report['blocks_read']} blocks, "
+          f"{report['proof_hashes']} proof hashes in {verify_ms:.1f} ms")
+    failures += 0 if report["verified"] else 1
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dir", default="/tmp/audit-bench")
+    parser.add_argument("--size-mb", type=int, default=2048)
+    parser.add_argument("--segment-mb", type=int, default=256)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--reuse", action="store_true", help="query an existing --dir without regenerating it")
+    parser.add_argument("--skip-legacy", action="store_true", help="only time the indexed store")
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Codec benchmark: cache value encoding before and after the codec layer.
+
+"legacy" is the previous CacheService path (json.dumps, falling back to pickle;
+json.loads, falling back to pickle.loads via the exception). The codec rows
+use CacheCodec with each installed format. Run from the backend directory:
+
+    python scripts/benchmark_cache_codec.py --rounds 2000
+"""
+
+import argparse
+import json
+import os
+import pickle
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.shared.infrastructure.codec import CacheCodec, ORJSON_AVAILABLE, MSGPACK_AVAILABLE  # noqa: E402
+
+
+def legacy_encode(value):
+    try:
+        return json.dumps(value).encode("utf-8")
+    except (TypeError, ValueError):
+        return pickle.dumps(value)
+
+
+def legacy_decode(data):
+    try:
+        return json.loads(data)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return pickle.loads(data)
+
+
+def sample_payloads():
+    now = datetime.utcnow()
+    session = {
+        "user_id": 42,
+        "user_data": {"username": "operator", "role": "admin", "client_ip": "10.0.0.5", "user_agent": "Mozilla/5.0"},
+        "created_at": now.isoformat(),
+        "last_activity": now.isoformat(),
+        "session_id": "42_1700000000"
+    }
+    audit_entry = {
+        "id": "audit_123456",
+        "event_type": "user_login",
+        "timestamp": now,
+        "user_id": 42,
+        "details": {"ip": "10.0.0.5", "success": True, "methods": {"password", "mfa"}}
+    }
+    recent_ids = [f"audit_{i}" for i in range(1000)]
+    dashboard = {
+        "targets": [
+            {"id": i, "name": f"target-{i}", "status": "healthy", "last_check": now - timedelta(minutes=i), "tags": ["prod", "linux"]}
+            for i in range(500)
+        ]
+    }
+    return {
+        "session (json-safe)": session,
+        "audit entry (datetime, set)": audit_entry,
+        "recent id list": recent_ids,
+        "dashboard (500 rows)": dashboard
+    }
+
+
+def measure(encode, decode, value, rounds):
+    started = time.perf_counter()
+    for _ in range(rounds):
+        data = encode(value)
+    encode_us = (time.perf_counter() - started) / rounds * 1e6
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        decode(data)
+    decode_us = (time.perf_counter() - started) / rounds * 1e6
+    return encode_us, decode_us, len(data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=2000, help="Encode/decode rounds per payload")
+    parser.add_argument("--compression-threshold", type=int, default=1024)
+    args = parser.parse_args()
+
+    contenders = [("legacy", legacy_encode, legacy_decode)]
+    formats = ["json"] + (["orjson"] if ORJSON_AVAILABLE else []) + (["msgpack"] if MSGPACK_AVAILABLE else [])
+    for name in formats:
+        codec = CacheCodec(name, compression_threshold=args.compression_threshold)
+        contenders.append((name, codec.encode, codec.decode))
+
+    print(f"🔬 {args.rounds} rounds per payload, compression above {args.compression_threshold} bytes")
+    print(f"{'payload':<30}{'codec':<10}{'encode us':>12}{'decode us':>12}{'bytes':>10}")
+    for payload_name, value in sample_payloads().items():
+        for codec_name, encode, decode in contenders:
+            encode_us, decode_us, size = measure(encode, decode, value, args.rounds)
+            print(f"{payload_name:<30}{codec_name:<10}{encode_us:>12.1f}{decode_us:>12.1f}{size:>10}")
+
+
+if __name__ == "__main__":
+    main()
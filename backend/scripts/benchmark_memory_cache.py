@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: CacheService memory tier (MemoryCache) vs. the previous plain-dict tier.
+
+Replays a Zipfian key workload (read-through: miss -> set) against both and
+reports hit rate, evictions and throughput. Since a memory-tier miss costs a
+Redis round-trip, an effective rate charging --miss-cost-us per miss is shown
+too. Run from the backend directory:
+
+    python scripts/benchmark_memory_cache.py --keys 20000 --ops 500000 --capacity 1000
+"""
+
+import argparse
+import itertools
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.shared.infrastructure.cache import MemoryCache  # noqa: E402
+
+
+class LegacyDictCache:
+    """The memory tier as it was: dict capped by entry count, wall-clock expiry, drop 20% when full."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        entry = self.entries.get(key)
+        if entry is not None:
+            if entry["expires_at"] > datetime.now():
+                self.hits += 1
+                return entry["value"]
+            del self.entries[key]
+        self.misses += 1
+        return default
+
+    def set(self, key, value, ttl):
+        if len(self.entries) >= self.max_size:
+            now = datetime.now()
+            for expired_key in [k for k, e in self.entries.items() if e["expires_at"] <= now]:
+                del self.entries[expired_key]
+            if len(self.entries) >= self.max_size:
+                oldest = sorted(self.entries.items(), key=lambda item: item[1]["expires_at"])
+                for old_key, _ in oldest[:len(oldest) // 5]:
+                    del self.entries[old_key]
+                    self.evictions += 1
+        self.entries[key] = {"value": value, "expires_at": datetime.now() + timedelta(seconds=ttl)}
+        return True
+
+
+def zipf_keys(key_count: int, op_count: int, skew: float, seed: int):
+    """Sample op_count keys whose popularity follows a Zipf distribution with exponent skew."""
+    rng = random.Random(seed)
+    cum_weights = list(itertools.accumulate(1.0 / (rank ** skew) for rank in range(1, key_count + 1)))
+    ranks = rng.choices(range(key_count), cum_weights=cum_weights, k=op_count)
+    # Spread keys over a few namespaces, as real callers do
+    namespaces = ("targets", "users", "jobs", "discovery")
+    return [f"{namespaces[rank % len(namespaces)]}:{rank}" for rank in ranks]
+
+
+def run(cache, keys, payload, ttl, miss_cost_us):
+    started = time.perf_counter()
+    for key in keys:
+        if cache.get(key) is None:
+            cache.set(key, payload, ttl)
+    elapsed = time.perf_counter() - started
+    lookups = cache.hits + cache.misses
+    return {
+        "hit_rate": cache.hits / lookups if lookups else 0.0,
+        "evictions": cache.evictions,
+        "ops_per_sec": len(keys) / elapsed,
+        "effective_ops_per_sec": len(keys) / (elapsed + cache.misses * miss_cost_us / 1e6)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--keys", type=int, default=20000, help="Distinct keys")
+    parser.add_argument("--ops", type=int, default=500000, help="Lookups to replay")
+    parser.add_argument("--capacity", type=int, default=1000, help="Entry capacity of both caches")
+    parser.add_argument("--skew", type=float, default=1.0, help="Zipf exponent")
+    parser.add_argument("--ttl", type=int, default=3600, help="Entry TTL in seconds")
+    parser.add_argument("--miss-cost-us", type=float, default=200, help="Modelled cost of a miss (Redis round-trip), microseconds")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    keys = zipf_keys(args.keys, args.ops, args.skew, args.seed)
+    payload = {"id": 1, "name": "target", "status": "active", "tags": ["a", "b", "c"]}
+
+    print(f"🔬 Zipf(s={args.skew}) over {args.keys} keys, {args.ops} ops, capacity {args.capacity}")
+    print(f"{'cache':<12}{'hit rate':>10}{'evictions':>12}{'ops/s':>14}{'effective ops/s':>18}")
+
+    contenders = [
+        ("dict", LegacyDictCache(args.capacity)),
+        ("lru", MemoryCache(max_entries=args.capacity, namespace_quota=1.0))
+    ]
+    for name, cache in contenders:
+        result = run(cache, keys, payload, args.ttl, args.miss_cost_us)
+        print(f"{name:<12}{result['hit_rate']:>10.2%}{result['evictions']:>12}{result['ops_per_sec']:>14,.0f}"
+              f"{result['effective_ops_per_sec']:>18,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark: compiled single-pass threat matcher vs. the per-pattern loop.
+
+Builds a --size-mb JSON request body (clean, or with an attack string every
+--attack-every KB) and reports throughput in MB/s for:
+- the previous check: re.findall for each malicious pattern in turn
+- ThreatMatcher.scan over the whole body (all signatures)
+- ThreatMatcher.stream fed --chunk-kb chunks of the encoded body
+- is_match (stops at the first match)
+For the original four patterns, the signatures they map to must be matched
+exactly when the old loop found something. Run from the backend directory:
+
+    python scripts/benchmark_threat_matcher.py --size-mb 8
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.domains.security.services.threat_signatures import (  # noqa: E402
+    REQUEST_CONTENT_SIGNATURES, ThreatMatcher
+)
+
+# The patterns analyze_request_content looped over before, and the signature each became
+LEGACY_PATTERNS = {
+    r"(?i)(union|select|insert|delete|drop|create|alter)\s+": "sql_statement",
+    r"(?i)<script[^>]*>.*?</script>": "xss_script_tag",
+    r"(?i)javascript:": "xss_javascript_uri",
+    r"(?i)eval\s*\(": "code_eval",
+}
+
+WORDS = ["status", "target", "hostname", "port", "enabled", "created_at", "description", "credentials",
+         "schedule", "retry", "timeout", "command", "output", "group", "tags", "windows", "linux"]
+ATTACKS = ["1 UNION SELECT password FROM users", "<script>alert(1)</script>", "javascript:alert(1)",
+           "eval (atob('x'))", "${jndi:ldap://x/a}", "../../../../etc/passwd"]
+
+
+def build_body(size_bytes: int, attack_every: int, seed: int) -> str:
+    rng = random.Random(seed)
+    parts, size, next_attack = [], 0, attack_every
+    while size < size_bytes:
+        record = {rng.choice(WORDS): " ".join(f"{rng.choice(WORDS)}{rng.randint(0, 999)}" for _ in range(8))
+                  for _ in range(6)}
+        if attack_every and size >= next_attack:
+            record["payload"] = rng.choice(ATTACKS)
+            next_attack += attack_every
+        part = json.dumps(record)
+        parts.append(part)
+        size += len(part) + 1
+    return "[" + ",".join(parts) + "]"
+
+
+def legacy_scan(content: str):
+    found = {}
+    for pattern, signature in LEGACY_PATTERNS.items():
+        matches = re.findall(pattern, content)
+        if matches:
+            found[signature] = len(matches)
+    return found
+
+
+def rate(size: int, fn, repeat: int):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    seconds = (time.perf_counter() - started) / repeat
+    return result, size / seconds / 1e6
+
+
+def main(args) -> int:
+    size = args.size_mb * 1024 * 1024
+    matcher = ThreatMatcher(REQUEST_CONTENT_SIGNATURES, max_chars=size * 2)
+    failures = 0
+    print(f"{'body':<10} {'legacy MB/s':>12} {'scan MB/s':>10} {'stream MB/s':>12} {'is_match MB/s':>14} {'matches':>8}")
+    for label, attack_every in (("clean", 0), ("attacks", args.attack_every * 1024)):
+        body = build_body(size, attack_every, args.seed)
+        encoded = body.encode()
+
+        def stream():
+            scan = matcher.stream()
+            for offset in range(0, len(encoded), args.chunk_kb * 1024):
+                scan.feed(encoded[offset:offset + args.chunk_kb * 1024])
+            return scan.close()
+
+        legacy, legacy_rate = rate(len(body), lambda: legacy_scan(body), args.repeat)
+        result, scan_rate = rate(len(body), lambda: matcher.scan(body), args.repeat)
+        streamed, stream_rate = rate(len(body), stream, args.repeat)
+        _, first_rate = rate(len(body), lambda: matcher.is_match(body), args.repeat)
+
+        counts = {match.signature.id: match.count for match in result.matches}
+        expected = {signature: counts.get(signature, 0) for signature in legacy}
+        if expected != legacy or {m.signature.id: m.count for m in streamed.matches} != counts:
+            print(f"  MISMATCH ({label}): legacy {legacy}, scan {counts}")
+            failures += 1
+        print(f"{label:<10} {legacy_rate:>12.1f} {scan_rate:>10.1f} {stream_rate:>12.1f} {first_rate:>14.1f} "
+              f"{sum(counts.values()):>8}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=int, default=8)
+    parser.add_argument("--attack-every", type=int, default=64, help="KB between injected attack strings")
+    parser.add_argument("--chunk-kb", type=int, default=64)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Load test: latency of an unrelated endpoint during a login burst.
+
+Probes --probe-path at a steady rate, first alone (baseline) and then while
+--logins logins are fired at /auth/login with --concurrency in flight. With
+bcrypt on the password hashing pool, probe p99 during the burst should stay
+close to the baseline; with bcrypt on the event loop it grows by roughly the
+hash time times the number of queued logins. Logins rejected with 503 mean
+the hashing queue (PASSWORD_HASH_MAX_QUEUE) was full. Run against a running
+backend (one worker makes the effect easiest to see):
+
+    python scripts/loadtest_login_burst.py --base-url http://localhost:8000 \\
+        --username admin --password secret --logins 200 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from collections import Counter
+from typing import Dict, List, Tuple
+
+import httpx
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    return {
+        "n": len(samples),
+        "p50": percentile(samples, 50),
+        "p95": percentile(samples, 95),
+        "p99": percentile(samples, 99),
+        "max": max(samples) if samples else 0.0,
+        "mean": statistics.fmean(samples) if samples else 0.0,
+    }
+
+
+async def probe(client: httpx.AsyncClient, path: str, rate: float, stop: asyncio.Event, samples: List[float]):
+    """Issue one request every 1/rate seconds (without waiting for replies) until stopped."""
+    interval = 1.0 / rate
+    pending = set()
+
+    async def one():
+        started = time.perf_counter()
+        try:
+            await client.get(path)
+        except httpx.HTTPError:
+            return
+        samples.append((time.perf_counter() - started) * 1000)
+
+    while not stop.is_set():
+        task = asyncio.create_task(one())
+        pending.add(task)
+        task.add_done_callback(pending.discard)
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=interval)
+        except asyncio.TimeoutError:
+            pass
+    if pending:
+        await asyncio.gather(*pending)
+
+
+async def login_burst(client: httpx.AsyncClient, args) -> Tuple[Counter, List[float]]:
+    statuses: Counter = Counter()
+    latencies: List[float] = []
+    semaphore = asyncio.Semaphore(args.concurrency)
+    payload = {"username": args.username, "password": args.password}
+
+    async def one():
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                response = await client.post(args.login_path, json=payload)
+                statuses[response.status_code] += 1
+            except httpx.HTTPError as e:
+                statuses[type(e).__name__] += 1
+                return
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    await asyncio.gather(*(one() for _ in range(args.logins)))
+    return statuses, latencies
+
+
+async def run_phase(client: httpx.AsyncClient, args, with_burst: bool):
+    samples: List[float] = []
+    stop = asyncio.Event()
+    prober = asyncio.create_task(probe(client, args.probe_path, args.probe_rate, stop, samples))
+    result = None
+    if with_burst:
+        result = await login_burst(client, args)
+    else:
+        await asyncio.sleep(args.baseline_seconds)
+    stop.set()
+    await prober
+    return samples, result
+
+
+def print_row(label: str, stats: Dict[str, float]):
+    print(f"{label:<22} n={stats['n']:>6}  p50={stats['p50']:8.2f}  p95={stats['p95']:8.2f}  "
+          f"p99={stats['p99']:8.2f}  max={stats['max']:8.2f} ms")
+
+
+async def main(args) -> int:
+    limits = httpx.Limits(max_connections=args.concurrency + 50)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+        baseline, _ = await run_phase(client, args, with_burst=False)
+        burst, (statuses, login_latencies) = await run_phase(client, args, with_burst=True)
+
+    baseline_stats, burst_stats = summarize(baseline), summarize(burst)
+    print(f"Probe {args.probe_path} at {args.probe_rate:g}/s; "
+          f"{args.logins} logins, {args.concurrency} concurrent")
+    print_row("probe (baseline)", baseline_stats)
+    print_row("probe (login burst)", burst_stats)
+    print_row("login", summarize(login_latencies))
+    print("login statuses:", dict(statuses))
+
+    ratio = burst_stats["p99"] / baseline_stats["p99"] if baseline_stats["p99"] else float("inf")
+    print(f"probe p99 burst/baseline: {ratio:.2f}x (limit {args.max_p99_ratio:g}x)")
+    return 0 if ratio <= args.max_p99_ratio else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--login-path", default="/api/v3/auth/login")
+    parser.add_argument("--probe-path", default="/health")
+    parser.add_argument("--username", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--probe-rate", type=float, default=50.0, help="probe requests per second")
+    parser.add_argument("--baseline-seconds", type=float, default=10.0)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--max-p99-ratio", type=float, default=3.0,
+                        help="exit 1 if probe p99 during the burst exceeds this multiple of the baseline")
+    sys.exit(asyncio.run(main(parser.parse_args())))
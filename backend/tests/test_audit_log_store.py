@@ -0,0 +1,191 @@
+"""
+AuditLogStore: appends from several writers on one directory, the hash chain,
+checkpoints and tamper detection.
+"""
+import json
+import multiprocessing
+import os
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+
+from app.domains.audit.services.audit_log_store import AuditLogStore, CHECKPOINT_FILE
+
+
+def make_entry(source: str, number: int) -> dict:
+    return {
+        "id": str(uuid.uuid4()),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "event_type": "user_login",
+        "user_id": number % 3,
+        "severity": "info",
+        "resource_type": "user",
+        "details": {"source": source, "number": number}
+    }
+
+
+def make_store(directory, **kwargs) -> AuditLogStore:
+    return AuditLogStore(str(directory), fsync=False, **kwargs)
+
+
+def all_entries(store: AuditLogStore) -> list:
+    return [entry for _, entry in store.iter_entries()]
+
+
+def segment_paths(directory) -> list:
+    return sorted(
+        os.path.join(directory, name) for name in os.listdir(directory)
+        if name.startswith("audit-") and name.endswith(".jsonl")
+    )
+
+
+def _write_from_process(directory: str, source: str, batches: int, segment_max_bytes: int):
+    store = make_store(directory, segment_max_bytes=segment_max_bytes)
+    for number in range(batches):
+        store.append([make_entry(source, number * 2), make_entry(source, number * 2 + 1)])
+    store.close()
+
+
+def test_interleaved_writers_keep_every_entry_and_one_chain(tmp_path):
+    a, b = make_store(tmp_path), make_store(tmp_path)
+
+    b.append([make_entry("b", 0)])
+    a.append([make_entry("a", 0)])
+    b.append([make_entry("b", 1), make_entry("b", 2)])
+    a.append([make_entry("a", 1)])
+
+    for store in (a, b, make_store(tmp_path)):
+        sources = [(entry["details"]["source"], entry["details"]["number"]) for entry in all_entries(store)]
+        assert sources == [("b", 0), ("a", 0), ("b", 1), ("b", 2), ("a", 1)]
+        report = store.verify()
+        assert report["verified"], report["errors"]
+        assert report["events"] == 5
+
+
+def test_writer_picks_up_segments_sealed_by_another(tmp_path):
+    # Tiny segments so both writers roll over and checkpoint segments the other one started
+    a, b = make_store(tmp_path, segment_max_bytes=600), make_store(tmp_path, segment_max_bytes=600)
+    for number in range(20):
+        (a if number % 3 else b).append([make_entry("ab", number)])
+
+    assert len(segment_paths(tmp_path)) > 3
+    reader = make_store(tmp_path)
+    assert [entry["details"]["number"] for entry in all_entries(reader)] == list(range(20))
+    report = reader.verify()
+    assert report["verified"], report["errors"]
+    assert report["segments_checkpointed"] == report["segments"] - 1
+
+    with open(os.path.join(tmp_path, CHECKPOINT_FILE)) as handle:
+        checkpointed = [json.loads(line)["segment"] for line in handle]
+    assert len(checkpointed) == len(set(checkpointed))
+
+
+def test_reader_sees_appends_from_other_processes(tmp_path):
+    reader = make_store(tmp_path)
+    assert reader.query(filters={"event_type": "user_login"}) == ([], 0)
+
+    processes = [
+        multiprocessing.get_context("fork").Process(
+            target=_write_from_process, args=(str(tmp_path), source, 25, 4096)
+        )
+        for source in ("worker-1", "worker-2", "worker-3")
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(timeout=60)
+        assert process.exitcode == 0
+
+    events, total = reader.query(filters={"event_type": "user_login"}, limit=10)
+    assert total == 150
+    assert len(events) == 10
+    per_source = {}
+    for entry in all_entries(reader):
+        per_source.setdefault(entry["details"]["source"], []).append(entry["details"]["number"])
+    assert {source: sorted(numbers) for source, numbers in per_source.items()} == {
+        source: list(range(50)) for source in ("worker-1", "worker-2", "worker-3")
+    }
+    # Each process's entries stay in its own write order within the shared chain
+    assert all(numbers == sorted(numbers) for numbers in per_source.values())
+    report = reader.verify()
+    assert report["verified"], report["errors"]
+
+
+def test_torn_line_is_dropped_before_the_next_append(tmp_path):
+    store = make_store(tmp_path)
+    store.append([make_entry("a", 0)])
+    store.close()
+    with open(segment_paths(tmp_path)[-1], "ab") as handle:
+        handle.write(b'{"id": "half-writ')
+
+    store = make_store(tmp_path)
+    store.append([make_entry("a", 1)])
+
+    assert [entry["details"]["number"] for entry in all_entries(store)] == [0, 1]
+    assert store.verify()["verified"]
+
+
+@pytest.mark.parametrize("tamper", ["modify", "delete", "reorder"])
+def test_verify_detects_tampering(tmp_path, tamper):
+    store = make_store(tmp_path, segment_max_bytes=1500)
+    for number in range(12):
+        store.append([make_entry("a", number)])
+    assert store.verify()["verified"]
+    store.close()
+
+    path = segment_paths(tmp_path)[0]
+    with open(path, "rb") as handle:
+        lines = handle.readlines()
+    if tamper == "modify":
+        entry = json.loads(lines[1])
+        entry["severity"] = "critical"
+        lines[1] = json.dumps(entry, separators=(",", ":")).encode() + b"\n"
+    elif tamper == "delete":
+        del lines[1]
+    else:
+        lines[0], lines[1] = lines[1], lines[0]
+    with open(path, "wb") as handle:
+        handle.writelines(lines)
+
+    report = make_store(tmp_path).verify()
+    assert not report["verified"]
+    assert report["errors"]
+
+
+def test_verify_detects_a_rewritten_checkpoint(tmp_path):
+    store = make_store(tmp_path, segment_max_bytes=800)
+    for number in range(10):
+        store.append([make_entry("a", number)])
+    store.close()
+
+    path = os.path.join(tmp_path, CHECKPOINT_FILE)
+    with open(path) as handle:
+        checkpoints = [json.loads(line) for line in handle]
+    checkpoints[0]["root"] = "0" * 64
+    with open(path, "w") as handle:
+        handle.writelines(json.dumps(checkpoint) + "\n" for checkpoint in checkpoints)
+
+    report = make_store(tmp_path).verify()
+    assert not report["verified"]
+    assert any("Checkpoint log tampered" in error for error in report["errors"])
+
+
+def test_verify_summarizes_the_whole_range_in_one_pass(tmp_path):
+    store = make_store(tmp_path, segment_max_bytes=2000)
+    severities = ["info", "high", "critical"]
+    for number in range(60):
+        entry = make_entry("a", number)
+        entry["event_type"] = "data_export" if number % 4 == 0 else "user_login"
+        entry["severity"] = severities[number % 3]
+        entry["user_id"] = number % 7 or None
+        store.append([entry])
+
+    report = make_store(tmp_path).verify(summarize=True)
+    assert report["verified"], report["errors"]
+    assert report["segments"] > 1
+    assert report["events"] == 60
+    assert report["event_types"] == {"data_export": 15, "user_login": 45}
+    assert report["severities"] == {"info": 20, "high": 20, "critical": 20}
+    assert report["unique_users"] == 6
+    assert "event_types" not in store.verify()
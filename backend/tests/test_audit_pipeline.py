@@ -0,0 +1,212 @@
+"""
+AuditPipeline: the three overflow policies, spill and replay, and keeping
+events when the sink or the writer fails.
+"""
+import asyncio
+import json
+import os
+
+from app.domains.audit.services.audit_pipeline import AuditPipeline
+
+
+class GatedSink:
+    """Records batches; writes wait while the gate is closed and fail on chosen calls."""
+
+    def __init__(self, fail_calls=()):
+        self.batches = []
+        self.calls = 0
+        self.fail_calls = set(fail_calls)
+        self.gate = asyncio.Event()
+        self.gate.set()
+
+    async def __call__(self, entries):
+        await self.gate.wait()
+        call = self.calls
+        self.calls += 1
+        if call in self.fail_calls:
+            raise OSError("No space left on device")
+        self.batches.append([entry["n"] for entry in entries])
+
+    @property
+    def written(self):
+        return [number for batch in self.batches for number in batch]
+
+
+def entry(number: int, severity: str = "info") -> dict:
+    return {"n": number, "severity": severity}
+
+
+def make_pipeline(sink, **kwargs) -> AuditPipeline:
+    kwargs.setdefault("flush_interval", 0.001)
+    kwargs.setdefault("retry_initial", 0.001)
+    return AuditPipeline(sink, **kwargs)
+
+
+def write_spill(path, numbers):
+    with open(path, "w", encoding="utf-8") as spill:
+        spill.writelines(json.dumps(entry(number)) + "\n" for number in numbers)
+
+
+def read_spill(path):
+    with open(path, encoding="utf-8") as spill:
+        return [json.loads(line)["n"] for line in spill]
+
+
+def test_drop_info_drops_incoming_info_and_evicts_queued_info():
+    async def scenario():
+        sink = GatedSink()
+        sink.gate.clear()
+        pipeline = make_pipeline(sink, max_size=3, batch_size=1, overflow="drop_info")
+        await pipeline.start()
+        await pipeline.submit(entry(0))
+        await asyncio.sleep(0.02)  # entry 0 is now held by the stalled sink
+        for number in (1, 2, 3):
+            assert await pipeline.submit(entry(number))
+        assert await pipeline.submit(entry(4))              # full: incoming info is dropped
+        assert await pipeline.submit(entry(5, "high"))      # full: oldest queued info makes room
+        sink.gate.set()
+        await pipeline.stop()
+        return sink, pipeline
+
+    sink, pipeline = asyncio.run(scenario())
+    assert sink.written == [0, 2, 3, 5]
+    assert pipeline.dropped == 2
+
+
+def test_block_waits_for_space():
+    async def scenario():
+        sink = GatedSink()
+        sink.gate.clear()
+        pipeline = make_pipeline(sink, max_size=2, batch_size=1, overflow="block")
+        await pipeline.start()
+        await pipeline.submit(entry(0))
+        await asyncio.sleep(0.02)
+        await pipeline.submit(entry(1))
+        await pipeline.submit(entry(2))
+        waiting = asyncio.ensure_future(pipeline.submit(entry(3)))
+        await asyncio.sleep(0.02)
+        assert not waiting.done()
+        assert pipeline.blocked == 1
+        sink.gate.set()
+        assert await waiting
+        await pipeline.stop()
+        return sink, pipeline
+
+    sink, pipeline = asyncio.run(scenario())
+    assert sink.written == [0, 1, 2, 3]
+    assert pipeline.dropped == 0
+
+
+def test_spill_writes_overflow_to_disk_and_replays_it(tmp_path):
+    spill_path = str(tmp_path / "spill.jsonl")
+
+    async def scenario():
+        sink = GatedSink()
+        sink.gate.clear()
+        pipeline = make_pipeline(sink, max_size=2, batch_size=10, overflow="spill", spill_path=spill_path)
+        await pipeline.start()
+        await pipeline.submit(entry(0))
+        await asyncio.sleep(0.02)
+        for number in (1, 2, 3, 4):
+            await pipeline.submit(entry(number))
+        assert read_spill(spill_path) == [3, 4]
+        sink.gate.set()
+        await pipeline.stop()
+        return sink, pipeline
+
+    sink, pipeline = asyncio.run(scenario())
+    assert sink.batches == [[0], [1, 2], [3, 4]]
+    assert pipeline.spilled == 2
+    assert os.listdir(tmp_path) == []
+
+
+def test_failed_batches_are_retried_in_order():
+    async def scenario():
+        sink = GatedSink(fail_calls={0, 1, 3})
+        pipeline = make_pipeline(sink, batch_size=2, overflow="block")
+        await pipeline.start()
+        for number in range(5):
+            await pipeline.submit(entry(number))
+        await pipeline.stop()
+        return sink, pipeline
+
+    sink, pipeline = asyncio.run(scenario())
+    assert sink.written == [0, 1, 2, 3, 4]
+    assert pipeline.written == 5
+    assert pipeline.retries == 3
+    assert pipeline.failed > 0
+
+
+def test_replay_keeps_unwritten_events_until_they_are_written(tmp_path):
+    spill_path = str(tmp_path / "spill.jsonl")
+    write_spill(spill_path, range(5))
+
+    async def scenario():
+        sink = GatedSink(fail_calls={1})
+        pipeline = make_pipeline(sink, batch_size=2, overflow="spill", spill_path=spill_path, retry_initial=0.2)
+        await pipeline.start()
+        await asyncio.sleep(0.05)
+        # The first batch is written, the rest waits in the replay file for the retry
+        assert sink.written == [0, 1]
+        assert read_spill(f"{spill_path}.replay") == [2, 3, 4]
+        await pipeline.stop()
+        return sink
+
+    sink = asyncio.run(scenario())
+    assert sink.written == [0, 1, 2, 3, 4]
+    assert os.listdir(tmp_path) == []
+
+
+def test_writer_survives_unexpected_errors(tmp_path):
+    spill_path = str(tmp_path / "spill.jsonl")
+    write_spill(spill_path, [0, 1])
+
+    async def scenario():
+        sink = GatedSink()
+        pipeline = make_pipeline(sink, overflow="spill", spill_path=spill_path)
+        replay = pipeline._replay_spill
+        attempts = []
+
+        async def flaky_replay():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise OSError("Input/output error")
+            return await replay()
+
+        pipeline._replay_spill = flaky_replay
+        await pipeline.start()
+        await asyncio.sleep(0.05)
+        assert pipeline.running
+        await pipeline.submit(entry(2))
+        await pipeline.stop()
+        return sink, attempts
+
+    sink, attempts = asyncio.run(scenario())
+    assert len(attempts) == 2
+    assert sink.written == [0, 1, 2]
+
+
+def test_ended_writer_spills_what_it_holds_and_releases_blocked_callers(tmp_path):
+    spill_path = str(tmp_path / "spill.jsonl")
+
+    async def scenario():
+        sink = GatedSink()
+        sink.gate.clear()
+        pipeline = make_pipeline(sink, max_size=1, batch_size=1, overflow="block", spill_path=spill_path)
+        await pipeline.start()
+        await pipeline.submit(entry(0))
+        await asyncio.sleep(0.02)
+        await pipeline.submit(entry(1))
+        waiting = asyncio.ensure_future(pipeline.submit(entry(2)))
+        await asyncio.sleep(0.02)
+        assert not waiting.done()
+
+        pipeline._task.cancel()
+        # Released, and told to write the entry itself
+        assert await asyncio.wait_for(waiting, 1) is False
+        assert not pipeline.running
+        return pipeline
+
+    pipeline = asyncio.run(scenario())
+    assert read_spill(spill_path) == [0, 1]
+    assert pipeline.depth == 0
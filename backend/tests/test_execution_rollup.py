@@ -0,0 +1,133 @@
+"""
+Execution rollups: merging stats by addition, histogram percentiles and bucket
+boundaries. None of it needs a database.
+"""
+import math
+import random
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from app.models.job_models import ExecutionStatus
+from app.services.execution_rollup_service import (
+    ALL, DURATION_BINS, ExecutionRollupService, ExecutionStats, _duration_bin, bucket_start
+)
+
+STATUSES = [ExecutionStatus.COMPLETED] * 6 + [ExecutionStatus.FAILED, ExecutionStatus.CANCELLED]
+
+
+def random_rows(rng: random.Random, count: int) -> list:
+    return [
+        (rng.choice(STATUSES), None if rng.random() < 0.1 else int(rng.lognormvariate(8, 2)))
+        for _ in range(count)
+    ]
+
+
+def stats_of(rows) -> ExecutionStats:
+    stats = ExecutionStats()
+    for status, duration_ms in rows:
+        stats.add(status, duration_ms)
+    return stats
+
+
+def exact_percentile_seconds(rows, fraction: float) -> float:
+    durations = sorted(duration for status, duration in rows if status == ExecutionStatus.COMPLETED and duration is not None)
+    return durations[max(math.ceil(fraction * len(durations)), 1) - 1] / 1000
+
+
+def test_merging_parts_equals_stats_of_the_whole():
+    rng = random.Random(50)
+    rows = random_rows(rng, 1000)
+    cuts = sorted(rng.sample(range(1, len(rows)), 9))
+    parts = [rows[start:end] for start, end in zip([0] + cuts, cuts + [len(rows)])]
+
+    merged = ExecutionStats()
+    merged.merge(ExecutionStats())
+    for part in parts:
+        merged.merge(stats_of(part))
+    assert merged.to_values() == stats_of(rows).to_values()
+
+    # Stored rows merge the same way; their histogram is the duration_histogram column
+    row = SimpleNamespace(**stats_of(parts[0]).to_values())
+    from_rows = ExecutionStats()
+    from_rows.merge(row)
+    for part in parts[1:]:
+        from_rows.merge(stats_of(part))
+    assert from_rows.to_values() == merged.to_values()
+
+
+def test_counts_and_rates():
+    stats = stats_of([
+        (ExecutionStatus.COMPLETED, 1000), (ExecutionStatus.COMPLETED, None), (ExecutionStatus.COMPLETED, -5),
+        (ExecutionStatus.FAILED, 2000), (ExecutionStatus.CANCELLED, None)
+    ])
+    assert (stats.total, stats.completed, stats.failed, stats.cancelled, stats.timed) == (5, 3, 1, 1, 2)
+    assert stats.success_rate == 60
+    assert stats.avg_seconds == 0.5
+    assert (stats.duration_min_ms, stats.duration_max_ms) == (0, 1000)
+
+    empty = ExecutionStats()
+    assert empty.success_rate == 0 and empty.avg_seconds == 0
+    assert empty.percentile_seconds(0.95) is None
+    assert empty.duration_stats() == {}
+
+
+def test_percentiles_stay_within_the_bin_error():
+    rng = random.Random(95)
+    rows = random_rows(rng, 5000)
+    stats = stats_of(rows)
+    # Bins are a quarter octave wide and estimates sit at their geometric middle
+    tolerance = 2 ** (1 / 8) - 1
+    for fraction in (0.01, 0.25, 0.5, 0.9, 0.95, 0.99):
+        exact = exact_percentile_seconds(rows, fraction)
+        assert abs(stats.percentile_seconds(fraction) - exact) <= exact * tolerance + 0.001, fraction
+
+    assert stats.percentile_seconds(0) >= stats.duration_min_ms / 1000
+    assert stats.percentile_seconds(1) <= stats.duration_max_ms / 1000
+    single = stats_of([(ExecutionStatus.COMPLETED, 1234)])
+    assert single.percentile_seconds(0.5) == single.percentile_seconds(0.99) == 1.234
+
+
+def test_duration_bins():
+    assert _duration_bin(0) == 0
+    assert _duration_bin(0.5) == 0
+    assert _duration_bin(1) == 1
+    assert _duration_bin(2) == 5
+    assert _duration_bin(10 ** 12) == DURATION_BINS - 1
+    previous = 0
+    for duration_ms in range(1, 100000, 7):
+        assert _duration_bin(duration_ms) >= previous
+        previous = _duration_bin(duration_ms)
+
+
+def test_bucket_start():
+    moment = datetime(2026, 3, 14, 15, 9, 26, 535897, tzinfo=timezone.utc)
+    assert bucket_start(moment, "hour") == datetime(2026, 3, 14, 15, tzinfo=timezone.utc)
+    assert bucket_start(moment, "day") == datetime(2026, 3, 14, tzinfo=timezone.utc)
+    assert bucket_start(moment.replace(tzinfo=None), "hour") == datetime(2026, 3, 14, 15, tzinfo=timezone.utc)
+
+    # Buckets are UTC whatever the offset of the value
+    local = datetime(2026, 3, 15, 1, 30, tzinfo=timezone(timedelta(hours=5)))
+    assert bucket_start(local, "day") == datetime(2026, 3, 14, tzinfo=timezone.utc)
+    assert bucket_start(local, "hour") == datetime(2026, 3, 14, 20, tzinfo=timezone.utc)
+
+
+def test_stats_by_key_covers_each_scope_and_the_all_rows():
+    created = datetime(2026, 3, 14, 15, 9, tzinfo=timezone.utc)
+    execution = SimpleNamespace(
+        job_id=7, status=ExecutionStatus.COMPLETED, created_at=created,
+        started_at=created, completed_at=created + timedelta(seconds=3)
+    )
+    result = SimpleNamespace(
+        target_id=3, status=ExecutionStatus.FAILED, created_at=created, execution_time_ms=None,
+        started_at=created, completed_at=created + timedelta(seconds=1)
+    )
+    stats = ExecutionRollupService._stats_by_key([execution], [result])
+
+    hour, day = bucket_start(created, "hour"), bucket_start(created, "day")
+    assert set(stats) == {
+        (scope, scope_id, grain, bucket)
+        for scope, scope_id in (("job", 7), ("job", ALL), ("target", 3), ("target", ALL))
+        for grain, bucket in (("hour", hour), ("day", day))
+    }
+    assert stats[("job", 7, "hour", hour)].duration_sum_ms == 3000
+    assert stats[("target", ALL, "day", day)].failed == 1
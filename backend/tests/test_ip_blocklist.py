@@ -0,0 +1,134 @@
+"""
+IP blocklist: radix-tree lookups against a brute-force ipaddress scan, and
+client address resolution through trusted proxies.
+"""
+import ipaddress
+import random
+import time
+
+import pytest
+
+from app.core.ip_blocklist_middleware import resolve_client_ip
+from app.domains.security.services.ip_blocklist import IpBlocklist, NetworkSet, RadixTree, parse_network
+
+
+def make_blocklist() -> IpBlocklist:
+    return IpBlocklist("redis://localhost:6379/0", enabled=False)
+
+
+def block_locally(blocklist: IpBlocklist, network: str, ttl: float = 3600):
+    """Apply a block to this process's trees only (what a pub/sub receiver does)."""
+    parsed = str(parse_network(network))
+    now = time.time()
+    blocklist._apply(parsed, {"network": parsed, "blocked_at": now, "expires_ts": now + ttl})
+
+
+def random_network(rng: random.Random, version: int) -> str:
+    if version == 4:
+        return str(ipaddress.ip_network((rng.getrandbits(32), rng.randint(8, 32)), strict=False))
+    return str(ipaddress.ip_network((rng.getrandbits(128), rng.randint(16, 128)), strict=False))
+
+
+def brute_force(networks, address: str):
+    """The most specific network containing address, by scanning every network."""
+    parsed = ipaddress.ip_address(address)
+    matches = [network for network in networks if parsed in network]
+    return str(max(matches, key=lambda network: network.prefixlen)) if matches else None
+
+
+@pytest.mark.parametrize("version", [4, 6])
+def test_radix_lookup_matches_brute_force(version):
+    rng = random.Random(version)
+    width = 32 if version == 4 else 128
+    tree = RadixTree(width)
+    networks = {parse_network(random_network(rng, version)) for _ in range(300)}
+    for network in networks:
+        tree.insert(int(network.network_address), network.prefixlen, {"network": str(network)})
+    assert tree.size == len(networks)
+
+    # Addresses inside the stored networks as well as random ones
+    addresses = [str(network.network_address + rng.randrange(network.num_addresses)) for network in networks]
+    address_type = ipaddress.IPv4Address if version == 4 else ipaddress.IPv6Address
+    addresses += [str(address_type(rng.getrandbits(width))) for _ in range(300)]
+    for address in addresses:
+        entry = tree.lookup(int(ipaddress.ip_address(address)), lambda e: True)
+        assert (entry["network"] if entry else None) == brute_force(networks, address), address
+
+
+def test_radix_remove_falls_back_to_the_enclosing_network():
+    tree = RadixTree(32)
+    for network in ("10.0.0.0/8", "10.1.0.0/16", "10.1.2.0/24"):
+        parsed = parse_network(network)
+        tree.insert(int(parsed.network_address), parsed.prefixlen, {"network": network})
+    key = int(ipaddress.ip_address("10.1.2.3"))
+
+    assert tree.lookup(key, lambda e: True)["network"] == "10.1.2.0/24"
+    assert not tree.remove(int(ipaddress.ip_address("10.1.0.0")), 17)
+    assert tree.remove(int(ipaddress.ip_address("10.1.2.0")), 24)
+    assert tree.lookup(key, lambda e: True)["network"] == "10.1.0.0/16"
+    assert tree.lookup(key, lambda e: e["network"] != "10.1.0.0/16")["network"] == "10.0.0.0/8"
+    assert tree.size == 2
+
+
+def test_check_covers_ranges_mapped_addresses_and_expiry():
+    blocklist = make_blocklist()
+    block_locally(blocklist, "203.0.113.0/24")
+    block_locally(blocklist, "2001:db8::/32")
+    block_locally(blocklist, "198.51.100.7", ttl=-1)
+
+    assert blocklist.check("203.0.113.200")["network"] == "203.0.113.0/24"
+    assert blocklist.check("::ffff:203.0.113.9")["network"] == "203.0.113.0/24"
+    assert blocklist.check("2001:db8:1::5")["network"] == "2001:db8::/32"
+    assert blocklist.check("203.0.114.1") is None
+    assert blocklist.check("198.51.100.7") is None
+    assert blocklist.check("not-an-address") is None
+    assert [entry["network"] for entry in blocklist.list_blocks()] == ["2001:db8::/32", "203.0.113.0/24"]
+
+    blocklist._apply("203.0.113.0/24", None)
+    assert blocklist.check("203.0.113.200") is None
+
+
+def test_network_set_from_setting():
+    trusted = NetworkSet.from_setting(" 172.16.0.0/12, 127.0.0.1,, ::1 ")
+    assert trusted
+    assert "172.18.0.5" in trusted
+    assert "127.0.0.1" in trusted and "::1" in trusted
+    assert "::ffff:172.20.0.1" in trusted
+    assert "8.8.8.8" not in trusted and "garbage" not in trusted
+    assert not NetworkSet.from_setting(None)
+    assert not NetworkSet.from_setting("")
+
+
+def make_scope(peer: str, **headers) -> dict:
+    return {
+        "type": "http",
+        "client": (peer, 51234),
+        "headers": [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()]
+    }
+
+
+TRUSTED = NetworkSet.from_setting("172.16.0.0/12")
+
+
+def test_forwarded_headers_are_ignored_from_untrusted_peers():
+    scope = make_scope("198.51.100.1", x_forwarded_for="10.9.9.9", x_real_ip="10.9.9.9")
+    assert resolve_client_ip(scope, TRUSTED) == "198.51.100.1"
+    assert resolve_client_ip(make_scope("172.18.0.2", x_forwarded_for="10.9.9.9"), NetworkSet()) == "172.18.0.2"
+
+
+def test_forwarded_for_takes_the_right_most_untrusted_hop():
+    # The client can prepend anything; only hops added by trusted proxies count
+    scope = make_scope("172.18.0.2", x_forwarded_for="1.2.3.4, 203.0.113.9, 172.18.0.3")
+    assert resolve_client_ip(scope, TRUSTED) == "203.0.113.9"
+
+    repeated = make_scope("172.18.0.2")
+    repeated["headers"] = [(b"x-forwarded-for", b"1.2.3.4"), (b"x-forwarded-for", b"203.0.113.9")]
+    assert resolve_client_ip(repeated, TRUSTED) == "203.0.113.9"
+
+    assert resolve_client_ip(make_scope("172.18.0.2", x_forwarded_for="172.18.0.9, 172.18.0.3"), TRUSTED) == "172.18.0.9"
+
+
+def test_real_ip_and_peer_fallbacks():
+    assert resolve_client_ip(make_scope("172.18.0.2", x_real_ip="203.0.113.9"), TRUSTED) == "203.0.113.9"
+    assert resolve_client_ip(make_scope("172.18.0.2"), TRUSTED) == "172.18.0.2"
+    assert resolve_client_ip({"type": "http", "client": None}, TRUSTED) is None
@@ -0,0 +1,130 @@
+"""
+Threat signatures: the single-pass automaton against the per-pattern regexes
+it replaced, streaming across chunk boundaries, and the size cap.
+"""
+import random
+import re
+
+import pytest
+
+from app.domains.security.services.threat_signatures import (
+    ThreatMatcher, REQUEST_CONTENT_SIGNATURES, USER_AGENT_SIGNATURES
+)
+
+# The patterns SecurityService ran one after another with re.findall, by the signature replacing each
+LEGACY_PATTERNS = {
+    "sql_statement": r"(?i)(union|select|insert|delete|drop|create|alter)\s+",
+    "xss_script_tag": r"(?i)<script[^>]*>.*?</script>",
+    "xss_javascript_uri": r"(?i)javascript:",
+    "code_eval": r"(?i)eval\s*\(",
+}
+LEGACY_USER_AGENTS = {"sqlmap", "nikto", "nmap", "masscan", "curl/7.0"}
+
+# Fragments that make near-misses and matches likely in random content
+FRAGMENTS = [
+    "union", "UNION", "select", "SeLeCt", "drop", "alter", "insert", "delete", "create", "unio", "sel",
+    "<script>", "<SCRIPT type=x>", "</script>", "</scr", "<scrip", ">", "javascript:", "JavaScript", "java",
+    "eval", "EVAL", "(", ")", " ", "  ", "\t", "\n", "a", "b", "=", "'", "\"", "1", "/", "..",
+]
+
+
+def random_content(rng: random.Random, pieces: int) -> str:
+    return "".join(rng.choice(FRAGMENTS) for _ in range(pieces))
+
+
+def legacy_matches(content: str):
+    return {
+        signature_id: [found.group().lower() for found in re.finditer(pattern, content)]
+        for signature_id, pattern in LEGACY_PATTERNS.items()
+    }
+
+
+@pytest.fixture(scope="module")
+def matcher():
+    return ThreatMatcher(REQUEST_CONTENT_SIGNATURES)
+
+
+def test_automaton_agrees_with_legacy_patterns(matcher):
+    rng = random.Random(48)
+    for _ in range(2000):
+        content = random_content(rng, rng.randint(1, 40))
+        result = {match.signature.id: match for match in matcher.scan(content, max_samples=100).matches}
+        for signature_id, expected in legacy_matches(content).items():
+            if signature_id == "xss_script_tag" and "\n" in content:
+                # The signature also matches script blocks spanning lines, which "." without re.S missed
+                assert signature_id in result or not expected, content
+                continue
+            assert (signature_id in result) == bool(expected), (signature_id, content)
+            if expected and signature_id != "xss_script_tag":
+                # These patterns cannot overlap, so every findall match is one automaton match
+                assert result[signature_id].samples == expected, (signature_id, content)
+                assert result[signature_id].count == len(expected)
+        assert matcher.is_match(content) == bool(result), content
+
+
+def test_user_agent_matcher_agrees_with_substring_checks():
+    matcher = ThreatMatcher(USER_AGENT_SIGNATURES, max_chars=4096)
+    agents = [
+        "Mozilla/5.0 (X11; Linux x86_64)", "sqlmap/1.7.2#stable", "Mozilla/5.00 (Nikto/2.1.6)",
+        "Nmap Scripting Engine", "masscan/1.3", "curl/7.0.1", "curl/7.81.0", "python-requests/2.31", ""
+    ]
+    for agent in agents:
+        expected = any(suspicious in agent.lower() for suspicious in LEGACY_USER_AGENTS)
+        assert matcher.is_match(agent) == expected, agent
+
+
+def test_literal_signatures_and_shared_prefixes(matcher):
+    result = matcher.scan("GET /?q=${JNDI:ldap://x} ../../etc/passwd information_schema")
+    assert {match.signature.id for match in result.matches} == {
+        "jndi_lookup", "path_traversal", "command_injection", "sql_probe"
+    }
+    assert [match.signature.id for match in matcher.scan("<script>\nalert(1)\n</script>").matches] == ["xss_script_tag"]
+
+    # "select" also matches as an anchor when a longer literal starts at the same place
+    matcher = ThreatMatcher(REQUEST_CONTENT_SIGNATURES + [
+        REQUEST_CONTENT_SIGNATURES[0]._replace(id="selector", literals=("selector",), pattern=None)
+    ])
+    result = matcher.scan("selector select x")
+    counts = {match.signature.id: match.count for match in result.matches}
+    assert counts == {"selector": 1, "sql_statement": 1}
+
+
+def test_streaming_finds_matches_across_chunk_boundaries(matcher):
+    rng = random.Random(7)
+    for _ in range(200):
+        content = random_content(rng, rng.randint(20, 200)) + "x" * rng.randint(0, 5000)
+        whole = matcher.scan(content, max_samples=1000)
+        scan = matcher.stream(max_samples=1000)
+        position = 0
+        while position < len(content):
+            size = rng.randint(1, 64)
+            scan.feed(content[position:position + size].encode())
+            position += size
+        chunked = scan.close()
+        assert sorted(chunked.matches) == sorted(whole.matches)
+        assert chunked.scanned_chars == len(content)
+
+
+def test_multibyte_characters_split_between_chunks(matcher):
+    payload = "é<script>alert(1)</script>".encode()
+    scan = matcher.stream()
+    scan.feed(payload[:1])
+    scan.feed(payload[1:])
+    result = scan.close()
+    assert [match.signature.id for match in result.matches] == ["xss_script_tag"]
+    assert result.scanned_chars == len("é<script>alert(1)</script>")
+
+
+def test_content_beyond_the_cap_is_not_scanned():
+    matcher = ThreatMatcher(REQUEST_CONTENT_SIGNATURES, max_chars=100)
+    result = matcher.scan("a" * 95 + " union select 1")
+    assert result.truncated
+    assert result.scanned_chars == 100
+    assert result.matches == []
+
+    scan = matcher.stream()
+    assert not scan.feed("drop table x; " + "a" * 50)
+    assert scan.feed("a" * 100)
+    result = scan.close()
+    assert result.truncated
+    assert [match.signature.id for match in result.matches] == ["sql_statement"]